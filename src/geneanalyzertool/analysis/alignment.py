@@ -0,0 +1,295 @@
+from functools import lru_cache
+from typing import List, Tuple
+
+import numpy as np
+
+# Defaults of EMBOSS needle and water: +5/-4 for nucleotides (EDNAFULL on A, C, G and T), BLOSUM62 for proteins,
+# and a gap of length L costs gap_open + (L - 1) * gap_extend.
+DEFAULT_MATCH = 5.0
+DEFAULT_MISMATCH = -4.0
+DEFAULT_PROTEIN_MATRIX = "BLOSUM62"
+DEFAULT_GAP_OPEN = 10.0
+DEFAULT_GAP_EXTEND = 0.5
+
+# Alignment modes of the DP kernel. "anchored" alignments start at the first cell like global ones and may end in
+# any cell like local ones; they find where the best local alignment starts, see align().
+GLOBAL = "global"
+LOCAL = "local"
+ANCHORED = "anchored"
+
+NEG_INF = -np.inf
+
+# Bits of a traceback cell: where H came from (the low two bits) and whether the gap states extend a gap.
+FROM_DIAGONAL = 1
+FROM_UP = 2
+FROM_LEFT = 3
+UP_EXTENDS = 4
+LEFT_EXTENDS = 8
+
+
+@lru_cache(maxsize=32)
+def scoring_table(match: float = DEFAULT_MATCH, mismatch: float = DEFAULT_MISMATCH,
+                  matrix: str | None = None) -> np.ndarray:
+    """
+    256 x 256 substitution scores indexed by the bytes of two residues, case insensitive. Without a matrix, equal
+    residues score match and different ones mismatch. matrix names a substitution matrix shipped with Biopython
+    (BLOSUM62, PAM250, ...); residues it does not know score its lowest value.
+    """
+    upper = np.frombuffer(bytes(range(256)).upper(), dtype=np.uint8)
+    if matrix is None:
+        table = np.where(upper[:, None] == upper[None, :], float(match), float(mismatch))
+    else:
+        # Biopython is slow to import, so it is only loaded when a matrix is used.
+        from Bio.Align import substitution_matrices
+        try:
+            scores = substitution_matrices.load(matrix)
+        except FileNotFoundError:
+            raise ValueError(f"Unknown substitution matrix {matrix}. Choose one of "
+                             f"{', '.join(substitution_matrices.load())}.")
+        codes = np.full(256, len(scores.alphabet), dtype=np.intp)
+        for code, residue in enumerate(scores.alphabet):
+            codes[ord(residue.upper())] = code
+        known = np.full((len(scores.alphabet) + 1,) * 2, float(np.min(scores)))
+        known[:-1, :-1] = scores
+        table = known[np.ix_(codes[upper], codes[upper])]
+    table.setflags(write=False)
+    return table
+
+
+def band_limits(query_length: int, target_length: int, band: int | None) -> Tuple[int, int]:
+    """
+    Lowest and highest diagonal (target position - query position) of the cells computed. A band of width w keeps
+    w diagonals on either side of those joining the two corners, None keeps every cell.
+    """
+    if band is None:
+        return -query_length, target_length
+    if band < 0:
+        raise ValueError("Band width must not be negative")
+    return min(0, target_length - query_length) - band, max(0, target_length - query_length) + band
+
+
+def alignment_score(query: bytes, target: bytes, table: np.ndarray, gap_open: float = DEFAULT_GAP_OPEN,
+                    gap_extend: float = DEFAULT_GAP_EXTEND, mode: str = GLOBAL,
+                    band: int | None = None) -> Tuple[float, int, int]:
+    """
+    Score of the best alignment of query and target without its traceback, so memory stays linear in the length
+    of the sequences. Returns the score and the (exclusive) query and target ends of the alignment, which are the
+    sequence ends for global alignments.
+    """
+    _check_gaps(gap_open, gap_extend)
+    query, target = _codes(query), _codes(target)
+    score, end_i, end_j, _ = _dp(query, target, table, gap_open, gap_extend, mode,
+                                 band_limits(len(query), len(target), band))
+    return score, end_i, end_j
+
+
+def align(query: bytes, target: bytes, table: np.ndarray, gap_open: float = DEFAULT_GAP_OPEN,
+          gap_extend: float = DEFAULT_GAP_EXTEND, local: bool = False, band: int | None = None) -> dict:
+    """
+    Best global (Needleman-Wunsch) or local (Smith-Waterman) alignment of query and target with affine gap costs
+    (Gotoh), a gap of length L costing gap_open + (L - 1) * gap_extend.
+
+    Local alignments are found with two linear memory passes and one traceback over the aligned region only: a
+    forward pass finds where the best alignment ends, a reverse anchored pass from that end finds where it starts,
+    and a global alignment of the two segments recovers the alignment itself. A short query against a whole
+    chromosome therefore only keeps traceback for the matched region.
+
+    Args:
+        query: ASCII bytes of the query
+        target: ASCII bytes of the target
+        table: Substitution scores, see scoring_table()
+        gap_open: Cost of the first position of a gap
+        gap_extend: Cost of every further position of a gap, at most gap_open
+        local: Align the best matching segments instead of the whole sequences
+        band: Only consider alignments within this many diagonals of the corner diagonals (see band_limits()),
+            which is exact as long as the best alignment stays within the band and much faster for similar
+            sequences
+
+    Returns:
+        The score, the aligned segments (0-based, exclusive ends, so query[Query Start:Query End] is aligned), the
+        alignment length, identity and number of gap positions, and the aligned query and target with gaps as "-"
+    """
+    _check_gaps(gap_open, gap_extend)
+    query, target = _codes(query), _codes(target)
+    limits = band_limits(len(query), len(target), band)
+    query_start, target_start, query_end, target_end = 0, 0, len(query), len(target)
+
+    if local:
+        score, query_end, target_end, _ = _dp(query, target, table, gap_open, gap_extend, LOCAL, limits)
+        if score > 0:
+            # Reversed prefixes: diagonal d of the forward matrix is diagonal (target_end - query_end) - d here.
+            offset = target_end - query_end
+            window = max(0, target_end - _target_span(query_end, score, table, gap_open, gap_extend))
+            _, length_i, length_j, _ = _dp(query[:query_end][::-1], target[window:target_end][::-1], table, gap_open,
+                                           gap_extend, ANCHORED, (offset - limits[1], offset - limits[0]))
+            query_start, target_start = query_end - length_i, target_end - length_j
+        else:
+            query_end, target_end = query_start, target_start = 0, 0
+        # Diagonals of the segments are shifted by where they start.
+        limits = (limits[0] - (target_start - query_start), limits[1] - (target_start - query_start))
+
+    query_segment, target_segment = query[query_start:query_end], target[target_start:target_end]
+    score, _, _, trace = _dp(query_segment, target_segment, table, gap_open, gap_extend, GLOBAL, limits, trace=True)
+    aligned_query, aligned_target = _traceback(query_segment, target_segment, trace, limits)
+
+    identical = sum(a == b for a, b in zip(aligned_query.upper(), aligned_target.upper()) if a != "-")
+    gaps = aligned_query.count("-") + aligned_target.count("-")
+    return {
+        "Score": round(float(score), 2),
+        "Query Start": query_start,
+        "Query End": query_end,
+        "Target Start": target_start,
+        "Target End": target_end,
+        "Length": len(aligned_query),
+        "Identity": round(identical / len(aligned_query) * 100, 2) if aligned_query else 0.0,
+        "Gaps": gaps,
+        "Query": aligned_query,
+        "Target": aligned_target
+    }
+
+
+def _dp(query: np.ndarray, target: np.ndarray, table: np.ndarray, gap_open: float, gap_extend: float, mode: str,
+        limits: Tuple[int, int], trace: bool = False) -> Tuple[float, int, int, Tuple[np.ndarray, np.ndarray] | None]:
+    """
+    Gotoh's affine gap recurrences, one query position (row) at a time with NumPy operations over the target
+    positions (columns) of the row, restricted to the diagonals in limits. H holds the best score of a cell, F of
+    a cell ending in a gap in the target (coming from the row above) and E of one ending in a gap in the query
+    (coming from the left).
+
+    F only depends on the previous row and vectorizes directly. E[j] = max(H[j - 1] - open, E[j - 1] - extend)
+    runs along the row; it is solved for the whole row with one prefix maximum: E[j] = max over k < j of
+    H[k] + k * extend, minus open + (j - 1) * extend. H[k] may be taken before E is folded in, since a gap opened
+    right after a gap never beats extending it when open >= extend. This is the scan formulation of the striped
+    kernels, with NumPy vectors spanning the whole row.
+
+    Returns:
+        The score and the (exclusive) query and target ends of the best alignment, and with trace the traceback
+        cells of every row (see the FROM_ and _EXTENDS bits) and the first column each row of them starts at
+    """
+    n, m = len(query), len(target)
+    low, high = limits
+    local = mode == LOCAL
+    H = np.full(m + 1, NEG_INF)
+    F = np.full(m + 1, NEG_INF)
+    # j * extend and open + j * extend for every column, used by the scan for E.
+    extends = np.arange(m + 1) * gap_extend
+    opens = extends + gap_open
+    # Scratch rows, reused by every row to keep NumPy from allocating several arrays per row.
+    diagonal_buffer, before_left_buffer, left_buffer = np.empty(m), np.empty(m), np.empty(m)
+
+    last = min(m, high)
+    if local:
+        H[:last + 1] = 0.0
+    else:
+        H[0] = 0.0
+        H[1:last + 1] = -opens[:last]
+
+    best, best_i, best_j = 0.0, 0, 0
+    rows = np.zeros((n + 1, max(min(m, high - low + 1), 0)), dtype=np.uint8) if trace else None
+    row_starts = np.ones(n + 1, dtype=np.intp)
+
+    for i in range(1, n + 1):
+        first, last = max(1, i + low), min(m, i + high)
+        row_starts[i] = first
+        boundary = 0.0 if local else -(gap_open + (i - 1) * gap_extend)
+        if first > last:
+            H[0] = boundary
+            continue
+        width = last - first + 1
+
+        diagonal = table[query[i - 1]].take(target[first - 1:last], out=diagonal_buffer[:width])
+        diagonal += H[first - 1:last]
+        up = F[first:last + 1]
+        up -= gap_extend
+        opened = np.subtract(H[first:last + 1], gap_open, out=before_left_buffer[:width])
+        if trace:
+            up_extends = up >= opened
+        np.maximum(up, opened, out=up)
+        before_left = np.maximum(diagonal, up, out=before_left_buffer[:width])
+        if local:
+            np.maximum(before_left, 0.0, out=before_left)
+
+        # Column first - 1 is column 0 (the boundary) when it lies in the band, outside the band otherwise.
+        left = left_buffer[:width]
+        left[0] = boundary if i + low <= 0 else NEG_INF
+        left[1:] = before_left[:-1]
+        left += extends[first - 1:last]
+        np.maximum.accumulate(left, out=left)
+        left -= opens[first - 1:last]
+        row = np.maximum(before_left, left, out=H[first:last + 1])
+
+        if trace:
+            cells = np.where(row == diagonal, FROM_DIAGONAL, np.where(row == up, FROM_UP, FROM_LEFT)).astype(np.uint8)
+            cells |= up_extends.astype(np.uint8) * UP_EXTENDS
+            cells[1:] |= (left[:-1] - gap_extend >= before_left[:-1] - gap_open).astype(np.uint8) * LEFT_EXTENDS
+            rows[i, :width] = cells
+        H[0] = boundary
+
+        if mode != GLOBAL:
+            column = int(np.argmax(row))
+            if row[column] > best:
+                best, best_i, best_j = float(row[column]), i, first + column
+
+    traceback = (rows, row_starts) if trace else None
+    if mode == GLOBAL:
+        return float(H[m]), n, m, traceback
+    return best, best_i, best_j, traceback
+
+
+def _traceback(query: np.ndarray, target: np.ndarray, trace: Tuple[np.ndarray, np.ndarray],
+               limits: Tuple[int, int]) -> Tuple[str, str]:
+    """Follows the traceback cells of a global alignment from the last cell back to the first one."""
+    rows, row_starts = trace
+    query_text, target_text = query.tobytes().decode("latin-1"), target.tobytes().decode("latin-1")
+    aligned_query: List[str] = []
+    aligned_target: List[str] = []
+    i, j = len(query), len(target)
+    state = 0
+
+    while i > 0 or j > 0:
+        if i == 0 or j == 0:
+            # Leading gap along the first row or column.
+            aligned_query.append(query_text[i - 1] if i else "-")
+            aligned_target.append(target_text[j - 1] if j else "-")
+            i, j = max(i - 1, 0), max(j - 1, 0)
+            continue
+
+        cell = int(rows[i, j - row_starts[i]])
+        state = state or cell & 3
+        if state == FROM_DIAGONAL:
+            aligned_query.append(query_text[i - 1])
+            aligned_target.append(target_text[j - 1])
+            i, j, state = i - 1, j - 1, 0
+        elif state == FROM_UP:
+            aligned_query.append(query_text[i - 1])
+            aligned_target.append("-")
+            i, state = i - 1, FROM_UP if cell & UP_EXTENDS else 0
+        else:
+            aligned_query.append("-")
+            aligned_target.append(target_text[j - 1])
+            j, state = j - 1, FROM_LEFT if cell & LEFT_EXTENDS else 0
+
+    return "".join(reversed(aligned_query)), "".join(reversed(aligned_target))
+
+
+def _target_span(query_length: int, score: float, table: np.ndarray, gap_open: float, gap_extend: float) -> int:
+    """
+    Most target positions a local alignment scoring score over at most query_length query positions can span:
+    its residue pairs score at most query_length times the best substitution score, which bounds the cost, and
+    so the length, of the gaps in the query.
+    """
+    slack = query_length * float(table.max()) - score - gap_open
+    if slack < 0:
+        return query_length
+    if gap_extend == 0:
+        return np.iinfo(np.intp).max
+    return query_length + int(slack / gap_extend) + 1
+
+
+def _codes(sequence: bytes | np.ndarray) -> np.ndarray:
+    return sequence if isinstance(sequence, np.ndarray) else np.frombuffer(sequence, dtype=np.uint8)
+
+
+def _check_gaps(gap_open: float, gap_extend: float):
+    if not 0 <= gap_extend <= gap_open:
+        raise ValueError("Gap costs must satisfy 0 <= gap extend <= gap open")
@@ -0,0 +1,207 @@
+from typing import Any, Iterable, Iterator, List, Tuple, override
+
+from geneanalyzertool.analysis.alignment import (
+    DEFAULT_GAP_EXTEND, DEFAULT_GAP_OPEN, DEFAULT_MATCH, DEFAULT_MISMATCH, DEFAULT_PROTEIN_MATRIX, GLOBAL, LOCAL,
+    align, alignment_score, scoring_table
+)
+from geneanalyzertool.analysis.composition import sequence_bytes
+from geneanalyzertool.analysis.mode import CYAN, RESET, YELLOW, AnalysisMode
+from geneanalyzertool.analysis.parallel import analyze_in_parallel
+from geneanalyzertool.core.compact_sequences import CompactProtein
+from geneanalyzertool.core.exceptions import AnalysisMethodError
+from geneanalyzertool.core.export import WRITE_BUFFER_BYTES, write_results
+from geneanalyzertool.core.sequences import Protein, Sequence
+
+ALIGNMENT_METHODS = (GLOBAL, LOCAL)
+
+# Alignment columns per line of the text report.
+LINE_WIDTH = 60
+
+
+def format_alignment(result: dict, width: int = LINE_WIDTH) -> List[str]:
+    """
+    Lines of the readable report of one alignment from align(): its statistics, then blocks of width columns
+    with the query above the target and a "|" between identical residues. Positions are 1-based. Score only
+    results only report the score and where the alignment ends.
+    """
+    if "Query" not in result:
+        return ["  ".join(f"{name}: {value}" for name, value in result.items())]
+
+    lines = [f"Score: {result['Score']}  Length: {result['Length']}  Identity: {result['Identity']}%  "
+             f"Gaps: {result['Gaps']}"]
+    query_position, target_position = result["Query Start"], result["Target Start"]
+    label_width = len(str(max(result["Query End"], result["Target End"]))) + 1
+    for offset in range(0, result["Length"], width):
+        query, target = result["Query"][offset:offset + width], result["Target"][offset:offset + width]
+        midline = "".join("|" if a.upper() == b.upper() and a != "-" else " " for a, b in zip(query, target))
+        query_end = query_position + len(query) - query.count("-")
+        target_end = target_position + len(target) - target.count("-")
+        lines += ["",
+                  f"Query  {query_position + 1:>{label_width}} {query} {query_end}",
+                  f"       {'':>{label_width}} {midline}",
+                  f"Target {target_position + 1:>{label_width}} {target} {target_end}"]
+        query_position, target_position = query_end, target_end
+    return lines
+
+
+class AlignmentAnalysis(AnalysisMode):
+    """
+    Class for the alignment mode: aligns a query sequence against every record with affine gap costs, globally
+    (Needleman-Wunsch, "global") or locally (Smith-Waterman, "local"), see analysis/alignment.py.
+
+    Records are aligned independently of each other, so batch alignments of one query against all records of a
+    file are spread over worker processes with jobs.
+    """
+
+    @override
+    def export_stream(self, result_stream: Iterable[Tuple[str, Any]], out_file: str, out_format: str = "text",
+                      analysis_method: str | List[str] | None = None):
+        """
+        Writes alignments to out_file as they arrive. The text format is the readable report of format_alignment()
+        for every record; tsv, jsonl and parquet write one row per value, the aligned sequences included (see
+        core/export.py).
+        """
+        with self._stage("export"):
+            if out_format != "text":
+                write_results(result_stream, out_file, out_format, analysis_method)
+                return
+
+            with open(out_file, 'w', buffering=WRITE_BUFFER_BYTES) as out:
+                for seq, result in result_stream:
+                    out.write(f">{seq}\n" + "\n".join(format_alignment(result)) + "\n\n")
+
+    @override
+    def print_stream(self, result_stream: Iterable[Tuple[str, Any]]):
+        with self._stage("export"):
+            for seq, result in result_stream:
+                lines = format_alignment(result)
+                print(f"{YELLOW}{seq}{RESET}: {CYAN}{lines[0]}{RESET}")
+                for line in lines[1:]:
+                    print(line)
+                print()
+
+    @override
+    def analyze(self, sequence: Sequence, method: str, **options) -> Any:
+        """
+        Aligns the query against a sequence.
+
+        Args:
+            sequence: Sequence object to align the query against (the target)
+            method: "global" or "local"
+            options: query (the query sequence, required), match and mismatch scores or matrix (the name of a
+                substitution matrix, BLOSUM62 by default for proteins), gap_open and gap_extend costs, band (see
+                align()) and score_only, which skips the traceback and only reports the score and where the
+                alignment ends
+        Returns:
+            The alignment, see align()
+        """
+        if method not in ALIGNMENT_METHODS:
+            raise ValueError(f"Unknown method {method}")
+
+        return self._cached(sequence, method, options, lambda: self._align(sequence, method, **options))
+
+    def process_sequences(self, sequence_input: str, is_file: bool, seq_type: str, analysis_method: str | List[str],
+                          method_options: dict | None = None, jobs: int = 1, regions: List[str] | None = None,
+                          use_index: bool = False):
+        """
+        Aligns the query against one or more sequences.
+
+        Args:
+            sequence_input: Either a sequence string or a FASTA file path
+            is_file: Whether sequence_input is a file path
+            seq_type: Type of sequence (DNA, RNA, or Protein)
+            analysis_method: "global" or "local"
+            method_options: Optional keyword arguments keyed by method name, see analyze()
+            jobs: Number of worker processes, 1 aligns in this process and 0 uses one worker per CPU core
+            regions: Records or samtools style regions to fetch from the file through its .fai index
+            use_index: Select records interactively through the .fai index instead of parsing the whole file
+
+        Returns:
+            Results keyed by record id and the ordered record ids
+        """
+        self._check_method(analysis_method)
+        if is_file and regions:
+            available_sequences, sequence_keys = self.fetch_sequences(sequence_input, regions)
+        elif is_file:
+            available_sequences, sequence_keys = self.select_sequences(sequence_input, use_index=use_index)
+        else:
+            available_sequences = {"input_sequence": sequence_input}
+            sequence_keys = ["input_sequence"]
+
+        records = ((key, available_sequences[key]) for key in sequence_keys)
+        results = dict(self._align_records(records, seq_type, analysis_method, method_options, jobs))
+        return results, sequence_keys
+
+    @override
+    def stream_sequences(self, fasta_file: str, seq_type: str, analysis_method: str | List[str],
+                         method_options: dict | None = None, jobs: int = 1,
+                         chunk_size: int | None = None) -> Iterator[Tuple[str, Any]]:
+        """
+        Aligns the query against every record of a FASTA file one at a time.
+
+        Args:
+            fasta_file: Path to the FASTA file
+            seq_type: Type of sequence (DNA, RNA, or Protein)
+            analysis_method: "global" or "local"
+            method_options: Optional keyword arguments keyed by method name, see analyze()
+            jobs: Number of worker processes, 0 uses one per CPU core
+            chunk_size: Read every record in chunks of this many bases. An alignment needs the whole record, so the
+                chunks of each record are joined before it is aligned.
+
+        Returns:
+            Iterator of (record id, alignment) pairs in file order
+        """
+        self._check_method(analysis_method)
+        if chunk_size is not None:
+            records = ((key, b"".join(self._timed("read", chunks)))
+                       for key, chunks in self.iter_sequence_chunks(fasta_file, chunk_size))
+        else:
+            records = self._timed("read", self.iter_sequences(fasta_file))
+        yield from self._align_records(records, seq_type, analysis_method, method_options, jobs)
+
+    def _align_records(self, records: Iterable[Tuple[str, Any]], seq_type: str, analysis_method: str,
+                       method_options: dict | None, jobs: int) -> Iterator[Tuple[str, dict]]:
+        if jobs != 1:
+            alignments = analyze_in_parallel(self, records, seq_type, analysis_method, method_options, jobs)
+            yield from self._timed("analyze", alignments)
+            return
+
+        seq_type_class = self._sequence_class(seq_type)
+        for key, sequence in records:
+            with self._stage("convert"):
+                sequence = seq_type_class(sequence)
+            yield key, self._analyze_record(sequence, analysis_method, method_options)
+
+    def _analyze_record(self, sequence: Sequence, analysis_method: str, method_options: dict | None = None) -> dict:
+        """Aligns the query against a single record, see analyze(). Also the entry point of worker processes."""
+        with self._stage("analyze"):
+            if self.metrics is not None:
+                self.metrics.count(1, len(sequence))
+            with self._method_errors(type(sequence)):
+                return self.analyze(sequence, analysis_method, **(method_options or {}).get(analysis_method, {}))
+
+    @staticmethod
+    def _align(sequence: Sequence, method: str, query: str | None = None, match: float = DEFAULT_MATCH,
+               mismatch: float = DEFAULT_MISMATCH, matrix: str | None = None, gap_open: float = DEFAULT_GAP_OPEN,
+               gap_extend: float = DEFAULT_GAP_EXTEND, band: int | None = None, score_only: bool = False) -> dict:
+        if not query:
+            raise ValueError("Alignments need a query sequence")
+        if matrix is None and isinstance(sequence, (Protein, CompactProtein)):
+            matrix = DEFAULT_PROTEIN_MATRIX
+        table = scoring_table(match, mismatch, matrix)
+        query, target = sequence_bytes(query), sequence_bytes(sequence)
+
+        if not score_only:
+            return align(query, target, table, gap_open, gap_extend, local=method == LOCAL, band=band)
+
+        score, query_end, target_end = alignment_score(query, target, table, gap_open, gap_extend, method, band)
+        result = {"Score": round(score, 2)}
+        if method == LOCAL:
+            result.update({"Query End": query_end, "Target End": target_end})
+        return result
+
+    @staticmethod
+    def _check_method(analysis_method: str | List[str]):
+        if not isinstance(analysis_method, str) or analysis_method not in ALIGNMENT_METHODS:
+            raise AnalysisMethodError("Invalid analysis method provided. The alignment mode runs one of "
+                                      f"{', '.join(ALIGNMENT_METHODS)} at a time.")
@@ -1,7 +1,33 @@
 from abc import ABC, abstractmethod
-from typing import Any, List
+from importlib import import_module
+from typing import Any, Iterable, Iterator, List, Tuple
 from geneanalyzertool.core.sequences import Sequence
 
+# Pseudo method name that selects every analysis method applicable to the sequence type.
+ALL_METHODS = "all"
+
+
+class AnalysisReport(dict):
+    """Results of several analysis methods run over one record, keyed by method name in the order they were requested."""
+
+
+class WindowedResult(list):
+    """
+    Values of consecutive windows along one record, e.g. the GC percent of every 10 kb bin. Each window is a
+    dictionary with a 0-based "Start", an exclusive "End" and its values, ordered by position.
+    """
+
+
+def load_analysis_class(target: "type | str") -> type:
+    """
+    Returns an analysis class given either directly or as a "package.module:ClassName" path. Paths let callers name
+    analysis classes without importing them (and their dependencies) until they are used.
+    """
+    if not isinstance(target, str):
+        return target
+    module_name, _, class_name = target.partition(":")
+    return getattr(import_module(module_name), class_name)
+
 
 class Analysis(ABC):
     """
@@ -10,13 +36,25 @@ class Analysis(ABC):
     """
 
     @abstractmethod
-    def analyze(self, sequence: Sequence, method: str) -> Any:
+    def analyze(self, sequence: Sequence, method: str, **options) -> Any:
         raise NotImplementedError("Subclasses must implement this method.")
 
     @abstractmethod
-    def process_sequences(self, sequence_input: str, is_file: bool, seq_type: str, analysis_method: str):
+    def process_sequences(self, sequence_input: str, is_file: bool, seq_type: str, analysis_method: str | List[str],
+                          method_options: dict | None = None, jobs: int = 1, regions: List[str] | None = None,
+                          use_index: bool = False):
         raise NotImplementedError("Subclasses must implement this method.")
 
     @abstractmethod
     def print_to_terminal(self, results: dict, sequence_keys: List[str]):
         raise NotImplementedError("Subclasses must implement this method.")
+
+    @abstractmethod
+    def stream_sequences(self, fasta_file: str, seq_type: str, analysis_method: str | List[str],
+                         method_options: dict | None = None, jobs: int = 1,
+                         chunk_size: int | None = None) -> Iterator[Tuple[str, Any]]:
+        raise NotImplementedError("Subclasses must implement this method.")
+
+    @abstractmethod
+    def print_stream(self, result_stream: Iterable[Tuple[str, Any]]):
+        raise NotImplementedError("Subclasses must implement this method.")
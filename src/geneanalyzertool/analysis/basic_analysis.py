@@ -1,30 +1,86 @@
-from geneanalyzertool.analysis.analysis import Analysis
-from geneanalyzertool.core.sequences import Sequence, DNA, RNA, Protein
-from geneanalyzertool.core.file_handler import FileHandler
-from typing import Any, override, List
+import re
+from contextlib import contextmanager
+from functools import wraps
+from geneanalyzertool.analysis.analysis import ALL_METHODS, AnalysisReport, WindowedResult
+from geneanalyzertool.analysis.chunked import (
+    ChunkAccumulator, CompositionAccumulator, CountAccumulator, GcWindowAccumulator, KmerAccumulator,
+    MotifAccumulator, OrfAccumulator, orf_report
+)
+from geneanalyzertool.analysis.complement import (
+    DNA_COMPLEMENT, RNA_COMPLEMENT, TRANSCRIPTION, reverse_complement_batch, transcribe_batch
+)
+from geneanalyzertool.analysis.composition import (
+    byte_counts, counts_for, gc_fraction, nucleotide_composition, sliding_gc
+)
+from geneanalyzertool.analysis.kmers import CHUNK_KMERS, DEFAULT_MAX_DISTINCT, KmerCounter
+from geneanalyzertool.analysis.mode import CYAN, GREEN, RED, RESET, YELLOW, AnalysisMode
+from geneanalyzertool.analysis.motifs import Motif, describe_hits, motif_scanner, parse_motif
+from geneanalyzertool.analysis.parallel import analyze_in_parallel, batch_records
+from geneanalyzertool.analysis.protein import protein_properties
+from geneanalyzertool.analysis.translation import translate_sequence
+from geneanalyzertool.core.sequences import Sequence, DNA, RNA, Protein, same_storage
+from geneanalyzertool.core.cache import ResultCache
+from geneanalyzertool.core.compact_sequences import CompactSequence
+from geneanalyzertool.core.export import WRITE_BUFFER_BYTES, write_results
+from geneanalyzertool.core.metrics import RunMetrics
+from geneanalyzertool.core.selection import RecordSelection
+from geneanalyzertool.core.parser import DEFAULT_CHUNK_BASES
+from typing import Any, override, List, Iterable, Iterator, Tuple
 from geneanalyzertool.core.exceptions import InvalidSequenceTypeError, AnalysisMethodError
 
-YELLOW = "\033[1;33m"
-GREEN = "\033[1;32m"
-RED = "\033[1;31m"
-RESET = "\033[0m"
-CYAN = "\033[1;36m"
+# Records analyzed together by analyze_batch() are grouped until they hold this many bases or records, the latter
+# bounds the results held at once for very short records.
+BATCH_BASES = 1024 * 1024
+BATCH_RECORDS = 10_000
 
+# Packed compact records are unpacked this many bases at a time by the methods that read them in chunks, as many
+# as the k-mer counter encodes at once.
+UNPACK_CHUNK_BASES = CHUNK_KMERS
 
-class BasicSequenceAnalysis(Analysis, FileHandler):
+START_CODONS = ("ATG",)
+STOP_CODONS = ("TAA", "TAG", "TGA")
+
+
+def in_stage(name: str):
+    """Books the time spent in the decorated method to the metrics stage called name, see core/metrics.py."""
+    def decorate(method):
+        @wraps(method)
+        def timed_method(self, *args, **kwargs):
+            with self._stage(name):
+                return method(self, *args, **kwargs)
+        return timed_method
+    return decorate
+
+
+class BasicSequenceAnalysis(AnalysisMode):
     """
     Class for basic analysis performed on dna, rna or protein sequences. This class holds all the basic mode functionality.
-    It extends the Analysis class and implements the FileHandler interface.
+    It extends AnalysisMode, which holds the cache, metrics and file handling shared by every analysis mode.
 
     Note: If you are adding a method to the Basic analysis mode, add your method below and add a call to your method in the
     analyze method. Make sure your method is private (pythonic private) by adding an underscore "_" before the method name.
     """
 
+    def __init__(self, cache: ResultCache | None = None, compact: bool = False, parser: str = "native",
+                 metrics: RunMetrics | None = None, selection: RecordSelection | None = None):
+        super().__init__(cache, compact, parser, metrics, selection)
+        # (record, intermediates) of the record currently being analyzed, see _record_intermediates().
+        self._intermediates = None
+
     @override
-    def export_to_file(self, results: dict, sequence_keys: List[str], out_file: str):
-        def format_orf_result(seq_name, orf_result):
-            lines = [f"Sequence Name: {seq_name}"]
-            lines.append(f"Number of ORFs: {orf_result['Number of ORFS']}")
+    @in_stage("export")
+    def export_stream(self, result_stream: Iterable[Tuple[str, Any]], out_file: str, out_format: str = "text",
+                      analysis_method: str | List[str] | None = None):
+        """
+        Writes results to out_file as they arrive. The text format is the human readable report, tsv, jsonl and
+        parquet write a table (see core/export.py) in buffered chunks.
+        """
+        if out_format != "text":
+            write_results(result_stream, out_file, out_format, analysis_method)
+            return
+
+        def format_orf_result(orf_result):
+            lines = [f"Number of ORFs: {orf_result['Number of ORFS']}"]
             if orf_result['ORFS'].items():
                 for orf_name, orf_data in orf_result['ORFS'].items():
                     lines.append(f"{orf_name}: {orf_data['Sequence']}")
@@ -32,24 +88,64 @@ class BasicSequenceAnalysis(Analysis, FileHandler):
                         f"   Start: {orf_data['Start']}"
                         f"   End: {orf_data['End']}"
                         f"   Length: {orf_data['Length']}"
+                        f"   Strand: {orf_data['Strand']}"
                     )
             else:
                 lines.append("No Open Reading Frames Found")
-            return "\n".join(lines)
+            return lines
 
-        with open(out_file, 'w') as out:
-            for seq in sequence_keys:
-                value = results[seq]
-                if isinstance(value, dict) and 'ORFS' in value:
-                    out.write(format_orf_result(seq, value) + "\n\n")
+        def format_motif_result(motif_result):
+            lines = [f"Number of Hits: {motif_result['Number of Hits']}"]
+            if motif_result['Hits'].items():
+                for hit_name, hit in motif_result['Hits'].items():
+                    lines.append(f"{hit_name}: {hit['Motif']} {hit['Sequence']}")
+                    lines.append(
+                        f"   Start: {hit['Start']}"
+                        f"   End: {hit['End']}"
+                        f"   Strand: {hit['Strand']}"
+                        + (f"   Cut: {hit['Cut']}" if 'Cut' in hit else "")
+                    )
+            else:
+                lines.append("No Motif Hits Found")
+            return lines
+
+        def format_windows(windows):
+            return [f"{window['Start']}-{window['End']}: {window['GC Percent']} %" for window in windows]
+
+        def format_report(report):
+            lines = []
+            for method, method_result in report.items():
+                if isinstance(method_result, dict) and 'ORFS' in method_result:
+                    lines.append(f"{method}:")
+                    lines.extend("   " + line for line in format_orf_result(method_result))
+                elif isinstance(method_result, dict) and 'Hits' in method_result:
+                    lines.append(f"{method}:")
+                    lines.extend("   " + line for line in format_motif_result(method_result))
+                elif isinstance(method_result, WindowedResult):
+                    lines.append(f"{method}:")
+                    lines.extend("   " + line for line in format_windows(method_result))
+                else:
+                    lines.append(f"{method}: {method_result}")
+            return lines
+
+        with open(out_file, 'w', buffering=WRITE_BUFFER_BYTES) as out:
+            for seq, value in result_stream:
+                if isinstance(value, AnalysisReport):
+                    out.write("\n".join([f"Sequence Name: {seq}"] + format_report(value)) + "\n\n")
+                elif isinstance(value, dict) and 'ORFS' in value:
+                    out.write("\n".join([f"Sequence Name: {seq}"] + format_orf_result(value)) + "\n\n")
+                elif isinstance(value, dict) and 'Hits' in value:
+                    out.write("\n".join([f"Sequence Name: {seq}"] + format_motif_result(value)) + "\n\n")
+                elif isinstance(value, WindowedResult):
+                    out.write("\n".join([f"Sequence Name: {seq}"] + format_windows(value)) + "\n\n")
                 else:
                     out.write(f"{seq}: {value}\n")
 
     @override
-    def print_to_terminal(self, results: dict, sequence_keys: List[str]):
-        def format_orf_result(seq_name, orf_result):
-            lines = [f"{YELLOW}Sequence Name: {RESET}{seq_name}"]
-            lines.append(f"{GREEN}Number of ORFs:{RESET} {orf_result['Number of ORFS']}")
+    @in_stage("export")
+    def print_stream(self, result_stream: Iterable[Tuple[str, Any]]):
+        def format_orf_result(orf_result):
+            lines = [f"{GREEN}Number of ORFs:{RESET} {orf_result['Number of ORFS']}"]
             if orf_result['ORFS'].items():
                 for orf_name, orf_data in orf_result['ORFS'].items():
                     lines.append(f"{GREEN}{orf_name}:{RESET} {orf_data['Sequence']}")
@@ -57,45 +153,109 @@ class BasicSequenceAnalysis(Analysis, FileHandler):
                         f"   {CYAN}Start:{RESET} {orf_data['Start']}"
                         f"   {CYAN}End:{RESET} {orf_data['End']}"
                         f"   {CYAN}Length:{RESET} {orf_data['Length']}"
+                        f"   {CYAN}Strand:{RESET} {orf_data['Strand']}"
                     )
             else:
                 lines.append(RED + "No Open Reading Frames Found" + RESET)
-            return "\n".join(lines)
+            return lines
 
-        for seq in sequence_keys:
-            value = results[seq]
-            if isinstance(value, dict) and 'ORFS' in value:
-                print(format_orf_result(seq, value) + "\n")
+        def format_motif_result(motif_result):
+            lines = [f"{GREEN}Number of Hits:{RESET} {motif_result['Number of Hits']}"]
+            if motif_result['Hits'].items():
+                for hit_name, hit in motif_result['Hits'].items():
+                    lines.append(f"{GREEN}{hit_name}:{RESET} {hit['Motif']} {hit['Sequence']}")
+                    lines.append(
+                        f"   {CYAN}Start:{RESET} {hit['Start']}"
+                        f"   {CYAN}End:{RESET} {hit['End']}"
+                        f"   {CYAN}Strand:{RESET} {hit['Strand']}"
+                        + (f"   {CYAN}Cut:{RESET} {hit['Cut']}" if 'Cut' in hit else "")
+                    )
+            else:
+                lines.append(RED + "No Motif Hits Found" + RESET)
+            return lines
+
+        def format_windows(windows):
+            return [f"{GREEN}{window['Start']}-{window['End']}:{RESET} {window['GC Percent']} %" for window in windows]
+
+        def format_report(report):
+            lines = []
+            for method, method_result in report.items():
+                if isinstance(method_result, dict) and 'ORFS' in method_result:
+                    lines.append(f"{CYAN}{method}:{RESET}")
+                    lines.extend("   " + line for line in format_orf_result(method_result))
+                elif isinstance(method_result, dict) and 'Hits' in method_result:
+                    lines.append(f"{CYAN}{method}:{RESET}")
+                    lines.extend("   " + line for line in format_motif_result(method_result))
+                elif isinstance(method_result, WindowedResult):
+                    lines.append(f"{CYAN}{method}:{RESET}")
+                    lines.extend("   " + line for line in format_windows(method_result))
+                else:
+                    lines.append(f"{CYAN}{method}:{RESET} {method_result}")
+            return lines
+
+        for seq, value in result_stream:
+            if isinstance(value, AnalysisReport):
+                print("\n".join([f"{YELLOW}Sequence Name: {RESET}{seq}"] + format_report(value)) + "\n")
+            elif isinstance(value, dict) and 'ORFS' in value:
+                print("\n".join([f"{YELLOW}Sequence Name: {RESET}{seq}"] + format_orf_result(value)) + "\n")
+            elif isinstance(value, dict) and 'Hits' in value:
+                print("\n".join([f"{YELLOW}Sequence Name: {RESET}{seq}"] + format_motif_result(value)) + "\n")
+            elif isinstance(value, WindowedResult):
+                print("\n".join([f"{YELLOW}Sequence Name: {RESET}{seq}"] + format_windows(value)) + "\n")
             else:
                 print(f"{YELLOW}{seq}{RESET}: {value}")
 
     @override
-    def analyze(self, sequence: Sequence, method: str) -> Any:
+    def analyze(self, sequence: Sequence, method: str, **options) -> Any:
         """
         executes simple analysis of protein, RNA or DNA sequences.
         Args:
             sequence: Sequence object to analyze
             method: Analysis method to perform
+            options: Optional keyword arguments passed on to the analysis method
         Returns:
             Result of analysis
 
-        Note: If adding a method to the basic analysis options, add it also in the method dispatch below.
+        Note: If adding a method to the basic analysis options, add it also in the method dispatch.
         """
-        method_dispatch = {
+        method_dispatch = self._method_dispatch()
+
+        if method not in method_dispatch:
+            raise ValueError(f"Unknown method {method}")
+
+        return self._cached(sequence, method, options, lambda: method_dispatch[method](sequence, **options))
+
+    def available_methods(self) -> List[str]:
+        """Names of all analysis methods that analyze() can dispatch to."""
+        return list(self._method_dispatch())
+
+    def _method_dispatch(self) -> dict:
+        """Maps analysis method names onto the private methods implementing them."""
+        return {
             "gc_percent": self._gc_percent,
             "base_count": self._base_count,
+            "composition": self._composition,
+            "gc_windows": self._gc_windows,
+            "kmer_count": self._kmer_count,
             "translate": self._translate,
             "transcribe": self._transcribe,
             "reverse_complement": self._reverse_complement,
-            "orf": self._orf_finder
+            "orf": self._orf_finder,
+            "motif_search": self._motif_search,
+            "protein_properties": self._protein_properties
         }
 
-        if method not in method_dispatch:
-            raise ValueError(f"Unknown method {method}")
-
-        return method_dispatch[method](sequence)
+    def _batch_dispatch(self) -> dict:
+        """Maps the analysis methods that analyze_batch() runs on many records at once onto their implementations."""
+        return {
+            "transcribe": self._transcribe_batch,
+            "reverse_complement": self._reverse_complement_batch,
+            "protein_properties": self._protein_properties_batch
+        }
 
-    def process_sequences(self, sequence_input: str, is_file: bool, seq_type: str, analysis_method: str):
+    def process_sequences(self, sequence_input: str, is_file: bool, seq_type: str, analysis_method: str | List[str],
+                          method_options: dict | None = None, jobs: int = 1, regions: List[str] | None = None,
+                          use_index: bool = False):
         """
         Process one or more sequences and perform the specified analysis.
 
@@ -103,42 +263,369 @@ class BasicSequenceAnalysis(Analysis, FileHandler):
             sequence_input: Either a sequence string or file path
             is_file: Whether sequence_input is a file path
             seq_type: Type of sequence (DNA, RNA, or Protein)
-            analysis_method: Analysis method to perform
+            analysis_method: Analysis method to perform, a list of methods or "all". Several methods produce an
+                AnalysisReport per record.
+            method_options: Optional keyword arguments for the analysis methods, keyed by method name
+            jobs: Number of worker processes, 1 analyzes in this process and 0 uses one worker per CPU core
+            regions: Records or samtools style regions to fetch from the file through its .fai index
+            use_index: Select records interactively through the .fai index instead of parsing the whole file
 
         Returns:
             List of result strings
         """
 
         # Get sequences to analyze
-        if is_file:
-            available_sequences, sequence_keys = self.select_sequences(sequence_input)
+        if is_file and regions:
+            available_sequences, sequence_keys = self.fetch_sequences(sequence_input, regions)
+        elif is_file:
+            available_sequences, sequence_keys = self.select_sequences(sequence_input, use_index=use_index)
         else:
             # Treat the single sequence as a dict with one entry
             available_sequences = {"input_sequence": sequence_input}
             sequence_keys = ["input_sequence"]
 
-        try:
-            # Map sequence type to the appropriate class
-            type_map = {"DNA": DNA, "RNA": RNA, "PROTEIN": Protein}
-            seq_type_class = type_map[seq_type.upper()]
+        seq_type_class = self._sequence_class(seq_type)
+
+        if jobs != 1:
+            records = ((key, available_sequences[key]) for key in sequence_keys)
+            results = dict(self._analyze_in_parallel(records, seq_type, analysis_method, method_options, jobs))
+            return results, sequence_keys
 
-        except KeyError:
-            raise InvalidSequenceTypeError("Error: Invalid sequence type provided. Valid types are DNA, RNA, or Protein.")
+        if self.batchable(analysis_method):
+            records = ((key, available_sequences[key]) for key in sequence_keys)
+            return dict(self._analyze_batches(records, seq_type_class, analysis_method)), sequence_keys
 
         # Process each sequence
         results = {}
         for key in sequence_keys:
-            sequence_obj = seq_type_class(available_sequences[key])
-            try:
-                result = self.analyze(sequence_obj, analysis_method)
-                results[key] = result
-            except ValueError as e:
-                raise AnalysisMethodError(f"Invalid analysis method provided. {str(e)}")
-            except TypeError as e:
-                raise InvalidSequenceTypeError(f"Unable to perform this analysis on sequence of type {seq_type.upper()}. {e}")
+            with self._stage("convert"):
+                # The raw record is released as soon as it is converted.
+                sequence_obj = seq_type_class(available_sequences.pop(key))
+            results[key] = self._analyze_record(sequence_obj, analysis_method, method_options)
 
         return results, sequence_keys
 
+    @override
+    def stream_sequences(self, fasta_file: str, seq_type: str, analysis_method: str | List[str],
+                         method_options: dict | None = None, jobs: int = 1,
+                         chunk_size: int | None = None) -> Iterator[Tuple[str, Any]]:
+        """
+        Lazily analyze every record of a FASTA file. Records are parsed, converted and analyzed one at a time, so
+        only the record currently being analyzed and its result are held in memory. Methods that analyze_batch()
+        can run are run on batches of short records instead.
+
+        Args:
+            fasta_file: Path to the FASTA file
+            seq_type: Type of sequence (DNA, RNA, or Protein)
+            analysis_method: Analysis method to perform, a list of methods or "all"
+            method_options: Optional keyword arguments for the analysis methods, keyed by method name
+            jobs: Number of worker processes, 1 analyzes in this process and 0 uses one worker per CPU core
+            chunk_size: Analyze every record in chunks of this many bases instead of as a whole, see
+                analyze_chunks(). Chunked records are analyzed in this process.
+
+        Returns:
+            Iterator of (record id, result) pairs in file order
+        """
+        if chunk_size is not None:
+            for key, chunks in self.iter_sequence_chunks(fasta_file, chunk_size):
+                yield key, self.analyze_chunks(chunks, seq_type, analysis_method, method_options)
+            return
+
+        if jobs != 1:
+            yield from self._analyze_in_parallel(self.iter_sequences(fasta_file), seq_type, analysis_method,
+                                                 method_options, jobs)
+            return
+
+        seq_type_class = self._sequence_class(seq_type)
+
+        if self.batchable(analysis_method):
+            yield from self._analyze_batches(self.iter_sequences(fasta_file), seq_type_class, analysis_method)
+            return
+
+        for key, sequence in self._iter_records(fasta_file, seq_type_class):
+            yield key, self._analyze_record(sequence, analysis_method, method_options)
+
+    def _iter_records(self, fasta_file: str, seq_type_class: type) -> Iterator[Tuple[str, Sequence]]:
+        """
+        Lazily yield (record id, sequence) pairs of a FASTA file with the records converted into seq_type_class.
+        Compact records are packed chunk by chunk as they are read (see CompactSequence.from_chunks()), so the raw
+        record is never held in memory next to its packed copy.
+        """
+        by_length = self.selection is not None and self.selection.by_length
+        if issubclass(seq_type_class, CompactSequence) and (not by_length or self.indexable(fasta_file)):
+            for key, chunks in self.iter_sequence_chunks(fasta_file):
+                with self._stage("convert"):
+                    sequence = seq_type_class.from_chunks(chunks)
+                yield key, sequence
+            return
+
+        for key, sequence in self.iter_sequences(fasta_file):
+            with self._stage("convert"):
+                sequence = seq_type_class(sequence)
+            yield key, sequence
+
+    @override
+    def iter_sequences(self, fasta_file: str) -> Iterator[Tuple[str, Any]]:
+        return self._timed("read", super().iter_sequences(fasta_file))
+
+    @override
+    def iter_sequence_chunks(self, fasta_file: str,
+                             chunk_bases: int = DEFAULT_CHUNK_BASES) -> Iterator[Tuple[str, Iterator[bytes]]]:
+        records = super().iter_sequence_chunks(fasta_file, chunk_bases)
+        if self.metrics is None:
+            return records
+        return ((key, self._timed("read", chunks)) for key, chunks in self._timed("read", records))
+
+    @override
+    @in_stage("read")
+    def fetch_sequences(self, fasta_file: str, regions: List[str]) -> Tuple[dict, list]:
+        return super().fetch_sequences(fasta_file, regions)
+
+    @in_stage("analyze")
+    def analyze_chunks(self, chunks: Iterable[bytes], seq_type: str, analysis_method: str | List[str],
+                       method_options: dict | None = None) -> Any:
+        """
+        Analyzes one record given as consecutive chunks of its bases, see FileHandler.iter_sequence_chunks(). Each
+        method updates a running state chunk by chunk (see analysis/chunked.py) and gives the same result as on the
+        whole record, so memory stays flat however long the record is. Methods whose result is itself a full length
+        sequence (translate, transcribe and reverse_complement) need the whole record, which is then assembled from
+        the chunks. Chunked results are not cached.
+
+        Args:
+            chunks: The bases of the record, in order
+            seq_type: Type of sequence (DNA, RNA, or Protein)
+            analysis_method: Analysis method, list of methods or "all" for every method applicable to the sequence
+            method_options: Optional keyword arguments for the analysis methods, keyed by method name
+
+        Returns:
+            The result of a single method, otherwise an AnalysisReport of all results keyed by method
+        """
+        method_options = method_options or {}
+        seq_type_class = self._sequence_class(seq_type)
+        run_all = analysis_method == ALL_METHODS
+        single = isinstance(analysis_method, str) and not run_all
+        methods = [analysis_method] if single else self.available_methods() if run_all else analysis_method
+
+        accumulators = {}
+        for method in methods:
+            try:
+                accumulator = self._chunk_accumulator(seq_type_class, method, method_options.get(method, {}))
+            except InvalidSequenceTypeError:
+                if not run_all:
+                    raise
+                continue
+            if accumulator is None:
+                sequence = seq_type_class(b"".join(chunks))
+                return self._analyze_record(sequence, analysis_method, method_options)
+            accumulators[method] = accumulator
+
+        bases = 0
+        with self._method_errors(seq_type_class):
+            for chunk in chunks:
+                bases += len(chunk)
+                counts = byte_counts(chunk)
+                for accumulator in accumulators.values():
+                    accumulator.add(chunk, counts)
+            results = {method: accumulator.result() for method, accumulator in accumulators.items()}
+        if self.metrics is not None:
+            self.metrics.count(1, bases)
+
+        if "gc_windows" in results:
+            results["gc_windows"] = WindowedResult(results["gc_windows"])
+        return results[analysis_method] if single else AnalysisReport(results)
+
+    @in_stage("analyze")
+    def analyze_batch(self, sequences: List[Sequence], analysis_method: str | List[str]) -> List[Any]:
+        """
+        Runs methods that work on every residue on its own (transcribe, reverse_complement and protein_properties)
+        on many records in one pass: the records are joined into one buffer that is mapped through lookup tables,
+        see analysis/complement.py and analysis/protein.py. Results are the same as those of the records analyzed
+        one by one, at a fraction of the cost for short records such as primers or peptides. Batched results are
+        not cached, computing them is cheaper than looking them up.
+
+        Args:
+            sequences: Sequence objects to analyze, all of the same type
+            analysis_method: Analysis method or list of methods, see batchable()
+
+        Returns:
+            The result of a single method for every record, otherwise an AnalysisReport per record
+        """
+        methods = [analysis_method] if isinstance(analysis_method, str) else analysis_method
+        batch_dispatch = self._batch_dispatch()
+        if self.metrics is not None:
+            self.metrics.count(len(sequences), sum(map(len, sequences)))
+
+        results = {}
+        with self._method_errors(type(sequences[0]) if sequences else Sequence):
+            for method in methods:
+                if method not in batch_dispatch:
+                    raise ValueError(f"Method {method} can not be run on a batch of records")
+                results[method] = batch_dispatch[method](sequences)
+
+        if isinstance(analysis_method, str):
+            return results[analysis_method]
+        return [AnalysisReport((method, results[method][i]) for method in methods) for i in range(len(sequences))]
+
+    def batchable(self, analysis_method: str | List[str]) -> bool:
+        """Whether analyze_batch() can run analysis_method (a method or list of methods)."""
+        methods = [analysis_method] if isinstance(analysis_method, str) else analysis_method
+        return bool(methods) and set(methods) <= set(self._batch_dispatch())
+
+    def _analyze_batches(self, records: Iterable[Tuple[str, Any]], seq_type_class: type,
+                         analysis_method: str | List[str]) -> Iterator[Tuple[str, Any]]:
+        """Analyzes records with analyze_batch(), grouped into batches of about BATCH_BASES bases or BATCH_RECORDS records."""
+        for batch in batch_records(records, BATCH_BASES, BATCH_RECORDS):
+            yield from self._analyze_batch_records(batch, seq_type_class, analysis_method)
+
+    def _analyze_batch_records(self, batch: List[Tuple[str, Any]], seq_type_class: type,
+                               analysis_method: str | List[str]) -> Iterator[Tuple[str, Any]]:
+        with self._stage("convert"):
+            sequences = [seq_type_class(sequence) for _, sequence in batch]
+        return zip((key for key, _ in batch), self.analyze_batch(sequences, analysis_method))
+
+    def _chunk_accumulator(self, seq_type_class: type, method: str, options: dict) -> ChunkAccumulator | None:
+        """
+        Returns the accumulator computing method chunk by chunk for records of seq_type_class, None if the method
+        needs the whole record. Raises the same errors for unknown methods, options and sequence types as analyze().
+        """
+        if method not in self._method_dispatch():
+            raise AnalysisMethodError(f"Invalid analysis method provided. Unknown method {method}")
+
+        nucleotide = issubclass(seq_type_class, (DNA, RNA))
+        complement = DNA_COMPLEMENT if issubclass(seq_type_class, DNA) else RNA_COMPLEMENT
+        with self._method_errors(seq_type_class):
+            if method in ("gc_percent", "composition", "gc_windows", "kmer_count", "motif_search") and not nucleotide:
+                raise TypeError("Error: Sequence must be of type DNA or RNA")
+            if method == "orf" and not issubclass(seq_type_class, DNA):
+                raise TypeError("Error: Sequence must be of type DNA")
+            if method == "protein_properties" and not issubclass(seq_type_class, Protein):
+                raise TypeError("Error: Sequence must be of type Protein")
+
+            if method in ("gc_percent", "base_count"):
+                return CountAccumulator(method)
+            if method == "composition":
+                return CompositionAccumulator(**options)
+            if method == "gc_windows":
+                return GcWindowAccumulator(**options)
+            if method == "kmer_count":
+                return KmerAccumulator(**options)
+            if method == "motif_search":
+                motifs = [motif if isinstance(motif, Motif) else parse_motif(motif) for motif in options.get("motifs", ())]
+                return MotifAccumulator(motif_scanner(motifs, options.get("strand", "both")), complement)
+            if method == "orf":
+                options = dict(options)
+                start_codons = self._normalize_codons(options.pop("start_codons", START_CODONS))
+                stop_codons = self._normalize_codons(options.pop("stop_codons", STOP_CODONS))
+                return OrfAccumulator(start_codons, stop_codons, complement, **options)
+        return None
+
+    def _analyze_in_parallel(self, records: Iterable[Tuple[str, Any]], seq_type: str,
+                             analysis_method: str | List[str], method_options: dict | None,
+                             jobs: int) -> Iterator[Tuple[str, Any]]:
+        """analyze_in_parallel() on this analyzer. Records are counted as they are handed to the workers."""
+        if self.metrics is None:
+            return analyze_in_parallel(self, records, seq_type, analysis_method, method_options, jobs)
+        records = self._counted(records)
+        results = analyze_in_parallel(self, records, seq_type, analysis_method, method_options, jobs)
+        return self._timed("analyze", results)
+
+    def _counted(self, records: Iterable[Tuple[str, Any]]) -> Iterator[Tuple[str, Any]]:
+        for key, sequence in records:
+            self.metrics.count(1, len(sequence))
+            yield key, sequence
+
+    @in_stage("analyze")
+    def _analyze_record(self, sequence: Sequence, analysis_method: str | List[str],
+                        method_options: dict | None = None) -> Any:
+        """
+        Runs one or more analysis methods on a single record. All methods share the record's intermediates (its
+        bytes, uppercased bytes, byte counts and reverse complement), which are computed at most once.
+
+        Args:
+            sequence: Sequence object to analyze
+            analysis_method: Analysis method, list of methods or "all" for every method applicable to the sequence
+            method_options: Optional keyword arguments for the analysis methods, keyed by method name
+
+        Returns:
+            The result of a single method, otherwise an AnalysisReport of all results keyed by method
+        """
+        method_options = method_options or {}
+        if self.metrics is not None:
+            self.metrics.count(1, len(sequence))
+        with self._record_intermediates(sequence):
+            if isinstance(analysis_method, str) and analysis_method != ALL_METHODS:
+                return self._run_method(sequence, analysis_method, method_options.get(analysis_method, {}))
+
+            run_all = analysis_method == ALL_METHODS
+            report = AnalysisReport()
+            for method in (self.available_methods() if run_all else analysis_method):
+                try:
+                    report[method] = self._run_method(sequence, method, method_options.get(method, {}))
+                except InvalidSequenceTypeError:
+                    # "all" only runs the methods that apply to the sequence type.
+                    if not run_all:
+                        raise
+            return report
+
+    def _run_method(self, sequence: Sequence, analysis_method: str, options: dict) -> Any:
+        """Runs analyze() for one method and converts analysis errors into GeneAnalyzer errors."""
+        with self._method_errors(type(sequence)):
+            return self.analyze(sequence, analysis_method, **options)
+
+    @contextmanager
+    def _record_intermediates(self, sequence: Sequence):
+        """Shares the intermediates of sequence between all analyses run inside the block."""
+        outer = self._intermediates
+        self._intermediates = (sequence, {})
+        try:
+            yield
+        finally:
+            self._intermediates = outer
+
+    def _intermediate(self, sequence: Sequence, name: str, compute) -> Any:
+        """
+        Returns compute(sequence). While sequence is the record being analyzed, the value is computed once and
+        reused by every analysis method that asks for it.
+        """
+        if self._intermediates is None or self._intermediates[0] is not sequence:
+            return compute(sequence)
+
+        shared = self._intermediates[1]
+        if name not in shared:
+            shared[name] = compute(sequence)
+        return shared[name]
+
+    @override
+    def _sequence_digest(self, sequence: Sequence) -> str:
+        return self._intermediate(sequence, "digest", self.cache.sequence_digest)
+
+    def _bytes(self, sequence: Sequence) -> bytes:
+        return self._intermediate(sequence, "bytes", lambda seq: seq.as_bytes())
+
+    def _upper_bytes(self, sequence: Sequence) -> bytes:
+        return self._intermediate(sequence, "upper", lambda seq: self._bytes(seq).upper())
+
+    def _byte_counts(self, sequence: Sequence):
+        return self._intermediate(sequence, "counts", self._count_bytes)
+
+    def _count_bytes(self, sequence: Sequence):
+        if self._packed(sequence):
+            return sum(byte_counts(chunk) for chunk in sequence.iter_chunks(UNPACK_CHUNK_BASES))
+        return byte_counts(self._bytes(sequence))
+
+    @staticmethod
+    def _packed(sequence: Sequence) -> bool:
+        return isinstance(sequence, CompactSequence) and sequence.bits_per_residue < 8
+
+    def _accumulated(self, sequence: CompactSequence, accumulator: ChunkAccumulator) -> Any:
+        """
+        Runs an analysis on a packed compact sequence through its chunk accumulator, unpacking UNPACK_CHUNK_BASES at a
+        time, so the record is never held unpacked. Gives the same result as the method on the whole record.
+        """
+        for chunk in sequence.iter_chunks(UNPACK_CHUNK_BASES):
+            accumulator.add(chunk, byte_counts(chunk))
+        return accumulator.result()
+
     def _gc_percent(self, sequence: DNA | RNA) -> str:
         """
         Calculates the percent Guanine and Cytosine that are present in a DNA or RNA Molecule.
@@ -147,64 +634,99 @@ class BasicSequenceAnalysis(Analysis, FileHandler):
         if not isinstance(sequence, (DNA, RNA)):
             raise TypeError("Error: Sequence must be of type DNA or RNA")
 
-        gc_count = sequence.upper().count("G") + sequence.upper().count("C")
-        return f"{round((gc_count / len(sequence)) * 100, 2)} %"
+        return f"{round(gc_fraction(self._byte_counts(sequence)) * 100, 2)} %"
 
     def _base_count(self, sequence) -> dict:
         """
         Counts the number of each base in a DNA sequence.
         Sequence provided must be of type DNA or RNA.
         """
-        base_counts = {
-            'A': sequence.upper().count('A'),
-            'T': sequence.upper().count('T'),
-            'G': sequence.upper().count('G'),
-            'C': sequence.upper().count('C')
-        }
+        return counts_for(self._byte_counts(sequence), "ATGC")
+
+    def _composition(self, sequence: DNA | RNA, window: int | None = None, step: int | None = None) -> dict:
+        """
+        Reports the counts of every IUPAC nucleotide symbol (including N and ambiguity codes), the number of soft
+        masked (lower case) bases and the GC percent of a DNA or RNA sequence. If a window size is given, the GC
+        percent of each sliding window is reported as well. Sequence must be of type DNA or RNA.
+        """
+        if not isinstance(sequence, (DNA, RNA)):
+            raise TypeError("Error: Sequence must be of type DNA or RNA")
+
+        if self._packed(sequence):
+            return self._accumulated(sequence, CompositionAccumulator(window, step))
+        return nucleotide_composition(self._bytes(sequence), window, step, self._byte_counts(sequence))
 
-        return base_counts
+    def _gc_windows(self, sequence: DNA | RNA, window: int = 10_000, step: int | None = None) -> WindowedResult:
+        """
+        Reports the GC percent of every window of a DNA or RNA sequence, e.g. per 10 kb bin. Windows are laid
+        end to end unless a step is given, and the last window is truncated at the end of the sequence.
+        Sequence must be of type DNA or RNA.
+        """
+        if not isinstance(sequence, (DNA, RNA)):
+            raise TypeError("Error: Sequence must be of type DNA or RNA")
+
+        if self._packed(sequence):
+            return WindowedResult(self._accumulated(sequence, GcWindowAccumulator(window, step)))
+        return WindowedResult(sliding_gc(self._bytes(sequence), window, step))
+
+    def _kmer_count(self, sequence: DNA | RNA, k: int = 21, top: int = 10, canonical: bool = True,
+                    max_distinct: int = DEFAULT_MAX_DISTINCT) -> dict:
+        """
+        Counts the k-mers of a DNA or RNA sequence and reports the most frequent ones and the histogram of k-mer
+        counts. k-mers with ambiguous bases are skipped. Sequence must be of type DNA or RNA.
+
+        Args:
+            sequence: DNA or RNA sequence
+            k: k-mer length, 1 to 31
+            top: Number of most frequent k-mers reported
+            canonical: Count a k-mer and its reverse complement as one (the lexicographically smaller one)
+            max_distinct: Distinct k-mers counted exactly before counts are approximated with a count-min sketch
+
+        Returns:
+            Dictionary with the total and distinct k-mer counts, the top k-mers and (while exact) the histogram
+        """
+        if not isinstance(sequence, (DNA, RNA)):
+            raise TypeError("Error: Sequence must be of type DNA or RNA")
+
+        if self._packed(sequence):
+            return self._accumulated(sequence, KmerAccumulator(k, top, canonical, max_distinct))
+        counter = KmerCounter(k, canonical, max_distinct)
+        counter.update(self._bytes(sequence))
+        return counter.report(top)
 
-    def _translate(self, sequence) -> Protein:
+    def _translate(self, sequence, table: int = 1, frames: int = 1, to_stop: bool = True) -> Protein | dict:
         """
         Translates a given RNA sequence into a predicted protein sequence minus
         post translational modifications. Sequence provided must be of type RNA.
-        """
-        peptide_table = {
-            "UUU": "F", "UUC": "F", "UUA": "L", "UUG": "L",
-            "UCU": "S", "UCC": "S", "UCA": "S", "UCG": "S",
-            "UAU": "Y", "UAC": "Y", "UAA": "STOP", "UAG": "STOP",
-            "UGU": "C", "UGC": "C", "UGA": "STOP", "UGG": "W",
-            "CUU": "L", "CUC": "L", "CUA": "L", "CUG": "L",
-            "CCU": "P", "CCC": "P", "CCA": "P", "CCG": "P",
-            "CAU": "H", "CAC": "H", "CAA": "Q", "CAG": "Q",
-            "CGU": "R", "CGC": "R", "CGA": "R", "CGG": "R",
-            "AUU": "I", "AUC": "I", "AUA": "I", "AUG": "M",
-            "ACU": "T", "ACC": "T", "ACA": "T", "ACG": "T",
-            "AAU": "N", "AAC": "N", "AAA": "K", "AAG": "K",
-            "AGU": "S", "AGC": "S", "AGA": "R", "AGG": "R",
-            "GUU": "V", "GUC": "V", "GUA": "V", "GUG": "V",
-            "GCU": "A", "GCC": "A", "GCA": "A", "GCG": "A",
-            "GAU": "D", "GAC": "D", "GAA": "E", "GAG": "E",
-            "GGU": "G", "GGC": "G", "GGA": "G", "GGG": "G",
-        }
 
+        Args:
+            sequence: RNA sequence to translate
+            table: NCBI translation table id, the standard code by default
+            frames: 1 translates the first frame only, 3 the three forward frames and 6 all frames on both strands
+            to_stop: Stop at the first stop codon, otherwise read through stop codons
+
+        Returns:
+            A Protein for a single frame, otherwise a dictionary of Proteins keyed by frame (+1, +2, +3, -1, -2, -3)
+        """
         if not isinstance(sequence, RNA):
             raise TypeError("Error: Sequence must be of type RNA.")
 
-        protein_seq = ""
+        if frames not in (1, 3, 6):
+            raise ValueError(f"Unsupported number of frames {frames}. Choose 1, 3 or 6.")
 
-        for i in range(0, len(sequence), 3):
-            codon = sequence[i:i + 3]
-            if peptide_table.get(codon) == "STOP":
-                protein_seq += "*"
-                break
+        protein_class = same_storage(sequence, Protein)
+        if frames == 1:
+            return protein_class(translate_sequence(sequence, table, to_stop))
 
-            if (peptide := peptide_table.get(codon)) is None:
-                protein_seq += "X"
-            else:
-                protein_seq += peptide
+        strands = {"+": sequence}
+        if frames == 6:
+            strands["-"] = self._reverse_complement(sequence)
 
-        return Protein(protein_seq)
+        return {
+            f"{strand}{frame + 1}": protein_class(translate_sequence(strand_seq, table, to_stop, frame))
+            for strand, strand_seq in strands.items()
+            for frame in range(3)
+        }
 
     def _transcribe(self, sequence: DNA) -> RNA:
         """
@@ -214,8 +736,16 @@ class BasicSequenceAnalysis(Analysis, FileHandler):
         if not isinstance(sequence, DNA):
             raise TypeError("Error: Sequence must be of type DNA")
 
-        rna_sequence = sequence.replace("T", "U")
-        return RNA(rna_sequence)
+        rna_sequence = self._bytes(sequence).translate(TRANSCRIPTION)
+        return same_storage(sequence, RNA).from_bytes(rna_sequence)
+
+    def _transcribe_batch(self, sequences: List[DNA]) -> List[RNA]:
+        """Transcribes many DNA sequences in one pass, see analyze_batch()."""
+        if not all(isinstance(sequence, DNA) for sequence in sequences):
+            raise TypeError("Error: Sequence must be of type DNA")
+
+        rna_class = same_storage(sequences[0], RNA) if sequences else RNA
+        return [rna_class.from_bytes(rna) for rna in transcribe_batch([seq.as_bytes() for seq in sequences])]
 
     def _reverse_complement(self, sequence: DNA | RNA) -> DNA | RNA:
         """
@@ -225,41 +755,152 @@ class BasicSequenceAnalysis(Analysis, FileHandler):
         if not isinstance(sequence, (DNA, RNA)):
             raise TypeError("Error: Sequence must be of type DNA or RNA")
 
+        return self._intermediate(sequence, "reverse_complement", self._complement_strand)
+
+    def _complement_strand(self, sequence: DNA | RNA) -> DNA | RNA:
         if isinstance(sequence, DNA):
-            reverse_complement = sequence.translate(str.maketrans("ATGCatgc", "TACGtacg"))[::-1]
-            return DNA(reverse_complement)
+            reverse_complement = self._bytes(sequence).translate(DNA_COMPLEMENT)[::-1]
+            return same_storage(sequence, DNA).from_bytes(reverse_complement)
+
+        reverse_complement = self._bytes(sequence).translate(RNA_COMPLEMENT)[::-1]
+        return same_storage(sequence, RNA).from_bytes(reverse_complement)
+
+    def _reverse_complement_batch(self, sequences: List[DNA | RNA]) -> List[DNA | RNA]:
+        """Reverse complements many DNA or many RNA sequences in one pass, see analyze_batch()."""
+        if not sequences:
+            return []
+        target = DNA if isinstance(sequences[0], DNA) else RNA
+        if not all(isinstance(sequence, target) for sequence in sequences):
+            raise TypeError("Error: Sequence must be of type DNA or RNA")
+
+        complement = DNA_COMPLEMENT if target is DNA else RNA_COMPLEMENT
+        result_class = same_storage(sequences[0], target)
+        reverse_complements = reverse_complement_batch([seq.as_bytes() for seq in sequences], complement)
+        return [result_class.from_bytes(reverse_complement) for reverse_complement in reverse_complements]
+
+    def _orf_finder(self, sequence: DNA, start_codons: Iterable[str] = START_CODONS,
+                    stop_codons: Iterable[str] = STOP_CODONS, min_length: int = 0,
+                    strand: str = "both", nested: bool = True) -> dict:
+        """
+        Finds open reading frames in all three frames of the requested strand(s) of a DNA sequence.
 
-        if isinstance(sequence, RNA):
-            reverse_complement = sequence.translate(str.maketrans("AUGCaugc", "UACGuacg"))[::-1]
-            return RNA(reverse_complement)
+        Args:
+            sequence: DNA sequence to search
+            start_codons: Codons that open a reading frame
+            stop_codons: Codons that close a reading frame
+            min_length: Minimum ORF length in nucleotides (stop codon included)
+            strand: "+" for the given strand, "-" for its reverse complement or "both"
+            nested: If True every start codon yields an ORF, otherwise only the longest ORF per stop codon is kept
 
-    def _orf_finder(self, sequence: DNA):
+        Returns:
+            Dictionary with the number of ORFs found and the ORFs ordered by start position. Positions are
+            always given on the forward strand.
+        """
         if not isinstance(sequence, DNA):
             raise TypeError("Error: Sequence must be of type DNA")
 
-        start_codons = ["ATG"]
-        stop_codons = ["TAA", "TAG", "TGA"]
-        ORFS = {}
-        ORF_count = 0
-        for i in range(0, len(sequence)):
-            codon = sequence[i:i + 3].upper()
-            if codon not in start_codons:
-                continue
-            for j in range(i, len(sequence), 3):
-                codon = sequence[j:j + 3]
-                if codon in stop_codons:
-                    ORF_count += 1
-                    orf_name = f"ORF_{ORF_count}"
-                    orf_seq = sequence[i:j+3]
-                    ORFS[orf_name] = {
-                        "Sequence": orf_seq,
-                        "Start": i,
-                        "End": j + 2,
-                        "Length": (j + 3) - i
-                    }
-                    break
-        result = {
-            "Number of ORFS": ORF_count,
-            "ORFS": ORFS
+        if strand not in ("+", "-", "both"):
+            raise ValueError(f"Unknown strand {strand}")
+
+        start_codons = self._normalize_codons(start_codons)
+        stop_codons = self._normalize_codons(stop_codons)
+        seq_len = len(sequence)
+
+        found = []
+        if strand in ("+", "both"):
+            forward = self._bytes(sequence)
+            for start, end in self._scan_orfs(self._upper_bytes(sequence), start_codons, stop_codons, nested):
+                found.append((start, end, "+", forward[start:end].decode("latin-1")))
+
+        if strand in ("-", "both"):
+            reverse = self._reverse_complement(sequence).as_bytes()
+            for start, end in self._scan_orfs(reverse.upper(), start_codons, stop_codons, nested):
+                found.append((seq_len - end, seq_len - start, "-", reverse[start:end].decode("latin-1")))
+
+        return orf_report(found, min_length)
+
+    def _protein_properties(self, sequence: Protein) -> dict:
+        """
+        Reports the physicochemical properties of a protein: length, average molecular weight (Da), isoelectric
+        point, GRAVY hydropathy (Kyte & Doolittle), molar extinction coefficients at 280 nm (all cysteines reduced and
+        all forming cystines) and the residue counts. Values agree with ExPASy ProtParam. Sequence must be of type
+        Protein.
+        """
+        if not isinstance(sequence, Protein):
+            raise TypeError("Error: Sequence must be of type Protein")
+
+        return protein_properties([self._bytes(sequence)])[0]
+
+    def _protein_properties_batch(self, sequences: List[Protein]) -> List[dict]:
+        """Reports the properties of many proteins in one pass, see analyze_batch() and analysis/protein.py."""
+        if not all(isinstance(sequence, Protein) for sequence in sequences):
+            raise TypeError("Error: Sequence must be of type Protein")
+
+        return protein_properties([sequence.as_bytes() for sequence in sequences])
+
+    def _motif_search(self, sequence: DNA | RNA, motifs: Iterable[str | Motif] = (), strand: str = "both") -> dict:
+        """
+        Finds every occurrence of a set of motifs or restriction sites in a DNA or RNA sequence in one pass, see
+        analysis/motifs.py. Overlapping hits are all reported. Ambiguous bases in the sequence never match.
+
+        Args:
+            sequence: DNA or RNA sequence to search
+            motifs: IUPAC motifs written as PATTERN or NAME=PATTERN, a ^ marks a cut site
+            strand: "+" for the given strand, "-" for its reverse complement or "both". Palindromic motifs are
+                reported once, on the + strand.
+
+        Returns:
+            Dictionary with the number of hits and the hits ordered by position. Positions are always given on the
+            forward strand, the hit sequence reads in the motif's direction.
+        """
+        if not isinstance(sequence, (DNA, RNA)):
+            raise TypeError("Error: Sequence must be of type DNA or RNA")
+
+        motifs = [motif if isinstance(motif, Motif) else parse_motif(motif) for motif in motifs]
+        complement = DNA_COMPLEMENT if isinstance(sequence, DNA) else RNA_COMPLEMENT
+        forward = self._bytes(sequence)
+
+        hits = {f"Hit_{number}": hit
+                for number, hit in enumerate(describe_hits(forward, motif_scanner(motifs, strand).scan(forward),
+                                                           complement), 1)}
+
+        return {
+            "Number of Hits": len(hits),
+            "Hits": hits
         }
-        return result
+
+    def _scan_orfs(self, sequence: bytes, start_codons: frozenset, stop_codons: frozenset,
+                   nested: bool) -> List[Tuple[int, int]]:
+        """
+        Single pass ORF scan over one uppercased strand. Every start and stop codon is located with one regex sweep and the
+        open start positions are tracked per reading frame, so the work is linear in the sequence length plus the
+        number of ORFs reported. Returns (start, end) pairs with an exclusive end.
+        """
+        start_codons = {codon.encode() for codon in start_codons}
+        stop_codons = {codon.encode() for codon in stop_codons}
+        codon_pattern = re.compile(b"(?=(" + b"|".join(sorted(start_codons | stop_codons)) + b"))")
+        open_starts = ([], [], [])
+        orfs = []
+
+        for match in codon_pattern.finditer(sequence):
+            position = match.start()
+            codon = match.group(1)
+            frame = open_starts[position % 3]
+
+            if codon in stop_codons:
+                orfs.extend((start, position + 3) for start in frame)
+                frame.clear()
+
+            if codon in start_codons and (nested or not frame):
+                frame.append(position)
+
+        return orfs
+
+    @staticmethod
+    def _normalize_codons(codons: Iterable[str]) -> frozenset:
+        """Uppercases a collection of codons and checks that each one is three valid DNA bases long."""
+        normalized = frozenset(codon.strip().upper() for codon in codons)
+        for codon in normalized:
+            if len(codon) != 3 or set(codon) - set("ACGT"):
+                raise ValueError(f"Invalid codon {codon}")
+        return normalized
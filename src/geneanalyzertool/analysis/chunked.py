@@ -0,0 +1,269 @@
+import re
+from math import gcd
+from typing import Any, Iterable, List, Tuple
+
+import numpy as np
+
+from geneanalyzertool.analysis.composition import (
+    check_window, composition_from_counts, counts_for, gc_bin_sums, gc_fraction, gc_windows_from_bins, sequence_bytes
+)
+from geneanalyzertool.analysis.kmers import DEFAULT_MAX_DISTINCT, KmerCounter
+from geneanalyzertool.analysis.motifs import MotifScanner, describe_hits
+
+# (start, exclusive end, strand, sequence) of an ORF, positions on the forward strand.
+Orf = Tuple[int, int, str, str]
+
+
+def orf_report(found: Iterable[Orf], min_length: int = 0) -> dict:
+    """
+    Builds the ORF finder result from the ORFs found on either strand: ORFs shorter than min_length are dropped
+    and the rest are numbered in order of their position, + strand first on ties.
+    """
+    ORFS = {}
+    for start, end, strand, sequence in sorted(found, key=lambda orf: (orf[0], orf[1], orf[2] == "-")):
+        if end - start < min_length:
+            continue
+        ORFS[f"ORF_{len(ORFS) + 1}"] = {
+            "Sequence": sequence,
+            "Start": start,
+            "End": end - 1,
+            "Length": end - start,
+            "Strand": strand
+        }
+
+    return {
+        "Number of ORFS": len(ORFS),
+        "ORFS": ORFS
+    }
+
+
+class ChunkAccumulator:
+    """
+    Builds the result of one analysis method from the consecutive chunks of a record, so that records of any
+    length are analyzed without holding them in memory. Every accumulator keeps the few bases at the end of a
+    chunk it needs to find k-mers, motifs or codons running across the edge to the next chunk, and its result is
+    the same as that of the method run over the whole record.
+    """
+
+    def add(self, chunk: bytes, counts: np.ndarray):
+        """Adds the next chunk of the record. counts are the byte counts of the chunk, see byte_counts()."""
+        raise NotImplementedError("Subclasses must implement this method.")
+
+    def result(self) -> Any:
+        raise NotImplementedError("Subclasses must implement this method.")
+
+
+class CountAccumulator(ChunkAccumulator):
+    """Sums the byte counts of every chunk. Backs gc_percent, base_count and composition without windows."""
+
+    def __init__(self, report: str = "composition"):
+        if report not in ("gc_percent", "base_count", "composition"):
+            raise ValueError(f"Unknown count report {report}")
+        self.report = report
+        self.counts = np.zeros(256, dtype=np.int64)
+
+    def add(self, chunk: bytes, counts: np.ndarray):
+        self.counts += counts
+
+    def result(self) -> Any:
+        if self.report == "gc_percent":
+            return f"{round(gc_fraction(self.counts) * 100, 2)} %"
+        if self.report == "base_count":
+            return counts_for(self.counts, "ATGC")
+        return composition_from_counts(self.counts)
+
+
+class GcWindowAccumulator(ChunkAccumulator):
+    """
+    Sums the GC content of a record into bins of gcd(window, step) bases, holding back the bases of a bin cut by
+    the end of a chunk. The windows are read off the bins once the record is complete, see gc_windows_from_bins().
+    """
+
+    def __init__(self, window: int, step: int | None = None):
+        self.step = check_window(window, step)
+        self.window = window
+        self.bin_size = gcd(window, self.step)
+        self.length = 0
+        self._bins = []
+        self._carry = b""
+
+    def add(self, chunk: bytes, counts: np.ndarray):
+        data = self._carry + chunk if self._carry else chunk
+        full = len(data) - len(data) % self.bin_size
+        self._bins.append(gc_bin_sums(sequence_bytes(data[:full]), self.bin_size))
+        self._carry = data[full:]
+        self.length += len(chunk)
+
+    def result(self) -> List[dict]:
+        bins = np.concatenate(self._bins + [gc_bin_sums(sequence_bytes(self._carry), self.bin_size)])
+        return gc_windows_from_bins(bins, self.length, self.window, self.step)
+
+
+class CompositionAccumulator(ChunkAccumulator):
+    """Composition report of a record, with GC windows when a window size is given."""
+
+    def __init__(self, window: int | None = None, step: int | None = None):
+        self._counts = CountAccumulator("composition")
+        self._windows = None if window is None else GcWindowAccumulator(window, step)
+
+    def add(self, chunk: bytes, counts: np.ndarray):
+        self._counts.add(chunk, counts)
+        if self._windows is not None:
+            self._windows.add(chunk, counts)
+
+    def result(self) -> dict:
+        composition = self._counts.result()
+        if self._windows is not None:
+            composition["GC Windows"] = self._windows.result()
+        return composition
+
+
+class KmerAccumulator(ChunkAccumulator):
+    """Counts k-mers chunk by chunk, carrying the last k - 1 bases of a chunk over to the next one."""
+
+    def __init__(self, k: int = 21, top: int = 10, canonical: bool = True, max_distinct: int = DEFAULT_MAX_DISTINCT):
+        self.counter = KmerCounter(k, canonical, max_distinct)
+        self.top = top
+        self._carry = b""
+
+    def add(self, chunk: bytes, counts: np.ndarray):
+        data = self._carry + chunk
+        self.counter.update(data)
+        self._carry = data[max(len(data) - self.counter.k + 1, 0):]
+
+    def result(self) -> dict:
+        return self.counter.report(self.top)
+
+
+class MotifAccumulator(ChunkAccumulator):
+    """
+    Scans every chunk for motifs together with the last (longest motif - 1) bases of the chunk before it, and
+    keeps the hits that end in the new chunk, so hits across an edge are found exactly once. A hit that crosses an
+    edge is found after the shorter hits that start behind it, so hits are put in the order of scan() (position,
+    length, motif) and numbered once the record is done.
+    """
+
+    def __init__(self, scanner: MotifScanner, complement: bytes):
+        self.scanner = scanner
+        self.complement = complement
+        self.hits = []
+        # (start, length, rank) of every hit, see MotifScanner.rank().
+        self._keys = []
+        self._overlap = max(scanner.max_length - 1, 0)
+        self._carry = b""
+        # Position of the carried bases in the record.
+        self._offset = 0
+
+    def add(self, chunk: bytes, counts: np.ndarray):
+        data = self._carry + chunk
+        new_hits = [hit for hit in self.scanner.scan(data) if hit[1] > len(self._carry)]
+        for (start, end, strand, motif), hit in zip(new_hits, describe_hits(data, new_hits, self.complement,
+                                                                            self._offset)):
+            self.hits.append(hit)
+            self._keys.append((hit["Start"], end - start, self.scanner.rank(motif, strand)))
+
+        self._carry = data[len(data) - min(self._overlap, len(data)):]
+        self._offset += len(data) - len(self._carry)
+
+    def result(self) -> dict:
+        keys = np.array(self._keys, dtype=np.int64).reshape(-1, 3)
+        order = np.lexsort((keys[:, 2], keys[:, 1], keys[:, 0]))
+        return {
+            "Number of Hits": len(self.hits),
+            "Hits": {f"Hit_{number}": self.hits[index] for number, index in enumerate(order.tolist(), 1)}
+        }
+
+
+class OrfAccumulator(ChunkAccumulator):
+    """
+    Finds ORFs chunk by chunk with the same single pass codon scan as the whole record ORF finder, keeping the
+    open start codons of every reading frame from one chunk to the next.
+
+    The - strand is scanned on the forward strand as well: reverse complemented stop codons open a frame and every
+    reverse complemented start codon after them closes an ORF, so no reverse complement of the record is needed.
+    Only the bases from the oldest position an ORF may still start at are kept, which is bounded by the longest
+    stretch without a stop codon in some frame rather than by the length of the record.
+    """
+
+    def __init__(self, start_codons: Iterable[str], stop_codons: Iterable[str], complement: bytes,
+                 min_length: int = 0, strand: str = "both", nested: bool = True):
+        if strand not in ("+", "-", "both"):
+            raise ValueError(f"Unknown strand {strand}")
+
+        self.complement = complement
+        self.min_length = min_length
+        self.nested = nested
+        self.forward = strand in ("+", "both")
+        self.reverse = strand in ("-", "both")
+
+        self._starts = {codon.encode() for codon in start_codons}
+        self._stops = {codon.encode() for codon in stop_codons}
+        self._reverse_starts = {codon.translate(complement)[::-1] for codon in self._starts}
+        self._reverse_stops = {codon.translate(complement)[::-1] for codon in self._stops}
+        searched = (self._starts | self._stops if self.forward else set()) | \
+                   (self._reverse_starts | self._reverse_stops if self.reverse else set())
+        self._pattern = re.compile(b"(?=(" + b"|".join(sorted(searched)) + b"))")
+
+        # + strand: open start positions per frame. - strand: last stop per frame and, when only the longest ORF
+        # per stop is reported, the latest start seen after it.
+        self._open_starts = ([], [], [])
+        self._last_stops = [None, None, None]
+        self._pending_starts = [None, None, None]
+
+        self._buffer = b""
+        self._buffer_start = 0
+        # First position whose codon has not been scanned yet.
+        self._scanned = 0
+        self._found: List[Orf] = []
+
+    def add(self, chunk: bytes, counts: np.ndarray):
+        self._buffer += chunk
+        end = self._buffer_start + len(self._buffer)
+
+        for match in self._pattern.finditer(self._buffer[self._scanned - self._buffer_start:].upper()):
+            position = self._scanned + match.start()
+            codon = match.group(1)
+            frame = position % 3
+
+            if self.forward:
+                open_starts = self._open_starts[frame]
+                if codon in self._stops:
+                    for start in open_starts:
+                        self._emit(start, position + 3, "+")
+                    open_starts.clear()
+                if codon in self._starts and (self.nested or not open_starts):
+                    open_starts.append(position)
+
+            if self.reverse:
+                last_stop = self._last_stops[frame]
+                if codon in self._reverse_starts and last_stop is not None:
+                    if self.nested:
+                        self._emit(last_stop, position + 3, "-")
+                    else:
+                        self._pending_starts[frame] = position
+                if codon in self._reverse_stops:
+                    self._close_pending(frame)
+                    self._last_stops[frame] = position
+
+        # The last two bases cannot hold a whole codon yet and are scanned again with the next chunk.
+        self._scanned = max(end - 2, self._scanned)
+        keep = min([self._scanned] + [starts[0] for starts in self._open_starts if starts] +
+                   [stop for stop in self._last_stops if stop is not None])
+        self._buffer = self._buffer[keep - self._buffer_start:]
+        self._buffer_start = keep
+
+    def result(self) -> dict:
+        for frame in range(3):
+            self._close_pending(frame)
+        return orf_report(self._found, self.min_length)
+
+    def _close_pending(self, frame: int):
+        if self._pending_starts[frame] is not None:
+            self._emit(self._last_stops[frame], self._pending_starts[frame] + 3, "-")
+            self._pending_starts[frame] = None
+
+    def _emit(self, start: int, end: int, strand: str):
+        sequence = self._buffer[start - self._buffer_start:end - self._buffer_start]
+        if strand == "-":
+            sequence = sequence.translate(self.complement)[::-1]
+        self._found.append((start, end, strand, sequence.decode("latin-1")))
@@ -0,0 +1,46 @@
+from typing import List, Sequence
+
+import numpy as np
+
+# Complements of every IUPAC nucleotide symbol as 256 byte lookup tables. Case is kept, so soft masked (lower case)
+# bases stay masked, and bytes that are not nucleotide symbols are left as they are.
+DNA_COMPLEMENT = bytes.maketrans(b"ACGTRYSWKMBDHVNacgtryswkmbdhvn", b"TGCAYRSWMKVHDBNtgcayrswmkvhdbn")
+RNA_COMPLEMENT = bytes.maketrans(b"ACGURYSWKMBDHVNacguryswkmbdhvn", b"UGCAYRSWMKVHDBNugcayrswmkvhdbn")
+TRANSCRIPTION = bytes.maketrans(b"Tt", b"Uu")
+
+
+def translate_batch(sequences: Sequence[bytes], table: bytes, reverse: bool = False) -> List[bytes]:
+    """
+    Maps every base of a batch of sequences through a 256 byte lookup table and, if reverse is set, reverses each
+    sequence. The batch is joined into one buffer and mapped in a single NumPy pass, so the cost per sequence is
+    little more than slicing its result out of the buffer, however short the sequences are.
+
+    Args:
+        sequences: ASCII bytes of the sequences
+        table: Lookup table as made by bytes.maketrans(), e.g. DNA_COMPLEMENT
+        reverse: Reverse every sequence after mapping it (reverse complement)
+
+    Returns:
+        The mapped bytes of every sequence, in order
+    """
+    lengths = np.fromiter(map(len, sequences), dtype=np.int64, count=len(sequences))
+    ends = np.cumsum(lengths)
+    mapped = np.frombuffer(table, dtype=np.uint8)[np.frombuffer(b"".join(sequences), dtype=np.uint8)]
+    if reverse:
+        # Reversing the whole buffer reverses every sequence as well as their order.
+        mapped = mapped[::-1]
+        ends = len(mapped) - ends + lengths
+
+    data = mapped.tobytes()
+    starts = ends - lengths
+    return [data[start:end] for start, end in zip(starts.tolist(), ends.tolist())]
+
+
+def reverse_complement_batch(sequences: Sequence[bytes], complement: bytes = DNA_COMPLEMENT) -> List[bytes]:
+    """Reverse complements a batch of DNA (or, with RNA_COMPLEMENT, RNA) sequences, see translate_batch()."""
+    return translate_batch(sequences, complement, reverse=True)
+
+
+def transcribe_batch(sequences: Sequence[bytes]) -> List[bytes]:
+    """Transcribes a batch of DNA sequences into RNA (T to U, soft masking kept), see translate_batch()."""
+    return translate_batch(sequences, TRANSCRIPTION)
@@ -0,0 +1,134 @@
+from math import gcd
+from typing import List
+
+import numpy as np
+
+# IUPAC nucleotide symbols, including the N and two/three base ambiguity codes.
+IUPAC_NUCLEOTIDES = "ACGTURYSWKMBDHVN"
+
+# 1 for bytes counted as G or C (either case), 0 for everything else.
+GC_LOOKUP = np.zeros(256, dtype=np.uint8)
+GC_LOOKUP[[ord("G"), ord("C"), ord("g"), ord("c")]] = 1
+
+
+def sequence_bytes(sequence: str | bytes) -> np.ndarray:
+    """
+    Returns a read-only uint8 view of a sequence. Strings are encoded once, bytes-like objects are not copied and
+    compact sequences are read through their buffer.
+    """
+    if isinstance(sequence, str):
+        sequence = sequence.encode("latin-1", errors="replace")
+    elif hasattr(sequence, "as_buffer"):
+        sequence = sequence.as_buffer()
+    return np.frombuffer(sequence, dtype=np.uint8)
+
+
+def byte_counts(sequence: str | bytes) -> np.ndarray:
+    """Counts every byte value of a sequence in a single pass. Returns an array of 256 counts."""
+    return np.bincount(sequence_bytes(sequence), minlength=256)
+
+
+def counts_for(counts: np.ndarray, symbols: str) -> dict:
+    """Folds the upper and lower case counts of each symbol together."""
+    return {symbol: int(counts[ord(symbol)] + counts[ord(symbol.lower())]) for symbol in symbols}
+
+
+def gc_fraction(counts: np.ndarray) -> float:
+    """Fraction of G and C in a sequence given its byte counts. Ambiguity codes count towards the length only."""
+    total = int(counts.sum())
+    if total == 0:
+        return 0.0
+    return int(counts[[ord("G"), ord("C"), ord("g"), ord("c")]].sum()) / total
+
+
+def nucleotide_composition(sequence: str | bytes, window: int | None = None, step: int | None = None,
+                           counts: np.ndarray | None = None) -> dict:
+    """
+    Reports the full composition of a nucleotide sequence from a single byte count.
+
+    Args:
+        sequence: DNA or RNA sequence
+        window: Optional sliding window size for windowed GC content
+        step: Distance between consecutive windows, defaults to the window size
+        counts: Byte counts of the sequence if they are already known, see byte_counts()
+
+    Returns:
+        Dictionary with the length, counts for every IUPAC symbol, soft masked (lower case) and unrecognized symbol
+        counts, the overall GC percent and, when a window is given, the GC percent of every window.
+    """
+    data = sequence_bytes(sequence)
+    if counts is None:
+        counts = np.bincount(data, minlength=256)
+
+    composition = composition_from_counts(counts)
+    if window is not None:
+        composition["GC Windows"] = sliding_gc(data, window, step)
+
+    return composition
+
+
+def composition_from_counts(counts: np.ndarray) -> dict:
+    """The composition report of nucleotide_composition() without GC windows, built from byte counts alone."""
+    length = int(counts.sum())
+    symbol_counts = counts_for(counts, IUPAC_NUCLEOTIDES)
+    return {
+        "Length": length,
+        "Counts": symbol_counts,
+        "Soft Masked": int(counts[ord("a"):ord("z") + 1].sum()),
+        "Other": length - sum(symbol_counts.values()),
+        "GC Percent": round(gc_fraction(counts) * 100, 2)
+    }
+
+
+def sliding_gc(sequence: str | bytes | np.ndarray, window: int, step: int | None = None) -> List[dict]:
+    """
+    Computes the GC percent of sliding windows. The sequence is summed once into bins of gcd(window, step) bases,
+    so overlapping windows are read off a cumulative sum of the bins instead of being recounted. The last window
+    is truncated at the end of the sequence.
+
+    Returns:
+        List of windows with a 0-based start, exclusive end and GC percent
+    """
+    step = check_window(window, step)
+    data = sequence if isinstance(sequence, np.ndarray) else sequence_bytes(sequence)
+    return gc_windows_from_bins(gc_bin_sums(data, gcd(window, step)), len(data), window, step)
+
+
+def check_window(window: int, step: int | None) -> int:
+    """Checks a window and step size and returns the step, which defaults to the window size."""
+    step = window if step is None else step
+    if window <= 0 or step <= 0:
+        raise ValueError("Window and step sizes must be positive integers")
+    return step
+
+
+def gc_bin_sums(data: np.ndarray, bin_size: int) -> np.ndarray:
+    """Number of G and C bases in consecutive bins of bin_size bases. The last bin may be shorter."""
+    if not len(data):
+        return np.zeros(0, dtype=np.int64)
+    return np.add.reduceat(GC_LOOKUP[data], np.arange(0, len(data), bin_size), dtype=np.int64)
+
+
+def gc_windows_from_bins(bin_sums: np.ndarray, seq_len: int, window: int, step: int) -> List[dict]:
+    """
+    Reads the GC percent of sliding windows off the GC bin sums of a sequence of seq_len bases, see gc_bin_sums().
+    The bin size must be gcd(window, step). Split out of sliding_gc() so bins summed chunk by chunk give the same
+    windows as the whole sequence.
+    """
+    if seq_len == 0:
+        return []
+
+    bin_size = gcd(window, step)
+    cumulative = np.concatenate(([0], np.cumsum(bin_sums)))
+
+    last_start = max(seq_len - window, 0)
+    starts = np.arange(0, last_start + 1, step)
+    if starts[-1] + window < seq_len and starts[-1] + step < seq_len:
+        starts = np.append(starts, starts[-1] + step)
+    ends = np.minimum(starts + window, seq_len)
+
+    gc_counts = cumulative[-(-ends // bin_size)] - cumulative[starts // bin_size]
+    percents = np.round(gc_counts / (ends - starts) * 100, 2)
+
+    return [{"Start": int(start), "End": int(end), "GC Percent": float(percent)}
+            for start, end, percent in zip(starts, ends, percents)]
@@ -0,0 +1,79 @@
+from collections import Counter
+from typing import Any, Iterator, List, Tuple
+
+from geneanalyzertool.core.exceptions import SequenceParsingError
+from geneanalyzertool.core.manifest import ResultManifest, record_digest
+from geneanalyzertool.core.selection import RecordSelection
+
+
+def stream_incremental(analyzer: Any, manifest: ResultManifest, fasta_file: str, seq_type: str,
+                       analysis_method: str | List[str], method_options: dict | None = None, jobs: int = 1,
+                       chunk_size: int | None = None) -> Iterator[Tuple[str, Any]]:
+    """
+    Like analyzer.stream_sequences(), but only analyzes the records that are new or changed since the run that
+    wrote manifest; the results of the other records are taken from it. Results are yielded in file order and
+    are the same as those of a full run. Once the last result has been consumed, the manifest is replaced with
+    the records of this run, so records that left the file leave the manifest too.
+
+    The file is read once to digest every record, then the changed records are read again for the analysis,
+    through the analyzer's record selection (see RecordSelection), which reads them through the FASTA index
+    where the file has one.
+
+    Args:
+        analyzer: Analysis instance, also a FileHandler
+        manifest: Manifest of the last run, see core/manifest.py
+        fasta_file: Path to the FASTA file
+        seq_type: Type of sequence (DNA, RNA, or Protein)
+        analysis_method: Analysis method to perform, a list of methods or "all"
+        method_options: Optional keyword arguments for the analysis methods, keyed by method name
+        jobs: Number of worker processes used for the changed records, 0 uses one per CPU core
+        chunk_size: Read and analyze records in chunks of this many bases, see stream_sequences()
+
+    Returns:
+        Iterator of (record id, result) pairs in file order
+    """
+    if chunk_size is not None:
+        records = analyzer.iter_sequence_chunks(fasta_file, chunk_size)
+        digests = [(record_id, record_digest(chunks)) for record_id, chunks in records]
+    else:
+        digests = [(record_id, record_digest([sequence])) for record_id, sequence in analyzer.iter_sequences(fasta_file)]
+
+    # Records are matched by id. Records with repeated ids can neither be matched nor selected by id, so files with
+    # repeated ids are analyzed whole.
+    repeated = {record_id for record_id, count in Counter(record_id for record_id, _ in digests).items() if count > 1}
+    if repeated:
+        changed = {record_id for record_id, _ in digests}
+    else:
+        changed = {record_id for record_id, digest in digests if not manifest.lookup(record_id, digest)[0]}
+
+    selection = analyzer.selection
+    fresh = iter(())
+    if changed and not repeated:
+        # The changed records are a subset of those the selection selects, which keeps selecting them by length.
+        if selection is None:
+            analyzer.selection = RecordSelection(changed)
+        else:
+            analyzer.selection = RecordSelection(changed, selection.id_regex, selection.min_length, selection.max_length)
+    if changed:
+        fresh = analyzer.stream_sequences(fasta_file, seq_type, analysis_method, method_options, jobs, chunk_size)
+
+    current = []
+    try:
+        for record_id, digest in digests:
+            if record_id in changed:
+                fresh_id, result = next(fresh, (None, None))
+                if fresh_id != record_id:
+                    # The file changed between reading and analyzing it; results must never be paired with the
+                    # wrong record, nor kept in the manifest.
+                    raise SequenceParsingError(f"Error: {fasta_file} changed while it was analyzed, expected record "
+                                               f"{record_id} but read {fresh_id or 'no record'}. Run the analysis "
+                                               "again.")
+            else:
+                result = manifest.lookup(record_id, digest)[1]
+            if record_id not in repeated:
+                current.append((record_id, digest, result))
+            yield record_id, result
+    finally:
+        analyzer.selection = selection
+
+    manifest.save(current)
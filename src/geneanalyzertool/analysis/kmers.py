@@ -0,0 +1,336 @@
+from math import log
+from typing import Dict, Iterator, List, Tuple
+
+import numpy as np
+
+from geneanalyzertool.analysis.composition import sequence_bytes
+
+# k-mers are packed 2 bits per base into a uint64, which holds at most 31 bases plus room to shift.
+MAX_K = 31
+KMER_BASES = "ACGT"
+
+# Up to this k every possible k-mer gets a slot in a dense count array (4^10 counts, 8 MiB). Larger k are counted in
+# a sparse table of the k-mers actually seen.
+DENSE_MAX_K = 10
+
+# Number of distinct k-mers the sparse table may hold (16 bytes each) before counting switches to a count-min sketch.
+DEFAULT_MAX_DISTINCT = 10_000_000
+
+# Count-min sketch size: SKETCH_DEPTH rows of 2^SKETCH_WIDTH_BITS 32-bit counters (64 MiB).
+SKETCH_WIDTH_BITS = 22
+SKETCH_DEPTH = 4
+
+# Sequences are encoded this many k-mers at a time, so the uint64 code arrays of a chunk stay around 32 MiB.
+CHUNK_KMERS = 4 * 1024 * 1024
+
+# Base byte -> 2-bit code (A=0, C=1, G=2, T/U=3), 4 for anything else. The complement of a code c is 3 - c.
+INVALID_BASE = 4
+BASE_CODES = np.full(256, INVALID_BASE, dtype=np.uint8)
+for _code, _base in enumerate(KMER_BASES):
+    BASE_CODES[[ord(_base), ord(_base.lower())]] = _code
+BASE_CODES[[ord("U"), ord("u")]] = 3
+
+# Odd multipliers of the multiply-shift hash of each sketch row.
+_SKETCH_SEEDS = np.array([0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9, 0xD6E8FEB86659FD93,
+                          0xFF51AFD7ED558CCD, 0xC4CEB9FE1A85EC53, 0x27D4EB2F165667C5, 0x94D049BB133111EB],
+                         dtype=np.uint64)
+
+
+def kmer_codes(sequence: str | bytes | np.ndarray, k: int, canonical: bool = True) -> np.ndarray:
+    """
+    Encodes every k-mer of a DNA or RNA sequence as a uint64 of 2 bits per base. k-mers containing anything but
+    A, C, G, T or U (either case) are skipped. With canonical, each k-mer is replaced by the smaller code of itself
+    and its reverse complement, so both strands count as the same k-mer.
+    """
+    codes, valid = window_codes(sequence, k, canonical)
+    return codes[valid]
+
+
+def window_codes(sequence: str | bytes | np.ndarray, k: int, canonical: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Encodes the k-mer starting at every position of a sequence, see kmer_codes(). Returns the codes and a mask of
+    the positions whose k-mer holds only unambiguous bases; the codes of the other positions are meaningless.
+
+    The codes of all positions are computed at once by doubling: codes of windows of length L give those of
+    length 2L with one shift-or pass, and k is assembled from its binary digits, so a code array takes about
+    2 log2(k) NumPy passes instead of a Python loop over the sequence.
+    """
+    _check_k(k)
+    data = sequence if isinstance(sequence, np.ndarray) else sequence_bytes(sequence)
+    positions = len(data) - k + 1
+    if positions <= 0:
+        return np.empty(0, dtype=np.uint64), np.empty(0, dtype=bool)
+
+    bases = BASE_CODES[data]
+    invalid = np.concatenate(([0], np.cumsum(bases == INVALID_BASE)))
+    valid = invalid[k:] == invalid[:-k]
+
+    bases = (bases & 3).astype(np.uint64)
+    codes = _window_codes(bases, k, positions)
+    if canonical:
+        codes = np.minimum(codes, _window_codes(np.uint64(3) - bases, k, positions, reverse=True))
+
+    return codes, valid
+
+
+def _window_codes(bases: np.ndarray, k: int, positions: int, reverse: bool = False) -> np.ndarray:
+    """
+    2-bit codes of the windows of length k starting at the first positions bases, read forward or (for the
+    reverse complement, given complemented bases) backward.
+    """
+    # windows: codes of the windows of length `length` at every position they fit. codes: codes of the windows of
+    # the `covered` length assembled so far from the binary digits of k.
+    windows, length = bases, 1
+    codes, covered = None, 0
+    while True:
+        if k & length:
+            if codes is None:
+                codes = windows
+            elif reverse:
+                # Windows appended on the right come first in the reverse complement.
+                size = len(windows) - covered
+                codes = (windows[covered:] << np.uint64(2 * covered)) | codes[:size]
+            else:
+                size = len(windows) - covered
+                codes = (codes[:size] << np.uint64(2 * length)) | windows[covered:]
+            covered += length
+        if 2 * length > k:
+            return codes[:positions]
+        size = len(windows) - length
+        if reverse:
+            windows = (windows[length:] << np.uint64(2 * length)) | windows[:size]
+        else:
+            windows = (windows[:size] << np.uint64(2 * length)) | windows[length:]
+        length *= 2
+
+
+def iter_kmer_codes(sequence: str | bytes, k: int, canonical: bool = True,
+                    chunk_kmers: int = CHUNK_KMERS) -> Iterator[np.ndarray]:
+    """Yields the k-mer codes of a sequence in chunks of at most chunk_kmers, see kmer_codes()."""
+    data = sequence_bytes(sequence)
+    for start in range(0, max(len(data) - k + 1, 0), chunk_kmers):
+        yield kmer_codes(data[start:start + chunk_kmers + k - 1], k, canonical)
+
+
+def decode_kmer(code: int, k: int) -> str:
+    """Turns a 2-bit k-mer code back into its bases."""
+    return "".join(KMER_BASES[(int(code) >> (2 * (k - 1 - position))) & 3] for position in range(k))
+
+
+class CountMinSketch:
+    """
+    Fixed size count-min sketch of uint64 keys. Estimates never undercount; they overcount by at most
+    e / width * total with probability 1 - exp(-depth). Sketches of equal shape merge by adding their tables.
+    """
+
+    def __init__(self, width_bits: int = SKETCH_WIDTH_BITS, depth: int = SKETCH_DEPTH):
+        if not 1 <= depth <= len(_SKETCH_SEEDS):
+            raise ValueError(f"Sketch depth must be between 1 and {len(_SKETCH_SEEDS)}")
+        self.width_bits = width_bits
+        self.table = np.zeros((depth, 1 << width_bits), dtype=np.uint32)
+
+    def add(self, keys: np.ndarray, counts: np.ndarray):
+        """Adds counts[i] to keys[i]. Keys must be unique."""
+        width = self.table.shape[1]
+        for row, slots in enumerate(self._slots(keys)):
+            self.table[row] += np.bincount(slots, weights=counts, minlength=width).astype(np.uint32)
+
+    def estimate(self, keys: np.ndarray) -> np.ndarray:
+        return np.min([self.table[row][slots] for row, slots in enumerate(self._slots(keys))], axis=0).astype(np.int64)
+
+    def distinct(self) -> int:
+        """Estimates the number of distinct keys added by linear counting over the first row."""
+        width = self.table.shape[1]
+        empty = width - int(np.count_nonzero(self.table[0]))
+        return round(width * log(width / max(empty, 1)))
+
+    def merge(self, other: "CountMinSketch"):
+        if self.table.shape != other.table.shape:
+            raise ValueError("Only sketches of the same size can be merged")
+        self.table += other.table
+
+    def _slots(self, keys: np.ndarray) -> Iterator[np.ndarray]:
+        shift = np.uint64(64 - self.width_bits)
+        for seed in _SKETCH_SEEDS[:len(self.table)]:
+            yield ((keys * seed) >> shift).astype(np.intp)
+
+
+class KmerCounter:
+    """
+    Counts the k-mers of any number of sequences, which can be added one by one and merged across counters (for
+    example one per record or per file). Counting is exact until the number of distinct k-mers grows past
+    max_distinct. From then on counts go into a count-min sketch of fixed size, so memory stays bounded, and only
+    the max_distinct most frequent k-mers are tracked for the top k report.
+
+    k <= DENSE_MAX_K is counted into a dense array with np.bincount, larger k by merging each chunk's np.unique
+    counts into a sorted table.
+    """
+
+    def __init__(self, k: int, canonical: bool = True, max_distinct: int = DEFAULT_MAX_DISTINCT,
+                 sketch_width_bits: int = SKETCH_WIDTH_BITS, sketch_depth: int = SKETCH_DEPTH):
+        _check_k(k)
+        if max_distinct <= 0:
+            raise ValueError("max_distinct must be a positive integer")
+        self.k = k
+        self.canonical = canonical
+        self.max_distinct = max_distinct
+        self.total = 0
+        self._sketch_shape = (sketch_width_bits, sketch_depth)
+        self._sketch = None
+        self._dense = np.zeros(4 ** k, dtype=np.int64) if k <= DENSE_MAX_K else None
+        self._keys = np.empty(0, dtype=np.uint64)
+        self._counts = np.empty(0, dtype=np.int64)
+
+    @property
+    def approximate(self) -> bool:
+        """True once counting switched to the count-min sketch."""
+        return self._sketch is not None
+
+    def update(self, sequence: str | bytes):
+        """Counts the k-mers of one sequence."""
+        for codes in iter_kmer_codes(sequence, self.k, self.canonical):
+            self.add_codes(codes)
+
+    def add_codes(self, codes: np.ndarray):
+        """Counts already encoded k-mers, see kmer_codes()."""
+        self.total += len(codes)
+        if self._dense is not None:
+            self._dense += np.bincount(codes.astype(np.intp), minlength=len(self._dense))
+            return
+        if len(codes) == 0:
+            # Records or chunks whose every k-mer holds an N or another non-ACGT base.
+            return
+        codes = np.sort(codes)
+        starts = np.flatnonzero(np.concatenate(([True], codes[1:] != codes[:-1])))
+        self._add_counts(codes[starts], np.diff(np.append(starts, len(codes))))
+
+    def merge(self, other: "KmerCounter"):
+        """Adds the counts of another counter of the same k and strandedness."""
+        if (other.k, other.canonical) != (self.k, self.canonical):
+            raise ValueError("Only counters of the same k and canonical setting can be merged")
+
+        self.total += other.total
+        if self._dense is not None:
+            self._dense += other._dense
+            return
+        if other._sketch is not None:
+            self._switch_to_sketch()
+            self._sketch.merge(other._sketch)
+            self._track_candidates(other._keys)
+            return
+        self._add_counts(other._keys, other._counts)
+
+    def counts(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns the codes and counts of all counted k-mers (the tracked ones once approximate), sorted by code."""
+        if self._dense is not None:
+            codes = np.flatnonzero(self._dense)
+            return codes.astype(np.uint64), self._dense[codes]
+        if self._sketch is not None:
+            return self._keys, self._sketch.estimate(self._keys)
+        return self._keys, self._counts
+
+    def distinct(self) -> int:
+        """Number of distinct k-mers counted, estimated once approximate."""
+        if self._sketch is not None:
+            return max(self._sketch.distinct(), len(self._keys))
+        return len(self.counts()[0])
+
+    def top(self, n: int) -> List[Tuple[str, int]]:
+        """The n most frequent k-mers with their counts, ties broken by k-mer."""
+        codes, counts = self.counts()
+        order = np.lexsort((codes, -counts))[:n]
+        return [(decode_kmer(codes[index], self.k), int(counts[index])) for index in order]
+
+    def histogram(self) -> Dict[int, int] | None:
+        """Maps each k-mer count onto the number of distinct k-mers seen that often. None once approximate."""
+        if self._sketch is not None:
+            return None
+        counts, frequencies = np.unique(self.counts()[1], return_counts=True)
+        return {int(count): int(frequency) for count, frequency in zip(counts, frequencies)}
+
+    def report(self, top: int = 10) -> dict:
+        """Summary of the counts: totals, the top k-mers and the count histogram."""
+        report = {
+            "K": self.k,
+            "Canonical": self.canonical,
+            "Total K-mers": self.total,
+            "Distinct K-mers": self.distinct(),
+            "Top K-mers": dict(self.top(top)),
+            "Approximate": self.approximate
+        }
+        histogram = self.histogram()
+        if histogram is not None:
+            report["Histogram"] = histogram
+        return report
+
+    def save(self, path: str):
+        """Writes the counts to a .npz file, so counts of many files can be merged later, see load()."""
+        codes, counts = self.counts()
+        np.savez_compressed(path, k=self.k, canonical=self.canonical, total=self.total, codes=codes, counts=counts,
+                            sketch=self._sketch.table if self._sketch is not None else np.empty(0, dtype=np.uint32))
+
+    @classmethod
+    def load(cls, path: str, max_distinct: int = DEFAULT_MAX_DISTINCT) -> "KmerCounter":
+        with np.load(path) as data:
+            counter = cls(int(data["k"]), bool(data["canonical"]), max_distinct)
+            sketch = data["sketch"]
+            if sketch.size:
+                counter._sketch = CountMinSketch(sketch.shape[1].bit_length() - 1, sketch.shape[0])
+                counter._sketch.table[:] = sketch
+                counter._track_candidates(data["codes"])
+            elif counter._dense is not None:
+                counter._dense[data["codes"].astype(np.intp)] = data["counts"]
+            else:
+                counter._add_counts(data["codes"], data["counts"])
+            counter.total = int(data["total"])
+        return counter
+
+    def _add_counts(self, keys: np.ndarray, counts: np.ndarray):
+        """Adds counts of unique keys to the sparse table, switching to the sketch if it grows too large."""
+        if self._sketch is not None:
+            self._sketch.add(keys, counts)
+            self._track_candidates(keys)
+            return
+
+        self._keys, self._counts = _sum_by_key(np.concatenate((self._keys, keys)),
+                                               np.concatenate((self._counts, counts)))
+
+        if len(self._keys) > self.max_distinct:
+            self._switch_to_sketch()
+
+    def _switch_to_sketch(self):
+        if self._sketch is not None:
+            return
+        self._sketch = CountMinSketch(*self._sketch_shape)
+        self._sketch.add(self._keys, self._counts)
+        keys = self._keys
+        self._keys = np.empty(0, dtype=np.uint64)
+        self._counts = np.empty(0, dtype=np.int64)
+        self._track_candidates(keys)
+
+    def _track_candidates(self, keys: np.ndarray):
+        """Keeps the max_distinct keys with the highest estimated counts as top k candidates."""
+        candidates = _sum_by_key(np.concatenate((self._keys, keys)), np.zeros(len(self._keys) + len(keys)))[0]
+        if len(candidates) > self.max_distinct:
+            estimates = self._sketch.estimate(candidates)
+            keep = np.argpartition(-estimates, self.max_distinct - 1)[:self.max_distinct]
+            candidates = np.sort(candidates[keep])
+        self._keys = candidates
+
+
+def _sum_by_key(keys: np.ndarray, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Sorts keys and sums the values of equal keys. Inputs are concatenations of sorted runs, which a stable sort
+    merges several times faster than np.unique's hashing.
+    """
+    if not len(keys):
+        return keys, values
+    order = np.argsort(keys, kind="stable")
+    keys = keys[order]
+    starts = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1])))
+    return keys[starts], np.add.reduceat(values[order], starts)
+
+
+def _check_k(k: int):
+    if not 1 <= k <= MAX_K:
+        raise ValueError(f"k must be between 1 and {MAX_K}")
@@ -0,0 +1,123 @@
+from contextlib import contextmanager, nullcontext
+from typing import Any, Callable, Iterable, List, override
+
+from geneanalyzertool.analysis.analysis import Analysis
+from geneanalyzertool.core.cache import ResultCache
+from geneanalyzertool.core.compact_sequences import CompactSequence
+from geneanalyzertool.core.exceptions import AnalysisMethodError, InvalidSequenceTypeError
+from geneanalyzertool.core.file_handler import FileHandler
+from geneanalyzertool.core.metrics import RunMetrics
+from geneanalyzertool.core.selection import RecordSelection
+from geneanalyzertool.core.sequences import DNA, RNA, Protein, Sequence, same_storage
+
+YELLOW = "\033[1;33m"
+GREEN = "\033[1;32m"
+RED = "\033[1;31m"
+RESET = "\033[0m"
+CYAN = "\033[1;36m"
+
+
+def same_representation(result: Any, sequence: Any) -> Any:
+    """
+    result, with the sequences in it (at the top level or in dictionaries, such as translated frames) held in the
+    representation of sequence: compact if sequence is compact, str backed otherwise.
+    """
+    if isinstance(result, dict):
+        converted = {key: same_representation(value, sequence) for key, value in result.items()}
+        if all(converted[key] is value for key, value in result.items()):
+            return result
+        return type(result)(converted)
+
+    for seq_type_class in (DNA, RNA, Protein):
+        if isinstance(result, seq_type_class):
+            target = same_storage(sequence, seq_type_class)
+            return result if type(result) is target else target.from_bytes(result.as_bytes())
+    return result
+
+
+class AnalysisMode(Analysis, FileHandler):
+    """
+    Base class of the analysis modes (basic, similarity and alignment). It holds what every mode shares: the result
+    cache, the sequence representation, the run metrics and record selection, and the output of batch results
+    through export_stream() and print_stream(). Modes implement the Analysis interface on top of it.
+    """
+
+    def __init__(self, cache: ResultCache | None = None, compact: bool = False, parser: str = "native",
+                 metrics: RunMetrics | None = None, selection: RecordSelection | None = None):
+        """
+        Args:
+            cache: Optional persistent result cache. Analyses found in the cache are not recomputed.
+            compact: Hold sequences in the packed, byte backed CompactSequence representation instead of str.
+            parser: FASTA/FASTQ parser used for file input, "native" or "biopython"
+            metrics: Optional collector of per stage timings and record counters (read, convert, analyze, cache
+                and export)
+            selection: Only analyze the records of files it selects, without prompting
+        """
+        super().__init__(parser=parser, selection=selection)
+        self.cache = cache
+        self.compact = compact
+        self.metrics = metrics
+
+    def __getstate__(self) -> dict:
+        # Worker processes get a copy of the analyzer; their timings would be lost, the parent times the pool.
+        state = super().__getstate__()
+        state["metrics"] = None
+        return state
+
+    @override
+    def export_to_file(self, results: dict, sequence_keys: List[str], out_file: str, out_format: str = "text",
+                       analysis_method: str | List[str] | None = None):
+        self.export_stream(((seq, results[seq]) for seq in sequence_keys), out_file, out_format, analysis_method)
+
+    @override
+    def print_to_terminal(self, results: dict, sequence_keys: List[str]):
+        self.print_stream((seq, results[seq]) for seq in sequence_keys)
+
+    def _cached(self, sequence: Sequence, method: str, options: dict, compute: Callable[[], Any]) -> Any:
+        """Returns compute(), the result of method with options on sequence, from the result cache if it is there."""
+        if self.cache is None:
+            return compute()
+
+        with self._stage("cache"):
+            key = self.cache.make_key(self._sequence_digest(sequence), method, options)
+            hit, result = self.cache.get(key)
+        if not hit:
+            result = compute()
+            with self._stage("cache"):
+                self.cache.put(key, result)
+            return result
+        # Compact and str backed runs share cache entries; sequences in results keep the representation of the record.
+        return same_representation(result, sequence)
+
+    def _sequence_digest(self, sequence: Sequence) -> str:
+        """Cache digest of sequence, see ResultCache.sequence_digest(). Modes running several methods per record share it."""
+        return self.cache.sequence_digest(sequence)
+
+    @contextmanager
+    def _method_errors(self, seq_type_class: type):
+        """Converts the ValueErrors and TypeErrors raised by analysis methods into GeneAnalyzer errors."""
+        try:
+            yield
+        except ValueError as e:
+            raise AnalysisMethodError(f"Invalid analysis method provided. {str(e)}")
+        except TypeError as e:
+            seq_type = seq_type_class.__name__.upper().removeprefix("COMPACT")
+            raise InvalidSequenceTypeError(f"Unable to perform this analysis on sequence of type {seq_type}. {e}")
+
+    def _sequence_class(self, seq_type: str) -> type:
+        """Maps a sequence type name (DNA, RNA or Protein) onto its Sequence class."""
+        try:
+            type_map = {"DNA": DNA, "RNA": RNA, "PROTEIN": Protein}
+            seq_type_class = type_map[seq_type.upper()]
+
+        except KeyError:
+            raise InvalidSequenceTypeError("Error: Invalid sequence type provided. Valid types are DNA, RNA, or Protein.")
+
+        return CompactSequence.storage_types[seq_type_class] if self.compact else seq_type_class
+
+    def _stage(self, name: str):
+        """Metrics stage called name, a no-op unless metrics are collected."""
+        return nullcontext() if self.metrics is None else self.metrics.stage(name)
+
+    def _timed(self, name: str, items: Iterable) -> Iterable:
+        return items if self.metrics is None else self.metrics.timed(name, items)
@@ -0,0 +1,240 @@
+import re
+from functools import lru_cache
+from math import prod
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Tuple
+
+import numpy as np
+
+from geneanalyzertool.analysis.composition import sequence_bytes
+from geneanalyzertool.analysis.kmers import MAX_K, window_codes
+
+# Bases matched by each IUPAC symbol of a motif. T and U are interchangeable, so motifs match DNA and RNA alike.
+IUPAC_MOTIF_BASES = {
+    "A": "A", "C": "C", "G": "G", "T": "TU", "U": "TU",
+    "R": "AG", "Y": "CTU", "S": "CG", "W": "ATU", "K": "GTU", "M": "AC",
+    "B": "CGTU", "D": "AGTU", "H": "ACTU", "V": "ACG", "N": "ACGTU"
+}
+IUPAC_COMPLEMENT = str.maketrans("ACGTURYSWKMBDHVN", "TGCAAYRSWMKVHDBN")
+
+# 2-bit base codes (see analysis/kmers.py) matched by each IUPAC symbol.
+MOTIF_CODES = {symbol: sorted({"ACGT".index(base) for base in bases if base != "U"})
+               for symbol, bases in IUPAC_MOTIF_BASES.items()}
+
+# Motifs matching more concrete sequences than this are matched with a regular expression instead of being expanded.
+MAX_EXPANSIONS = 1 << 16
+
+# Sequences are scanned this many positions at a time to bound the size of the code arrays.
+SCAN_CHUNK = 4 * 1024 * 1024
+
+# Marks the cut position in restriction sites, e.g. G^AATTC for EcoRI.
+CUT_MARK = "^"
+
+STRANDS = ("+", "-", "both")
+
+
+class Motif(NamedTuple):
+    name: str
+    pattern: str
+    # Offset of the cut mark within the pattern, None if the motif has none.
+    cut: int | None = None
+
+
+def parse_motif(text: str, name: str | None = None) -> Motif:
+    """
+    Parses a motif written as PATTERN or NAME=PATTERN. Patterns use IUPAC nucleotide codes (either case) and may
+    hold one ^ marking a cut site. Motifs without a name are named after their pattern.
+    """
+    if name is None and "=" in text:
+        name, text = text.split("=", 1)
+
+    pattern = text.strip().upper()
+    cut = pattern.find(CUT_MARK)
+    pattern = pattern.replace(CUT_MARK, "", 1)
+    if not pattern or set(pattern) - set(IUPAC_MOTIF_BASES):
+        raise ValueError(f"Invalid motif {text.strip()!r}. Motifs are IUPAC nucleotide codes with an optional "
+                         f"{CUT_MARK} cut mark.")
+
+    return Motif((name or "").strip() or pattern, pattern, cut if cut >= 0 else None)
+
+
+def format_motif(motif: Motif) -> str:
+    """Writes a motif as NAME=PATTERN, the inverse of parse_motif()."""
+    pattern = motif.pattern if motif.cut is None else motif.pattern[:motif.cut] + CUT_MARK + motif.pattern[motif.cut:]
+    return f"{motif.name}={pattern}"
+
+
+def read_motif_file(path: str) -> List[Motif]:
+    """
+    Reads motifs from a text file. Each line holds a pattern, optionally preceded by a name (NAME PATTERN or
+    NAME=PATTERN); FASTA style files with the name on a ">" line work too. Blank lines and lines starting with # are
+    skipped.
+    """
+    motifs = []
+    name = None
+    with open(path) as handle:
+        for line in handle:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if line.startswith(">"):
+                name = line[1:].strip()
+                continue
+
+            fields = line.split()
+            if len(fields) > 2:
+                raise ValueError(f"Invalid motif line {line!r} in {path}. Expected PATTERN or NAME PATTERN.")
+            motifs.append(parse_motif(fields[-1], fields[0] if len(fields) == 2 else name))
+            name = None
+    return motifs
+
+
+def reverse_complement_motif(pattern: str) -> str:
+    return pattern.translate(IUPAC_COMPLEMENT)[::-1]
+
+
+class MotifScanner:
+    """
+    Finds every occurrence of a set of motifs on one or both strands, overlapping hits included.
+
+    The motifs (and the reverse complements of the non palindromic ones) are expanded into every concrete sequence
+    they match, encoded 2 bits per base like k-mers (see analysis/kmers.py), and stored in one sorted table per
+    motif length. A scan encodes the k-mer at each position of the sequence once per distinct motif length and
+    looks all of them up in the table with a binary search, so its cost hardly depends on the number of motifs.
+    Motifs longer than MAX_K or with too many ambiguous positions to expand are matched with a regular expression.
+    """
+
+    def __init__(self, motifs: Iterable[Motif], strand: str = "both"):
+        if strand not in STRANDS:
+            raise ValueError(f"Unknown strand {strand}")
+
+        # (motif, strand, pattern) of every motif orientation searched for.
+        self._alternatives = []
+        for motif in motifs:
+            reverse = reverse_complement_motif(motif.pattern)
+            # The complement of U is A, which complements back to T, so RNA palindromes are compared as DNA.
+            palindromic = reverse == motif.pattern.upper().replace("U", "T")
+            if strand in ("+", "both"):
+                self._alternatives.append((motif, "+", motif.pattern))
+            if strand == "-" or (strand == "both" and not palindromic):
+                self._alternatives.append((motif, "-", reverse))
+        # Alternative index of every (motif, strand), which orders hits at the same position and of the same length.
+        self._ranks = {(motif, motif_strand): index for index, (motif, motif_strand, _) in enumerate(self._alternatives)}
+
+        # Motif length -> (sorted codes, alternative index of each code).
+        self._tables: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+        self._expressions: List[Tuple[int, re.Pattern]] = []
+
+        expansions = {}
+        for index, (_, _, pattern) in enumerate(self._alternatives):
+            if len(pattern) > MAX_K or prod(len(MOTIF_CODES[symbol]) for symbol in pattern) > MAX_EXPANSIONS:
+                self._expressions.append((index, re.compile(b"(?=" + _motif_expression(pattern) + b")")))
+            else:
+                expansions.setdefault(len(pattern), []).append((index, _expand_codes(pattern)))
+
+        for length, entries in expansions.items():
+            codes = np.concatenate([codes for _, codes in entries])
+            indexes = np.concatenate([np.full(len(codes), index, dtype=np.int64) for index, codes in entries])
+            order = np.argsort(codes, kind="stable")
+            self._tables[length] = (codes[order], indexes[order])
+
+    @property
+    def max_length(self) -> int:
+        """Length of the longest motif, 0 without motifs."""
+        return max((len(pattern) for _, _, pattern in self._alternatives), default=0)
+
+    def rank(self, motif: Motif, strand: str) -> int:
+        """Order of the hits of motif on strand among hits at the same position and of the same length, see scan()."""
+        return self._ranks[(motif, strand)]
+
+    def scan(self, sequence: bytes) -> List[Tuple[int, int, str, Motif]]:
+        """
+        Scans a DNA or RNA sequence. Returns (start, exclusive end, strand, motif) hits ordered by position, in
+        forward strand coordinates. Positions holding ambiguous bases never match.
+        """
+        positions, indexes = [], []
+        data = sequence_bytes(sequence)
+
+        for length, (table, table_indexes) in self._tables.items():
+            for offset in range(0, max(len(data) - length + 1, 0), SCAN_CHUNK):
+                codes, valid = window_codes(data[offset:offset + SCAN_CHUNK + length - 1], length)
+                first = np.searchsorted(table, codes, side="left")
+                last = np.searchsorted(table, codes, side="right")
+                hit_positions = np.flatnonzero(valid & (last > first))
+                if not len(hit_positions):
+                    continue
+
+                # Several motifs can match the same window; expand each hit into one entry per matching motif.
+                first, last = first[hit_positions], last[hit_positions]
+                repeats = last - first
+                run_starts = np.repeat(np.cumsum(repeats) - repeats, repeats)
+                entries = np.repeat(first, repeats) + np.arange(repeats.sum()) - run_starts
+                positions.append(np.repeat(hit_positions, repeats) + offset)
+                indexes.append(table_indexes[entries])
+
+        upper = sequence.upper() if self._expressions else b""
+        for index, expression in self._expressions:
+            matches = [match.start() for match in expression.finditer(upper)]
+            positions.append(np.array(matches, dtype=np.int64))
+            indexes.append(np.full(len(matches), index, dtype=np.int64))
+
+        if not positions:
+            return []
+
+        positions, indexes = np.concatenate(positions), np.concatenate(indexes)
+        lengths = np.array([len(pattern) for _, _, pattern in self._alternatives], dtype=np.int64)[indexes]
+        order = np.lexsort((indexes, lengths, positions))
+
+        hits = []
+        for position, index in zip(positions[order].tolist(), indexes[order].tolist()):
+            motif, strand, pattern = self._alternatives[index]
+            hits.append((position, position + len(pattern), strand, motif))
+        return hits
+
+
+def describe_hits(sequence: bytes, hits: Iterable[Tuple[int, int, str, Motif]], complement: bytes,
+                  offset: int = 0) -> Iterator[dict]:
+    """
+    Turns scan() hits into result entries with the matched site (reverse complemented with the complement table on
+    the - strand), 0-based start, inclusive end and, for motifs with a cut mark, the forward strand position the
+    cut lies before. offset is the position of sequence within its record.
+    """
+    for start, end, strand, motif in hits:
+        site = sequence[start:end] if strand == "+" else sequence[start:end].translate(complement)[::-1]
+        hit = {
+            "Motif": motif.name,
+            "Sequence": site.decode("latin-1"),
+            "Start": offset + start,
+            "End": offset + end - 1,
+            "Length": end - start,
+            "Strand": strand
+        }
+        if motif.cut is not None:
+            hit["Cut"] = offset + (start + motif.cut if strand == "+" else end - motif.cut)
+        yield hit
+
+
+def motif_scanner(motifs: Iterable[Motif], strand: str = "both") -> MotifScanner:
+    """Returns a compiled scanner, reusing it for every record searched for the same motifs."""
+    return _compiled_scanner(tuple(motifs), strand)
+
+
+# Bounded, so a long running server does not keep every motif set its clients ever sent.
+@lru_cache(maxsize=32)
+def _compiled_scanner(motifs: Tuple[Motif, ...], strand: str) -> MotifScanner:
+    return MotifScanner(motifs, strand)
+
+
+def _expand_codes(pattern: str) -> np.ndarray:
+    """2-bit codes of every concrete sequence an IUPAC pattern matches."""
+    codes = np.zeros(1, dtype=np.uint64)
+    for symbol in pattern:
+        bases = np.array(MOTIF_CODES[symbol], dtype=np.uint64)
+        codes = ((codes[:, None] << np.uint64(2)) | bases[None, :]).ravel()
+    return codes
+
+
+def _motif_expression(pattern: str) -> bytes:
+    return b"".join(
+        symbol.encode() if len(bases) == 1 else b"[" + bases.encode() + b"]"
+        for symbol, bases in ((symbol, IUPAC_MOTIF_BASES[symbol]) for symbol in pattern)
+    )
@@ -0,0 +1,94 @@
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Iterable, Iterator, List, Tuple
+
+# A batch is closed once it holds this many bases or records, whichever comes first. Batching keeps small
+# records from being dominated by pickling and IPC overhead, while the base limit keeps batches of large
+# records small enough to spread evenly over the workers.
+DEFAULT_BATCH_BASES = 1_000_000
+DEFAULT_BATCH_RECORDS = 2_000
+
+# Number of batches queued per worker. Bounds memory when the records come from a lazy stream.
+BATCHES_IN_FLIGHT_PER_WORKER = 2
+
+
+def resolve_jobs(jobs: int) -> int:
+    """Returns the number of worker processes to use. A value of 0 or less means one worker per CPU core."""
+    if jobs <= 0:
+        return os.cpu_count() or 1
+    return jobs
+
+
+def batch_records(records: Iterable[Tuple[str, Any]], max_bases: int = DEFAULT_BATCH_BASES,
+                  max_records: int = DEFAULT_BATCH_RECORDS) -> Iterator[List[Tuple[str, str | bytes]]]:
+    """
+    Groups (record id, sequence) pairs into batches bounded by total bases and record count.
+    Sequences are converted to plain strings (bytes are kept) so they pickle cheaply.
+    """
+    batch = []
+    bases = 0
+    for key, sequence in records:
+        if not isinstance(sequence, bytes):
+            sequence = str(sequence)
+        batch.append((key, sequence))
+        bases += len(sequence)
+        if bases >= max_bases or len(batch) >= max_records:
+            yield batch
+            batch = []
+            bases = 0
+
+    if batch:
+        yield batch
+
+
+# Analyzer configured by the parent process, sent once to every worker when the pool starts.
+_worker_analyzer = None
+
+
+def _init_worker(analyzer: Any):
+    global _worker_analyzer
+    _worker_analyzer = analyzer
+
+
+def _analyze_batch(seq_type: str, analysis_method: str | List[str], method_options: dict | None,
+                   batch: List[Tuple[str, str]]) -> List[Tuple[str, Any]]:
+    """Worker entry point: analyzes one batch of records in a child process."""
+    seq_type_class = _worker_analyzer._sequence_class(seq_type)
+    return [(key, _worker_analyzer._analyze_record(seq_type_class(sequence), analysis_method, method_options))
+            for key, sequence in batch]
+
+
+def analyze_in_parallel(analyzer: Any, records: Iterable[Tuple[str, Any]], seq_type: str,
+                        analysis_method: str | List[str], method_options: dict | None = None, jobs: int = 0,
+                        batch_bases: int = DEFAULT_BATCH_BASES,
+                        batch_size: int = DEFAULT_BATCH_RECORDS) -> Iterator[Tuple[str, Any]]:
+    """
+    Analyzes records across a pool of worker processes.
+
+    Args:
+        analyzer: Configured analysis instance, copied into every worker
+        records: (record id, sequence) pairs, may be a lazy stream
+        seq_type: Type of sequence (DNA, RNA, or Protein)
+        analysis_method: Analysis method to perform, a list of methods or "all"
+        method_options: Optional keyword arguments for the analysis methods, keyed by method name
+        jobs: Number of worker processes, 0 for one per CPU core
+        batch_bases: Maximum number of bases sent to a worker in one batch
+        batch_size: Maximum number of records sent to a worker in one batch
+
+    Returns:
+        Iterator of (record id, result) pairs in input order
+    """
+    workers = resolve_jobs(jobs)
+    max_in_flight = workers * BATCHES_IN_FLIGHT_PER_WORKER
+    pending = deque()
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(analyzer,)) as pool:
+        for batch in batch_records(records, batch_bases, batch_size):
+            pending.append(pool.submit(_analyze_batch, seq_type, analysis_method, method_options, batch))
+            # Results are yielded strictly in submission order, which keeps the output deterministic.
+            while len(pending) >= max_in_flight:
+                yield from pending.popleft().result()
+
+        while pending:
+            yield from pending.popleft().result()
@@ -0,0 +1,190 @@
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+# One letter residue codes: the 20 standard amino acids, then the ambiguity codes B (D or N), J (I or L),
+# X (any) and Z (E or Q) and the rare residues O (pyrrolysine) and U (selenocysteine).
+AMINO_ACIDS = "ACDEFGHIKLMNPQRSTVWY"
+OTHER_RESIDUES = "BJOUXZ"
+RESIDUES = AMINO_ACIDS + OTHER_RESIDUES
+
+# Code of every byte that is not a residue (stop codon '*', gaps, digits, ...). Such bytes are skipped.
+NOT_A_RESIDUE = len(RESIDUES)
+
+# Average masses of the free amino acids (Da) and of water, as used by ExPASy ProtParam and Biopython.
+RESIDUE_WEIGHTS = {
+    "A": 89.0932, "C": 121.1582, "D": 133.1027, "E": 147.1293, "F": 165.1891, "G": 75.0666, "H": 155.1546,
+    "I": 131.1729, "K": 146.1876, "L": 131.1729, "M": 149.2113, "N": 132.1179, "O": 255.3134, "P": 115.1305,
+    "Q": 146.1445, "R": 174.201, "S": 105.0926, "T": 119.1192, "U": 168.0532, "V": 117.1463, "W": 204.2252,
+    "Y": 181.1885
+}
+WATER_WEIGHT = 18.01528
+
+# Kyte & Doolittle hydropathy index.
+HYDROPATHY = {
+    "A": 1.8, "R": -4.5, "N": -3.5, "D": -3.5, "C": 2.5, "Q": -3.5, "E": -3.5, "G": -0.4, "H": -3.2, "I": 4.5,
+    "L": 3.8, "K": -3.9, "M": 1.9, "F": 2.8, "P": -1.6, "S": -0.8, "T": -0.7, "W": -0.9, "Y": -1.3, "V": 4.2
+}
+
+# Residues an ambiguity or rare code stands for. Its weight and hydropathy are their mean.
+RESIDUE_ALIASES = {"B": "DN", "J": "IL", "X": AMINO_ACIDS, "Z": "EQ", "O": "K", "U": "C"}
+
+# pK values of the charged groups after Bjellqvist et al. (1993, 1994), the values of ExPASy Compute pI/Mw.
+POSITIVE_PKS = {"K": 10.0, "R": 12.0, "H": 5.98}
+NEGATIVE_PKS = {"D": 4.05, "E": 4.45, "C": 9.0, "Y": 10.0}
+N_TERMINAL_PK = 7.5
+C_TERMINAL_PK = 3.55
+N_TERMINAL_PKS = {"A": 7.59, "M": 7.0, "S": 6.93, "P": 8.36, "T": 6.82, "V": 7.44, "E": 7.7}
+C_TERMINAL_PKS = {"D": 4.55, "E": 4.75}
+
+# Molar extinction coefficients at 280 nm (M^-1 cm^-1) of Trp, Tyr and a cystine (pair of cysteines), Pace et al.
+EXTINCTION = {"W": 5500, "Y": 1490}
+CYSTINE_EXTINCTION = 125
+
+
+def _residue_codes() -> np.ndarray:
+    codes = np.full(256, NOT_A_RESIDUE, dtype=np.intp)
+    for code, residue in enumerate(RESIDUES):
+        codes[ord(residue)] = codes[ord(residue.lower())] = code
+    return codes
+
+
+def _residue_table(values: dict) -> np.ndarray:
+    """Table of values per residue code, ambiguity and rare codes get the mean of the residues they stand for."""
+    table = np.zeros(len(RESIDUES), dtype=np.float64)
+    for code, residue in enumerate(RESIDUES):
+        aliases = residue if residue in values else RESIDUE_ALIASES[residue]
+        table[code] = np.mean([values[alias] for alias in aliases])
+    return table
+
+
+def _terminal_table(pks: dict, default: float) -> np.ndarray:
+    """pK of a terminal group per code of the terminal residue, NOT_A_RESIDUE included."""
+    table = np.full(len(RESIDUES) + 1, default)
+    for residue, pk in pks.items():
+        table[RESIDUES.index(residue)] = pk
+    return table
+
+
+RESIDUE_CODES = _residue_codes()
+WEIGHT_TABLE = _residue_table(RESIDUE_WEIGHTS)
+HYDROPATHY_TABLE = _residue_table(HYDROPATHY)
+N_TERMINAL_TABLE = _terminal_table(N_TERMINAL_PKS, N_TERMINAL_PK)
+C_TERMINAL_TABLE = _terminal_table(C_TERMINAL_PKS, C_TERMINAL_PK)
+
+
+def residue_counts(sequences: Sequence[bytes]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Counts the residues of a batch of protein sequences in one pass: the batch is joined into one buffer, every
+    byte is mapped to its residue code through a lookup table and the codes are counted per sequence with a single
+    bincount. Lower case residues count as upper case ones.
+
+    Returns:
+        Residue counts (one row per sequence, one column per code in RESIDUES) and the codes of the first and last
+        byte of every sequence (NOT_A_RESIDUE for empty sequences)
+    """
+    lengths = np.fromiter(map(len, sequences), dtype=np.int64, count=len(sequences))
+    # A trailing NOT_A_RESIDUE stands in for the ends of empty sequences.
+    codes = np.append(RESIDUE_CODES[np.frombuffer(b"".join(sequences), dtype=np.uint8)], NOT_A_RESIDUE)
+    columns = NOT_A_RESIDUE + 1
+
+    record = np.repeat(np.arange(len(sequences)), lengths)
+    counts = np.bincount(record * columns + codes[:-1], minlength=len(sequences) * columns)
+    counts = counts.reshape(len(sequences), columns)[:, :NOT_A_RESIDUE]
+
+    ends = np.cumsum(lengths)
+    empty = len(codes) - 1
+    first = codes[np.where(lengths > 0, ends - lengths, empty)]
+    last = codes[np.where(lengths > 0, ends - 1, empty)]
+    return counts, first, last
+
+
+def molecular_weights(counts: np.ndarray) -> np.ndarray:
+    """Average molecular weights (Da) of the sequences with the given residue counts, 0 for empty sequences."""
+    lengths = counts.sum(axis=1)
+    return np.where(lengths > 0, counts @ WEIGHT_TABLE - (lengths - 1) * WATER_WEIGHT, 0.0)
+
+
+def gravy_scores(counts: np.ndarray) -> np.ndarray:
+    """Grand average of hydropathy (Kyte & Doolittle) of the sequences, 0 for empty sequences."""
+    lengths = counts.sum(axis=1)
+    return np.divide(counts @ HYDROPATHY_TABLE, lengths, out=np.zeros(len(counts)), where=lengths > 0)
+
+
+def extinction_coefficients(counts: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Molar extinction coefficients at 280 nm with all cysteines reduced and with all of them forming cystines."""
+    reduced = sum(counts[:, RESIDUES.index(residue)] * value for residue, value in EXTINCTION.items())
+    return reduced, reduced + counts[:, RESIDUES.index("C")] // 2 * CYSTINE_EXTINCTION
+
+
+def isoelectric_points(counts: np.ndarray, first: np.ndarray, last: np.ndarray) -> np.ndarray:
+    """
+    Isoelectric points of the sequences after Bjellqvist, the method of ExPASy Compute pI/Mw and Biopython. The pH
+    of zero net charge is found by bisection, run for every sequence of the batch at once.
+    """
+    positive = counts[:, [RESIDUES.index(residue) for residue in POSITIVE_PKS]]
+    negative = counts[:, [RESIDUES.index(residue) for residue in NEGATIVE_PKS]]
+    # Dissociation constants (10 ** pK), so that each step takes a single power per sequence, 10 ** pH.
+    positive_ks = 10.0 ** np.array(list(POSITIVE_PKS.values()))
+    negative_ks = 10.0 ** np.array(list(NEGATIVE_PKS.values()))
+    n_terminal = 10.0 ** N_TERMINAL_TABLE[first]
+    c_terminal = 10.0 ** C_TERMINAL_TABLE[last]
+
+    def charge(pH: np.ndarray) -> np.ndarray:
+        h = 10.0 ** pH
+        column = h[:, None]
+        return (1.0 / (h / n_terminal + 1.0)
+                + (positive / (column / positive_ks + 1.0)).sum(axis=1)
+                - 1.0 / (c_terminal / h + 1.0)
+                - (negative / (negative_ks / column + 1.0)).sum(axis=1))
+
+    # Same start and stopping rule as Biopython's IsoelectricPoint.pi(), so results agree.
+    low = np.full(len(counts), 4.05)
+    high = np.full(len(counts), 12.0)
+    pH = np.full(len(counts), 7.775)
+    active = high - low > 0.0001
+    while active.any():
+        positive_charge = charge(pH) > 0.0
+        low = np.where(active & positive_charge, pH, low)
+        high = np.where(active & ~positive_charge, pH, high)
+        pH = np.where(active, (low + high) / 2, pH)
+        active = high - low > 0.0001
+    return pH
+
+
+def protein_properties(sequences: Sequence[bytes]) -> List[dict]:
+    """
+    Physicochemical properties of a batch of protein sequences: length, average molecular weight, isoelectric
+    point, GRAVY hydropathy, extinction coefficients and residue composition. Every property is computed for the
+    whole batch with table lookups and matrix products over the residue counts, see residue_counts().
+
+    Args:
+        sequences: ASCII bytes of the protein sequences
+
+    Returns:
+        A property report per sequence, in order
+    """
+    counts, first, last = residue_counts(sequences)
+    lengths = counts.sum(axis=1).tolist()
+    weights = np.round(molecular_weights(counts), 2).tolist()
+    points = np.round(isoelectric_points(counts, first, last), 2).tolist()
+    gravy = np.round(gravy_scores(counts), 3).tolist()
+    reduced, cystines = (coefficients.tolist() for coefficients in extinction_coefficients(counts))
+    has_others = counts[:, len(AMINO_ACIDS):].any(axis=1).tolist()
+
+    reports = []
+    for row, length, weight, point, score, reduced_coefficient, cystine_coefficient, has_other in zip(
+            counts.tolist(), lengths, weights, points, gravy, reduced, cystines, has_others):
+        composition = dict(zip(AMINO_ACIDS, row))
+        if has_other:
+            composition.update((residue, count) for residue, count in zip(OTHER_RESIDUES, row[len(AMINO_ACIDS):])
+                               if count)
+        reports.append({
+            "Length": length,
+            "Molecular Weight": weight,
+            "Isoelectric Point": point,
+            "GRAVY": score,
+            "Extinction Coefficient": {"Reduced": reduced_coefficient, "Cystines": cystine_coefficient},
+            "Composition": composition
+        })
+    return reports
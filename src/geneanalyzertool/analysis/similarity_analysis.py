@@ -0,0 +1,251 @@
+from typing import Any, Iterable, Iterator, List, Tuple, override
+
+import numpy as np
+
+from geneanalyzertool.analysis.mode import CYAN, RESET, YELLOW, AnalysisMode
+from geneanalyzertool.analysis.parallel import analyze_in_parallel
+from geneanalyzertool.analysis.sketches import (
+    DEFAULT_K, DEFAULT_SKETCH_SIZE, DISTANCE_METRICS, SKETCH_EXTENSION, MinHashSketch, distance_rows, load_sketches,
+    save_sketches, sketch_matrix
+)
+from geneanalyzertool.core.exceptions import AnalysisMethodError
+from geneanalyzertool.core.export import WRITE_BUFFER_BYTES, write_results
+from geneanalyzertool.core.sequences import DNA, RNA, Sequence
+
+SIMILARITY_METHODS = ("sketch", "distance")
+
+# Decimal places of reported distances.
+DISTANCE_DIGITS = 6
+
+
+class SimilarityAnalysis(AnalysisMode):
+    """
+    Class for the similarity mode: estimates how alike records are from MinHash sketches of their k-mers (see
+    analysis/sketches.py) instead of aligning them, which scales to all-vs-all comparisons of thousands of
+    assemblies.
+
+    "sketch" sketches every record; sketches can be saved to a sketch file and compared later without the
+    sequences. "distance" sketches every record (or reads a sketch file) and reports the distances of each record
+    to every record, one row of the distance matrix per record.
+
+    Sketches found in the result cache are not recomputed, so records sketched once are compared again at the cost
+    of reading them.
+    """
+
+    @override
+    def export_stream(self, result_stream: Iterable[Tuple[str, Any]], out_file: str, out_format: str = "text",
+                      analysis_method: str | List[str] | None = None):
+        """
+        Writes results to out_file as they arrive. Sketches are saved as a sketch file (see save_sketches()).
+        Distances in the text format are the square distance matrix as tab separated values with a header row of
+        record ids; tsv, jsonl and parquet write one row per pair of records (see core/export.py).
+        """
+        with self._stage("export"):
+            if analysis_method == "sketch":
+                if out_format != "text":
+                    raise AnalysisMethodError(f"Error: Sketches are saved as a sketch file, --format {out_format} "
+                                              "does not apply.")
+                save_sketches(out_file, result_stream)
+                return
+
+            if out_format != "text":
+                write_results(result_stream, out_file, out_format, analysis_method)
+                return
+
+            with open(out_file, 'w', buffering=WRITE_BUFFER_BYTES) as out:
+                for i, (seq, row) in enumerate(result_stream):
+                    if i == 0:
+                        out.write("\t".join(["#query", *row]) + "\n")
+                    out.write("\t".join([seq, *map(str, row.values())]) + "\n")
+
+    @override
+    def print_stream(self, result_stream: Iterable[Tuple[str, Any]]):
+        with self._stage("export"):
+            for i, (seq, value) in enumerate(result_stream):
+                if isinstance(value, MinHashSketch):
+                    print(f"{YELLOW}{seq}{RESET}: {value}")
+                    continue
+                if i == 0:
+                    print("\t".join([f"{CYAN}#query{RESET}", *(f"{CYAN}{name}{RESET}" for name in value)]))
+                print("\t".join([f"{YELLOW}{seq}{RESET}", *map(str, value.values())]))
+
+    @override
+    def analyze(self, sequence: Sequence, method: str, **options) -> Any:
+        """
+        Sketches a DNA or RNA sequence. Distances need every record of a file and are computed by
+        process_sequences() and stream_sequences().
+
+        Args:
+            sequence: Sequence object to analyze
+            method: "sketch"
+            options: k (k-mer length) and size (number of sketch bins), see MinHashSketch
+        Returns:
+            The MinHashSketch of the sequence
+        """
+        if method != "sketch":
+            raise ValueError(f"Unknown method {method}")
+
+        return self._cached(sequence, method, options, lambda: self._sketch(sequence, **options))
+
+    def process_sequences(self, sequence_input: str, is_file: bool, seq_type: str, analysis_method: str | List[str],
+                          method_options: dict | None = None, jobs: int = 1, regions: List[str] | None = None,
+                          use_index: bool = False):
+        """
+        Sketches or compares one or more sequences.
+
+        Args:
+            sequence_input: Either a sequence string, a FASTA file path or a sketch file path
+            is_file: Whether sequence_input is a file path
+            seq_type: Type of sequence (DNA or RNA)
+            analysis_method: "sketch" or "distance"
+            method_options: Optional keyword arguments keyed by method name: k and size for both methods, plus
+                metric ("mash" or "jaccard") for distance
+            jobs: Number of worker processes, 1 analyzes in this process and 0 uses one worker per CPU core
+            regions: Records or samtools style regions to fetch from the file through its .fai index
+            use_index: Select records interactively through the .fai index instead of parsing the whole file
+
+        Returns:
+            Results keyed by record id and the ordered record ids
+        """
+        self._check_method(analysis_method)
+        if is_file and sequence_input.endswith(SKETCH_EXTENSION):
+            records = None
+            sketches = self._read_sketch_file(sequence_input)
+        else:
+            if is_file and regions:
+                available_sequences, sequence_keys = self.fetch_sequences(sequence_input, regions)
+            elif is_file:
+                available_sequences, sequence_keys = self.select_sequences(sequence_input, use_index=use_index)
+            else:
+                available_sequences = {"input_sequence": sequence_input}
+                sequence_keys = ["input_sequence"]
+            records = ((key, available_sequences[key]) for key in sequence_keys)
+            sketches = None
+
+        results = dict(self._similarity(records, sketches, seq_type, analysis_method, method_options, jobs))
+        return results, list(results)
+
+    @override
+    def stream_sequences(self, fasta_file: str, seq_type: str, analysis_method: str | List[str],
+                         method_options: dict | None = None, jobs: int = 1,
+                         chunk_size: int | None = None) -> Iterator[Tuple[str, Any]]:
+        """
+        Sketches every record of a FASTA file one at a time, or reads the sketches of a sketch file. sketch yields
+        each sketch as soon as it is ready; distance needs all sketches (a few kilobytes per record, whatever its
+        length) before it yields one row of the distance matrix per record.
+
+        Args:
+            fasta_file: Path to the FASTA file or to a sketch file written by save_sketches()
+            seq_type: Type of sequence (DNA or RNA)
+            analysis_method: "sketch" or "distance"
+            method_options: Optional keyword arguments keyed by method name, see process_sequences()
+            jobs: Number of worker processes used for sketching and for comparing sketches, 0 uses one per CPU core
+            chunk_size: Sketch every record in chunks of this many bases instead of as a whole
+
+        Returns:
+            Iterator of (record id, result) pairs in file order
+        """
+        self._check_method(analysis_method)
+        if fasta_file.endswith(SKETCH_EXTENSION):
+            yield from self._similarity(None, self._read_sketch_file(fasta_file), seq_type, analysis_method,
+                                        method_options, jobs)
+            return
+
+        if chunk_size is not None:
+            sketches = self._sketch_chunked(fasta_file, seq_type, self._sketch_options(analysis_method, method_options),
+                                            chunk_size)
+            yield from self._similarity(None, sketches, seq_type, analysis_method, method_options, jobs)
+            return
+
+        yield from self._similarity(self._timed("read", self.iter_sequences(fasta_file)), None, seq_type,
+                                    analysis_method, method_options, jobs)
+
+    def _similarity(self, records: Iterable[Tuple[str, Any]] | None,
+                    sketches: Iterable[Tuple[str, MinHashSketch]] | None, seq_type: str, analysis_method: str,
+                    method_options: dict | None, jobs: int) -> Iterator[Tuple[str, Any]]:
+        """Sketches records unless their sketches are given, then yields the sketches or the distance matrix rows."""
+        if sketches is None:
+            sketches = self._sketch_records(records, seq_type, self._sketch_options(analysis_method, method_options),
+                                            jobs)
+        if analysis_method == "sketch":
+            yield from sketches
+            return
+
+        sketches = list(sketches)
+        names = [name for name, _ in sketches]
+        metric = ((method_options or {}).get("distance") or {}).get("metric", "mash")
+        if metric not in DISTANCE_METRICS:
+            raise AnalysisMethodError(f"Invalid analysis method provided. Unknown distance metric {metric}. "
+                                      f"Choose one of {', '.join(DISTANCE_METRICS)}.")
+        try:
+            bins = sketch_matrix([sketch for _, sketch in sketches])
+        except ValueError as e:
+            raise AnalysisMethodError(f"Invalid analysis method provided. {e}")
+        k = sketches[0][1].k if sketches else DEFAULT_K
+
+        rows = self._timed("analyze", distance_rows(bins, k, metric, jobs))
+        for name, row in zip(names, rows):
+            yield name, dict(zip(names, np.round(row, DISTANCE_DIGITS).tolist()))
+
+    def _sketch_records(self, records: Iterable[Tuple[str, Any]], seq_type: str, options: dict,
+                        jobs: int) -> Iterator[Tuple[str, MinHashSketch]]:
+        if jobs != 1:
+            sketches = analyze_in_parallel(self, records, seq_type, "sketch", {"sketch": options}, jobs)
+            yield from self._timed("analyze", sketches)
+            return
+
+        seq_type_class = self._sequence_class(seq_type)
+        for key, sequence in records:
+            with self._stage("convert"):
+                sequence = seq_type_class(sequence)
+            yield key, self._analyze_record(sequence, "sketch", {"sketch": options})
+
+    def _sketch_chunked(self, fasta_file: str, seq_type: str, options: dict,
+                        chunk_size: int) -> Iterator[Tuple[str, MinHashSketch]]:
+        """Sketches every record chunk by chunk, so memory stays flat however long the records are."""
+        seq_type_class = self._sequence_class(seq_type)
+        for key, chunks in self.iter_sequence_chunks(fasta_file, chunk_size):
+            with self._method_errors(seq_type_class):
+                self._check_nucleotide(seq_type_class)
+                sketch = MinHashSketch(**options)
+            with self._stage("analyze"):
+                sketch.add_chunks(self._timed("read", chunks))
+            if self.metrics is not None:
+                self.metrics.count(1, sketch.length)
+            yield key, sketch
+
+    def _read_sketch_file(self, path: str) -> List[Tuple[str, MinHashSketch]]:
+        with self._stage("read"):
+            return load_sketches(path)
+
+    def _analyze_record(self, sequence: Sequence, analysis_method: str,
+                        method_options: dict | None = None) -> MinHashSketch:
+        """Sketches a single record, see analyze(). Also the entry point of worker processes (analysis/parallel.py)."""
+        with self._stage("analyze"):
+            if self.metrics is not None:
+                self.metrics.count(1, len(sequence))
+            with self._method_errors(type(sequence)):
+                return self.analyze(sequence, analysis_method, **(method_options or {}).get(analysis_method, {}))
+
+    def _sketch(self, sequence: DNA | RNA, k: int = DEFAULT_K, size: int = DEFAULT_SKETCH_SIZE) -> MinHashSketch:
+        self._check_nucleotide(type(sequence))
+        sketch = MinHashSketch(k, size)
+        sketch.add(sequence)
+        return sketch
+
+    @staticmethod
+    def _sketch_options(analysis_method: str, method_options: dict | None) -> dict:
+        """The k and size options of analysis_method, which are the ones sketches are made with."""
+        options = (method_options or {}).get(analysis_method) or {}
+        return {name: options[name] for name in ("k", "size") if name in options}
+
+    @staticmethod
+    def _check_method(analysis_method: str | List[str]):
+        if not isinstance(analysis_method, str) or analysis_method not in SIMILARITY_METHODS:
+            raise AnalysisMethodError("Invalid analysis method provided. The similarity mode runs one of "
+                                      f"{', '.join(SIMILARITY_METHODS)} at a time.")
+
+    @staticmethod
+    def _check_nucleotide(seq_type_class: type):
+        if not issubclass(seq_type_class, (DNA, RNA)):
+            raise TypeError("Error: Sequence must be of type DNA or RNA")
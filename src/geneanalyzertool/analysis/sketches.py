@@ -0,0 +1,240 @@
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator, List, Sequence, Tuple
+
+import numpy as np
+
+from geneanalyzertool.analysis.composition import sequence_bytes
+from geneanalyzertool.analysis.kmers import iter_kmer_codes, kmer_codes
+from geneanalyzertool.analysis.parallel import resolve_jobs
+
+DEFAULT_K = 21
+DEFAULT_SKETCH_SIZE = 1024
+
+# Distances reported between sketches: "mash" is the Mash distance, an estimate of the per base mutation rate
+# (Ondov et al. 2016), "jaccard" is one minus the Jaccard index of the k-mer sets.
+DISTANCE_METRICS = ("mash", "jaccard")
+
+# Sketch files written by save_sketches() are NumPy .npz archives.
+SKETCH_EXTENSION = ".npz"
+
+# Value of a bin no k-mer hashed into.
+EMPTY_BIN = np.iinfo(np.uint64).max
+
+# Bound of the boolean comparison arrays built by jaccard_matrix() for one block of query sketches.
+COMPARE_BYTES = 64 * 1024 * 1024
+
+# Number of row blocks queued per worker by distance_rows().
+BLOCKS_IN_FLIGHT_PER_WORKER = 2
+
+_MIX_1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX_2 = np.uint64(0x94D049BB133111EB)
+_SEED = np.uint64(0x9E3779B97F4A7C15)
+
+
+def hash_codes(codes: np.ndarray) -> np.ndarray:
+    """Scrambles 2-bit k-mer codes into uniformly spread 64-bit hashes (the splitmix64 finalizer)."""
+    # uint64 arithmetic wraps around, as the finalizer expects.
+    hashes = codes + _SEED
+    hashes = (hashes ^ (hashes >> np.uint64(30))) * _MIX_1
+    hashes = (hashes ^ (hashes >> np.uint64(27))) * _MIX_2
+    return hashes ^ (hashes >> np.uint64(31))
+
+
+class MinHashSketch:
+    """
+    One permutation MinHash sketch of the canonical k-mers of a DNA or RNA sequence.
+
+    Every k-mer is hashed once and the hash space is split into size bins by hash modulo size; a bin keeps the
+    smallest hash that fell into it. Two sketches agree on a bin with probability equal to the Jaccard index of
+    their k-mer sets, so comparing sketches is an elementwise equality test, which vectorizes across thousands of
+    sketches at once (see jaccard_matrix()). Bins no k-mer fell into hold EMPTY_BIN and are left out of estimates.
+    """
+
+    def __init__(self, k: int = DEFAULT_K, size: int = DEFAULT_SKETCH_SIZE, bins: np.ndarray | None = None,
+                 length: int = 0):
+        if size <= 0:
+            raise ValueError("Sketch size must be a positive number of bins")
+        self.k = k
+        self.size = size
+        self.bins = np.full(size, EMPTY_BIN, dtype=np.uint64) if bins is None else bins
+        # Number of bases sketched.
+        self.length = length
+
+    def add(self, sequence: str | bytes):
+        """Adds the k-mers of a whole sequence."""
+        data = sequence_bytes(sequence)
+        for codes in iter_kmer_codes(data, self.k):
+            self._add_codes(codes)
+        self.length += len(data)
+
+    def add_chunks(self, chunks: Iterable[bytes]):
+        """Adds the k-mers of a sequence given as consecutive chunks, k-mers across chunk edges included."""
+        carry = b""
+        for chunk in chunks:
+            data = carry + chunk
+            self._add_codes(kmer_codes(data, self.k))
+            carry = data[len(data) - self.k + 1:] if len(data) >= self.k else data
+            self.length += len(chunk)
+
+    def filled(self) -> int:
+        """Number of bins holding a hash."""
+        return int(np.count_nonzero(self.bins != EMPTY_BIN))
+
+    def jaccard(self, other: "MinHashSketch") -> float:
+        """Estimated Jaccard index of the k-mer sets of both sequences."""
+        self._check_compatible(other)
+        return float(jaccard_matrix(self.bins[None], other.bins[None])[0, 0])
+
+    def distance(self, other: "MinHashSketch", metric: str = "mash") -> float:
+        """Estimated distance between both sequences, see DISTANCE_METRICS."""
+        return float(distances(np.array([[self.jaccard(other)]]), self.k, metric)[0, 0])
+
+    def _add_codes(self, codes: np.ndarray):
+        hashes = hash_codes(codes)
+        np.minimum.at(self.bins, (hashes % np.uint64(self.size)).astype(np.intp), hashes)
+
+    def _check_compatible(self, other: "MinHashSketch"):
+        if (self.k, self.size) != (other.k, other.size):
+            raise ValueError(f"Sketches of k={self.k}, size={self.size} and k={other.k}, size={other.size} "
+                             "cannot be compared")
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, MinHashSketch) and (self.k, self.size, self.length) == \
+            (other.k, other.size, other.length) and np.array_equal(self.bins, other.bins)
+
+    def __str__(self) -> str:
+        return f"MinHash sketch of {self.length} bases (k={self.k}, {self.filled()}/{self.size} bins filled)"
+
+    def __repr__(self) -> str:
+        return f"MinHashSketch(k={self.k}, size={self.size}, length={self.length})"
+
+
+def sketch_sequence(sequence: str | bytes, k: int = DEFAULT_K, size: int = DEFAULT_SKETCH_SIZE) -> MinHashSketch:
+    """Sketches the k-mers of a whole DNA or RNA sequence, see MinHashSketch."""
+    sketch = MinHashSketch(k, size)
+    sketch.add(sequence)
+    return sketch
+
+
+def jaccard_matrix(query: np.ndarray, bins: np.ndarray) -> np.ndarray:
+    """
+    Estimated Jaccard indexes between every row of query and every row of bins (both sketch bins, one sketch per
+    row): the fraction of matching bins among those filled in at least one of the two sketches. Pairs of sketches
+    without a single filled bin get 0.
+
+    Returns:
+        A len(query) x len(bins) float64 array
+    """
+    # Bins empty in both sketches are equal but not informative, they are counted with one matrix product and
+    # taken off both the matches and the bins compared.
+    both_empty = (query == EMPTY_BIN).astype(np.float32) @ (bins == EMPTY_BIN).T.astype(np.float32)
+    matches = np.count_nonzero(query[:, None, :] == bins[None, :, :], axis=2) - both_empty
+    informative = query.shape[1] - both_empty
+    return np.divide(matches, informative, out=np.zeros(matches.shape), where=informative > 0)
+
+
+def distances(jaccard: np.ndarray, k: int, metric: str = "mash") -> np.ndarray:
+    """Turns Jaccard indexes into distances, see DISTANCE_METRICS. Sequences without shared k-mers are 1 apart."""
+    if metric == "jaccard":
+        return 1.0 - jaccard
+    if metric != "mash":
+        raise ValueError(f"Unknown distance metric {metric}. Choose one of {', '.join(DISTANCE_METRICS)}.")
+
+    # D = -1/k ln(2J / (1 + J)), capped at 1 like Mash does.
+    with np.errstate(divide="ignore"):
+        mash = -np.log(2.0 * jaccard / (1.0 + jaccard)) / k
+    return np.minimum(mash, 1.0) + 0.0
+
+
+def sketch_matrix(sketches: Sequence[MinHashSketch]) -> np.ndarray:
+    """Stacks the bins of sketches made with the same k and size into one array, one sketch per row."""
+    if not sketches:
+        return np.empty((0, DEFAULT_SKETCH_SIZE), dtype=np.uint64)
+    for sketch in sketches[1:]:
+        sketches[0]._check_compatible(sketch)
+    return np.stack([sketch.bins for sketch in sketches])
+
+
+def block_rows(count: int, size: int) -> int:
+    """Number of query sketches compared at once so the comparison arrays stay around COMPARE_BYTES."""
+    return max(1, COMPARE_BYTES // max(count * size, 1))
+
+
+# Sketch bins of every record, sent once to every worker when the pool starts.
+_worker_bins = None
+
+
+def _init_worker(bins: np.ndarray):
+    global _worker_bins
+    _worker_bins = bins
+
+
+def _distance_block(k: int, metric: str, start: int, stop: int) -> np.ndarray:
+    """Worker entry point: distances of the sketches start to stop against all sketches."""
+    return distances(jaccard_matrix(_worker_bins[start:stop], _worker_bins), k, metric)
+
+
+def distance_rows(bins: np.ndarray, k: int, metric: str = "mash", jobs: int = 1) -> Iterator[np.ndarray]:
+    """
+    All-vs-all distances between sketches, computed in blocks of rows (see block_rows()) so memory stays bounded
+    however many sketches are compared. With jobs other than 1 the blocks are spread over a pool of worker
+    processes, which each get a copy of bins once.
+
+    Args:
+        bins: Sketch bins, one sketch per row, see sketch_matrix()
+        k: k-mer length of the sketches
+        metric: Distance metric, see DISTANCE_METRICS
+        jobs: Number of worker processes, 1 compares in this process and 0 uses one worker per CPU core
+
+    Returns:
+        Iterator of distance matrix rows (float64 arrays of len(bins)), in order
+    """
+    step = block_rows(*bins.shape)
+    blocks = [(start, min(start + step, len(bins))) for start in range(0, len(bins), step)]
+    if jobs == 1:
+        for start, stop in blocks:
+            yield from distances(jaccard_matrix(bins[start:stop], bins), k, metric)
+        return
+
+    workers = resolve_jobs(jobs)
+    pending = deque()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(bins,)) as pool:
+        for start, stop in blocks:
+            pending.append(pool.submit(_distance_block, k, metric, start, stop))
+            while len(pending) >= workers * BLOCKS_IN_FLIGHT_PER_WORKER:
+                yield from pending.popleft().result()
+
+        while pending:
+            yield from pending.popleft().result()
+
+
+def save_sketches(path: str, records: Iterable[Tuple[str, MinHashSketch]]) -> int:
+    """
+    Writes (record id, sketch) pairs to a sketch file, a NumPy .npz archive, so records are sketched once and
+    compared any number of times. All sketches must share k and size.
+
+    Returns:
+        Number of sketches written
+    """
+    names, sketches = [], []
+    for name, sketch in records:
+        names.append(name)
+        sketches.append(sketch)
+    bins = sketch_matrix(sketches)
+    k, size = (sketches[0].k, sketches[0].size) if sketches else (DEFAULT_K, DEFAULT_SKETCH_SIZE)
+
+    # Writing to an open file keeps NumPy from appending .npz to the path.
+    with open(path, "wb") as out:
+        np.savez(out, names=np.array(names, dtype=str), bins=bins,
+                 lengths=np.array([sketch.length for sketch in sketches], dtype=np.int64),
+                 k=np.int64(k), size=np.int64(size))
+    return len(sketches)
+
+
+def load_sketches(path: str) -> List[Tuple[str, MinHashSketch]]:
+    """Reads the (record id, sketch) pairs of a sketch file written by save_sketches()."""
+    with np.load(path) as archive:
+        k, size = int(archive["k"]), int(archive["size"])
+        return [(str(name), MinHashSketch(k, size, bins, int(length)))
+                for name, bins, length in zip(archive["names"], archive["bins"], archive["lengths"])]
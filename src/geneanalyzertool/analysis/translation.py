@@ -0,0 +1,77 @@
+from itertools import product
+from typing import Dict, List
+
+import numpy as np
+
+from geneanalyzertool.analysis.composition import sequence_bytes
+from geneanalyzertool.analysis.genetic_codes import CODON_BASES, NCBI_TABLES
+
+# Base byte -> index into CODON_BASES, 4 for anything that is not an unambiguous base. U is read as T.
+BASE_INDEX = np.full(256, 4, dtype=np.uint8)
+for _index, _base in enumerate(CODON_BASES):
+    BASE_INDEX[[ord(_base), ord(_base.lower())]] = _index
+BASE_INDEX[[ord("U"), ord("u")]] = 0
+
+_CODON_LOOKUPS: Dict[int, np.ndarray] = {}
+
+
+def codon_lookup(table: int = 1) -> np.ndarray:
+    """
+    Returns the amino acid lookup array of a translation table. Codons are indexed as b0 * 25 + b1 * 5 + b2 over
+    BASE_INDEX values, so every codon containing an ambiguous or unknown base maps to X. Arrays are built once per
+    table and reused.
+    """
+    if table not in NCBI_TABLES:
+        raise ValueError(f"Unknown translation table {table}. Valid tables are {sorted(NCBI_TABLES)}")
+
+    if table not in _CODON_LOOKUPS:
+        lookup = np.full(125, ord("X"), dtype=np.uint8)
+        amino_acids = NCBI_TABLES[table][1]
+        for codon_number, (b0, b1, b2) in enumerate(product(range(4), repeat=3)):
+            lookup[b0 * 25 + b1 * 5 + b2] = ord(amino_acids[codon_number])
+        _CODON_LOOKUPS[table] = lookup
+
+    return _CODON_LOOKUPS[table]
+
+
+def start_codons(table: int = 1) -> List[str]:
+    """Start codons of a translation table, as DNA."""
+    return _codons_marked(NCBI_TABLES[table][2], "M")
+
+
+def stop_codons(table: int = 1) -> List[str]:
+    """Stop codons of a translation table, as DNA."""
+    return _codons_marked(NCBI_TABLES[table][1], "*")
+
+
+def _codons_marked(marks: str, mark: str) -> List[str]:
+    codons = ("".join(codon) for codon in product(CODON_BASES, repeat=3))
+    return [codon for codon, codon_mark in zip(codons, marks) if codon_mark == mark]
+
+
+def translate_sequence(sequence: str | bytes, table: int = 1, to_stop: bool = True, frame: int = 0) -> str:
+    """
+    Translates a nucleotide sequence in one vectorized lookup over its bytes.
+
+    Args:
+        sequence: DNA or RNA sequence, upper or lower case
+        table: NCBI translation table id
+        to_stop: Stop after the first stop codon (kept as "*"), otherwise read through stop codons
+        frame: Offset (0, 1 or 2) of the first codon
+
+    Returns:
+        Protein sequence. Codons with ambiguous bases and a trailing incomplete codon are translated as X.
+    """
+    lookup = codon_lookup(table)
+    data = sequence_bytes(sequence)[frame:]
+    codon_count = len(data) // 3
+
+    codes = BASE_INDEX[data[:codon_count * 3]].reshape(-1, 3).astype(np.uint16)
+    protein = lookup[codes[:, 0] * 25 + codes[:, 1] * 5 + codes[:, 2]].tobytes()
+
+    if to_stop and (stop := protein.find(b"*")) != -1:
+        return protein[:stop + 1].decode("ascii")
+
+    if len(data) % 3:
+        protein += b"X"
+    return protein.decode("ascii")
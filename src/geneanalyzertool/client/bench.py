@@ -0,0 +1,303 @@
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, List, NamedTuple
+
+from geneanalyzertool.analysis.basic_analysis import BasicSequenceAnalysis
+from geneanalyzertool.core.fasta_index import FastaIndex
+from geneanalyzertool.core.synthetic import parse_size, synthetic_sequence, write_synthetic_fasta
+
+YELLOW = "\033[1;33m"
+GREEN = "\033[1;32m"
+RED = "\033[1;31m"
+RESET = "\033[0m"
+CYAN = "\033[1;36m"
+
+SEQUENCE_TYPES = ("DNA", "RNA", "Protein")
+
+# FASTA I/O paths that are timed for every size and record count. iter_sequences_biopython parses the same input
+# through Bio.SeqIO, the baseline of the native parser behind iter_sequences.
+IO_BENCHMARKS = ("read_sequences", "iter_sequences", "iter_sequences_biopython", "index_build", "index_fetch")
+
+# Methods run on batches of records (see BasicSequenceAnalysis.analyze_batch()), timed by streaming a FASTA file of
+# many short records such as primers or a predicted proteome, with the sequence type they are timed on.
+BATCH_BENCHMARKS = {"reverse_complement": "DNA", "transcribe": "DNA", "protein_properties": "Protein"}
+
+
+class BenchmarkCase(NamedTuple):
+    """One timed benchmark: an analysis method or I/O path over a synthetic input."""
+    name: str
+    seq_type: str
+    size: int
+    records: int
+    # Analyze compact (packed) sequences instead of str backed ones.
+    compact: bool = False
+
+
+def method_sequence_type(analyzer: BasicSequenceAnalysis, method: str) -> str | None:
+    """Returns the first sequence type an analysis method accepts, or None if it accepts none of them."""
+    for seq_type in SEQUENCE_TYPES:
+        try:
+            analyzer.analyze(analyzer._sequence_class(seq_type)("ATGGCCAAGTAA"), method)
+            return seq_type
+        except TypeError:
+            continue
+    return None
+
+
+def build_cases(sizes: List[int], record_counts: List[int], methods: List[str] | None = None,
+                include_io: bool = True, compact: bool = False) -> List[BenchmarkCase]:
+    """
+    Builds the benchmark matrix: every analysis method at every size plus every I/O path and batched method per size
+    and record count. With compact, every analysis method also runs on compact sequences, and is streamed from a one
+    record FASTA file with either representation, so peak RSS covers reading and holding the record as well.
+    """
+    analyzer = BasicSequenceAnalysis()
+    cases = []
+    for method in methods or analyzer.available_methods():
+        seq_type = method_sequence_type(analyzer, method)
+        if seq_type is None:
+            continue
+        cases.extend(BenchmarkCase(f"analyze.{method}", seq_type, size, 1) for size in sizes)
+        if compact:
+            cases.extend(BenchmarkCase(f"analyze.{method}", seq_type, size, 1, True) for size in sizes)
+            cases.extend(BenchmarkCase(f"stream.{method}", seq_type, size, 1, packed)
+                         for size in sizes
+                         for packed in (False, True))
+
+    if include_io:
+        cases.extend(BenchmarkCase(f"io.{name}", "DNA", size, records)
+                     for name in IO_BENCHMARKS
+                     for size in sizes
+                     for records in record_counts
+                     if records <= size)
+        cases.extend(BenchmarkCase(f"batch.{method}", seq_type, size, records)
+                     for method, seq_type in BATCH_BENCHMARKS.items()
+                     if methods is None or method in methods
+                     for size in sizes
+                     for records in record_counts
+                     if records <= size)
+    return cases
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of the current process in megabytes."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere.
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_case(case: BenchmarkCase, repeat: int, workdir: str) -> dict:
+    """Times one benchmark case. Runs in a fresh worker process so peak RSS belongs to this case alone."""
+    run = _prepare_case(case, workdir)
+    baseline_rss = peak_rss_mb()
+
+    wall_times = []
+    cpu_times = []
+    for _ in range(repeat):
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        run()
+        cpu_times.append(time.process_time() - cpu_start)
+        wall_times.append(time.perf_counter() - wall_start)
+
+    best = min(wall_times)
+    return {
+        "name": case.name,
+        "seq_type": case.seq_type,
+        "size": case.size,
+        "records": case.records,
+        "compact": case.compact,
+        "seconds": best,
+        "mean_seconds": sum(wall_times) / len(wall_times),
+        "cpu_seconds": min(cpu_times),
+        "bases_per_second": case.size / best if best else None,
+        "records_per_second": case.records / best if best else None,
+        "peak_rss_mb": round(peak_rss_mb(), 2),
+        "rss_growth_mb": round(peak_rss_mb() - baseline_rss, 2)
+    }
+
+
+def _prepare_case(case: BenchmarkCase, workdir: str) -> Callable[[], object]:
+    """Creates the input of a benchmark case and returns the callable that is timed."""
+    analyzer = BasicSequenceAnalysis(compact=case.compact)
+    group, name = case.name.split(".", 1)
+
+    if group == "analyze":
+        sequence = analyzer._sequence_class(case.seq_type)(synthetic_sequence(case.seq_type, case.size))
+        return lambda: analyzer.analyze(sequence, name)
+
+    fasta_file = os.path.join(workdir, f"{case.seq_type}_{case.size}_{case.records}.fasta")
+    if not os.path.exists(fasta_file):
+        write_synthetic_fasta(fasta_file, case.seq_type, case.size, case.records)
+
+    if group in ("batch", "stream"):
+        return lambda: sum(1 for _ in analyzer.stream_sequences(fasta_file, case.seq_type, name))
+    if name == "read_sequences":
+        return lambda: analyzer.read_sequences(fasta_file)
+    if name == "iter_sequences":
+        return lambda: sum(1 for _ in analyzer.iter_sequences(fasta_file))
+    if name == "iter_sequences_biopython":
+        biopython = BasicSequenceAnalysis(parser="biopython")
+        return lambda: sum(1 for _ in biopython.iter_sequences(fasta_file))
+    if name == "index_build":
+        return lambda: FastaIndex(fasta_file, rebuild=True).close()
+    if name == "index_fetch":
+        FastaIndex(fasta_file).close()
+        return lambda: _fetch_all(fasta_file)
+
+    raise ValueError(f"Unknown benchmark {case.name}")
+
+
+def _fetch_all(fasta_file: str):
+    with FastaIndex(fasta_file) as index:
+        for record_name in index.names:
+            index.fetch(record_name)
+
+
+def run_benchmarks(cases: List[BenchmarkCase], repeat: int = 3, workdir: str | None = None) -> dict:
+    """Runs every case in its own spawned worker process and collects the results with environment details."""
+    context = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory(dir=workdir) as scratch:
+        with ProcessPoolExecutor(max_workers=1, mp_context=context, max_tasks_per_child=1) as pool:
+            results = [pool.submit(run_case, case, repeat, scratch).result() for case in cases]
+
+    return {
+        "environment": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "processor": platform.processor(),
+            "cpu_count": os.cpu_count()
+        },
+        "repeat": repeat,
+        "results": results
+    }
+
+
+def compare_results(current: dict, baseline: dict, threshold: float) -> List[dict]:
+    """
+    Compares a benchmark run against a saved baseline. A case regresses when its best time grew by more than the
+    threshold fraction. Cases missing from the baseline are skipped.
+    """
+    def case_key(entry: dict) -> tuple:
+        # Reports written before compact cases existed have no compact field.
+        return entry["name"], entry["size"], entry["records"], entry.get("compact", False)
+
+    baseline_cases = {case_key(entry): entry for entry in baseline["results"]}
+    comparisons = []
+    for entry in current["results"]:
+        previous = baseline_cases.get(case_key(entry))
+        if previous is None or not previous["seconds"]:
+            continue
+        ratio = entry["seconds"] / previous["seconds"]
+        comparisons.append({
+            "name": entry["name"],
+            "size": entry["size"],
+            "records": entry["records"],
+            "compact": entry.get("compact", False),
+            "baseline_seconds": previous["seconds"],
+            "seconds": entry["seconds"],
+            "ratio": round(ratio, 3),
+            "regression": ratio > 1 + threshold
+        })
+    return comparisons
+
+
+def parse_args(argv: List[str] | None = None):
+    parser = argparse.ArgumentParser(
+        prog='GeneAnalyzer2-bench',
+        description='Benchmarks every GeneAnalyzer2 analysis method and the FASTA I/O path on synthetic inputs.'
+    )
+    parser.add_argument(
+        '--sizes',
+        default='1k,100k,1M',
+        help='Comma separated input sizes in bases, e.g. 1k,1M,100M. Default is %(default)s.'
+    )
+    parser.add_argument(
+        '--records',
+        default='1,1000',
+        help='Comma separated record counts used for the FASTA I/O and batch benchmarks. Default is %(default)s.'
+    )
+    parser.add_argument(
+        '--methods',
+        help='Optional: Comma separated analysis methods to benchmark. Defaults to every method.'
+    )
+    parser.add_argument(
+        '--no-io',
+        action='store_true',
+        help='Optional: Skip the FASTA I/O and batch benchmarks.'
+    )
+    parser.add_argument(
+        '--compact',
+        action='store_true',
+        help='Optional: Also benchmark every analysis method on compact sequences, in memory and streamed from a FASTA '
+             'file with and without them, to compare peak RSS.'
+    )
+    parser.add_argument(
+        '--repeat',
+        type=int,
+        default=3,
+        help='Number of timed repetitions per case, the best time is reported. Default is %(default)s.'
+    )
+    parser.add_argument(
+        '--output', '-o',
+        metavar='JSON_FILE',
+        help='Optional: Write the JSON report to this file instead of stdout.'
+    )
+    parser.add_argument(
+        '--compare',
+        metavar='BASELINE_JSON',
+        help='Optional: Compare against a saved report and exit with status 1 if any case regressed.'
+    )
+    parser.add_argument(
+        '--threshold',
+        type=float,
+        default=0.1,
+        help='Allowed slowdown before a case counts as a regression, as a fraction. Default is %(default)s.'
+    )
+    parser.add_argument(
+        '--workdir',
+        help='Optional: Directory for the temporary synthetic FASTA files.'
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str] | None = None):
+    args = parse_args(argv)
+
+    sizes = [parse_size(size) for size in args.sizes.split(",")]
+    record_counts = [int(records) for records in args.records.split(",")]
+    methods = args.methods.split(",") if args.methods else None
+
+    report = run_benchmarks(build_cases(sizes, record_counts, methods, not args.no_io, args.compact), args.repeat, args.workdir)
+
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            report["comparison"] = compare_results(report, json.load(baseline_file), args.threshold)
+
+    if args.output:
+        with open(args.output, "w") as out:
+            json.dump(report, out, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+    regressions = [entry for entry in report.get("comparison", []) if entry["regression"]]
+    for entry in regressions:
+        compact = " compact" if entry["compact"] else ""
+        print(f"{RED}Regression:{RESET} {entry['name']} size={entry['size']} records={entry['records']}{compact} "
+              f"{CYAN}{entry['baseline_seconds']:.4f}s -> {entry['seconds']:.4f}s{RESET} (x{entry['ratio']})",
+              file=sys.stderr)
+    if regressions:
+        exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,19 @@
 import argparse
-from geneanalyzertool.analysis.basic_analysis import BasicSequenceAnalysis
-from geneanalyzertool.core.exceptions import InvalidSequenceTypeError, AnalysisMethodError, SequenceParsingError
+import os
+import sys
+from contextlib import nullcontext
+from geneanalyzertool.analysis.analysis import ALL_METHODS, load_analysis_class
+from geneanalyzertool.analysis.incremental import stream_incremental
+from geneanalyzertool.core.cache import DEFAULT_MAX_BYTES, ResultCache, default_cache_dir
+from geneanalyzertool.core.export import EXPORT_FORMATS
+from geneanalyzertool.core.manifest import ResultManifest, manifest_path
+from geneanalyzertool.core.parser import PARSERS, parse_sequences
+from geneanalyzertool.core.selection import RecordSelection, read_id_list
+from geneanalyzertool.analysis.genetic_codes import NCBI_TABLES
+from geneanalyzertool.client.remote import SERVER_ENV, request_analysis
+from geneanalyzertool.core.exceptions import (
+    InvalidSequenceTypeError, AnalysisMethodError, SequenceParsingError, GeneAnalyzerError
+)
 
 YELLOW = "\033[1;33m"
 GREEN = "\033[1;32m"
@@ -8,13 +21,20 @@ RED = "\033[1;31m"
 RESET = "\033[0m"
 CYAN = "\033[1;36m"
 
+# Analysis classes are named by path and only imported once their mode is used (numpy and friends are slow to
+# import, and --help or a server call never needs them).
 # if a class is added to this map, --mode in parse_args() must also be updated.
 analysis_map = {
-    "basic": BasicSequenceAnalysis
+    "basic": "geneanalyzertool.analysis.basic_analysis:BasicSequenceAnalysis",
+    "similarity": "geneanalyzertool.analysis.similarity_analysis:SimilarityAnalysis",
+    "alignment": "geneanalyzertool.analysis.alignment_analysis:AlignmentAnalysis"
 }
 
 analysis_options = {
-    "basic": ['gc_percent', 'base_count', 'translate', 'transcribe', 'reverse_complement', 'orf']
+    "basic": ['gc_percent', 'base_count', 'composition', 'gc_windows', 'kmer_count', 'translate', 'transcribe',
+              'reverse_complement', 'orf', 'motif_search', 'protein_properties'],
+    "similarity": ['sketch', 'distance'],
+    "alignment": ['global', 'local']
 }
 
 
@@ -22,7 +42,8 @@ analysis_options = {
 def parse_args():
     parser = argparse.ArgumentParser(
         prog='GeneAnalyzer2',
-        description='Command-line bioinformatics tool for analyzing DNA, RNA, and protein sequences.'
+        description='Command-line bioinformatics tool for analyzing DNA, RNA, and protein sequences. '
+                    'Run "geneanalyzer2 serve" to start a long running server (see "geneanalyzer2 serve --help").'
     )
 
     # sequence input args
@@ -35,6 +56,74 @@ def parse_args():
         action='store_true',
         help='Treat the "sequence" argument as a file path rather than a raw sequence.'
     )
+    parser.add_argument(
+        '--stream',
+        action='store_true',
+        help='Optional: Analyze every record of the --file one at a time, writing each result as soon as it is ready. '
+             'Skips the interactive sequence selection and keeps memory bounded by the largest record.'
+    )
+    parser.add_argument(
+        '--chunk-size',
+        type=int,
+        metavar='BASES',
+        help='Optional: With --stream, read and analyze every record in chunks of this many bases, so memory stays '
+             'flat even for chromosome scale records. k-mers, motifs, codons and ORFs across chunk edges are handled '
+             'exactly. translate, transcribe and reverse_complement still need whole records.'
+    )
+
+    parser.add_argument(
+        '--region', '-r',
+        action='append',
+        metavar='REGION',
+        help='Optional: Record name or samtools style region (chr1:10000-20000, 1-based inclusive) to fetch from the '
+             '--file through its .fai index. Can be given multiple times. Skips the interactive sequence selection.'
+    )
+    parser.add_argument(
+        '--index',
+        action='store_true',
+        help='Optional: Use (and build if needed) a samtools compatible .fai index of the --file, so only the '
+             'selected records are read.'
+    )
+    parser.add_argument(
+        '--ids',
+        metavar='IDS',
+        help='Optional: Only analyze the records of the --file with these ids, given as a comma separated list or a '
+             'file with one id per line. Skips the interactive sequence selection, like --id-regex, --min-len and '
+             '--max-len, which can be combined.'
+    )
+    parser.add_argument(
+        '--id-regex',
+        metavar='REGEX',
+        help='Optional: Only analyze the records of the --file whose id contains a match of this regular expression.'
+    )
+    parser.add_argument(
+        '--min-len',
+        type=int,
+        metavar='BASES',
+        help='Optional: Only analyze the records of the --file at least this long.'
+    )
+    parser.add_argument(
+        '--max-len',
+        type=int,
+        metavar='BASES',
+        help='Optional: Only analyze the records of the --file at most this long.'
+    )
+
+    parser.add_argument(
+        '--parser',
+        choices=PARSERS,
+        default='native',
+        help='Optional: Parser used to read --file. native is a fast FASTA/FASTQ reader, biopython uses Bio.SeqIO. '
+             'Default is native.'
+    )
+
+    parser.add_argument(
+        '--compact',
+        action='store_true',
+        help='Optional: Hold sequences in a packed byte representation (2 or 4 bits per base). With --stream, records '
+             'are packed as they are read and never held as text by the counting, GC window and k-mer analyses, '
+             'which cuts peak memory on large genomes several fold.'
+    )
 
     # sequence type args
     parser.add_argument(
@@ -47,54 +136,523 @@ def parse_args():
     # analysis args
     parser.add_argument(
         '--mode', '-m',
-        choices=['basic'],
+        choices=['basic', 'similarity', 'alignment'],
         default='basic',
-        help='Mode of analysis to be performed. Default is basic. Refer to docs for more information.'
+        help='Mode of analysis to be performed. basic analyzes every sequence on its own, similarity compares '
+             'DNA or RNA sequences through MinHash sketches of their k-mers, alignment aligns a --query against '
+             'every sequence. Default is basic. Refer to docs for more information.'
     )
 
     parser.add_argument(
         '--analysis', '-a',
         required=True,
-        help='Type of analysis to perform. Based on mode chosen.'
+        help='Type of analysis to perform. Based on mode chosen. Several analyses can be given as a comma separated '
+             'list, or "all" for every analysis that applies to the sequence type; the file is then read once and '
+             'all results are reported together per sequence.'
+    )
+
+    parser.add_argument(
+        '--jobs', '-j',
+        type=int,
+        default=1,
+        metavar='N',
+        help='Optional: Number of worker processes used to analyze records in parallel. 0 uses one per CPU core. '
+             'Default is 1.'
+    )
+
+    # composition args
+    parser.add_argument(
+        '--window',
+        type=int,
+        metavar='BASES',
+        help='Optional: Sliding window size used to report windowed GC content with the composition and gc_windows '
+             'analyses. gc_windows defaults to 10000.'
+    )
+    parser.add_argument(
+        '--step',
+        type=int,
+        metavar='BASES',
+        help='Optional: Distance between consecutive composition windows. Defaults to the window size.'
+    )
+
+    # k-mer args
+    parser.add_argument(
+        '--kmer-size', '-k',
+        type=int,
+        default=21,
+        metavar='K',
+        help='Optional: k-mer length used by kmer_count and the similarity mode, 1 to 31. Default is 21.'
+    )
+    parser.add_argument(
+        '--kmer-top',
+        type=int,
+        default=10,
+        metavar='N',
+        help='Optional: Number of most frequent k-mers reported by kmer_count. Default is 10.'
+    )
+    parser.add_argument(
+        '--kmer-forward',
+        action='store_true',
+        help='Optional: Count k-mers as read instead of merging each k-mer with its reverse complement.'
+    )
+    parser.add_argument(
+        '--kmer-max-distinct',
+        type=int,
+        default=10_000_000,
+        metavar='N',
+        help='Optional: Distinct k-mers counted exactly before kmer_count switches to an approximate, fixed size '
+             'count-min sketch to bound memory. Default is %(default)s.'
+    )
+
+    # similarity args
+    parser.add_argument(
+        '--sketch-size',
+        type=int,
+        default=1024,
+        metavar='BINS',
+        help='Optional: Number of bins of the MinHash sketch of every record in the similarity mode. Larger sketches '
+             'give more precise distances. Default is %(default)s.'
+    )
+    parser.add_argument(
+        '--distance',
+        choices=['mash', 'jaccard'],
+        default='mash',
+        help='Optional: Distance reported by the distance analysis. mash estimates the per base mutation rate, '
+             'jaccard is one minus the Jaccard index of the k-mer sets. Default is mash.'
+    )
+
+    # alignment args
+    parser.add_argument(
+        '--query',
+        metavar='SEQUENCE',
+        help='Query sequence aligned against every sequence by the alignment mode, OR a FASTA/FASTQ file path whose '
+             'first record is used.'
+    )
+    parser.add_argument(
+        '--match',
+        type=float,
+        default=5,
+        help='Optional: Score of identical residues in nucleotide alignments. Default is %(default)s.'
+    )
+    parser.add_argument(
+        '--mismatch',
+        type=float,
+        default=-4,
+        help='Optional: Score of different residues in nucleotide alignments. Default is %(default)s.'
+    )
+    parser.add_argument(
+        '--matrix',
+        metavar='NAME',
+        help='Optional: Substitution matrix scoring the residues of alignments instead of --match and --mismatch, any '
+             'matrix shipped with Biopython (BLOSUM62, PAM250, ...). Protein alignments default to BLOSUM62.'
+    )
+    parser.add_argument(
+        '--gap-open',
+        type=float,
+        default=10,
+        help='Optional: Cost of opening a gap in alignments. Default is %(default)s.'
+    )
+    parser.add_argument(
+        '--gap-extend',
+        type=float,
+        default=0.5,
+        help='Optional: Cost of every further position of a gap, at most --gap-open. Default is %(default)s.'
+    )
+    parser.add_argument(
+        '--band',
+        type=int,
+        metavar='DIAGONALS',
+        help='Optional: Only consider alignments staying within this many diagonals of the corners of the alignment '
+             'matrix. Much faster for similar sequences, exact as long as their alignment has fewer net gaps.'
+    )
+    parser.add_argument(
+        '--score-only',
+        action='store_true',
+        help='Optional: Only report alignment scores (and where local alignments end), skipping the traceback.'
+    )
+
+    # translation args
+    parser.add_argument(
+        '--table',
+        type=int,
+        choices=sorted(NCBI_TABLES),
+        default=1,
+        metavar='ID',
+        help='Optional: NCBI translation table used by translate. Default is 1 (standard code).'
+    )
+    parser.add_argument(
+        '--frames',
+        type=int,
+        choices=[1, 3, 6],
+        default=1,
+        help='Optional: Number of reading frames translated: 1, 3 (forward) or 6 (both strands). Default is 1.'
+    )
+    parser.add_argument(
+        '--read-through',
+        action='store_true',
+        help='Optional: Translate through stop codons instead of stopping at the first one.'
+    )
+
+    # orf finder args
+    parser.add_argument(
+        '--orf-min-length',
+        type=int,
+        default=0,
+        metavar='NUCLEOTIDES',
+        help='Optional: Minimum length of reported ORFs in nucleotides, stop codon included. Default is 0.'
+    )
+    parser.add_argument(
+        '--orf-strand',
+        choices=['+', '-', 'both'],
+        default='both',
+        help='Optional: Strand(s) to search for ORFs. Default is both.'
+    )
+    parser.add_argument(
+        '--start-codons',
+        default='ATG',
+        help='Optional: Comma separated start codons used by the ORF finder. Default is ATG.'
+    )
+    parser.add_argument(
+        '--stop-codons',
+        default='TAA,TAG,TGA',
+        help='Optional: Comma separated stop codons used by the ORF finder. Default is TAA,TAG,TGA.'
+    )
+    parser.add_argument(
+        '--longest-orfs',
+        action='store_true',
+        help='Optional: Only report the longest ORF for each stop codon instead of every nested ORF.'
+    )
+
+    # motif search args
+    parser.add_argument(
+        '--motifs',
+        metavar='MOTIFS',
+        help='Optional: Comma separated IUPAC motifs searched for by motif_search, written as PATTERN or NAME=PATTERN. '
+             'A ^ marks the cut site of a restriction enzyme, e.g. EcoRI=G^AATTC.'
+    )
+    parser.add_argument(
+        '--motif-file',
+        metavar='PATH',
+        help='Optional: Text file with one motif per line (PATTERN, NAME PATTERN or NAME=PATTERN), searched for '
+             'together with --motifs.'
+    )
+    parser.add_argument(
+        '--motif-strand',
+        choices=['+', '-', 'both'],
+        default='both',
+        help='Optional: Strand searched by motif_search. Default is both.'
+    )
+
+    # result cache args
+    parser.add_argument(
+        '--cache-dir',
+        default=default_cache_dir(),
+        metavar='PATH',
+        help='Optional: Directory of the persistent result cache. Default is %(default)s.'
+    )
+    parser.add_argument(
+        '--cache-size',
+        type=int,
+        default=DEFAULT_MAX_BYTES // (1024 * 1024),
+        metavar='MB',
+        help='Optional: Maximum size of the result cache in megabytes. Least recently used results are evicted '
+             'first. Default is %(default)s.'
+    )
+    parser.add_argument(
+        '--cache',
+        action=argparse.BooleanOptionalAction,
+        default=False,
+        help='Optional: Reuse results of earlier runs from the persistent result cache and store new ones. Off by '
+             'default, hashing every record costs about as much as cheap analyses.'
+    )
+
+    # server args
+    parser.add_argument(
+        '--server',
+        default=os.environ.get(SERVER_ENV),
+        metavar='SOCKET',
+        help='Optional: Send the analysis to a "geneanalyzer2 serve" server listening on this Unix socket instead of '
+             f'running it here. Defaults to the {SERVER_ENV} environment variable. Files are analyzed like --stream '
+             'unless --region is given; the server uses its own cache settings.'
     )
 
     # output file args
     parser.add_argument(
         '--out', '-o',
         metavar='OUTPUT_FILE',
-        help='Optional: Path to save analysis results. If omitted, results are printed to stdout.'
+        help='Optional: Path to save analysis results. If omitted, results are printed to stdout. The sketch analysis '
+             'of the similarity mode saves a sketch file (.npz), which can be given back as --file to distance.'
+    )
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help='Optional: Keep the digest and result of every record in a manifest next to the --out file, and on later '
+             'runs only analyze the records of the --file that were added or changed since. The output is the same '
+             'as that of a full run. The file is analyzed like --stream.'
+    )
+    parser.add_argument(
+        '--format',
+        choices=EXPORT_FORMATS,
+        default='text',
+        help='Optional: Format of the --out file. text is a readable report, tsv, jsonl and parquet write a table '
+             'with one row per value (one row per ORF for orf, one per pair of records for distance). text writes the '
+             'distance matrix as tab separated values. parquet requires pyarrow. Default is text.'
+    )
+
+    # profiling args
+    parser.add_argument(
+        '--metrics',
+        metavar='PATH',
+        help='Optional: Write a JSON summary of the run to PATH ("-" for stderr): wall and CPU time per stage (read, '
+             'convert, analyze, cache, export), records and bases per second and peak memory.'
+    )
+    parser.add_argument(
+        '--profile',
+        metavar='PATH',
+        help='Optional: Profile the run and write the profile to PATH, see --profile-mode.'
+    )
+    parser.add_argument(
+        '--profile-mode',
+        choices=['cprofile', 'sample'],
+        default='cprofile',
+        help='Optional: cprofile writes a pstats file (python -m pstats, snakeviz). sample writes folded stacks '
+             '(flamegraph.pl, speedscope) from a low overhead sampling profiler, not available on Windows. '
+             'Default is cprofile.'
     )
     return parser.parse_args()
 
 
+def run_analysis(args: argparse.Namespace, analyzer, analysis_method: str | list, method_options: dict, metrics=None):
+    """Runs the analysis selected by args with analyzer and prints or exports the results. metrics is a RunMetrics."""
+    if args.server:
+        # The server resolves paths from its own working directory.
+        result_stream = request_analysis(args.server, {
+            "mode": args.mode,
+            "sequence": os.path.abspath(args.sequence) if args.file else args.sequence,
+            "is_file": args.file,
+            "seq_type": args.type,
+            "analysis_method": analysis_method,
+            "method_options": method_options,
+            "regions": args.region,
+            "use_index": args.index,
+            "compact": args.compact,
+            "parser": args.parser,
+            "chunk_size": args.chunk_size,
+            "selection": analyzer.selection.to_dict() if analyzer.selection is not None else None
+        })
+        if metrics is not None:
+            # Waiting for the server is booked as analysis, the local stages only cover the export.
+            result_stream = metrics.timed("analyze", result_stream)
+    elif args.incremental:
+        # Results depend on the analysis and the options of its methods, not on how the records are read or held.
+        methods = [analysis_method] if isinstance(analysis_method, str) else analysis_method
+        manifest = ResultManifest(manifest_path(args.out), {
+            "mode": args.mode,
+            "seq_type": args.type,
+            "analysis_method": analysis_method,
+            "method_options": {method: options for method, options in method_options.items()
+                               if ALL_METHODS in methods or method in methods}
+        })
+        result_stream = stream_incremental(analyzer, manifest, args.sequence, args.type, analysis_method,
+                                           method_options, args.jobs, args.chunk_size)
+    elif args.stream:
+        result_stream = analyzer.stream_sequences(
+            fasta_file=args.sequence,
+            seq_type=args.type,
+            analysis_method=analysis_method,
+            method_options=method_options,
+            jobs=args.jobs,
+            chunk_size=args.chunk_size
+        )
+
+    if args.server or args.stream or args.incremental:
+        if args.out:
+            analyzer.export_stream(result_stream, args.out, args.format, analysis_method)
+        else:
+            analyzer.print_stream(result_stream)
+        return
+
+    # Delegate sequence processing to the analysis class
+    results, sequence_keys = analyzer.process_sequences(
+        sequence_input=args.sequence,
+        is_file=args.file,
+        seq_type=args.type,
+        analysis_method=analysis_method,
+        method_options=method_options,
+        jobs=args.jobs,
+        regions=args.region,
+        use_index=args.index
+    )
+
+    # Output results
+    if args.out:
+        analyzer.export_to_file(results, sequence_keys, args.out, args.format, analysis_method)
+    else:
+        analyzer.print_to_terminal(results, sequence_keys)
+
+
+def record_selection(args: argparse.Namespace) -> RecordSelection | None:
+    """Returns the RecordSelection of the --ids, --id-regex, --min-len and --max-len arguments, None without them."""
+    if args.ids is None and args.id_regex is None and args.min_len is None and args.max_len is None:
+        return None
+
+    try:
+        ids = None if args.ids is None else read_id_list(args.ids)
+        return RecordSelection(ids, args.id_regex, args.min_len, args.max_len)
+    except (OSError, ValueError) as e:
+        print(f"{RED}Error: Invalid record selection. {e}{RESET}")
+        exit(1)
+
+
+def read_query(query: str | None) -> str:
+    """Returns the --query sequence, the first record of the file when it names one."""
+    if not query:
+        print(f"{RED}Error: The alignment mode needs a --query sequence or file.{RESET}")
+        exit(1)
+    if not os.path.isfile(query):
+        return query
+
+    try:
+        _, sequence = next(parse_sequences(query))
+    except StopIteration:
+        print(f"{RED}Error: Query file {query} holds no sequence.{RESET}")
+        exit(1)
+    except (OSError, SequenceParsingError) as e:
+        print(f"{RED}Error: Could not read query file {query}. {e}{RESET}")
+        exit(1)
+    return sequence.decode("latin-1")
+
+
 def main():
+    if sys.argv[1:2] == ["serve"]:
+        from geneanalyzertool.client.server import serve_main
+        serve_main(sys.argv[2:], analysis_map)
+        return
+
     args = parse_args()
 
-    # Validate analysis option for the selected mode
-    if args.analysis not in analysis_options[args.mode]:
-        print(f"{RED}Error: Analysis '{args.analysis}' is not valid for mode '{args.mode}'.")
-        print(f"Valid options: {GREEN}{analysis_options[args.mode]}{RESET}")
+    # Validate analysis options for the selected mode
+    methods = [method.strip() for method in args.analysis.split(",")]
+    if methods != [ALL_METHODS]:
+        for method in methods:
+            if method not in analysis_options[args.mode]:
+                print(f"{RED}Error: Analysis '{method}' is not valid for mode '{args.mode}'.")
+                print(f"Valid options: {GREEN}{analysis_options[args.mode] + [ALL_METHODS]}{RESET}")
+                exit(1)
+    analysis_method = methods[0] if len(methods) == 1 else methods
+
+    motifs = [motif.strip() for motif in (args.motifs or "").split(",") if motif.strip()]
+    if args.motif_file:
+        # Imported here since the motif module loads numpy.
+        from geneanalyzertool.analysis.motifs import format_motif, read_motif_file
+        try:
+            motifs += [format_motif(motif) for motif in read_motif_file(args.motif_file)]
+        except (OSError, ValueError) as e:
+            print(f"{RED}Error: Could not read motif file {args.motif_file}. {e}{RESET}")
+            exit(1)
+    if "motif_search" in methods and not motifs:
+        print(f"{RED}Error: motif_search needs at least one motif from --motifs or --motif-file.{RESET}")
         exit(1)
 
-    # Get the appropriate analysis class based on mode
-    analysis_class = analysis_map[args.mode]
-    analyzer = analysis_class()
+    method_options = {
+        "translate": {
+            "table": args.table,
+            "frames": args.frames,
+            "to_stop": not args.read_through
+        },
+        "composition": {
+            "window": args.window,
+            "step": args.step
+        },
+        "gc_windows": {
+            "window": args.window or 10_000,
+            "step": args.step
+        },
+        "kmer_count": {
+            "k": args.kmer_size,
+            "top": args.kmer_top,
+            "canonical": not args.kmer_forward,
+            "max_distinct": args.kmer_max_distinct
+        },
+        "orf": {
+            "start_codons": args.start_codons.split(","),
+            "stop_codons": args.stop_codons.split(","),
+            "min_length": args.orf_min_length,
+            "strand": args.orf_strand,
+            "nested": not args.longest_orfs
+        },
+        "motif_search": {
+            "motifs": motifs,
+            "strand": args.motif_strand
+        },
+        "sketch": {
+            "k": args.kmer_size,
+            "size": args.sketch_size
+        },
+        "distance": {
+            "k": args.kmer_size,
+            "size": args.sketch_size,
+            "metric": args.distance
+        }
+    }
+    if args.mode == "alignment":
+        alignment_options = {
+            "query": read_query(args.query),
+            "match": args.match,
+            "mismatch": args.mismatch,
+            "matrix": args.matrix,
+            "gap_open": args.gap_open,
+            "gap_extend": args.gap_extend,
+            "band": args.band,
+            "score_only": args.score_only
+        }
+        method_options.update({"global": alignment_options, "local": alignment_options})
 
-    try:
-        # Delegate sequence processing to the analysis class
-        results, sequence_keys = analyzer.process_sequences(
-            sequence_input=args.sequence,
-            is_file=args.file,
-            seq_type=args.type,
-            analysis_method=args.analysis
-        )
+    if args.format != "text" and not args.out:
+        print(f"{RED}Error: --format {args.format} can only be used together with --out.{RESET}")
+        exit(1)
 
-        # Output results
-        if args.out:
-            analyzer.export_to_file(results, sequence_keys, args.out)
-        else:
-            analyzer.print_to_terminal(results, sequence_keys)
+    if args.server and args.mode == "similarity" and "sketch" in methods:
+        print(f"{RED}Error: Sketches cannot be sent through --server, run sketch locally.{RESET}")
+        exit(1)
+
+    if (args.stream or args.region or args.index) and not args.file:
+        print(f"{RED}Error: --stream, --region and --index can only be used together with --file.{RESET}")
+        exit(1)
 
+    if args.incremental and (not args.file or not args.out or args.server or args.region or "distance" in methods):
+        print(f"{RED}Error: --incremental needs --file and --out, and cannot be used with --server, --region or the "
+              f"distance analysis, whose results depend on every record.{RESET}")
+        exit(1)
+
+    selection = record_selection(args)
+    if selection is not None and (not args.file or args.region):
+        print(f"{RED}Error: --ids, --id-regex, --min-len and --max-len can only be used together with --file, "
+              f"without --region.{RESET}")
+        exit(1)
+
+    if args.chunk_size is not None and (not (args.stream or args.incremental) or args.jobs != 1 or args.chunk_size <= 0):
+        print(f"{RED}Error: --chunk-size must be a positive number of bases and can only be used together with "
+              f"--stream or --incremental, without --jobs.{RESET}")
+        exit(1)
+
+    # Get the appropriate analysis class based on mode
+    analysis_class = load_analysis_class(analysis_map[args.mode])
+    cache = None if not args.cache or args.server else ResultCache(args.cache_dir, args.cache_size * 1024 * 1024)
+    metrics = None
+    if args.metrics:
+        from geneanalyzertool.core.metrics import RunMetrics
+        metrics = RunMetrics()
+    analyzer = analysis_class(cache=cache, compact=args.compact, parser=args.parser, metrics=metrics,
+                              selection=selection)
+    profile = nullcontext()
+    if args.profile:
+        from geneanalyzertool.core.metrics import profiled
+        profile = profiled(args.profile, args.profile_mode)
+
+    try:
+        with profile:
+            run_analysis(args, analyzer, analysis_method, method_options, metrics)
     except InvalidSequenceTypeError as e:
         print(RED + str(e) + RESET)
         exit(1)
@@ -104,6 +662,14 @@ def main():
     except SequenceParsingError as e:
         print(RED + str(e) + RESET)
         exit(1)
+    except (GeneAnalyzerError, OSError) as e:
+        if not args.server:
+            raise
+        print(f"{RED}Error: Request to the analysis server at {args.server} failed. {e}{RESET}")
+        exit(1)
+    finally:
+        if metrics is not None:
+            metrics.write(args.metrics)
 
 
 if __name__ == "__main__":
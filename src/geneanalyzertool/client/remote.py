@@ -0,0 +1,80 @@
+import json
+import os
+import socket
+import tempfile
+from typing import Any, Iterator, Tuple
+
+from geneanalyzertool.analysis.analysis import ALL_METHODS, AnalysisReport, WindowedResult
+from geneanalyzertool.core import exceptions
+from geneanalyzertool.core.exceptions import GeneAnalyzerError
+
+# Client side of "geneanalyzer2 serve" (see client/server.py). Kept apart from the server so forwarding a call to a
+# running server does not import asyncio or any analysis code.
+
+# Environment variable holding the socket of a running server. If set, geneanalyzer2 forwards its calls to it.
+SERVER_ENV = "GENEANALYZER2_SERVER"
+
+# Methods whose results are WindowedResults.
+WINDOWED_METHODS = {"gc_windows"}
+
+# Result fields keyed by integers, by method. JSON turns their keys into strings.
+INTEGER_KEYED_FIELDS = {"kmer_count": "Histogram"}
+
+
+def default_socket_path() -> str:
+    """Per-user socket location in the temporary directory."""
+    return os.path.join(tempfile.gettempdir(), f"geneanalyzer2-{os.getuid()}.sock")
+
+
+def request_analysis(socket_path: str, request: dict) -> Iterator[Tuple[str, Any]]:
+    """
+    Sends an analysis request to a running server and yields its (record id, result) pairs as they arrive.
+    Multi method results are returned as AnalysisReports, windowed results as WindowedResults and server side
+    GeneAnalyzer errors are raised again.
+    """
+    multiple = not isinstance(request["analysis_method"], str) or request["analysis_method"] == ALL_METHODS
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(socket_path)
+        client.sendall(encode_message(request))
+        for line in client.makefile("rb"):
+            response = json.loads(line)
+            if "error" in response:
+                error_class = getattr(exceptions, response["type"], None)
+                if not (isinstance(error_class, type) and issubclass(error_class, GeneAnalyzerError)):
+                    error_class = GeneAnalyzerError
+                raise error_class(response["error"])
+            if response.get("done"):
+                return
+            result = response["result"]
+            if multiple:
+                yield response["record"], AnalysisReport({method: _result_type(method, value)
+                                                          for method, value in result.items()})
+            else:
+                yield response["record"], _result_type(request["analysis_method"], result)
+
+    raise GeneAnalyzerError("Error: The analysis server closed the connection before finishing the request.")
+
+
+def _result_type(method: str, result: Any) -> Any:
+    # JSON turns every result into plain lists and dictionaries, with string keys.
+    if method in WINDOWED_METHODS:
+        return WindowedResult(result)
+    field = INTEGER_KEYED_FIELDS.get(method)
+    if field is not None and isinstance(result, dict) and field in result:
+        return {**result, field: {int(key): value for key, value in result[field].items()}}
+    return result
+
+
+def server_available(socket_path: str) -> bool:
+    """Returns True if a server answers on socket_path."""
+    try:
+        list(request_analysis(socket_path, {"op": "ping", "analysis_method": ""}))
+        return True
+    except (OSError, GeneAnalyzerError):
+        return False
+
+
+def encode_message(message: dict) -> bytes:
+    """Encodes one protocol message as a JSON line."""
+    # Sequences are str subclasses and serialize as strings; compact sequences fall back on str().
+    return json.dumps(message, default=str).encode() + b"\n"
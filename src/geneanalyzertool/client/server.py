@@ -0,0 +1,211 @@
+import argparse
+import asyncio
+import json
+import os
+import signal
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, List, Tuple
+
+from geneanalyzertool.analysis.analysis import load_analysis_class
+from geneanalyzertool.client.remote import SERVER_ENV, default_socket_path, encode_message, server_available
+from geneanalyzertool.core import exceptions
+from geneanalyzertool.core.cache import DEFAULT_MAX_BYTES, ResultCache, default_cache_dir
+from geneanalyzertool.core.exceptions import GeneAnalyzerError
+from geneanalyzertool.core.selection import RecordSelection
+
+YELLOW = "\033[1;33m"
+GREEN = "\033[1;32m"
+RED = "\033[1;31m"
+RESET = "\033[0m"
+CYAN = "\033[1;36m"
+
+# Longest accepted request line. Raw sequences are sent inline, so this bounds the size of a request.
+MAX_REQUEST_BYTES = 256 * 1024 * 1024
+
+# Worker process state. Every worker keeps one analyzer per configuration alive between requests, so their open
+# FASTA indexes and result cache connections stay warm.
+_worker_analysis_map = None
+_worker_cache = None
+_worker_analyzers = {}
+
+
+def _init_worker(analysis_map: dict, cache: ResultCache | None):
+    global _worker_analysis_map, _worker_cache
+    _worker_analysis_map = analysis_map
+    _worker_cache = cache
+    _worker_analyzers.clear()
+
+
+def _worker_analyzer(mode: str, compact: bool, parser: str):
+    key = (mode, compact, parser)
+    if key not in _worker_analyzers:
+        if mode not in _worker_analysis_map:
+            raise exceptions.AnalysisMethodError(f"Error: Unknown analysis mode '{mode}'.")
+        analysis_class = load_analysis_class(_worker_analysis_map[mode])
+        _worker_analyzers[key] = analysis_class(cache=_worker_cache, compact=compact, parser=parser)
+    return _worker_analyzers[key]
+
+
+def run_request(request: dict) -> List[Tuple[str, Any]]:
+    """
+    Worker entry point: runs one analysis request and returns its (record id, result) pairs in input order.
+
+    Files are analyzed record by record like --stream, unless regions are given. Records cannot be selected
+    interactively through the server, but a selection (the arguments of a RecordSelection) picks records by id
+    and length.
+    """
+    analyzer = _worker_analyzer(request.get("mode", "basic"), request.get("compact", False),
+                                request.get("parser", "native"))
+    # Workers keep their analyzers between requests, the selection only applies to this one.
+    selection = request.get("selection")
+    analyzer.selection = RecordSelection(**selection) if selection else None
+
+    if request.get("is_file") and not request.get("regions"):
+        return list(analyzer.stream_sequences(request["sequence"], request["seq_type"], request["analysis_method"],
+                                              request.get("method_options"), chunk_size=request.get("chunk_size")))
+
+    results, sequence_keys = analyzer.process_sequences(
+        sequence_input=request["sequence"],
+        is_file=request.get("is_file", False),
+        seq_type=request["seq_type"],
+        analysis_method=request["analysis_method"],
+        method_options=request.get("method_options"),
+        regions=request.get("regions"),
+        use_index=request.get("use_index", False)
+    )
+    return [(key, results[key]) for key in sequence_keys]
+
+
+class AnalysisServer:
+    """
+    Long running analysis daemon on a local Unix socket.
+
+    Clients send one JSON request per line and receive one {"record": ..., "result": ...} line per record followed by
+    {"done": true}, or a single {"error": ..., "type": ...} line. Requests are read concurrently by asyncio and run
+    on a pool of worker processes, which keep their analyzers, FASTA indexes and caches between requests.
+    """
+
+    def __init__(self, socket_path: str, analysis_map: dict, jobs: int = 1, cache: ResultCache | None = None):
+        self.socket_path = socket_path
+        self.analysis_map = analysis_map
+        self.jobs = max(jobs, 1)
+        self.cache = cache
+        self._pool = None
+        self._server = None
+
+    async def start(self):
+        _remove_stale_socket(self.socket_path)
+        self._pool = ProcessPoolExecutor(self.jobs, initializer=_init_worker, initargs=(self.analysis_map, self.cache))
+        self._server = await asyncio.start_unix_server(self._handle_client, path=self.socket_path,
+                                                       limit=MAX_REQUEST_BYTES)
+        # Only the user running the server may send it requests.
+        os.chmod(self.socket_path, 0o600)
+
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    def close(self):
+        if self._server is not None:
+            self._server.close()
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        loop = asyncio.get_running_loop()
+        try:
+            while line := await reader.readline():
+                try:
+                    request = json.loads(line)
+                    if request.get("op") == "ping":
+                        writer.write(encode_message({"done": True}))
+                    else:
+                        for key, result in await loop.run_in_executor(self._pool, run_request, request):
+                            writer.write(encode_message({"record": key, "result": result}))
+                        writer.write(encode_message({"done": True}))
+                except Exception as e:
+                    writer.write(encode_message({"error": str(e), "type": type(e).__name__}))
+                await writer.drain()
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+
+def parse_serve_args(argv: List[str] | None = None):
+    parser = argparse.ArgumentParser(
+        prog='GeneAnalyzer2 serve',
+        description='Runs GeneAnalyzer2 as a long running server on a local Unix socket. Point the CLI at it with '
+                    f'--server or the {SERVER_ENV} environment variable.'
+    )
+    parser.add_argument(
+        '--socket',
+        default=default_socket_path(),
+        metavar='PATH',
+        help='Path of the Unix socket to listen on. Default is %(default)s.'
+    )
+    parser.add_argument(
+        '--jobs', '-j',
+        type=int,
+        default=os.cpu_count() or 1,
+        metavar='N',
+        help='Number of worker processes running requests concurrently. Default is one per CPU core.'
+    )
+    parser.add_argument(
+        '--cache-dir',
+        default=default_cache_dir(),
+        metavar='PATH',
+        help='Directory of the persistent result cache. Default is %(default)s.'
+    )
+    parser.add_argument(
+        '--cache-size',
+        type=int,
+        default=DEFAULT_MAX_BYTES // (1024 * 1024),
+        metavar='MB',
+        help='Maximum size of the result cache in megabytes. Default is %(default)s.'
+    )
+    parser.add_argument(
+        '--cache',
+        action=argparse.BooleanOptionalAction,
+        default=False,
+        help='Reuse results of earlier runs from the persistent result cache and store new ones. Off by '
+             'default, hashing every record costs about as much as cheap analyses.'
+    )
+    return parser.parse_args(argv)
+
+
+def serve_main(argv: List[str], analysis_map: dict):
+    args = parse_serve_args(argv)
+    cache = None if not args.cache else ResultCache(args.cache_dir, args.cache_size * 1024 * 1024)
+    server = AnalysisServer(args.socket, analysis_map, args.jobs, cache)
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        task = asyncio.current_task()
+        for signal_number in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signal_number, task.cancel)
+        await server.start()
+        print(f"{YELLOW}GeneAnalyzer2 server listening on {GREEN}{args.socket}{YELLOW} with {args.jobs} "
+              f"worker(s).{RESET}", flush=True)
+        await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except asyncio.CancelledError:
+        pass
+    finally:
+        server.close()
+        print(f"{YELLOW}GeneAnalyzer2 server stopped.{RESET}")
+
+
+def _remove_stale_socket(socket_path: str):
+    """Removes a socket file left behind by a server that is no longer running."""
+    if not os.path.exists(socket_path):
+        return
+    if server_available(socket_path):
+        raise GeneAnalyzerError(f"Error: A GeneAnalyzer2 server is already running on {socket_path}.")
+    os.unlink(socket_path)
@@ -0,0 +1,123 @@
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import time
+from typing import Any, Tuple
+
+# Bump when analysis results change shape so stale entries are never served.
+CACHE_FORMAT = 1
+
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+
+
+def default_cache_dir() -> str:
+    """Per-user cache location, following XDG_CACHE_HOME when it is set."""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "geneanalyzer2")
+
+
+class ResultCache:
+    """
+    Persistent, content addressed store of analysis results.
+
+    Results are keyed by a digest of the sequence (and its type), the analysis method and its parameters, and kept
+    in a SQLite database under cache_dir. SQLite's write-ahead log and locking make the cache safe to share between
+    processes. Once the stored results grow past max_bytes, the least recently used entries are evicted.
+    """
+
+    def __init__(self, cache_dir: str | None = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.max_bytes = max_bytes
+        self._connection = None
+
+    def __getstate__(self) -> dict:
+        # Connections cannot cross process boundaries; workers reopen the database on first use.
+        state = self.__dict__.copy()
+        state["_connection"] = None
+        return state
+
+    @property
+    def path(self) -> str:
+        return os.path.join(self.cache_dir, "results.sqlite")
+
+    @staticmethod
+    def sequence_digest(sequence: Any) -> str:
+        """
+        Digest of a sequence and its type for make_key(). Compact and str backed sequences of the same type get the
+        same digest, their results are the same. Callers running several methods on a record compute it once.
+        """
+        digest = hashlib.sha256(type(sequence).__name__.removeprefix("Compact").encode())
+        digest.update(b"\0")
+        digest.update(sequence.encode("latin-1", errors="replace") if isinstance(sequence, str) else bytes(sequence))
+        return digest.hexdigest()
+
+    def make_key(self, sequence_digest: str, method: str, options: dict) -> str:
+        """Builds the cache key of an analysis from the sequence digest (see sequence_digest()), method and parameters."""
+        parameters = json.dumps(options, sort_keys=True, default=str)
+        return f"{CACHE_FORMAT}:{sequence_digest}:{method}:{parameters}"
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """Returns (True, result) on a hit and (False, None) on a miss. Hits refresh the entry's LRU position."""
+        connection = self._connect()
+        row = connection.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return False, None
+
+        with connection:
+            connection.execute("UPDATE results SET last_access = ? WHERE key = ?", (time.time(), key))
+        return True, pickle.loads(row[0])
+
+    def put(self, key: str, value: Any):
+        """Stores a result and evicts least recently used entries if the cache grew past its size limit."""
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(payload) > self.max_bytes:
+            return
+
+        connection = self._connect()
+        with connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO results (key, value, size, last_access) VALUES (?, ?, ?, ?)",
+                (key, payload, len(payload), time.time())
+            )
+            self._evict(connection)
+
+    def clear(self):
+        connection = self._connect()
+        with connection:
+            connection.execute("DELETE FROM results")
+
+    def size(self) -> int:
+        """Total size in bytes of all stored results."""
+        return self._connect().execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def _evict(self, connection: sqlite3.Connection):
+        excess = connection.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0] - self.max_bytes
+        if excess <= 0:
+            return
+
+        evicted = []
+        for key, size in connection.execute("SELECT key, size FROM results ORDER BY last_access"):
+            evicted.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        connection.executemany("DELETE FROM results WHERE key = ?", evicted)
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            self._connection = sqlite3.connect(self.path, timeout=60)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, last_access REAL NOT NULL)"
+            )
+            self._connection.execute("CREATE INDEX IF NOT EXISTS results_last_access ON results (last_access)")
+        return self._connection
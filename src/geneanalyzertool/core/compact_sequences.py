@@ -0,0 +1,323 @@
+from typing import Iterable, Iterator
+
+import numpy as np
+
+from geneanalyzertool.core.sequences import DNA, RNA, Protein
+
+# The 16 IUPAC nucleotide symbols fit a 4-bit code exactly.
+IUPAC_NIBBLE_ALPHABET = b"ACGTURYSWKMBDHVN"
+
+UNKNOWN_CODE = 255
+LOWER_CASE_BIT = 0x20
+
+# Bases repacked at a time when from_chunks() widens what it has packed so far (a multiple of 4).
+WIDEN_BASES = 1024 * 1024
+
+
+def _encoder(alphabet: bytes) -> np.ndarray:
+    """Lookup table from byte (either case) to the symbol's index in alphabet, UNKNOWN_CODE otherwise."""
+    table = np.full(256, UNKNOWN_CODE, dtype=np.uint8)
+    for code, symbol in enumerate(alphabet):
+        table[symbol] = code
+        table[symbol | LOWER_CASE_BIT] = code
+    return table
+
+
+def _to_buffer(sequence) -> bytes | memoryview:
+    """Returns the ASCII bytes of any sequence like object, without copying bytes and memoryviews."""
+    if isinstance(sequence, str):
+        return sequence.encode("latin-1", errors="replace")
+    if isinstance(sequence, CompactSequence):
+        return sequence.as_buffer()
+    if isinstance(sequence, (bytes, memoryview)):
+        return sequence
+    # bytearrays are copied because they could change underneath us; Biopython Seq objects support bytes().
+    return bytes(sequence)
+
+
+def _encode(values: np.ndarray, bits: int, alphabet: bytes) -> bytes:
+    """Packs the symbols of values bits per symbol by their index in alphabet, zero padding the last byte."""
+    codes = _encoder(alphabet)[values]
+    per_byte = 8 // bits
+    padding = (-len(codes)) % per_byte
+    if padding:
+        codes = np.concatenate((codes, np.zeros(padding, dtype=np.uint8)))
+    codes = codes.reshape(-1, per_byte)
+
+    packed = np.zeros(len(codes), dtype=np.uint8)
+    for slot in range(per_byte):
+        packed |= codes[:, slot] << (8 - bits * (slot + 1))
+    return packed.tobytes()
+
+
+def _lower_case_runs(values: np.ndarray) -> np.ndarray:
+    """(start, exclusive end) of every run of lower case symbols in values."""
+    lower = (values & LOWER_CASE_BIT).astype(bool)
+    edges = np.flatnonzero(np.diff(np.concatenate(([False], lower, [False])).astype(np.int8)))
+    return edges.reshape(-1, 2).astype(np.int64)
+
+
+def _joined_runs(runs: list) -> np.ndarray | None:
+    """Concatenates the lower case runs of consecutive chunks, joining the runs cut by the edge between chunks."""
+    if not runs:
+        return None
+    edges = np.concatenate(runs).ravel()
+    cut = np.flatnonzero(edges[1:-1:2] == edges[2::2]) * 2 + 1
+    edges = np.delete(edges, np.concatenate((cut, cut + 1)))
+    return edges.reshape(-1, 2) if len(edges) else None
+
+
+class CompactSequence:
+    """
+    Byte backed alternative to the str based Sequence classes.
+
+    Nucleotide sequences made of the four unambiguous bases are packed 2 bits per base (4x smaller than a str), other
+    IUPAC nucleotide sequences 4 bits per base, and anything else is kept as one byte per residue. Lower case
+    (soft masked) stretches are stored separately as runs, so packing loses nothing. Slicing unpacked storage returns
+    a memoryview backed slice without copying.
+
+    Subclasses register as virtual subclasses of DNA, RNA and Protein, so the isinstance checks of the analysis
+    methods accept them. Analyses read them through as_buffer()/as_bytes().
+    """
+    __slots__ = ("_data", "_length", "_bits", "_masks")
+
+    # Alphabet used for 2-bit packing, None disables packing.
+    two_bit_alphabet: bytes | None = None
+
+    # Maps DNA, RNA and Protein onto their compact counterparts, see same_storage().
+    storage_types: dict = {}
+
+    def __init__(self, sequence):
+        data = _to_buffer(sequence)
+        self._data = data
+        self._length = len(data)
+        self._bits = 8
+        self._masks = None
+
+        if self.two_bit_alphabet is not None and self._length:
+            self._pack(np.frombuffer(data, dtype=np.uint8))
+
+    @classmethod
+    def from_bytes(cls, data: bytes):
+        return cls(data)
+
+    @classmethod
+    def from_chunks(cls, chunks: Iterable[bytes]):
+        """
+        Packs a sequence given as consecutive chunks of its bytes (see FileHandler.iter_sequence_chunks()) into the
+        same sequence as cls(b"".join(chunks)), without ever holding it unpacked. Each chunk is packed as it arrives.
+        When a chunk needs more bits per base than the chunks before it, such as an N gap after ACGT only chunks, the
+        bases packed so far are repacked at the wider width WIDEN_BASES at a time.
+        """
+        bits = 8 if cls.two_bit_alphabet is None else 2
+        packed = bytearray()
+        runs = []
+        length = 0
+        carry = b""
+
+        for chunk in chunks:
+            data = carry + bytes(chunk) if carry else chunk
+            values = np.frombuffer(data, dtype=np.uint8)
+            needed = cls._packing_bits(values)
+            if needed > bits:
+                packed, runs = cls._widened(packed, runs, length, bits, needed)
+                bits = needed
+
+            # Bases that do not fill a whole byte wait for the next chunk.
+            full = len(values) - len(values) % (8 // bits)
+            if bits == 8:
+                packed += data
+            elif full:
+                packed += _encode(values[:full], bits, cls._alphabet(bits))
+                runs.append(_lower_case_runs(values[:full]) + length)
+            carry = values[full:].tobytes()
+            length += full
+
+        if carry:
+            values = np.frombuffer(carry, dtype=np.uint8)
+            packed += _encode(values, bits, cls._alphabet(bits))
+            runs.append(_lower_case_runs(values) + length)
+            length += len(carry)
+
+        if not length:
+            return cls(b"")
+        instance = cls.__new__(cls)
+        instance._data = memoryview(packed).toreadonly()
+        instance._length = length
+        instance._bits = bits
+        instance._masks = _joined_runs(runs)
+        return instance
+
+    @classmethod
+    def _widened(cls, packed: bytearray, runs: list, length: int, bits: int, wider: int) -> tuple:
+        """Repacks the first length bases of packed from bits to wider bits per base. Returns the data and runs."""
+        current = cls.__new__(cls)
+        current._data = packed
+        current._length = length
+        current._bits = bits
+        current._masks = _joined_runs(runs)
+
+        widened = bytearray()
+        for start in range(0, length, WIDEN_BASES):
+            values = np.frombuffer(current._unpack(start, min(start + WIDEN_BASES, length)), dtype=np.uint8)
+            widened += values.tobytes() if wider == 8 else _encode(values, wider, cls._alphabet(wider))
+        # Unpacked storage keeps lower case in the bytes themselves.
+        return widened, [] if wider == 8 else runs
+
+    @classmethod
+    def _packing_bits(cls, values: np.ndarray) -> int:
+        """Fewest bits per base that hold every symbol in values: 2, 4, or 8 when they cannot be packed."""
+        if cls.two_bit_alphabet is None:
+            return 8
+        present = np.flatnonzero(np.bincount(values, minlength=256))
+        for bits in (2, 4):
+            if (_encoder(cls._alphabet(bits))[present] != UNKNOWN_CODE).all():
+                return bits
+        return 8
+
+    @classmethod
+    def _alphabet(cls, bits: int) -> bytes:
+        return cls.two_bit_alphabet if bits == 2 else IUPAC_NIBBLE_ALPHABET
+
+    @classmethod
+    def _unpacked(cls, data: bytes | memoryview):
+        """Wraps already unpacked bytes without scanning or copying them."""
+        instance = cls.__new__(cls)
+        instance._data = data
+        instance._length = len(data)
+        instance._bits = 8
+        instance._masks = None
+        return instance
+
+    @property
+    def bits_per_residue(self) -> int:
+        return self._bits
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes used to store the sequence, including soft mask runs."""
+        return len(self._data) + (self._masks.nbytes if self._masks is not None else 0)
+
+    def as_buffer(self) -> bytes | memoryview:
+        """Returns the ASCII bytes of the sequence, without copying when the storage is unpacked."""
+        if self._bits == 8:
+            return self._data
+        return self._unpack(0, self._length)
+
+    def as_bytes(self) -> bytes:
+        return bytes(self.as_buffer())
+
+    def iter_chunks(self, chunk_bases: int) -> Iterator[bytes | memoryview]:
+        """Yields the ASCII bytes of the sequence chunk_bases at a time, unpacking only the chunk being read."""
+        for start in range(0, self._length, chunk_bases):
+            yield self._slice_bytes(start, min(start + chunk_bases, self._length))
+
+    def __bytes__(self) -> bytes:
+        return self.as_bytes()
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, key):
+        if isinstance(key, int):
+            index = key + self._length if key < 0 else key
+            if not 0 <= index < self._length:
+                raise IndexError("sequence index out of range")
+            return chr(self._slice_bytes(index, index + 1)[0])
+
+        start, stop, step = key.indices(self._length)
+        if step != 1:
+            return type(self)(self.as_bytes()[key])
+        return type(self)._unpacked(self._slice_bytes(start, max(start, stop)))
+
+    def __str__(self) -> str:
+        return self.as_bytes().decode("latin-1")
+
+    def __repr__(self) -> str:
+        preview = bytes(self._slice_bytes(0, min(self._length, 20))).decode("latin-1")
+        suffix = "..." if self._length > 20 else ""
+        return f"{type(self).__name__}('{preview}{suffix}', length={self._length}, bits={self._bits})"
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, str):
+            return len(other) == self._length and str(self) == other
+        if isinstance(other, CompactSequence):
+            return self.as_bytes() == other.as_bytes()
+        if isinstance(other, (bytes, bytearray, memoryview)):
+            return self.as_bytes() == bytes(other)
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        # Equal to the str it represents, so it must hash like it.
+        return hash(str(self))
+
+    def __reduce__(self):
+        return type(self), (self.as_bytes(),)
+
+    def count(self, sub: str | bytes) -> int:
+        return self.as_bytes().count(sub.encode("latin-1") if isinstance(sub, str) else sub)
+
+    def upper(self):
+        return type(self)(self.as_bytes().upper())
+
+    def lower(self):
+        return type(self)(self.as_bytes().lower())
+
+    def _pack(self, values: np.ndarray):
+        """Packs the sequence 2 or 4 bits per base when every symbol allows it, recording lower case runs."""
+        bits = self._packing_bits(values)
+        if bits == 8:
+            return
+
+        runs = _lower_case_runs(values)
+        self._masks = runs if len(runs) else None
+        self._data = _encode(values, bits, self._alphabet(bits))
+        self._bits = bits
+
+    def _slice_bytes(self, start: int, stop: int) -> memoryview | bytes:
+        if self._bits == 8:
+            return memoryview(self._data)[start:stop]
+        return self._unpack(start, stop)
+
+    def _unpack(self, start: int, stop: int) -> bytes:
+        """Decodes the packed bases between start and stop back into ASCII, restoring soft masking."""
+        bits = self._bits
+        per_byte = 8 // bits
+        decoder = np.frombuffer(self._alphabet(bits), dtype=np.uint8)
+
+        packed = np.frombuffer(self._data, dtype=np.uint8)[start // per_byte:-(-stop // per_byte)]
+        shifts = np.arange(8 - bits, -1, -bits, dtype=np.uint8)
+        codes = ((packed[:, None] >> shifts) & ((1 << bits) - 1)).ravel()
+        offset = start % per_byte
+        values = decoder[codes[offset:offset + stop - start]]
+
+        if self._masks is not None:
+            runs = self._masks[(self._masks[:, 1] > start) & (self._masks[:, 0] < stop)]
+            if len(runs):
+                marks = np.zeros(stop - start + 1, dtype=np.int32)
+                np.add.at(marks, np.clip(runs[:, 0] - start, 0, None), 1)
+                np.add.at(marks, np.clip(runs[:, 1] - start, None, stop - start), -1)
+                values[np.cumsum(marks[:-1]) > 0] |= LOWER_CASE_BIT
+
+        return values.tobytes()
+
+
+class CompactDNA(CompactSequence):
+    __slots__ = ()
+    two_bit_alphabet = b"ACGT"
+
+
+class CompactRNA(CompactSequence):
+    __slots__ = ()
+    two_bit_alphabet = b"ACGU"
+
+
+class CompactProtein(CompactSequence):
+    __slots__ = ()
+
+
+DNA.register(CompactDNA)
+RNA.register(CompactRNA)
+Protein.register(CompactProtein)
+
+CompactSequence.storage_types = {DNA: CompactDNA, RNA: CompactRNA, Protein: CompactProtein}
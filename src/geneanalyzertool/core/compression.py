@@ -0,0 +1,297 @@
+import gzip
+import io
+import os
+import struct
+import zlib
+from bisect import bisect_left, bisect_right
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO, Iterator, List, TextIO, Tuple
+
+from geneanalyzertool.core.exceptions import SequenceParsingError
+
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+# Fixed part of a gzip member header: magic, method (deflate), flags, mtime, extra flags, OS and extra length.
+GZIP_HEADER = struct.Struct("<2sBBIBBH")
+GZIP_FEXTRA = 4
+DEFLATE = 8
+
+COMPRESSED_EXTENSIONS = (".gz", ".bgz", ".bgzf", ".zst", ".zstd")
+
+# zlib releases the GIL while inflating, so BGZF blocks decompress in parallel on threads. One task inflates this
+# many consecutive blocks (about 1 MiB of output) to keep the scheduling overhead small.
+DEFAULT_THREADS = min(4, os.cpu_count() or 1)
+BLOCKS_PER_TASK = 16
+TASKS_IN_FLIGHT_PER_THREAD = 2
+
+
+def detect_compression(path: str) -> str | None:
+    """Returns "bgzf", "gzip" or "zstd" from the magic bytes of a file, or None if it is not compressed."""
+    if not os.path.isfile(path):
+        # Pipes and other special files cannot be peeked at without consuming their data.
+        return None
+
+    with open(path, "rb") as handle:
+        header = handle.read(GZIP_HEADER.size + 6)
+
+    if header.startswith(ZSTD_MAGIC):
+        return "zstd"
+    if header.startswith(GZIP_MAGIC):
+        return "bgzf" if _is_bgzf_header(header) else "gzip"
+    return None
+
+
+def strip_compression_extension(path: str) -> str:
+    """Removes a compression extension, so genome.fa.gz becomes genome.fa."""
+    for extension in COMPRESSED_EXTENSIONS:
+        if path.lower().endswith(extension):
+            return path[:-len(extension)]
+    return path
+
+
+def open_binary(path: str, threads: int = DEFAULT_THREADS) -> BinaryIO:
+    """
+    Opens a plain, gzip, BGZF or zstd compressed file for reading, decompressing it on the fly. The compression is
+    detected from the file contents, not its name. BGZF files are decompressed by threads worker threads.
+    """
+    compression = detect_compression(path)
+    if compression == "bgzf":
+        return io.BufferedReader(BgzfReader(path, threads), buffer_size=1024 * 1024)
+    if compression == "gzip":
+        return gzip.open(path, "rb")
+    if compression == "zstd":
+        return io.BufferedReader(_open_zstd(path), buffer_size=1024 * 1024)
+    return open(path, "rb")
+
+
+def open_text(path: str, threads: int = DEFAULT_THREADS) -> TextIO:
+    """Text mode counterpart of open_binary()."""
+    if detect_compression(path) is None:
+        return open(path)
+    return io.TextIOWrapper(open_binary(path, threads))
+
+
+def inflate_block(block: bytes | memoryview) -> bytes:
+    """Decompresses one raw BGZF block and checks it against the block's CRC32 and size."""
+    xlen = GZIP_HEADER.unpack_from(block)[-1]
+    try:
+        data = zlib.decompress(memoryview(block)[GZIP_HEADER.size + xlen:-8], wbits=-15)
+    except zlib.error as e:
+        raise SequenceParsingError(f"Error: Corrupt BGZF block. {e}")
+    crc, size = struct.unpack_from("<II", block, len(block) - 8)
+    if len(data) != size or zlib.crc32(data) != crc:
+        raise SequenceParsingError("Error: Corrupt BGZF block, the CRC or size does not match.")
+    return data
+
+
+def read_block(handle: BinaryIO) -> bytes | None:
+    """Reads the next raw (still compressed) BGZF block from handle, None at the end of the file."""
+    header = handle.read(GZIP_HEADER.size)
+    if not header:
+        return None
+    block_size, extra = _block_size(header, handle.read)
+
+    block = header + extra + handle.read(block_size - len(header) - len(extra))
+    if len(block) != block_size:
+        raise SequenceParsingError("Error: Truncated BGZF block.")
+    return block
+
+
+def inflate_blocks(blocks: Iterator[bytes], pool: ThreadPoolExecutor | None, threads: int) -> Iterator[bytes]:
+    """Decompresses a stream of raw BGZF blocks, in parallel when a pool is given. Output keeps the input order."""
+    if pool is None:
+        for block in blocks:
+            yield inflate_block(block)
+        return
+
+    pending = deque()
+    while batch := [block for _, block in zip(range(BLOCKS_PER_TASK), blocks)]:
+        pending.append(pool.submit(_inflate_batch, batch))
+        while len(pending) >= threads * TASKS_IN_FLIGHT_PER_THREAD:
+            yield pending.popleft().result()
+
+    while pending:
+        yield pending.popleft().result()
+
+
+class BgzfReader(io.RawIOBase):
+    """
+    Sequential reader of a BGZF (bgzip) file. BGZF is a series of independent gzip members of at most 64 KiB,
+    so the blocks are read in order and inflated by a pool of threads ahead of the consumer.
+    """
+
+    def __init__(self, path: str, threads: int = DEFAULT_THREADS):
+        self._handle = open(path, "rb")
+        self._threads = max(threads, 1)
+        self._pool = ThreadPoolExecutor(self._threads) if self._threads > 1 else None
+        self._chunks = inflate_blocks(iter(lambda: read_block(self._handle), None), self._pool, self._threads)
+        self._buffer = memoryview(b"")
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not len(self._buffer):
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return 0
+            self._buffer = memoryview(chunk)
+
+        size = min(len(buffer), len(self._buffer))
+        buffer[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return size
+
+    def close(self):
+        if not self.closed:
+            self._chunks.close()
+            if self._pool is not None:
+                self._pool.shutdown(cancel_futures=True)
+            self._handle.close()
+        super().close()
+
+
+def gzi_path(path: str) -> str:
+    """Path of the .gzi index that belongs to a BGZF file."""
+    return path + ".gzi"
+
+
+def build_gzi(path: str) -> List[Tuple[int, int]]:
+    """
+    Scans the block headers of a BGZF file and returns the (compressed offset, uncompressed offset) of every block
+    but the first, as in the bgzip/htslib .gzi index. Only headers and size trailers are read, nothing is inflated.
+    """
+    entries = []
+    compressed = uncompressed = 0
+    with open(path, "rb") as handle:
+        while header := handle.read(GZIP_HEADER.size):
+            block_size, _ = _block_size(header, handle.read)
+            handle.seek(compressed + block_size - 4)
+            trailer = handle.read(4)
+            if len(trailer) != 4:
+                raise SequenceParsingError(f"Error: Truncated BGZF block in {path}.")
+
+            compressed += block_size
+            uncompressed += struct.unpack("<I", trailer)[0]
+            entries.append((compressed, uncompressed))
+
+    # The last entry points past the final block, it is not a block start.
+    return entries[:-1]
+
+
+def write_gzi(entries: List[Tuple[int, int]], gzi_file: str):
+    """Writes a bgzip compatible .gzi index: the entry count followed by offset pairs, all little endian uint64."""
+    with open(gzi_file, "wb") as out:
+        out.write(struct.pack("<Q", len(entries)))
+        out.write(b"".join(struct.pack("<QQ", *entry) for entry in entries))
+
+
+def read_gzi(gzi_file: str) -> List[Tuple[int, int]]:
+    """Reads a bgzip .gzi index."""
+    with open(gzi_file, "rb") as handle:
+        data = handle.read()
+    if len(data) < 8 or len(data) != 8 + 16 * struct.unpack_from("<Q", data)[0]:
+        raise SequenceParsingError(f"Error: Malformed BGZF index {gzi_file}.")
+    return list(struct.iter_unpack("<QQ", data[8:]))
+
+
+class BgzfRandomAccess:
+    """
+    Random access to the uncompressed contents of a BGZF file through its .gzi index. The index is reused when it
+    is newer than the file and (re)built otherwise. A read only inflates the blocks overlapping the requested range.
+    """
+
+    def __init__(self, path: str, threads: int = DEFAULT_THREADS, rebuild: bool = False):
+        self.path = path
+        gzi_file = gzi_path(path)
+
+        if not rebuild and os.path.exists(gzi_file) and os.path.getmtime(gzi_file) >= os.path.getmtime(path):
+            entries = read_gzi(gzi_file)
+        else:
+            entries = build_gzi(path)
+            try:
+                write_gzi(entries, gzi_file)
+            except OSError:
+                pass
+
+        self._compressed = [0] + [entry[0] for entry in entries]
+        self._uncompressed = [0] + [entry[1] for entry in entries]
+        self._threads = max(threads, 1)
+        self._pool = None
+        self._handle = open(path, "rb")
+
+    def read(self, start: int, end: int) -> bytes:
+        """Returns the uncompressed bytes between start and exclusive end."""
+        if start >= end:
+            return b""
+
+        first = bisect_right(self._uncompressed, start) - 1
+        last = bisect_left(self._uncompressed, end)
+        self._handle.seek(self._compressed[first])
+        raw = self._handle.read(self._compressed[last] - self._compressed[first] if last < len(self._compressed) else -1)
+
+        stream = io.BytesIO(raw)
+        blocks = iter(lambda: read_block(stream), None)
+        # Short reads are inflated inline, a pool only pays off for ranges spanning many blocks.
+        parallel = self._threads > 1 and last - first > BLOCKS_PER_TASK
+        if parallel and self._pool is None:
+            self._pool = ThreadPoolExecutor(self._threads)
+        data = b"".join(inflate_blocks(blocks, self._pool if parallel else None, self._threads))
+
+        offset = start - self._uncompressed[first]
+        return data[offset:offset + end - start]
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+        self._handle.close()
+
+
+def _inflate_batch(blocks: List[bytes]) -> bytes:
+    return b"".join(inflate_block(block) for block in blocks)
+
+
+def _is_bgzf_header(header: bytes) -> bool:
+    if len(header) < GZIP_HEADER.size:
+        return False
+    _, method, flags, _, _, _, xlen = GZIP_HEADER.unpack_from(header)
+    extra = header[GZIP_HEADER.size:GZIP_HEADER.size + xlen]
+    return method == DEFLATE and bool(flags & GZIP_FEXTRA) and _bc_subfield(extra) is not None
+
+
+def _bc_subfield(extra: bytes) -> int | None:
+    """Returns the BSIZE value of the BGZF "BC" extra subfield, None if the gzip extra field has none."""
+    position = 0
+    while position + 4 <= len(extra):
+        subfield_id = extra[position:position + 2]
+        length = struct.unpack_from("<H", extra, position + 2)[0]
+        if subfield_id == b"BC" and length == 2 and position + 6 <= len(extra):
+            return struct.unpack_from("<H", extra, position + 4)[0]
+        position += 4 + length
+    return None
+
+
+def _block_size(header: bytes, read) -> Tuple[int, bytes]:
+    """Validates a BGZF block header, reading its extra field through read. Returns the block size and extra field."""
+    if len(header) < GZIP_HEADER.size:
+        raise SequenceParsingError("Error: Truncated BGZF block header.")
+    magic, method, flags, _, _, _, xlen = GZIP_HEADER.unpack_from(header)
+    if magic != GZIP_MAGIC or method != DEFLATE or not flags & GZIP_FEXTRA:
+        raise SequenceParsingError("Error: Not a BGZF file. Recompress it with bgzip.")
+
+    extra = read(xlen)
+    bsize = _bc_subfield(extra)
+    if bsize is None:
+        raise SequenceParsingError("Error: Not a BGZF file. Recompress it with bgzip.")
+    return bsize + 1, extra
+
+
+def _open_zstd(path: str) -> BinaryIO:
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError("Reading zstd compressed files requires zstandard. "
+                          "Install it with: pip install 'geneanalyzertool[zstd]'")
+    return zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True)
@@ -0,0 +1,202 @@
+from itertools import islice
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, List, Tuple
+
+from geneanalyzertool.analysis.analysis import ALL_METHODS, AnalysisReport
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# "text" is the human readable report written by the analysis classes themselves, the others are tables.
+EXPORT_FORMATS = ("text", "tsv", "jsonl", "parquet")
+
+ORF_COLUMNS = ("sequence", "orf_id", "start", "end", "strand", "length")
+MOTIF_COLUMNS = ("sequence", "hit_id", "motif", "start", "end", "strand", "length", "cut", "site")
+WINDOW_COLUMNS = ("sequence", "start", "end", "gc_percent")
+VALUE_COLUMNS = ("sequence", "method", "field", "value")
+
+# Rows are collected into chunks of this size and each chunk is written with one bulk write, so output of any
+# size streams to disk with bounded memory.
+CHUNK_ROWS = 100_000
+
+# Buffer size of text outputs. Large buffers turn many small record writes into few large ones.
+WRITE_BUFFER_BYTES = 1024 * 1024
+
+
+def orf_rows(sequence_name: str, orf_result: dict) -> Iterator[tuple]:
+    """Flattens the ORF finder result of one record into (sequence, orf_id, start, end, strand, length) rows."""
+    for orf_id, orf in orf_result["ORFS"].items():
+        yield sequence_name, orf_id, orf["Start"], orf["End"], orf["Strand"], orf["Length"]
+
+
+def motif_rows(sequence_name: str, motif_result: dict) -> Iterator[tuple]:
+    """
+    Flattens the motif search result of one record into (sequence, hit_id, motif, start, end, strand, length, cut,
+    site) rows. cut is None for motifs without a cut site.
+    """
+    for hit_id, hit in motif_result["Hits"].items():
+        yield (sequence_name, hit_id, hit["Motif"], hit["Start"], hit["End"], hit["Strand"], hit["Length"],
+               hit.get("Cut"), hit["Sequence"])
+
+
+def window_rows(sequence_name: str, windows: List[dict]) -> Iterator[tuple]:
+    """Flattens the GC windows of one record into (sequence, start, end, gc_percent) rows, like a bedGraph track."""
+    for window in windows:
+        yield sequence_name, window["Start"], window["End"], window["GC Percent"]
+
+
+def value_rows(sequence_name: str, method: str, result: Any) -> Iterator[tuple]:
+    """
+    Flattens the result of one method into (sequence, method, field, value) rows. Nested dictionaries and lists are
+    flattened into dotted field paths, e.g. "Counts.A" or "GC Windows.0.GC Percent". Scalar results use the field
+    "value".
+    """
+    for field, value in _flatten(result):
+        yield sequence_name, method, field or "value", value if isinstance(value, (int, float)) else str(value)
+
+
+def result_rows(result_stream: Iterable[Tuple[str, Any]],
+                analysis_method: str | List[str] | None) -> Tuple[Tuple[str, ...], Iterator[tuple]]:
+    """
+    Turns a stream of (record id, result) pairs into table rows. ORF finder runs produce one row per ORF, motif
+    searches one row per hit, GC windows one row per window, every other run (including several methods at once)
+    produces one row per reported value.
+
+    Returns:
+        The column names and a lazy iterator of rows
+    """
+    if analysis_method == "orf":
+        return ORF_COLUMNS, (row for name, result in result_stream for row in orf_rows(name, result))
+    if analysis_method == "motif_search":
+        return MOTIF_COLUMNS, (row for name, result in result_stream for row in motif_rows(name, result))
+    if analysis_method == "gc_windows":
+        return WINDOW_COLUMNS, (row for name, result in result_stream for row in window_rows(name, result))
+
+    def rows():
+        for name, result in result_stream:
+            if isinstance(result, AnalysisReport):
+                for method, method_result in result.items():
+                    yield from value_rows(name, method, method_result)
+            else:
+                method = analysis_method if isinstance(analysis_method, str) and analysis_method != ALL_METHODS \
+                    else "result"
+                yield from value_rows(name, method, result)
+
+    return VALUE_COLUMNS, rows()
+
+
+def write_results(result_stream: Iterable[Tuple[str, Any]], out_file: str, out_format: str,
+                  analysis_method: str | List[str] | None = None, chunk_rows: int = CHUNK_ROWS) -> int:
+    """
+    Writes analysis results to out_file as a TSV, JSON lines or Parquet table.
+
+    Args:
+        result_stream: (record id, result) pairs, may be a lazy stream
+        out_file: Output path
+        out_format: tsv, jsonl or parquet
+        analysis_method: The method(s) that produced the results, used to pick the table layout and label rows
+        chunk_rows: Number of rows collected before they are written in one go
+
+    Returns:
+        Number of rows written
+    """
+    # pandas is only needed for table output and is slow to import, so it is not imported with the module.
+    import pandas as pd
+
+    columns, rows = result_rows(result_stream, analysis_method)
+    writers = {"tsv": _TsvWriter, "jsonl": _JsonlWriter, "parquet": _ParquetWriter}
+    if out_format not in writers:
+        raise ValueError(f"Unsupported export format {out_format}. Choose one of {', '.join(EXPORT_FORMATS)}.")
+
+    written = 0
+    with writers[out_format](out_file, columns) as writer:
+        while chunk := list(islice(rows, chunk_rows)):
+            writer.write(pd.DataFrame.from_records(chunk, columns=columns))
+            written += len(chunk)
+    return written
+
+
+def _flatten(value: Any, prefix: str = "") -> Iterator[Tuple[str, Any]]:
+    if isinstance(value, dict):
+        items = value.items()
+    elif isinstance(value, list):
+        items = enumerate(value)
+    else:
+        yield prefix, value
+        return
+
+    for key, item in items:
+        yield from _flatten(item, f"{prefix}.{key}" if prefix else str(key))
+
+
+class _TableWriter:
+    """Writes a table chunk by chunk. The header (or schema) is written even if no rows follow."""
+
+    def __init__(self, out_file: str, columns: Tuple[str, ...]):
+        self.out_file = out_file
+        self.columns = columns
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def write(self, frame: "pd.DataFrame"):
+        raise NotImplementedError("Subclasses must implement this method.")
+
+    def close(self):
+        raise NotImplementedError("Subclasses must implement this method.")
+
+
+class _TsvWriter(_TableWriter):
+    def __init__(self, out_file: str, columns: Tuple[str, ...]):
+        super().__init__(out_file, columns)
+        self._out = open(out_file, "w", newline="", buffering=WRITE_BUFFER_BYTES)
+        self._out.write("\t".join(columns) + "\n")
+
+    def write(self, frame: "pd.DataFrame"):
+        frame.to_csv(self._out, sep="\t", header=False, index=False)
+
+    def close(self):
+        self._out.close()
+
+
+class _JsonlWriter(_TableWriter):
+    def __init__(self, out_file: str, columns: Tuple[str, ...]):
+        super().__init__(out_file, columns)
+        self._out = open(out_file, "w", buffering=WRITE_BUFFER_BYTES)
+
+    def write(self, frame: "pd.DataFrame"):
+        # Object columns keep the JSON type of every value, so mixed number and text values survive.
+        self._out.write(frame.to_json(orient="records", lines=True))
+
+    def close(self):
+        self._out.close()
+
+
+class _ParquetWriter(_TableWriter):
+    """Appends every chunk as a row group of one Parquet file. Needs the optional pyarrow dependency."""
+
+    def __init__(self, out_file: str, columns: Tuple[str, ...]):
+        super().__init__(out_file, columns)
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Parquet export requires pyarrow. Install it with: pip install 'geneanalyzertool[parquet]'")
+
+        self._pa = pa
+        integer_columns = {"start", "end", "length", "cut"} if columns != VALUE_COLUMNS else set()
+        self._schema = pa.schema([(column, pa.int64() if column in integer_columns else
+                                   pa.float64() if column == "gc_percent" else pa.string())
+                                  for column in columns])
+        self._writer = pq.ParquetWriter(out_file, self._schema)
+
+    def write(self, frame: "pd.DataFrame"):
+        if "value" in frame:
+            # Values of different methods mix numbers and text; Parquet columns need a single type.
+            frame["value"] = frame["value"].astype(str)
+        self._writer.write_table(self._pa.Table.from_pandas(frame, schema=self._schema, preserve_index=False))
+
+    def close(self):
+        self._writer.close()
@@ -0,0 +1,223 @@
+import mmap
+import os
+import re
+from typing import Dict, List, NamedTuple, Tuple
+
+from geneanalyzertool.core.compression import BgzfRandomAccess, detect_compression, open_binary
+from geneanalyzertool.core.exceptions import SequenceParsingError
+
+REGION_PATTERN = re.compile(r"^(?P<name>.+?):(?P<start>[\d,]+)(?:-(?P<end>[\d,]+))?$")
+
+
+class FaiEntry(NamedTuple):
+    """One line of a samtools compatible .fai index."""
+    name: str
+    length: int
+    offset: int
+    line_bases: int
+    line_width: int
+
+
+def index_path(fasta_file: str) -> str:
+    """Path of the .fai index that belongs to a FASTA file."""
+    return fasta_file + ".fai"
+
+
+def build_fai(fasta_file: str) -> List[FaiEntry]:
+    """
+    Scans a FASTA file once and returns its samtools compatible index entries. Every line of a record except the
+    last must hold the same number of bases, otherwise random access would be ambiguous and an error is raised.
+    Compressed files are indexed by their uncompressed offsets, as samtools does for bgzip files.
+    """
+    entries = []
+    name = None
+    offset = 0
+
+    def finish_record():
+        entries.append(FaiEntry(name, length, seq_offset, line_bases or 0, line_width or 0))
+
+    with open_binary(fasta_file) as handle:
+        for line in handle:
+            line_len = len(line)
+
+            if line.startswith(b">"):
+                if name is not None:
+                    finish_record()
+                header = line[1:].split(None, 1)
+                if not header:
+                    raise SequenceParsingError(f"Error: Empty FASTA header at byte {offset} of {fasta_file}.")
+                # Record names are decoded like the parser does, so any header byte round trips.
+                name = header[0].decode("latin-1")
+                seq_offset = offset + line_len
+                length = 0
+                line_bases = line_width = None
+                last_line_seen = False
+
+            else:
+                bases = len(line.rstrip(b"\r\n"))
+                if name is None:
+                    if bases:
+                        raise SequenceParsingError(f"Error: {fasta_file} does not start with a FASTA header.")
+                elif bases:
+                    if last_line_seen:
+                        raise SequenceParsingError(f"Error: Different line lengths in sequence '{name}' of {fasta_file}.")
+                    if line_bases is None:
+                        line_bases, line_width = bases, line_len
+                    elif bases > line_bases:
+                        raise SequenceParsingError(f"Error: Different line lengths in sequence '{name}' of {fasta_file}.")
+                    elif bases < line_bases or line_len != line_width:
+                        last_line_seen = True
+                    length += bases
+                elif line_bases is not None:
+                    last_line_seen = True
+
+            offset += line_len
+
+    if name is not None:
+        finish_record()
+
+    return entries
+
+
+def write_fai(entries: List[FaiEntry], fai_file: str):
+    """Writes index entries in the samtools .fai format."""
+    with open(fai_file, "w", encoding="latin-1") as out:
+        out.writelines(f"{entry.name}\t{entry.length}\t{entry.offset}\t{entry.line_bases}\t{entry.line_width}\n"
+                       for entry in entries)
+
+
+def read_fai(fai_file: str) -> List[FaiEntry]:
+    """Reads a samtools .fai index."""
+    entries = []
+    with open(fai_file, encoding="latin-1") as handle:
+        for line in handle:
+            fields = line.rstrip("\n").split("\t")
+            if len(fields) < 5:
+                raise SequenceParsingError(f"Error: Malformed FASTA index line in {fai_file}: {line.strip()}")
+            entries.append(FaiEntry(fields[0], *(int(field) for field in fields[1:5])))
+    return entries
+
+
+class FastaIndex:
+    """
+    Random access to the records of a FASTA file through a samtools compatible .fai index. The index is reused when
+    it is newer than the FASTA file and (re)built otherwise. Sequences are sliced straight out of a memory map of
+    the file, so fetching a record or a region never parses the rest of the file. bgzip compressed files are read
+    through their .gzi block index instead, inflating only the blocks that hold the requested bases.
+
+    Usage:
+        with FastaIndex("genome.fasta") as index:
+            index.fetch_region("chr1:10000-20000")
+    """
+
+    def __init__(self, fasta_file: str, rebuild: bool = False):
+        self.fasta_file = fasta_file
+        fai_file = index_path(fasta_file)
+
+        if not rebuild and os.path.exists(fai_file) and os.path.getmtime(fai_file) >= os.path.getmtime(fasta_file):
+            entries = read_fai(fai_file)
+        else:
+            entries = build_fai(fasta_file)
+            try:
+                write_fai(entries, fai_file)
+            except OSError:
+                # Read only locations still get an in-memory index.
+                pass
+
+        self.entries: Dict[str, FaiEntry] = {entry.name: entry for entry in entries}
+        self._handle = None
+        self._map = None
+        self._bgzf = None
+
+        compression = detect_compression(fasta_file)
+        if compression == "bgzf":
+            self._bgzf = BgzfRandomAccess(fasta_file, rebuild=rebuild)
+        elif compression is not None:
+            raise SequenceParsingError(f"Error: {fasta_file} is {compression} compressed, which does not allow random "
+                                       f"access. Recompress it with bgzip to use an index.")
+        else:
+            self._handle = open(fasta_file, "rb")
+            if os.path.getsize(fasta_file):
+                self._map = mmap.mmap(self._handle.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.entries
+
+    @property
+    def names(self) -> List[str]:
+        """Record names in file order."""
+        return list(self.entries)
+
+    def length(self, name: str) -> int:
+        """Number of bases in a record."""
+        return self._entry(name).length
+
+    def fetch(self, name: str, start: int = 0, end: int | None = None) -> str:
+        """
+        Returns the bases of a record between 0-based start and exclusive end. The end is clipped to the length
+        of the record and omitting it fetches up to the end of the record.
+        """
+        return self.fetch_bytes(name, start, end).decode("latin-1")
+
+    def fetch_bytes(self, name: str, start: int = 0, end: int | None = None) -> bytes:
+        """Like fetch(), but returns the bases as bytes, as the native parser does."""
+        entry = self._entry(name)
+        end = entry.length if end is None else min(end, entry.length)
+        if start < 0 or start > end:
+            raise SequenceParsingError(f"Error: Invalid range {start}-{end} for sequence '{name}'.")
+        if start == end:
+            return b""
+
+        first = self._byte_offset(entry, start)
+        last = self._byte_offset(entry, end - 1) + 1
+        chunk = self._bgzf.read(first, last) if self._bgzf is not None else self._map[first:last]
+        if entry.line_width != entry.line_bases:
+            chunk = chunk.replace(b"\n", b"").replace(b"\r", b"")
+        return chunk
+
+    def fetch_region(self, region: str) -> str:
+        """Returns the bases of a samtools style region: name, name:start or name:start-end (1-based, inclusive)."""
+        name, start, end = self.parse_region(region)
+        return self.fetch(name, start, end)
+
+    def parse_region(self, region: str) -> Tuple[str, int, int | None]:
+        """Converts a samtools style region into a record name, 0-based start and exclusive end."""
+        if region in self.entries:
+            return region, 0, None
+
+        match = REGION_PATTERN.match(region)
+        if match is None or match.group("name") not in self.entries:
+            raise SequenceParsingError(f"Error: Sequence '{region}' not found in {self.fasta_file}.")
+
+        start = int(match.group("start").replace(",", ""))
+        end = int(match.group("end").replace(",", "")) if match.group("end") else None
+        if start < 1 or (end is not None and end < start):
+            raise SequenceParsingError(f"Error: Invalid region '{region}'.")
+        return match.group("name"), start - 1, end
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+        if self._handle is not None:
+            self._handle.close()
+        if self._bgzf is not None:
+            self._bgzf.close()
+
+    def _entry(self, name: str) -> FaiEntry:
+        try:
+            return self.entries[name]
+        except KeyError:
+            raise SequenceParsingError(f"Error: Sequence '{name}' not found in {self.fasta_file}.")
+
+    @staticmethod
+    def _byte_offset(entry: FaiEntry, position: int) -> int:
+        return entry.offset + (position // entry.line_bases) * entry.line_width + position % entry.line_bases
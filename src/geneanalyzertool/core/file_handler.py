@@ -1,6 +1,12 @@
-from Bio import SeqIO
-from typing import List
+from itertools import chain, groupby
+from typing import Any, Iterable, Iterator, List, Tuple
+from geneanalyzertool.core.compression import detect_compression, open_text, strip_compression_extension
 from geneanalyzertool.core.exceptions import SequenceParsingError
+from geneanalyzertool.core.fasta_index import FastaIndex
+from geneanalyzertool.core.parser import (
+    DEFAULT_CHUNK_BASES, FASTQ_EXTENSIONS, PARSERS, parse_sequence_chunks, parse_sequences, sequence_format, split_chunks
+)
+from geneanalyzertool.core.selection import RecordSelection
 
 YELLOW = "\033[1;33m"
 GREEN = "\033[1;32m"
@@ -12,41 +18,180 @@ CYAN = "\033[1;36m"
 class FileHandler():
     """Handles file operations for GeneAnalyzer2 tool."""
 
-    def __init__(self):
-        pass
+    def __init__(self, parser: str = "native", selection: RecordSelection | None = None):
+        """
+        Args:
+            parser: "native" reads records with the lean parser in core/parser.py, "biopython" with Bio.SeqIO
+            selection: Only read the records of files it selects, without prompting, see selected_names()
+        """
+        if parser not in PARSERS:
+            raise ValueError(f"Unknown parser {parser}. Choose one of {', '.join(PARSERS)}.")
+        self.parser = parser
+        self.selection = selection
+        # Open FASTA indexes by file path, reused across lookups.
+        self._indexes = {}
+
+    def __getstate__(self) -> dict:
+        # Open indexes hold file handles and memory maps; copies sent to worker processes reopen them on demand.
+        state = self.__dict__.copy()
+        state["_indexes"] = {}
+        return state
+
+    def export_to_file(self, results: dict, sequence_keys: List[str], out_file: str, out_format: str = "text",
+                       analysis_method: str | List[str] | None = None):
+        raise NotImplementedError("Subclasses must implement this method.")
 
-    def export_to_file(self, results: dict, sequence_keys: List[str], out_file: str):
+    def export_stream(self, result_stream: Iterable[Tuple[str, Any]], out_file: str, out_format: str = "text",
+                      analysis_method: str | List[str] | None = None):
         raise NotImplementedError("Subclasses must implement this method.")
 
     def file_support_check(self, file: str) -> bool:
-        """Check if the file has a supported extension (.fna or .fasta)."""
-        if file.endswith(".fna") or file.endswith(".fasta"):
+        """Check if the file has a supported extension (.fna, .fa, .fasta or FASTQ, optionally .gz, .bgz or .zst compressed)."""
+        file = strip_compression_extension(file)
+        if file.endswith((".fna", ".fa", ".fasta") + FASTQ_EXTENSIONS):
             print('\033[1;33mOpening and parsing file...\033[0m')
             return True
         else:
-            print('\033[1;31mFile type not supported. Please select a .fna or .fasta file.\033[0m')
+            print('\033[1;31mFile type not supported. Please select a .fna, .fasta or .fastq file.\033[0m')
             return False
 
+    def iter_sequences(self, fasta_file: str) -> Iterator[Tuple[str, Any]]:
+        """
+        Lazily yield (record id, sequence) pairs from a FASTA or FASTQ file, one record at a time. gzip, bgzip and
+        zstd compressed files are decompressed on the fly. The native parser yields sequences as bytes, the
+        Biopython parser as Seq objects. With a selection only the selected records are yielded, read through the
+        FASTA index as bytes when the file has one.
+        """
+        if self.selection is not None:
+            if self.indexable(fasta_file):
+                index = self.open_index(fasta_file)
+                for name in self.selected_names(fasta_file):
+                    yield name, index.fetch_bytes(name)
+                return
+            yield from ((name, sequence) for name, sequence in self._iter_all_sequences(fasta_file)
+                        if self.selection.matches(name, len(sequence)))
+            return
+
+        yield from self._iter_all_sequences(fasta_file)
+
+    def _iter_all_sequences(self, fasta_file: str) -> Iterator[Tuple[str, Any]]:
+        if self.parser == "native":
+            yield from parse_sequences(fasta_file)
+            return
+
+        # Biopython takes a noticeable share of start up time, so it is only imported when it is used.
+        from Bio import SeqIO
+
+        file_format = sequence_format(fasta_file)
+        if detect_compression(fasta_file) is None:
+            for record in SeqIO.parse(fasta_file, file_format):
+                yield record.id, record.seq
+            return
+
+        with open_text(fasta_file) as handle:
+            for record in SeqIO.parse(handle, file_format):
+                yield record.id, record.seq
+
+    def iter_sequence_chunks(self, fasta_file: str,
+                             chunk_bases: int = DEFAULT_CHUNK_BASES) -> Iterator[Tuple[str, Iterator[bytes]]]:
+        """
+        Lazily yield (record id, chunks) pairs from a FASTA or FASTQ file, where chunks iterates over the bases of
+        the record chunk_bases at a time. Like itertools.groupby, the chunks of a record must be read before moving
+        on to the next record. The native parser never holds a whole record in memory. With a selection only the
+        selected records are yielded, sliced out of the FASTA index when the file has one.
+        """
+        if self.selection is not None and self.indexable(fasta_file):
+            index = self.open_index(fasta_file)
+            for name in self.selected_names(fasta_file):
+                # Empty records still get one (empty) chunk, as from the parsers.
+                yield name, (index.fetch_bytes(name, start, start + chunk_bases)
+                             for start in range(0, max(index.length(name), 1), chunk_bases))
+            return
+        if self.selection is not None and self.selection.by_length:
+            raise SequenceParsingError(f"Error: Selecting records by length in chunks needs the index of a FASTA "
+                                       f"file, which {fasta_file} cannot have. Leave out the chunk size.")
+
+        if self.parser == "native":
+            pieces = parse_sequence_chunks(fasta_file, chunk_bases)
+        else:
+            pieces = (piece for name, sequence in self.iter_sequences(fasta_file)
+                      for piece in split_chunks(name, str(sequence).encode("latin-1"), chunk_bases))
+
+        record = -1
+
+        def record_number(piece: Tuple[str, int, bytes]) -> int:
+            # Record ids may repeat, a chunk at offset 0 is what starts a new record.
+            nonlocal record
+            record += piece[1] == 0
+            return record
+
+        for _, group in groupby(pieces, key=record_number):
+            name, _, first = next(group)
+            if self.selection is None or self.selection.matches_id(name):
+                yield name, chain([first], (chunk for _, _, chunk in group))
+
     def read_sequences(self, fasta_file: str) -> dict:
         """Parse all sequences from a FASTA file into a dictionary."""
-        sequence_dict = {}
-        for record in SeqIO.parse(fasta_file, 'fasta'):
-            sequence_dict[record.id] = record.seq
-        return sequence_dict
+        return dict(self.iter_sequences(fasta_file))
 
-    def select_sequences(self, fasta_file: str, selection_func=input, max_attempts: int = 3):
-        """User-guided sequence selection with numbered options.
+    def open_index(self, fasta_file: str) -> FastaIndex:
+        """Returns the .fai backed index of a FASTA file, building it on first use and keeping it open."""
+        if fasta_file not in self._indexes:
+            self._indexes[fasta_file] = FastaIndex(fasta_file)
+        return self._indexes[fasta_file]
+
+    @staticmethod
+    def indexable(fasta_file: str) -> bool:
+        """Whether a FASTA index can be built for the file: an uncompressed or bgzip compressed FASTA file."""
+        return sequence_format(fasta_file) == "fasta" and detect_compression(fasta_file) in (None, "bgzf")
+
+    def selected_names(self, fasta_file: str) -> List[str]:
+        """
+        Ids of the records of an indexable file that the selection selects, in file order. Ids and lengths are
+        read from the .fai index, so no record is read to select it.
+        """
+        entries = self.open_index(fasta_file).entries.values()
+        return [entry.name for entry in entries if self.selection.matches(entry.name, entry.length)]
+
+    def fetch_sequences(self, fasta_file: str, regions: List[str]) -> Tuple[dict, list]:
+        """Fetch records or samtools style regions (chr1:10000-20000) through the FASTA index.
+
+        Args:
+            fasta_file: Path to the FASTA file.
+            regions: Record names or regions to fetch.
+
+        Returns:
+            Tuple[dict, list]: Sequences keyed by the requested region and the ordered list of keys.
+        """
+        index = self.open_index(fasta_file)
+        sequences = {region: index.fetch_region(region) for region in regions}
+        return sequences, list(sequences.keys())
+
+    def select_sequences(self, fasta_file: str, selection_func=input, max_attempts: int = 3, use_index: bool = False):
+        """User-guided sequence selection with numbered options, or the records of the selection if there is one.
 
         Args:
             fasta_file: Path to the FASTA file.
             selection_func: Function to get user input (can be mocked in tests).
             max_attempts: Maximum number of invalid attempts before raising an error.
+            use_index: List and load records through the .fai index, so only selected records are read.
 
         Returns:
             Tuple[dict, list]: Selected sequences dictionary and ordered list of keys.
         """
-        sequences = self.read_sequences(fasta_file)
-        keys = list(sequences.keys())
+        if self.selection is not None:
+            # Batch runs: no listing and no prompt.
+            sequences = dict(self.iter_sequences(fasta_file))
+            return sequences, list(sequences.keys())
+
+        if use_index:
+            index = self.open_index(fasta_file)
+            keys = index.names
+            fetch = index.fetch
+        else:
+            sequences = self.read_sequences(fasta_file)
+            keys = list(sequences.keys())
+            fetch = sequences.__getitem__
 
         print(YELLOW + "Available sequences:" + RESET)
         for idx, record_id in enumerate(keys, 1):
@@ -58,13 +203,13 @@ class FileHandler():
                                     ).strip().lower()
 
             if select == "all":
-                return sequences, keys
+                return {record_id: fetch(record_id) for record_id in keys}, keys
 
             if select.isdigit():
                 index = int(select) - 1
                 if 0 <= index < len(keys):
                     record_id = keys[index]
-                    seq = sequences[record_id]
+                    seq = fetch(record_id)
 
                     print(f"{YELLOW}Name:{GREEN} {record_id}{RESET}")
                     print(f"{YELLOW}Length:{RESET} {len(seq)}")
@@ -0,0 +1,73 @@
+import hashlib
+import json
+import os
+import pickle
+from typing import Any, Dict, Iterable, Tuple
+
+from geneanalyzertool.core.cache import CACHE_FORMAT
+
+# Manifests are written next to the output file they describe, with this suffix.
+MANIFEST_SUFFIX = ".manifest"
+
+
+def manifest_path(out_file: str) -> str:
+    """Path of the manifest that belongs to an output file."""
+    return out_file + MANIFEST_SUFFIX
+
+
+def record_digest(pieces: Iterable[Any]) -> str:
+    """SHA-256 of the bases of a record, given whole (as a single piece) or as consecutive chunks."""
+    digest = hashlib.sha256()
+    for piece in pieces:
+        digest.update(piece.encode("latin-1", errors="replace") if isinstance(piece, str) else bytes(piece))
+    return digest.hexdigest()
+
+
+class ResultManifest:
+    """
+    Record digests and results of the last run that wrote an output file, kept next to it so a re-run only
+    analyzes the records that were added or changed since (see analysis/incremental.py).
+
+    A manifest belongs to one configuration (mode, sequence type, methods and their options); results of any
+    other configuration, or of an older result format (see CACHE_FORMAT), are ignored. Manifests are pickled, like
+    the entries of the result cache.
+    """
+
+    def __init__(self, path: str, config: dict):
+        """
+        Args:
+            path: Manifest file, see manifest_path()
+            config: Everything the results depend on besides the records themselves
+        """
+        self.path = path
+        self.config = json.dumps({"format": CACHE_FORMAT, **config}, sort_keys=True, default=str)
+        # Digest and result of every record of the last run, by record id.
+        self.records: Dict[str, Tuple[str, Any]] = {}
+
+        if os.path.exists(path):
+            try:
+                with open(path, "rb") as handle:
+                    manifest = pickle.load(handle)
+            except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+                # Unreadable manifests only cost a full run.
+                return
+            if isinstance(manifest, dict) and manifest.get("config") == self.config:
+                self.records = manifest["records"]
+
+    def lookup(self, record_id: str, digest: str) -> Tuple[bool, Any]:
+        """Returns (True, result) if the record was analyzed by the last run and is unchanged, (False, None) if not."""
+        previous = self.records.get(record_id)
+        if previous is None or previous[0] != digest:
+            return False, None
+        return True, previous[1]
+
+    def save(self, records: Iterable[Tuple[str, str, Any]]):
+        """
+        Replaces the manifest with (record id, digest, result) triples of the current run. The file is written
+        next to its final path and moved over it, so an interrupted run never leaves a truncated manifest.
+        """
+        self.records = {record_id: (digest, result) for record_id, digest, result in records}
+        temporary = self.path + ".tmp"
+        with open(temporary, "wb") as handle:
+            pickle.dump({"config": self.config, "records": self.records}, handle, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary, self.path)
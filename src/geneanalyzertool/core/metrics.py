@@ -0,0 +1,185 @@
+import json
+import os
+import sys
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Iterable, Iterator, List, TypeVar
+
+# Output for profiles: "cprofile" writes a pstats file (python -m pstats, snakeviz), "sample" writes folded stacks
+# (flamegraph.pl, speedscope).
+PROFILE_MODES = ("cprofile", "sample")
+
+# Interval of the sampling profiler in seconds of CPU time.
+SAMPLE_INTERVAL = 0.005
+
+T = TypeVar("T")
+
+
+class RunMetrics:
+    """
+    Collects per stage wall and CPU time plus record and base counters over one run.
+
+    Stages nest: time spent in a stage entered while another one is running is only booked to the inner stage.
+    Results are produced lazily (an export loop pulls results, which pulls records from the parser), so with
+    exclusive times "export" covers writing alone, "analyze" the analysis alone and so on, and the stage times add
+    up to the time of the run.
+
+    Usage:
+        metrics = RunMetrics()
+        with metrics.stage("analyze"):
+            ...
+        metrics.write("metrics.json")
+    """
+
+    def __init__(self):
+        self.stages = {}
+        self.records = 0
+        self.bases = 0
+        # [stage name, wall start, cpu start, wall time of nested stages, cpu time of nested stages]
+        self._stack: List[list] = []
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.process_time()
+
+    @contextmanager
+    def stage(self, name: str):
+        """Books the time spent inside the block, minus that of nested stages, to the stage called name."""
+        frame = [name, time.perf_counter(), time.process_time(), 0.0, 0.0]
+        self._stack.append(frame)
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - frame[1]
+            cpu = time.process_time() - frame[2]
+            self._stack.pop()
+            if self._stack:
+                self._stack[-1][3] += wall
+                self._stack[-1][4] += cpu
+
+            stage = self.stages.setdefault(name, {"calls": 0, "wall_s": 0.0, "cpu_s": 0.0})
+            stage["calls"] += 1
+            stage["wall_s"] += wall - frame[3]
+            stage["cpu_s"] += cpu - frame[4]
+
+    def timed(self, name: str, items: Iterable[T]) -> Iterator[T]:
+        """Passes items through, booking the time spent producing each one to the stage called name."""
+        iterator = iter(items)
+        while True:
+            with self.stage(name):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            yield item
+
+    def count(self, records: int = 1, bases: int = 0):
+        self.records += records
+        self.bases += bases
+
+    def summary(self) -> dict:
+        """Machine readable summary of the run so far."""
+        wall = time.perf_counter() - self._wall_start
+        cpu = time.process_time() - self._cpu_start
+        stages = {name: {"calls": stage["calls"], "wall_s": round(stage["wall_s"], 6), "cpu_s": round(stage["cpu_s"], 6)}
+                  for name, stage in self.stages.items()}
+
+        return {
+            "wall_s": round(wall, 6),
+            "cpu_s": round(cpu, 6),
+            "cpu_children_s": round(_children_cpu(), 6),
+            "peak_rss_bytes": peak_rss_bytes(),
+            "records": self.records,
+            "bases": self.bases,
+            "records_per_s": round(self.records / wall, 3) if wall else None,
+            "bases_per_s": round(self.bases / wall, 3) if wall else None,
+            "stages": stages,
+            "unattributed_wall_s": round(wall - sum(stage["wall_s"] for stage in self.stages.values()), 6)
+        }
+
+    def write(self, path: str):
+        """Writes the summary as JSON to path, or to stderr if path is "-"."""
+        text = json.dumps(self.summary(), indent=2) + "\n"
+        if path == "-":
+            sys.stderr.write(text)
+            return
+        with open(path, "w") as out:
+            out.write(text)
+
+
+def peak_rss_bytes() -> int | None:
+    """Peak resident set size of this process, None where the resource module is not available."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _children_cpu() -> float:
+    # CPU time of finished worker processes (--jobs), which process_time() does not include.
+    times = os.times()
+    return times.children_user + times.children_system
+
+
+@contextmanager
+def profiled(path: str, mode: str = "cprofile"):
+    """Profiles the block and writes the profile to path, see PROFILE_MODES."""
+    if mode not in PROFILE_MODES:
+        raise ValueError(f"Unknown profile mode {mode}. Choose one of {', '.join(PROFILE_MODES)}.")
+
+    if mode == "cprofile":
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            profiler.dump_stats(path)
+        return
+
+    sampler = SamplingProfiler()
+    sampler.start()
+    try:
+        yield
+    finally:
+        sampler.stop()
+        sampler.write(path)
+
+
+class SamplingProfiler:
+    """
+    Low overhead statistical profiler of the main thread. A CPU time interval timer interrupts the process every
+    interval seconds and the current call stack is counted, so the cost does not depend on the number of calls the
+    way cProfile's does. Only available where signal.setitimer is (not on Windows).
+    """
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL):
+        self.interval = interval
+        self.samples = Counter()
+        self._previous_handler = None
+
+    def start(self):
+        import signal
+        self._previous_handler = signal.signal(signal.SIGPROF, self._sample)
+        signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+
+    def stop(self):
+        import signal
+        signal.setitimer(signal.ITIMER_PROF, 0, 0)
+        signal.signal(signal.SIGPROF, self._previous_handler or signal.SIG_DFL)
+
+    def write(self, path: str):
+        """Writes the samples as folded stacks: one "outer;...;inner count" line per distinct stack."""
+        with open(path, "w") as out:
+            out.writelines(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+    def _sample(self, signum, frame):
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+            frame = frame.f_back
+        self.samples[";".join(reversed(stack))] += 1
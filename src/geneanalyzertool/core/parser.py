@@ -0,0 +1,234 @@
+import os
+from typing import BinaryIO, Iterator, Tuple
+
+from geneanalyzertool.core.compression import open_binary, strip_compression_extension
+from geneanalyzertool.core.exceptions import SequenceParsingError
+
+# "native" is the parser below, "biopython" goes through Bio.SeqIO and builds a SeqRecord per record.
+PARSERS = ("native", "biopython")
+
+FASTQ_EXTENSIONS = (".fastq", ".fq")
+
+# Input is read in blocks of this size. Records are cut out of the blocks as they arrive, so records of
+# any size are assembled without re-copying what was already read.
+READ_BLOCK_BYTES = 4 * 1024 * 1024
+
+# Records are cut into chunks of this many bases by parse_sequence_chunks() unless told otherwise.
+DEFAULT_CHUNK_BASES = 1024 * 1024
+
+# Whitespace removed from sequence data, as Biopython does.
+SEQUENCE_WHITESPACE = b" \t\r\n"
+
+
+def sequence_format(path: str) -> str:
+    """
+    Returns "fasta" or "fastq". Regular files are recognized from their first character (decompressing them if
+    needed), anything else from its extension.
+    """
+    if os.path.isfile(path):
+        with open_binary(path) as handle:
+            first = handle.read(64).lstrip()[:1]
+        if first == b"@":
+            return "fastq"
+        if first == b">" or first == b"":
+            return "fasta"
+
+    return "fastq" if strip_compression_extension(path).lower().endswith(FASTQ_EXTENSIONS) else "fasta"
+
+
+def parse_sequences(path: str) -> Iterator[Tuple[str, bytes]]:
+    """Lazily yields (record id, sequence bytes) pairs from a plain or compressed FASTA or FASTQ file."""
+    parse = parse_fastq if sequence_format(path) == "fastq" else parse_fasta
+    with open_binary(path) as handle:
+        yield from parse(handle)
+
+
+def parse_sequence_chunks(path: str, chunk_bases: int = DEFAULT_CHUNK_BASES) -> Iterator[Tuple[str, int, bytes]]:
+    """
+    Lazily yields (record id, offset, chunk) triples from a plain or compressed FASTA or FASTQ file, see
+    parse_fasta_chunks().
+    """
+    if chunk_bases <= 0:
+        raise ValueError("Chunk size must be a positive number of bases")
+
+    with open_binary(path) as handle:
+        if sequence_format(path) == "fasta":
+            yield from parse_fasta_chunks(handle, chunk_bases)
+            return
+        for name, sequence in parse_fastq(handle):
+            yield from split_chunks(name, sequence, chunk_bases)
+
+
+def split_chunks(name: str, sequence: bytes, chunk_bases: int) -> Iterator[Tuple[str, int, bytes]]:
+    """Cuts a sequence that is already in memory into (record id, offset, chunk) triples."""
+    for offset in range(0, max(len(sequence), 1), chunk_bases):
+        yield name, offset, sequence[offset:offset + chunk_bases]
+
+
+def parse_fasta(handle: BinaryIO, block_size: int = READ_BLOCK_BYTES) -> Iterator[Tuple[str, bytes]]:
+    """
+    Lazily yields (record id, sequence bytes) pairs from a binary FASTA stream. The id is the first word of the
+    header, line breaks and whitespace are removed from the sequence. Text before the first header is ignored.
+
+    Every block is split on "\\n>" in one C level pass, so records that lie entirely inside a block cost a handful of
+    bytes operations each. Only the record running across a block boundary is assembled piece by piece, which keeps
+    huge records linear in their size.
+    """
+    record = None
+    # A virtual newline in front of the input lets a header on the very first line match "\\n>" like all others.
+    carry = b"\n"
+
+    for block in iter(lambda: handle.read(block_size), b""):
+        pieces = (carry + block).split(b"\n>")
+        carry = b""
+        tail = pieces.pop()
+        if tail.endswith(b"\n"):
+            # The newline may be followed by ">" in the next block, so it is held back.
+            tail, carry = tail[:-1], b"\n"
+
+        if not pieces:
+            if record is not None:
+                record.add(tail)
+            continue
+
+        if record is not None:
+            record.add(pieces[0])
+            yield record.finish()
+        for index in range(1, len(pieces)):
+            header, _, sequence = pieces[index].partition(b"\n")
+            yield _record_id(header), sequence.translate(None, SEQUENCE_WHITESPACE)
+        record = _RecordBuilder(tail)
+
+    if record is not None:
+        yield record.finish()
+
+
+def parse_fasta_chunks(handle: BinaryIO, chunk_bases: int = DEFAULT_CHUNK_BASES,
+                       block_size: int = READ_BLOCK_BYTES) -> Iterator[Tuple[str, int, bytes]]:
+    """
+    Lazily yields (record id, offset, chunk) triples from a binary FASTA stream. Every record is cut into chunks of
+    chunk_bases bases (the last one may be shorter) and offset is the 0-based position of the chunk in its record,
+    so a chunk at offset 0 starts a new record. A record without bases yields one empty chunk.
+
+    Unlike parse_fasta() no record is ever assembled in full, so memory stays bounded by the block and chunk sizes
+    however long the records are.
+    """
+    record = None
+    carry = b"\n"
+
+    for block in iter(lambda: handle.read(block_size), b""):
+        pieces = (carry + block).split(b"\n>")
+        carry = b""
+        tail = pieces.pop()
+        if tail.endswith(b"\n"):
+            tail, carry = tail[:-1], b"\n"
+
+        if not pieces:
+            if record is not None:
+                yield from record.add(tail)
+            continue
+
+        if record is not None:
+            yield from record.add(pieces[0])
+            yield from record.finish()
+        for index in range(1, len(pieces)):
+            complete = _RecordChunker(chunk_bases)
+            yield from complete.add(pieces[index])
+            yield from complete.finish()
+        record = _RecordChunker(chunk_bases)
+        yield from record.add(tail)
+
+    if record is not None:
+        yield from record.finish()
+
+
+def parse_fastq(handle: BinaryIO) -> Iterator[Tuple[str, bytes]]:
+    """
+    Lazily yields (record id, sequence bytes) pairs from a binary FASTQ stream of four line records. Quality lines
+    are checked against the sequence length but not returned.
+    """
+    lines = iter(handle)
+    for header in lines:
+        if not header.strip():
+            continue
+        if not header.startswith(b"@"):
+            raise SequenceParsingError(f"Error: Expected a FASTQ header starting with '@', found: {header[:50]!r}")
+
+        sequence = next(lines, b"").rstrip(b"\r\n")
+        separator = next(lines, b"")
+        quality = next(lines, b"").rstrip(b"\r\n")
+        name = _record_id(header[1:])
+        if not separator.startswith(b"+"):
+            raise SequenceParsingError(f"Error: FASTQ record '{name}' is missing its '+' separator line.")
+        if len(quality) != len(sequence):
+            raise SequenceParsingError(f"Error: Sequence and quality lengths differ in FASTQ record '{name}'.")
+        yield name, sequence
+
+
+def _record_id(header: bytes) -> str:
+    words = header.split(None, 1)
+    return words[0].decode("latin-1") if words else ""
+
+
+class _RecordBuilder:
+    """Collects a FASTA record that arrives over several blocks, starting right after its ">"."""
+    __slots__ = ("name", "header", "parts")
+
+    def __init__(self, text: bytes):
+        self.name = None
+        self.header = []
+        self.parts = []
+        self.add(text)
+
+    def add(self, text: bytes):
+        if self.name is None:
+            line_end = text.find(b"\n")
+            if line_end < 0:
+                self.header.append(text)
+                return
+            self.header.append(text[:line_end])
+            self.name = _record_id(b"".join(self.header))
+            text = text[line_end + 1:]
+        self.parts.append(text.translate(None, SEQUENCE_WHITESPACE))
+
+    def finish(self) -> Tuple[str, bytes]:
+        if self.name is None:
+            self.name = _record_id(b"".join(self.header))
+        return self.name, b"".join(self.parts)
+
+
+class _RecordChunker:
+    """Cuts a FASTA record that arrives over several blocks, starting right after its ">", into fixed size chunks."""
+    __slots__ = ("name", "header", "buffer", "offset", "chunk_bases")
+
+    def __init__(self, chunk_bases: int):
+        self.name = None
+        self.header = []
+        self.buffer = bytearray()
+        self.offset = 0
+        self.chunk_bases = chunk_bases
+
+    def add(self, text: bytes) -> Iterator[Tuple[str, int, bytes]]:
+        if self.name is None:
+            line_end = text.find(b"\n")
+            if line_end < 0:
+                self.header.append(text)
+                return
+            self.header.append(text[:line_end])
+            self.name = _record_id(b"".join(self.header))
+            text = text[line_end + 1:]
+
+        self.buffer += text.translate(None, SEQUENCE_WHITESPACE)
+        # Full chunks are sliced off by position and the buffer is shortened once, not once per chunk.
+        start = 0
+        while len(self.buffer) - start >= self.chunk_bases:
+            yield self.name, self.offset, bytes(self.buffer[start:start + self.chunk_bases])
+            start += self.chunk_bases
+            self.offset += self.chunk_bases
+        del self.buffer[:start]
+
+    def finish(self) -> Iterator[Tuple[str, int, bytes]]:
+        if self.name is None:
+            self.name = _record_id(b"".join(self.header))
+        if self.buffer or self.offset == 0:
+            yield self.name, self.offset, bytes(self.buffer)
@@ -0,0 +1,66 @@
+import os
+import re
+from typing import Iterable, List
+
+
+def read_id_list(value: str) -> List[str]:
+    """
+    Record ids given on the command line: the ids of a file with one id per line when value names a file (blank
+    lines and lines starting with # are skipped, a leading > and anything after the first whitespace are dropped,
+    so FASTA headers work too), a comma separated list otherwise.
+    """
+    if not os.path.isfile(value):
+        return [record_id.strip() for record_id in value.split(",") if record_id.strip()]
+
+    ids = []
+    with open(value) as handle:
+        for line in handle:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                ids.append(line.removeprefix(">").split(None, 1)[0])
+    return ids
+
+
+class RecordSelection:
+    """
+    Non-interactive selection of the records of a file by id and length. A record is selected when it matches
+    every criterion given: its id is one of ids, id_regex is found in its id (re.search) and its length lies
+    within min_length and max_length (inclusive).
+
+    FileHandler evaluates selections against the .fai index of the file where it can, so only the selected
+    records are ever read; see FileHandler.selected_names().
+    """
+
+    def __init__(self, ids: Iterable[str] | None = None, id_regex: str | None = None, min_length: int | None = None,
+                 max_length: int | None = None):
+        if min_length is not None and max_length is not None and min_length > max_length:
+            raise ValueError(f"Minimum length {min_length} is above maximum length {max_length}")
+        try:
+            self.pattern = re.compile(id_regex) if id_regex else None
+        except re.error as e:
+            raise ValueError(f"Invalid id regex {id_regex!r}: {e}")
+        self.ids = None if ids is None else set(ids)
+        self.id_regex = id_regex
+        self.min_length = min_length
+        self.max_length = max_length
+
+    @property
+    def by_length(self) -> bool:
+        """Whether the selection depends on record lengths."""
+        return self.min_length is not None or self.max_length is not None
+
+    def matches_id(self, record_id: str) -> bool:
+        return (self.ids is None or record_id in self.ids) and (self.pattern is None or
+                                                                self.pattern.search(record_id) is not None)
+
+    def matches_length(self, length: int) -> bool:
+        return (self.min_length is None or length >= self.min_length) and \
+            (self.max_length is None or length <= self.max_length)
+
+    def matches(self, record_id: str, length: int) -> bool:
+        return self.matches_id(record_id) and self.matches_length(length)
+
+    def to_dict(self) -> dict:
+        """The arguments of the selection, as sent to a server."""
+        return {"ids": None if self.ids is None else sorted(self.ids), "id_regex": self.id_regex,
+                "min_length": self.min_length, "max_length": self.max_length}
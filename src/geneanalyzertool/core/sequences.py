@@ -1,11 +1,27 @@
+from abc import ABCMeta
 
-class Sequence(str):
+
+class Sequence(str, metaclass=ABCMeta):
     """
     An abstract base class for all sequence type data. All sequences should inherit from this class.
+
+    Alternative representations (see core/compact_sequences.py) register themselves as virtual subclasses of
+    DNA, RNA or Protein, so isinstance checks keep working for them.
     """
     def __new__(cls, sequence):
+        if isinstance(sequence, (bytes, bytearray, memoryview)):
+            sequence = bytes(sequence).decode("latin-1")
         return super().__new__(cls, sequence)
 
+    @classmethod
+    def from_bytes(cls, data: bytes):
+        """Builds a sequence of this class from its ASCII bytes."""
+        return cls(data)
+
+    def as_bytes(self) -> bytes:
+        """Returns the sequence as ASCII bytes."""
+        return self.encode("latin-1", errors="replace")
+
 
 class DNA(Sequence):
     pass
@@ -17,3 +33,12 @@ class RNA(Sequence):
 
 class Protein(Sequence):
     pass
+
+
+def same_storage(sequence, target: type) -> type:
+    """
+    Returns the class of type target (DNA, RNA or Protein) that uses the same representation as sequence, so results
+    derived from a compact sequence stay compact.
+    """
+    storage_types = getattr(type(sequence), "storage_types", None)
+    return storage_types[target] if storage_types else target
@@ -0,0 +1,75 @@
+import re
+from typing import List
+
+import numpy as np
+
+ALPHABETS = {
+    "DNA": b"ACGT",
+    "RNA": b"ACGU",
+    "PROTEIN": b"ACDEFGHIKLMNPQRSTVWY"
+}
+
+SIZE_SUFFIXES = {"": 1, "K": 10**3, "M": 10**6, "G": 10**9}
+
+# Sequences are generated and written in blocks of this many bases so huge files never sit in memory at once.
+WRITE_BLOCK_BASES = 6_000_000
+
+
+def parse_size(size: str | int) -> int:
+    """Parses sizes such as 1000, 1k, 10M or 1.5G into a number of bases."""
+    if isinstance(size, int):
+        return size
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([kKmMgG]?)[bB]?\s*", size)
+    if match is None:
+        raise ValueError(f"Invalid size {size}")
+    return int(float(match.group(1)) * SIZE_SUFFIXES[match.group(2).upper()])
+
+
+def synthetic_sequence(seq_type: str, length: int, seed: int = 0) -> str:
+    """Returns a deterministic pseudo random DNA, RNA or protein sequence of the given length."""
+    rng = np.random.default_rng(seed)
+    return _random_block(rng, _alphabet(seq_type), length).decode("ascii")
+
+
+def record_lengths(total_length: int, records: int) -> List[int]:
+    """Splits a total length into record lengths that differ by at most one base."""
+    base, extra = divmod(total_length, records)
+    return [base + (1 if index < extra else 0) for index in range(records)]
+
+
+def write_synthetic_fasta(path: str, seq_type: str, total_length: int, records: int = 1, seed: int = 0,
+                          line_width: int = 60):
+    """
+    Writes a deterministic synthetic FASTA file.
+
+    Args:
+        path: Output path
+        seq_type: DNA, RNA or Protein
+        total_length: Total number of residues across all records
+        records: Number of records the residues are spread over
+        seed: Random seed, the same seed always produces the same file
+        line_width: Residues per sequence line
+    """
+    rng = np.random.default_rng(seed)
+    alphabet = _alphabet(seq_type)
+    block_bases = max(line_width, WRITE_BLOCK_BASES - WRITE_BLOCK_BASES % line_width)
+
+    with open(path, "wb") as out:
+        for index, length in enumerate(record_lengths(total_length, records)):
+            out.write(f">synthetic_{index + 1} length={length}\n".encode())
+            remaining = length
+            while remaining:
+                block = _random_block(rng, alphabet, min(block_bases, remaining))
+                out.write(b"\n".join(block[i:i + line_width] for i in range(0, len(block), line_width)) + b"\n")
+                remaining -= len(block)
+
+
+def _alphabet(seq_type: str) -> np.ndarray:
+    try:
+        return np.frombuffer(ALPHABETS[seq_type.upper()], dtype=np.uint8)
+    except KeyError:
+        raise ValueError(f"Unknown sequence type {seq_type}")
+
+
+def _random_block(rng: np.random.Generator, alphabet: np.ndarray, length: int) -> bytes:
+    return alphabet[rng.integers(0, len(alphabet), length)].tobytes()
@@ -0,0 +1,142 @@
+import re
+
+import numpy as np
+import pytest
+from Bio.Align import PairwiseAligner, substitution_matrices
+from geneanalyzertool.analysis.alignment import GLOBAL, LOCAL, align, alignment_score, band_limits, scoring_table
+from tests.helpers import edit, random_sequence
+
+GAP_COSTS = [(10, 0.5), (5, 2), (3, 3), (4, 0)]
+
+
+def biopython_score(query: str, target: str, local: bool, gap_open: float, gap_extend: float, **scores) -> float:
+    aligner = PairwiseAligner(mode="local" if local else "global", open_gap_score=-gap_open,
+                              extend_gap_score=-gap_extend, **(scores or {"match_score": 5, "mismatch_score": -4}))
+    return aligner.score(query, target)
+
+
+def rescore(result: dict, gap_open: float, gap_extend: float) -> float:
+    """Score of the aligned sequences of a result, recomputed from scratch."""
+    score = sum(5 if a == b else -4 for a, b in zip(result["Query"], result["Target"]) if "-" not in (a, b))
+    gaps = re.findall("-+", result["Query"]) + re.findall("-+", result["Target"])
+    return score - sum(gap_open + (len(gap) - 1) * gap_extend for gap in gaps)
+
+
+# ---------- scoring ----------
+def test_scoring_table_is_case_insensitive():
+    table = scoring_table(2, -3)
+    assert table[ord("A"), ord("a")] == 2
+    assert table[ord("A"), ord("C")] == -3
+
+
+def test_scoring_table_from_substitution_matrix():
+    table = scoring_table(matrix="BLOSUM62")
+    blosum = substitution_matrices.load("BLOSUM62")
+    assert table[ord("W"), ord("w")] == blosum["W"]["W"]
+    assert table[ord("A"), ord("R")] == blosum["A"]["R"]
+    # Residues the matrix does not know score its lowest value.
+    assert table[ord("J"), ord("A")] == np.min(blosum)
+    with pytest.raises(ValueError):
+        scoring_table(matrix="NOT_A_MATRIX")
+
+
+def test_band_limits():
+    assert band_limits(10, 15, None) == (-10, 15)
+    assert band_limits(10, 15, 3) == (-3, 8)
+    assert band_limits(15, 10, 0) == (-5, 0)
+    with pytest.raises(ValueError):
+        band_limits(10, 10, -1)
+
+
+# ---------- alignment ----------
+@pytest.mark.parametrize("local", [False, True])
+@pytest.mark.parametrize("gap_open, gap_extend", GAP_COSTS)
+def test_scores_match_biopython(local, gap_open, gap_extend):
+    table = scoring_table()
+    for seed in range(40):
+        rng = np.random.default_rng(seed)
+        query = random_sequence(rng.integers(1, 40), seed)
+        target = random_sequence(rng.integers(1, 40), seed + 100)
+        expected = biopython_score(query, target, local, gap_open, gap_extend)
+
+        result = align(query.encode(), target.encode(), table, gap_open, gap_extend, local=local)
+        assert result["Score"] == pytest.approx(expected)
+        assert rescore(result, gap_open, gap_extend) == pytest.approx(expected)
+        assert result["Query"].replace("-", "") == query[result["Query Start"]:result["Query End"]]
+        assert result["Target"].replace("-", "") == target[result["Target Start"]:result["Target End"]]
+
+        mode = LOCAL if local else GLOBAL
+        assert alignment_score(query.encode(), target.encode(), table, gap_open, gap_extend, mode)[0] == \
+            pytest.approx(expected)
+
+
+def test_protein_scores_match_biopython():
+    table = scoring_table(matrix="BLOSUM62")
+    for seed in range(20):
+        query = random_sequence(30 + seed, seed, "ARNDCQEGHILKMFPSTWYV")
+        target = random_sequence(40, seed + 100, "ARNDCQEGHILKMFPSTWYV")
+        expected = biopython_score(query, target, True, 10, 0.5,
+                                   substitution_matrix=substitution_matrices.load("BLOSUM62"))
+        assert align(query.encode(), target.encode(), table, local=True)["Score"] == pytest.approx(expected)
+
+
+def test_local_alignment_finds_query_in_target():
+    query = random_sequence(200, 1)
+    target = random_sequence(5000, 2) + edit(query, 5, 3) + random_sequence(5000, 4)
+    result = align(query.encode(), target.encode(), scoring_table(), local=True)
+    assert result["Target Start"] >= 4990 and result["Target End"] <= 5210
+    assert result["Identity"] > 90
+    score, query_end, target_end = alignment_score(query.encode(), target.encode(), scoring_table(), mode=LOCAL)
+    assert (score, query_end, target_end) == (result["Score"], result["Query End"], result["Target End"])
+
+
+def test_identical_sequences():
+    result = align(b"ACGTACGT", b"acgtacgt", scoring_table())
+    assert result == {"Score": 40.0, "Query Start": 0, "Query End": 8, "Target Start": 0, "Target End": 8,
+                      "Length": 8, "Identity": 100.0, "Gaps": 0, "Query": "ACGTACGT", "Target": "acgtacgt"}
+
+
+def test_affine_gaps_are_kept_together():
+    result = align(b"AAAACCCCGGGGTTTT", b"AAAAGGGGTTTT", scoring_table())
+    assert result["Target"] == "AAAA----GGGGTTTT"
+    assert result["Score"] == 12 * 5 - (10 + 3 * 0.5)
+
+
+def test_empty_sequences():
+    table = scoring_table()
+    assert align(b"", b"ACG", table)["Score"] == -11.0
+    assert align(b"", b"", table)["Length"] == 0
+    local = align(b"ACG", b"", table, local=True)
+    assert (local["Score"], local["Length"], local["Identity"]) == (0.0, 0, 0.0)
+
+
+@pytest.mark.parametrize("local", [False, True])
+def test_banded_alignment_matches_full_alignment(local):
+    table = scoring_table()
+    for seed in range(10):
+        query = random_sequence(300, seed)
+        target = edit(query, 10, seed + 50)
+        full = align(query.encode(), target.encode(), table, local=local)
+        banded = align(query.encode(), target.encode(), table, local=local, band=15)
+        assert banded == full
+        mode = LOCAL if local else GLOBAL
+        assert alignment_score(query.encode(), target.encode(), table, mode=mode, band=15)[0] == full["Score"]
+
+
+def test_narrow_band_misses_alignments_outside_it():
+    # Same lengths, but the best alignment runs 20 diagonals off the main one between an insertion and a deletion.
+    query = random_sequence(120, 1)
+    target = query[:40] + random_sequence(20, 2) + query[40:100]
+    table = scoring_table()
+    full = align(query.encode(), target.encode(), table)
+    assert align(query.encode(), target.encode(), table, band=20) == full
+    narrow = align(query.encode(), target.encode(), table, band=0)
+    assert narrow["Score"] < full["Score"]
+    assert narrow["Gaps"] == 0
+
+
+def test_invalid_gap_costs():
+    with pytest.raises(ValueError):
+        align(b"ACGT", b"ACGT", scoring_table(), gap_open=1, gap_extend=2)
+    with pytest.raises(ValueError):
+        alignment_score(b"ACGT", b"ACGT", scoring_table(), gap_open=1, gap_extend=-1)
@@ -0,0 +1,136 @@
+import pytest
+from geneanalyzertool.analysis.alignment import align, scoring_table
+from geneanalyzertool.analysis.alignment_analysis import AlignmentAnalysis, format_alignment
+from geneanalyzertool.core.cache import ResultCache
+from geneanalyzertool.core.exceptions import AnalysisMethodError
+from geneanalyzertool.core.metrics import RunMetrics
+from geneanalyzertool.core.sequences import DNA, Protein
+from tests.helpers import random_sequence
+
+
+QUERY = random_sequence(80)
+OPTIONS = {"global": {"query": QUERY}, "local": {"query": QUERY}}
+
+
+@pytest.fixture
+def analyzer():
+    return AlignmentAnalysis()
+
+
+@pytest.fixture
+def records():
+    return {"contains_query": random_sequence(300, 4) + QUERY[:40] + "T" + QUERY[40:] + random_sequence(200, 5),
+            "unrelated": random_sequence(400, 6),
+            "query_itself": QUERY}
+
+
+@pytest.fixture
+def fasta_file(tmp_path, records):
+    path = tmp_path / "records.fasta"
+    path.write_text("".join(f">{name}\n{sequence}\n" for name, sequence in records.items()))
+    return str(path)
+
+
+# ---------- analyze ----------
+def test_analyze_local_and_global(analyzer):
+    target = DNA("GGGG" + QUERY + "CCCC")
+    local = analyzer.analyze(target, "local", query=QUERY)
+    assert (local["Target Start"], local["Target End"], local["Identity"]) == (4, 84, 100.0)
+    assert local == align(QUERY.encode(), target.encode(), scoring_table(), local=True)
+    assert analyzer.analyze(target, "global", query=QUERY)["Gaps"] == 8
+
+
+def test_score_only(analyzer):
+    target = DNA("GGGG" + QUERY + "CCCC")
+    full = analyzer.analyze(target, "local", query=QUERY)
+    assert analyzer.analyze(target, "local", query=QUERY, score_only=True) == {
+        "Score": full["Score"], "Query End": full["Query End"], "Target End": full["Target End"]}
+    assert analyzer.analyze(target, "global", query=QUERY, score_only=True, band=10) == {
+        "Score": analyzer.analyze(target, "global", query=QUERY)["Score"]}
+
+
+def test_proteins_default_to_blosum62(analyzer):
+    result = analyzer.analyze(Protein("MKWVTFISLL"), "global", query="MKWVTFISLL")
+    assert result["Score"] == sum(scoring_table(matrix="BLOSUM62")[ord(r), ord(r)] for r in "MKWVTFISLL")
+
+
+def test_alignments_are_cached(tmp_path, monkeypatch):
+    analyzer = AlignmentAnalysis(cache=ResultCache(str(tmp_path)))
+    expected = analyzer.analyze(DNA(QUERY), "local", query=QUERY[10:50])
+    monkeypatch.setattr(analyzer, "_align", lambda *args, **kwargs: pytest.fail("alignment was not cached"))
+    assert analyzer.analyze(DNA(QUERY), "local", query=QUERY[10:50]) == expected
+
+
+def test_invalid_methods_and_options(analyzer, fasta_file):
+    with pytest.raises(ValueError):
+        analyzer.analyze(DNA("ACGT"), "distance", query="ACGT")
+    for method in ("all", ["global", "local"], "gc_percent"):
+        with pytest.raises(AnalysisMethodError):
+            list(analyzer.stream_sequences(fasta_file, "DNA", method, OPTIONS))
+    for options in ({}, {"query": QUERY, "gap_open": 1, "gap_extend": 2}, {"query": QUERY, "matrix": "NOPE"},
+                    {"query": QUERY, "band": -1}):
+        with pytest.raises(AnalysisMethodError):
+            list(analyzer.stream_sequences(fasta_file, "DNA", "local", {"local": options}))
+
+
+# ---------- records ----------
+def test_stream_aligns_query_against_every_record(analyzer, fasta_file, records):
+    results = dict(analyzer.stream_sequences(fasta_file, "DNA", "local", OPTIONS))
+    assert list(results) == list(records)
+    assert results["query_itself"]["Identity"] == 100.0
+    assert results["contains_query"]["Target Start"] == 300
+    assert results["contains_query"]["Gaps"] == 1
+    assert results["unrelated"]["Score"] < results["contains_query"]["Score"] / 3
+
+
+def test_chunked_and_parallel_alignments_match(analyzer, fasta_file):
+    expected = list(analyzer.stream_sequences(fasta_file, "DNA", "global", OPTIONS))
+    assert list(analyzer.stream_sequences(fasta_file, "DNA", "global", OPTIONS, chunk_size=50)) == expected
+    assert list(analyzer.stream_sequences(fasta_file, "DNA", "global", OPTIONS, jobs=2)) == expected
+
+
+def test_process_sequences_matches_stream(analyzer, fasta_file, records, monkeypatch):
+    monkeypatch.setattr(analyzer, "select_sequences", lambda file, use_index=False: analyzer.fetch_sequences(
+        file, list(records)))
+    results, keys = analyzer.process_sequences(fasta_file, True, "DNA", "local", OPTIONS)
+    assert [(key, results[key]) for key in keys] == list(analyzer.stream_sequences(fasta_file, "DNA", "local",
+                                                                                   OPTIONS))
+
+
+def test_raw_sequence_input(analyzer):
+    results, keys = analyzer.process_sequences(QUERY, False, "DNA", "global", OPTIONS)
+    assert keys == ["input_sequence"]
+    assert results["input_sequence"]["Identity"] == 100.0
+
+
+def test_stream_metrics(fasta_file):
+    metrics = RunMetrics()
+    list(AlignmentAnalysis(metrics=metrics).stream_sequences(fasta_file, "DNA", "local", OPTIONS))
+    assert metrics.records == 3
+    assert {"read", "convert", "analyze"} <= set(metrics.stages)
+
+
+# ---------- output ----------
+def test_format_alignment_blocks():
+    result = align(QUERY.encode(), (QUERY[:40] + "T" + QUERY[40:]).encode(), scoring_table())
+    lines = format_alignment(result, width=50)
+    assert lines[0] == f"Score: {result['Score']}  Length: 81  Identity: 98.77%  Gaps: 1"
+    query_lines = [line for line in lines if line.startswith("Query")]
+    target_lines = [line for line in lines if line.startswith("Target")]
+    assert query_lines[0].split() == ["Query", "1", result["Query"][:50], "49"]
+    assert target_lines[1].split() == ["Target", "51", result["Target"][50:], "81"]
+    assert format_alignment({"Score": 12.5}) == ["Score: 12.5"]
+
+
+def test_export_text_and_table(analyzer, fasta_file, tmp_path):
+    out_file = tmp_path / "alignments.txt"
+    analyzer.export_stream(analyzer.stream_sequences(fasta_file, "DNA", "local", OPTIONS), str(out_file))
+    text = out_file.read_text()
+    assert text.startswith(">contains_query\nScore: ")
+    assert text.count(">") == 3
+
+    table_file = tmp_path / "alignments.tsv"
+    analyzer.export_stream(analyzer.stream_sequences(fasta_file, "DNA", "local", OPTIONS), str(table_file), "tsv",
+                           "local")
+    rows = [line.split("\t") for line in table_file.read_text().splitlines()[1:]]
+    assert ["query_itself", "local", "Identity", "100.0"] in rows
@@ -1,7 +1,12 @@
 import pytest
 from geneanalyzertool.core.sequences import DNA, RNA, Protein
+from geneanalyzertool.analysis.analysis import AnalysisReport
+from geneanalyzertool.analysis import basic_analysis
 from geneanalyzertool.analysis.basic_analysis import BasicSequenceAnalysis
+from geneanalyzertool.core.cache import ResultCache
+from geneanalyzertool.core.compact_sequences import CompactProtein, CompactRNA, CompactSequence
 from geneanalyzertool.core.exceptions import InvalidSequenceTypeError, AnalysisMethodError
+from geneanalyzertool.core.metrics import RunMetrics
 
 
 @pytest.fixture
@@ -90,6 +95,76 @@ def test_reverse_complement_invalid_type(analyzer):
         analyzer._reverse_complement(Protein("MKWV"))
 
 
+def test_reverse_complement_iupac_and_soft_masked(analyzer):
+    assert analyzer._reverse_complement(DNA("ACGTRYkmNn")) == "nNkmRYACGT"
+    assert analyzer._transcribe(DNA("ATGCatgc")) == "AUGCaugc"
+
+
+# ---------- protein properties ----------
+def test_protein_properties(analyzer):
+    result = analyzer._protein_properties(Protein("MKWVTFISLLLLFSSAYSRGVFRR"))
+    assert result["Length"] == 24
+    assert result["Molecular Weight"] == 2878.44
+    assert result["Extinction Coefficient"] == {"Reduced": 6990, "Cystines": 6990}
+    assert result["Composition"]["L"] == 4
+
+
+def test_protein_properties_invalid_type(analyzer):
+    with pytest.raises(TypeError):
+        analyzer._protein_properties(DNA("ATGC"))
+
+
+def test_protein_properties_batch_matches_single_records(analyzer):
+    sequences = [Protein("MKWV"), Protein("acdefghik*"), Protein("")]
+    assert analyzer.analyze_batch(sequences, "protein_properties") == \
+        [analyzer._analyze_record(sequence, "protein_properties") for sequence in sequences]
+
+
+def test_all_methods_on_dna_skip_protein_properties(analyzer):
+    assert "protein_properties" not in analyzer._analyze_record(DNA("ATGC"), "all")
+    assert "protein_properties" in analyzer._analyze_record(Protein("MKWV"), "all")
+
+
+# ---------- batches ----------
+def test_analyze_batch_matches_single_records(analyzer):
+    sequences = [DNA("ATGCRYatgcn"), DNA(""), DNA("GGGTTTAAAC")]
+    for method in ("transcribe", "reverse_complement"):
+        batch = analyzer.analyze_batch(sequences, method)
+        assert batch == [analyzer._analyze_record(sequence, method) for sequence in sequences]
+        assert [type(result) for result in batch] == [type(analyzer._analyze_record(sequences[0], method))] * 3
+
+
+def test_analyze_batch_several_methods(analyzer):
+    reports = analyzer.analyze_batch([DNA("ATGC"), DNA("AACC")], ["transcribe", "reverse_complement"])
+    assert reports == [AnalysisReport(transcribe="AUGC", reverse_complement="GCAT"),
+                       AnalysisReport(transcribe="AACC", reverse_complement="GGTT")]
+
+
+def test_analyze_batch_rna_and_compact():
+    compact_analyzer = BasicSequenceAnalysis(compact=True)
+    sequences = [CompactRNA("AUGCaugc"), CompactRNA("UUAG")]
+    batch = compact_analyzer.analyze_batch(sequences, "reverse_complement")
+    assert batch == ["gcauGCAU", "CUAA"]
+    assert all(isinstance(result, CompactRNA) for result in batch)
+
+
+def test_analyze_batch_errors(analyzer):
+    with pytest.raises(InvalidSequenceTypeError):
+        analyzer.analyze_batch([RNA("AUGC")], "transcribe")
+    with pytest.raises(InvalidSequenceTypeError):
+        analyzer.analyze_batch([Protein("MKWV")], "reverse_complement")
+    with pytest.raises(AnalysisMethodError):
+        analyzer.analyze_batch([DNA("ATGC")], "gc_percent")
+
+
+def test_batchable(analyzer):
+    assert analyzer.batchable("reverse_complement")
+    assert analyzer.batchable(["transcribe", "reverse_complement"])
+    assert not analyzer.batchable(["transcribe", "gc_percent"])
+    assert not analyzer.batchable("all")
+    assert not analyzer.batchable([])
+
+
 # ---------- analyze() dispatcher ----------
 def test_analyze_dispatch_calls_gc_percent(analyzer):
     DNA_analysis = ["gc_percent", "base_count", "transcribe", "reverse_complement"]
@@ -190,7 +265,8 @@ def test_orf_finder_simple_sequence(analyzer):
                             "Sequence": "ATGGGGGCGCGCGCGCGCGCGCGCGCGAGTTAG",
                             "Start": 0,
                             "End": 32,
-                            "Length": 33
+                            "Length": 33,
+                            "Strand": "+"
                         }
                     }
                 }
@@ -212,19 +288,22 @@ def test_orf_finder_complex_sequence(analyzer):
                                 "Sequence": "ATGAAATGA",
                                 "Start": 0,
                                 "End": 8,
-                                "Length": 9
+                                "Length": 9,
+                                "Strand": "+"
                             },
                             "ORF_2": {
                                 "Sequence": "ATGTAG",
                                 "Start": 9,
                                 "End": 14,
-                                "Length": 6
+                                "Length": 6,
+                                "Strand": "+"
                             },
                             "ORF_3": {
                                 "Sequence": "ATGCCCTAA",
                                 "Start": 15,
                                 "End": 23,
-                                "Length": 9
+                                "Length": 9,
+                                "Strand": "+"
                             }
                         }
                     }
@@ -239,3 +318,407 @@ def test_orf_finder_RNA(analyzer):
             seq_type="RNA",
             analysis_method="orf"
         )
+
+
+def test_orf_finder_reverse_strand(analyzer):
+    # reverse complement of ATGAAATAG
+    result = analyzer._orf_finder(DNA("CTATTTCAT"))
+    assert result == {
+        "Number of ORFS": 1,
+        "ORFS": {
+            "ORF_1": {
+                "Sequence": "ATGAAATAG",
+                "Start": 0,
+                "End": 8,
+                "Length": 9,
+                "Strand": "-"
+            }
+        }
+    }
+
+
+def test_orf_finder_forward_strand_only(analyzer):
+    result = analyzer._orf_finder(DNA("CTATTTCAT"), strand="+")
+    assert result == {"Number of ORFS": 0, "ORFS": {}}
+
+
+def test_orf_finder_nested_and_longest(analyzer):
+    seq = DNA("ATGATGAAATAA")
+    nested = analyzer._orf_finder(seq, strand="+")
+    longest = analyzer._orf_finder(seq, strand="+", nested=False)
+    assert [orf["Start"] for orf in nested["ORFS"].values()] == [0, 3]
+    assert [orf["Start"] for orf in longest["ORFS"].values()] == [0]
+    assert longest["ORFS"]["ORF_1"]["End"] == 11
+
+
+def test_orf_finder_min_length(analyzer):
+    result = analyzer._orf_finder(DNA("ATGTAGATGCCCAAATAA"), strand="+", min_length=9)
+    assert result["Number of ORFS"] == 1
+    assert result["ORFS"]["ORF_1"]["Sequence"] == "ATGCCCAAATAA"
+
+
+def test_orf_finder_custom_codons(analyzer):
+    result = analyzer._orf_finder(DNA("GTGAAATAGATGTGA"), start_codons=["gtg"], stop_codons=["TAG"], strand="+")
+    assert result["Number of ORFS"] == 1
+    assert result["ORFS"]["ORF_1"]["Sequence"] == "GTGAAATAG"
+
+
+def test_orf_finder_lowercase_sequence(analyzer):
+    result = analyzer._orf_finder(DNA("atgaaatag"), strand="+")
+    assert result["ORFS"]["ORF_1"]["Sequence"] == "atgaaatag"
+
+
+def test_orf_finder_invalid_codon(analyzer):
+    with pytest.raises(ValueError):
+        analyzer._orf_finder(DNA("ATGAAATAG"), start_codons=["AT"])
+
+
+def test_orf_finder_invalid_strand(analyzer):
+    with pytest.raises(ValueError):
+        analyzer._orf_finder(DNA("ATGAAATAG"), strand="sideways")
+
+
+def test_process_sequences_orf_options(analyzer):
+    results, sequence_keys = analyzer.process_sequences(
+        sequence_input="ATGTAGATGCCCAAATAA",
+        is_file=False,
+        seq_type="DNA",
+        analysis_method="orf",
+        method_options={"orf": {"min_length": 9, "strand": "+"}}
+    )
+    assert results["input_sequence"]["Number of ORFS"] == 1
+
+
+# ---------- streaming ----------
+@pytest.fixture
+def fasta_file(tmp_path):
+    path = tmp_path / "records.fasta"
+    path.write_text(">seq1\nATGCGC\n>seq2\nATAT\nATAT\n>seq3\nGGCC\n")
+    return str(path)
+
+
+def test_stream_sequences_yields_results_in_file_order(analyzer, fasta_file):
+    stream = analyzer.stream_sequences(fasta_file, "DNA", "gc_percent")
+    assert list(stream) == [("seq1", "66.67 %"), ("seq2", "0.0 %"), ("seq3", "100.0 %")]
+
+
+def test_stream_sequences_matches_process_sequences(analyzer, fasta_file, monkeypatch):
+    select_all = analyzer.select_sequences
+    monkeypatch.setattr(analyzer, "select_sequences", lambda path, **kwargs: select_all(path, lambda _: "all", **kwargs))
+    results, sequence_keys = analyzer.process_sequences(fasta_file, True, "DNA", "orf")
+    streamed = list(analyzer.stream_sequences(fasta_file, "DNA", "orf"))
+    assert streamed == [(key, results[key]) for key in sequence_keys]
+
+
+def test_compact_stream_packs_records_while_reading(analyzer, fasta_file, monkeypatch):
+    expected = list(analyzer.stream_sequences(fasta_file, "DNA", "composition"))
+    compact_analyzer = BasicSequenceAnalysis(compact=True)
+    monkeypatch.setattr(compact_analyzer, "iter_sequences", lambda *args: pytest.fail("records were read whole"))
+    assert list(compact_analyzer.stream_sequences(fasta_file, "DNA", "composition")) == expected
+
+
+def test_stream_sequences_invalid_type(analyzer, fasta_file):
+    with pytest.raises(InvalidSequenceTypeError):
+        list(analyzer.stream_sequences(fasta_file, "DNA", "translate"))
+
+
+def test_export_stream_writes_each_record(analyzer, fasta_file, tmp_path):
+    out_file = tmp_path / "out.txt"
+    analyzer.export_stream(analyzer.stream_sequences(fasta_file, "DNA", "gc_percent"), str(out_file))
+    assert out_file.read_text() == "seq1: 66.67 %\nseq2: 0.0 %\nseq3: 100.0 %\n"
+
+
+def test_stream_batches_records(analyzer, fasta_file, monkeypatch):
+    monkeypatch.setattr("geneanalyzertool.analysis.basic_analysis.BATCH_BASES", 8)
+    batch_sizes = []
+    analyze_batch = analyzer.analyze_batch
+    monkeypatch.setattr(analyzer, "analyze_batch",
+                        lambda sequences, method: batch_sizes.append(len(sequences)) or analyze_batch(sequences, method))
+    assert list(analyzer.stream_sequences(fasta_file, "DNA", "reverse_complement")) == \
+        [("seq1", "GCGCAT"), ("seq2", "ATATATAT"), ("seq3", "GGCC")]
+    assert batch_sizes == [2, 1]
+
+
+def test_stream_batches_are_bounded_in_records(analyzer, fasta_file, monkeypatch):
+    monkeypatch.setattr("geneanalyzertool.analysis.basic_analysis.BATCH_RECORDS", 1)
+    batch_sizes = []
+    analyze_batch = analyzer.analyze_batch
+    monkeypatch.setattr(analyzer, "analyze_batch",
+                        lambda sequences, method: batch_sizes.append(len(sequences)) or analyze_batch(sequences, method))
+    assert len(list(analyzer.stream_sequences(fasta_file, "DNA", "transcribe"))) == 3
+    assert batch_sizes == [1, 1, 1]
+
+
+def test_stream_metrics_count_records_and_time_stages(fasta_file, tmp_path):
+    metrics = RunMetrics()
+    analyzer = BasicSequenceAnalysis(metrics=metrics)
+    analyzer.export_stream(analyzer.stream_sequences(fasta_file, "DNA", "gc_percent"), str(tmp_path / "out.txt"))
+
+    summary = metrics.summary()
+    assert (summary["records"], summary["bases"]) == (3, 18)
+    assert summary["stages"]["analyze"]["calls"] == 3
+    assert summary["stages"]["read"]["calls"] == 4
+    assert {"convert", "export"} <= set(summary["stages"])
+
+
+def test_chunked_stream_metrics(fasta_file):
+    metrics = RunMetrics()
+    analyzer = BasicSequenceAnalysis(metrics=metrics)
+    list(analyzer.stream_sequences(fasta_file, "DNA", "gc_percent", chunk_size=3))
+    assert (metrics.records, metrics.bases) == (3, 18)
+
+
+def test_metrics_are_not_sent_to_workers(fasta_file):
+    metrics = RunMetrics()
+    analyzer = BasicSequenceAnalysis(metrics=metrics)
+    assert analyzer.__getstate__()["metrics"] is None
+    assert len(list(analyzer.stream_sequences(fasta_file, "DNA", "gc_percent", jobs=2))) == 3
+    assert (metrics.records, metrics.bases) == (3, 18)
+    assert "analyze" in metrics.stages
+
+
+# ---------- composition ----------
+def test_composition_dna(analyzer):
+    result = analyzer._composition(DNA("ACGTNacgt"), window=5)
+    assert result["Counts"]["N"] == 1
+    assert result["Soft Masked"] == 4
+    assert len(result["GC Windows"]) == 2
+
+
+def test_composition_invalid_type(analyzer):
+    with pytest.raises(TypeError):
+        analyzer._composition(Protein("MKWV"))
+
+
+def test_gc_percent_soft_masked(analyzer):
+    assert analyzer._gc_percent(DNA("atgcGC")) == "66.67 %"
+
+
+def test_translate_three_frames(analyzer):
+    proteins = analyzer._translate(RNA("AUGGCCUAA"), frames=3)
+    assert proteins == {"+1": "MA*", "+2": "WPX", "+3": "GLX"}
+    assert all(isinstance(protein, Protein) for protein in proteins.values())
+
+
+def test_translate_six_frames(analyzer):
+    proteins = analyzer._translate(RNA("AUGGCCUAA"), frames=6, to_stop=False)
+    assert list(proteins) == ["+1", "+2", "+3", "-1", "-2", "-3"]
+    assert proteins["-1"] == "LGH"
+
+
+def test_translate_invalid_frames(analyzer):
+    with pytest.raises(ValueError):
+        analyzer._translate(RNA("AUGGCCUAA"), frames=2)
+
+
+# ---------- GC windows ----------
+def test_gc_windows(analyzer):
+    result = analyzer._gc_windows(DNA("GGCCAATTGC"), window=4)
+    assert result == [{"Start": 0, "End": 4, "GC Percent": 100.0}, {"Start": 4, "End": 8, "GC Percent": 0.0},
+                      {"Start": 8, "End": 10, "GC Percent": 100.0}]
+
+
+def test_gc_windows_invalid_type(analyzer):
+    with pytest.raises(TypeError):
+        analyzer._gc_windows(Protein("MKWV"))
+
+
+def test_gc_windows_invalid_window(analyzer):
+    with pytest.raises(AnalysisMethodError):
+        analyzer.process_sequences("ACGT", False, "DNA", "gc_windows", method_options={"gc_windows": {"window": 0}})
+
+
+# ---------- k-mer counting ----------
+def test_kmer_count_dna(analyzer):
+    result = analyzer._kmer_count(DNA("ACGTacgtNACGT"), k=4, top=2)
+    assert result["Total K-mers"] == 6
+    assert result["Top K-mers"] == {"ACGT": 3, "CGTA": 2}
+    assert result["Histogram"] == {1: 1, 2: 1, 3: 1}
+    assert not result["Approximate"]
+
+
+def test_kmer_count_rna_matches_dna(analyzer):
+    assert analyzer._kmer_count(RNA("AUGGCAUU"), k=3) == analyzer._kmer_count(DNA("ATGGCATT"), k=3)
+
+
+def test_kmer_count_invalid_type(analyzer):
+    with pytest.raises(TypeError):
+        analyzer._kmer_count(Protein("MKWV"))
+
+
+def test_kmer_count_through_dispatcher(analyzer):
+    results, keys = analyzer.process_sequences("AAAAAA", False, "DNA", "kmer_count",
+                                               method_options={"kmer_count": {"k": 3, "canonical": False}})
+    assert results[keys[0]]["Top K-mers"] == {"AAA": 4}
+
+
+def test_kmer_count_invalid_k(analyzer):
+    with pytest.raises(AnalysisMethodError):
+        analyzer.process_sequences("ACGT", False, "DNA", "kmer_count", method_options={"kmer_count": {"k": 40}})
+
+
+# ---------- motif search ----------
+def test_motif_search_both_strands(analyzer):
+    result = analyzer._motif_search(DNA("ccGAATTCaaGGTTACC"), motifs=["EcoRI=G^AATTC", "GTAAC"])
+    assert result["Number of Hits"] == 2
+    assert result["Hits"]["Hit_1"] == {"Motif": "EcoRI", "Sequence": "GAATTC", "Start": 2, "End": 7, "Length": 6,
+                                       "Strand": "+", "Cut": 3}
+    assert result["Hits"]["Hit_2"] == {"Motif": "GTAAC", "Sequence": "GTAAC", "Start": 11, "End": 15, "Length": 5,
+                                       "Strand": "-"}
+
+
+def test_motif_search_cut_on_minus_strand(analyzer):
+    # BsmBI cuts CGTCTCN^; on the reverse strand the cut lies before the hit.
+    result = analyzer._motif_search(DNA("AAGAGACGTT"), motifs=["BsmBI=CGTCTCN^"], strand="-")
+    assert result["Hits"]["Hit_1"]["Sequence"] == "CGTCTCT"
+    assert result["Hits"]["Hit_1"]["Cut"] == 1
+
+
+def test_motif_search_rna(analyzer):
+    result = analyzer._motif_search(RNA("AUGUAAUGA"), motifs=["TGA"], strand="+")
+    assert [hit["Start"] for hit in result["Hits"].values()] == [6]
+    assert result["Hits"]["Hit_1"]["Sequence"] == "UGA"
+
+
+def test_motif_search_invalid_type(analyzer):
+    with pytest.raises(TypeError):
+        analyzer._motif_search(Protein("MKWV"), motifs=["ACGT"])
+
+
+def test_motif_search_through_dispatcher(analyzer):
+    results, keys = analyzer.process_sequences("GATCGATC", False, "DNA", "motif_search",
+                                               method_options={"motif_search": {"motifs": ["GATC"]}})
+    assert results[keys[0]]["Number of Hits"] == 2
+
+
+def test_motif_search_invalid_motif(analyzer):
+    with pytest.raises(AnalysisMethodError):
+        analyzer.process_sequences("ACGT", False, "DNA", "motif_search",
+                                   method_options={"motif_search": {"motifs": ["ACXT"]}})
+
+
+# ---------- result cache ----------
+def test_analyze_uses_cache(tmp_path, monkeypatch):
+    cached_analyzer = BasicSequenceAnalysis(cache=ResultCache(str(tmp_path)))
+    assert cached_analyzer.analyze(DNA("ATGCGC"), "gc_percent") == "66.67 %"
+
+    def fail(*args, **kwargs):
+        raise AssertionError("cache hit must skip the computation")
+
+    monkeypatch.setattr(cached_analyzer, "_gc_percent", fail)
+    assert cached_analyzer.analyze(DNA("ATGCGC"), "gc_percent") == "66.67 %"
+    with pytest.raises(AssertionError):
+        cached_analyzer.analyze(DNA("ATGCGA"), "gc_percent")
+
+
+def test_cached_results_keep_their_type(tmp_path):
+    cached_analyzer = BasicSequenceAnalysis(cache=ResultCache(str(tmp_path)))
+    cached_analyzer.analyze(RNA("AUGUUUUAA"), "translate")
+    assert isinstance(cached_analyzer.analyze(RNA("AUGUUUUAA"), "translate"), Protein)
+
+
+def test_records_are_digested_once_for_all_methods(tmp_path, monkeypatch):
+    cached_analyzer = BasicSequenceAnalysis(cache=ResultCache(str(tmp_path)))
+    digested = []
+    digest = cached_analyzer.cache.sequence_digest
+    monkeypatch.setattr(cached_analyzer.cache, "sequence_digest", lambda sequence: digested.append(sequence) or
+                        digest(sequence))
+    cached_analyzer.process_sequences("ATGAAATGA", False, "DNA", ["gc_percent", "base_count", "orf"])
+    assert digested == ["ATGAAATGA"]
+
+
+def test_compact_and_str_runs_share_cache_entries(tmp_path, monkeypatch):
+    str_analyzer = BasicSequenceAnalysis(cache=ResultCache(str(tmp_path)))
+    compact_analyzer = BasicSequenceAnalysis(cache=ResultCache(str(tmp_path)), compact=True)
+    expected = str_analyzer.process_sequences("AUGUUUUAA", False, "RNA", ["gc_percent", "translate"])[0]
+
+    monkeypatch.setattr(compact_analyzer, "_translate", lambda *args, **kwargs: pytest.fail("translation was not cached"))
+    results = compact_analyzer.process_sequences("AUGUUUUAA", False, "RNA", ["gc_percent", "translate"])[0]
+    assert results == expected
+    assert isinstance(results["input_sequence"]["translate"], CompactProtein)
+
+
+# ---------- compact sequences ----------
+def test_compact_analyzer_matches_str_results():
+    compact_analyzer = BasicSequenceAnalysis(compact=True)
+    str_analyzer = BasicSequenceAnalysis()
+    dna_methods = ["gc_percent", "base_count", "composition", "transcribe", "reverse_complement", "orf"]
+    rna_methods = ["translate", "reverse_complement", "gc_percent"]
+    cases = [("DNA", "ATGAAATGAATGTAGATGCCCTAAnnRY", dna_methods), ("RNA", "AUGUUUGGCUAA", rna_methods)]
+    for seq_type, sequence, methods in cases:
+        for method in methods:
+            compact_results, _ = compact_analyzer.process_sequences(sequence, False, seq_type, method)
+            str_results, _ = str_analyzer.process_sequences(sequence, False, seq_type, method)
+            assert compact_results == str_results
+
+
+def test_packed_records_are_analyzed_in_chunks(monkeypatch):
+    monkeypatch.setattr(basic_analysis, "UNPACK_CHUNK_BASES", 7)
+    methods = ["gc_percent", "base_count", "composition", "gc_windows", "kmer_count"]
+    options = {"composition": {"window": 6}, "gc_windows": {"window": 5, "step": 3}, "kmer_count": {"k": 3}}
+    sequence = "ACGTTGCAacgtGGCCNNATATGCGC" * 3
+    expected, _ = BasicSequenceAnalysis().process_sequences(sequence, False, "DNA", methods, options)
+
+    monkeypatch.setattr(CompactSequence, "as_bytes", lambda self: pytest.fail("the record was unpacked whole"))
+    results, _ = BasicSequenceAnalysis(compact=True).process_sequences(sequence, False, "DNA", methods, options)
+    assert results == expected
+
+
+def test_compact_analyzer_keeps_results_compact():
+    compact_analyzer = BasicSequenceAnalysis(compact=True)
+    results, _ = compact_analyzer.process_sequences("ATGC", False, "DNA", "transcribe")
+    assert isinstance(results["input_sequence"], CompactRNA)
+
+
+def test_compact_analyzer_type_mismatch():
+    compact_analyzer = BasicSequenceAnalysis(compact=True)
+    with pytest.raises(InvalidSequenceTypeError, match="type DNA"):
+        compact_analyzer.process_sequences("ATGC", False, "DNA", "translate")
+
+
+# ---------- multi method analysis ----------
+def test_process_sequences_multiple_methods(analyzer):
+    methods = ["gc_percent", "base_count", "orf", "reverse_complement"]
+    results, _ = analyzer.process_sequences("ATGAAATAGCC", False, "DNA", methods)
+    report = results["input_sequence"]
+    assert isinstance(report, AnalysisReport)
+    assert list(report) == methods
+    for method in methods:
+        single, _ = analyzer.process_sequences("ATGAAATAGCC", False, "DNA", method)
+        assert report[method] == single["input_sequence"]
+
+
+def test_process_sequences_all_methods_skips_inapplicable(analyzer):
+    results, _ = analyzer.process_sequences("AUGUUUUAA", False, "RNA", "all")
+    report = results["input_sequence"]
+    assert "translate" in report and "gc_percent" in report
+    assert "transcribe" not in report and "orf" not in report
+
+
+def test_process_sequences_multiple_methods_type_mismatch(analyzer):
+    with pytest.raises(InvalidSequenceTypeError):
+        analyzer.process_sequences("ATGC", False, "DNA", ["gc_percent", "translate"])
+
+
+def test_multiple_methods_share_intermediates(analyzer, monkeypatch):
+    calls = []
+    complement_strand = analyzer._complement_strand
+    monkeypatch.setattr(analyzer, "_complement_strand", lambda seq: calls.append(seq) or complement_strand(seq))
+    results, _ = analyzer.process_sequences("ATGAAATAGCC", False, "DNA", ["orf", "reverse_complement"])
+    assert len(calls) == 1
+    assert results["input_sequence"]["reverse_complement"] == "GGCTATTTCAT"
+
+
+def test_intermediates_are_not_kept_between_records(analyzer):
+    first = analyzer.analyze(DNA("ATGC"), "reverse_complement")
+    second = analyzer.analyze(DNA("AATT"), "reverse_complement")
+    assert (first, second) == ("GCAT", "AATT")
+    assert analyzer._intermediates is None
+
+
+def test_stream_multiple_methods(analyzer, fasta_file, tmp_path):
+    out_file = tmp_path / "out.txt"
+    analyzer.export_stream(analyzer.stream_sequences(fasta_file, "DNA", ["gc_percent", "orf"]), str(out_file))
+    lines = out_file.read_text().splitlines()
+    assert lines[:5] == ["Sequence Name: seq1", "gc_percent: 66.67 %", "orf:", "   Number of ORFs: 0",
+                         "   No Open Reading Frames Found"]
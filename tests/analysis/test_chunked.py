@@ -0,0 +1,144 @@
+from functools import partial
+
+import pytest
+
+from geneanalyzertool.analysis.analysis import AnalysisReport, WindowedResult
+from geneanalyzertool.analysis.basic_analysis import DNA_COMPLEMENT, BasicSequenceAnalysis
+from geneanalyzertool.analysis.chunked import GcWindowAccumulator, OrfAccumulator
+from geneanalyzertool.analysis.composition import byte_counts, sliding_gc
+from geneanalyzertool.core.exceptions import AnalysisMethodError, InvalidSequenceTypeError
+from tests.helpers import random_sequence
+
+METHOD_OPTIONS = {
+    "composition": {"window": 70, "step": 30},
+    "gc_windows": {"window": 50},
+    "kmer_count": {"k": 5},
+    "motif_search": {"motifs": ["EcoRI=G^AATTC", "GATC", "CANNTG", "ACGTACGTACGTACGTACGTACGTACGTACGTAC"]}
+}
+# Soft masked random sequences with a few N.
+masked_sequence = partial(random_sequence, seed=4, alphabet="ACGTacgtN", p=[.2] * 4 + [.04] * 5)
+CHUNKED_METHODS = ["gc_percent", "base_count", "composition", "gc_windows", "kmer_count", "motif_search", "orf"]
+
+
+@pytest.fixture
+def analyzer():
+    return BasicSequenceAnalysis()
+
+
+def chunks_of(sequence: str, size: int):
+    data = sequence.encode()
+    return (data[offset:offset + size] for offset in range(0, max(len(data), 1), size))
+
+
+def whole_record(analyzer, sequence, methods, method_options, seq_type="DNA"):
+    return analyzer._analyze_record(analyzer._sequence_class(seq_type)(sequence), methods, method_options)
+
+
+@pytest.mark.parametrize("size, chunk_size", [(0, 10), (5, 1), (2000, 1), (2000, 7), (3000, 64), (3000, 5000)])
+def test_chunked_results_match_whole_record(analyzer, size, chunk_size):
+    sequence = masked_sequence(size)
+    chunked = analyzer.analyze_chunks(chunks_of(sequence, chunk_size), "DNA", CHUNKED_METHODS, METHOD_OPTIONS)
+    assert isinstance(chunked, AnalysisReport)
+    assert chunked == whole_record(analyzer, sequence, CHUNKED_METHODS, METHOD_OPTIONS)
+
+
+@pytest.mark.parametrize("strand", ["+", "-", "both"])
+@pytest.mark.parametrize("nested", [True, False])
+def test_chunked_orfs_match_whole_record(analyzer, strand, nested):
+    sequence = masked_sequence(4000, seed=9)
+    options = {"orf": {"strand": strand, "nested": nested, "min_length": 9, "start_codons": ["ATG", "GTG"]}}
+    for chunk_size in (1, 2, 3, 100):
+        chunked = analyzer.analyze_chunks(chunks_of(sequence, chunk_size), "DNA", "orf", options)
+        assert chunked == whole_record(analyzer, sequence, "orf", options)
+
+
+def test_chunked_orfs_when_a_codon_is_start_and_stop(analyzer):
+    sequence = masked_sequence(3000, seed=2)
+    for nested in (True, False):
+        options = {"orf": {"start_codons": ["ATG", "TGA"], "nested": nested}}
+        assert analyzer.analyze_chunks(chunks_of(sequence, 11), "DNA", "orf", options) == \
+            whole_record(analyzer, sequence, "orf", options)
+
+
+def test_orf_across_chunk_edge_keeps_its_sequence():
+    accumulator = OrfAccumulator({"ATG"}, {"TAA"}, DNA_COMPLEMENT, strand="+")
+    for chunk in (b"CCA", b"TGAAAT", b"AAGG"):
+        accumulator.add(chunk, byte_counts(chunk))
+    orf = accumulator.result()["ORFS"]["ORF_1"]
+    assert orf == {"Sequence": "ATGAAATAA", "Start": 2, "End": 10, "Length": 9, "Strand": "+"}
+
+
+def test_orf_accumulator_drops_bases_it_no_longer_needs():
+    accumulator = OrfAccumulator({"ATG"}, {"TAA", "TAG", "TGA"}, DNA_COMPLEMENT)
+    chunk = masked_sequence(1000, seed=5).upper().encode()
+    for _ in range(50):
+        accumulator.add(chunk, byte_counts(chunk))
+    assert len(accumulator._buffer) < 2 * len(chunk)
+
+
+@pytest.mark.parametrize("window, step, chunk_size", [(10, None, 3), (10, 4, 7), (7, 3, 1), (100, 100, 1000)])
+def test_gc_window_accumulator_matches_sliding_gc(window, step, chunk_size):
+    sequence = masked_sequence(997, seed=3)
+    accumulator = GcWindowAccumulator(window, step)
+    for chunk in chunks_of(sequence, chunk_size):
+        accumulator.add(chunk, byte_counts(chunk))
+    assert accumulator.result() == sliding_gc(sequence, window, step)
+
+
+def test_gc_windows_are_a_windowed_result(analyzer):
+    result = analyzer.analyze_chunks(chunks_of("GGCCAATT", 3), "DNA", "gc_windows", {"gc_windows": {"window": 4}})
+    assert isinstance(result, WindowedResult)
+    assert result == [{"Start": 0, "End": 4, "GC Percent": 100.0}, {"Start": 4, "End": 8, "GC Percent": 0.0}]
+
+
+def test_whole_record_methods_fall_back_to_the_joined_record(analyzer):
+    result = analyzer.analyze_chunks(chunks_of("ATGGCC", 4), "DNA", ["gc_percent", "reverse_complement"])
+    assert result == AnalysisReport(gc_percent="66.67 %", reverse_complement="GGCCAT")
+
+
+def test_all_methods_skip_inapplicable_ones(analyzer):
+    assert analyzer.analyze_chunks(chunks_of("MKWV", 2), "Protein", "all") == \
+        whole_record(analyzer, "MKWV", "all", None, "Protein")
+
+
+def test_chunked_protein_properties(analyzer):
+    assert analyzer.analyze_chunks(chunks_of("MKWVTF", 4), "Protein", "protein_properties") == \
+        whole_record(analyzer, "MKWVTF", "protein_properties", None, "Protein")
+    with pytest.raises(InvalidSequenceTypeError):
+        analyzer.analyze_chunks(chunks_of("ACGT", 2), "DNA", "protein_properties")
+
+
+def test_chunked_motif_hits_keep_whole_record_order(analyzer):
+    # GGATCC starts before GATC but ends after it, across the edge of 9 base chunks.
+    sequence = "CCCCGGATCCCC" + masked_sequence(2000, seed=8)
+    options = {"motif_search": {"motifs": ["BamHI=G^GATCC", "GATC", "ATCNNNNNNNNNGAT", "TC"]}}
+    for chunk_size in (9, 10, 13, 64):
+        assert analyzer.analyze_chunks(chunks_of(sequence, chunk_size), "DNA", "motif_search", options) == \
+            whole_record(analyzer, sequence, "motif_search", options)
+
+
+def test_chunked_kmers_with_chunks_of_only_n(analyzer):
+    sequence = masked_sequence(300, seed=5) + "N" * 200 + masked_sequence(300, seed=6)
+    options = {"kmer_count": {"k": 21}}
+    assert analyzer.analyze_chunks(chunks_of(sequence, 100), "DNA", "kmer_count", options) == \
+        whole_record(analyzer, sequence, "kmer_count", options)
+
+
+def test_chunked_errors_match_whole_record(analyzer):
+    with pytest.raises(InvalidSequenceTypeError):
+        analyzer.analyze_chunks(chunks_of("MKWV", 2), "Protein", "gc_percent")
+    with pytest.raises(InvalidSequenceTypeError):
+        analyzer.analyze_chunks(chunks_of("AUGC", 2), "RNA", "orf")
+    with pytest.raises(AnalysisMethodError):
+        analyzer.analyze_chunks(chunks_of("ACGT", 2), "DNA", "kmer_count", {"kmer_count": {"k": 40}})
+    with pytest.raises(AnalysisMethodError):
+        analyzer.analyze_chunks(chunks_of("ACGT", 2), "DNA", "unknown")
+
+
+def test_stream_sequences_in_chunks(analyzer, tmp_path):
+    fasta_file = tmp_path / "genome.fasta"
+    records = {"chr1": masked_sequence(5000, seed=1), "chr2": masked_sequence(300, seed=2)}
+    fasta_file.write_text("".join(f">{name}\n{sequence}\n" for name, sequence in records.items()))
+
+    chunked = list(analyzer.stream_sequences(str(fasta_file), "DNA", CHUNKED_METHODS, METHOD_OPTIONS, chunk_size=256))
+    assert chunked == list(analyzer.stream_sequences(str(fasta_file), "DNA", CHUNKED_METHODS, METHOD_OPTIONS))
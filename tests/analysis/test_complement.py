@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from geneanalyzertool.analysis.complement import (
+    DNA_COMPLEMENT, RNA_COMPLEMENT, reverse_complement_batch, transcribe_batch, translate_batch
+)
+
+
+def random_sequences(count: int, seed: int = 3, alphabet: str = "ACGTRYSWKMBDHVNacgtn") -> list:
+    rng = np.random.default_rng(seed)
+    return ["".join(rng.choice(list(alphabet), size=rng.integers(0, 40))).encode() for _ in range(count)]
+
+
+def test_iupac_complements_are_involutions():
+    symbols = b"ACGTRYSWKMBDHVNacgtryswkmbdhvn"
+    assert symbols.translate(DNA_COMPLEMENT).translate(DNA_COMPLEMENT) == symbols
+    rna_symbols = symbols.replace(b"T", b"U").replace(b"t", b"u")
+    assert rna_symbols.translate(RNA_COMPLEMENT).translate(RNA_COMPLEMENT) == rna_symbols
+
+
+def test_complement_keeps_soft_masking():
+    assert b"ACGTrykmN".translate(DNA_COMPLEMENT) == b"TGCAyrmkN"
+    assert b"AUGCaugc".translate(RNA_COMPLEMENT) == b"UACGuacg"
+
+
+def test_reverse_complement_batch_matches_single_records():
+    sequences = random_sequences(500)
+    assert reverse_complement_batch(sequences) == [sequence.translate(DNA_COMPLEMENT)[::-1]
+                                                   for sequence in sequences]
+
+
+def test_transcribe_batch():
+    assert transcribe_batch([b"ATGc", b"", b"ttAN"]) == [b"AUGc", b"", b"uuAN"]
+
+
+@pytest.mark.parametrize("reverse", [True, False])
+def test_translate_batch_edge_cases(reverse):
+    assert translate_batch([], DNA_COMPLEMENT, reverse) == []
+    assert translate_batch([b"", b""], DNA_COMPLEMENT, reverse) == [b"", b""]
+    assert translate_batch([b"A", b"", b"GG"], DNA_COMPLEMENT, reverse) == [b"T", b"", b"CC"]
+
+
+def test_unknown_bytes_are_kept():
+    assert reverse_complement_batch([b"AC-GT*"]) == [b"*AC-GT"]
@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+from geneanalyzertool.analysis.composition import (
+    byte_counts, counts_for, gc_fraction, nucleotide_composition, sequence_bytes, sliding_gc
+)
+
+
+# ---------- byte counting ----------
+def test_sequence_bytes_from_str_and_bytes():
+    assert sequence_bytes("ACGT").tolist() == sequence_bytes(b"ACGT").tolist() == [65, 67, 71, 84]
+
+
+def test_counts_for_folds_case():
+    assert counts_for(byte_counts("AAcgTTt"), "ACGT") == {"A": 2, "C": 1, "G": 1, "T": 3}
+
+
+def test_gc_fraction_empty_sequence():
+    assert gc_fraction(byte_counts("")) == 0.0
+
+
+# ---------- nucleotide_composition ----------
+def test_nucleotide_composition_reports_iupac_and_soft_masking():
+    composition = nucleotide_composition("ACGTNNRYacgt*")
+    assert composition["Length"] == 13
+    assert composition["Counts"]["A"] == 2
+    assert composition["Counts"]["N"] == 2
+    assert composition["Counts"]["R"] == 1
+    assert composition["Counts"]["Y"] == 1
+    assert composition["Soft Masked"] == 4
+    assert composition["Other"] == 1
+    assert composition["GC Percent"] == round(4 / 13 * 100, 2)
+    assert "GC Windows" not in composition
+
+
+def test_nucleotide_composition_with_windows():
+    composition = nucleotide_composition("GGGGAAAA", window=4)
+    assert composition["GC Windows"] == [
+        {"Start": 0, "End": 4, "GC Percent": 100.0},
+        {"Start": 4, "End": 8, "GC Percent": 0.0}
+    ]
+
+
+# ---------- sliding_gc ----------
+def test_sliding_gc_matches_naive_windows():
+    rng = np.random.default_rng(7)
+    sequence = "".join(rng.choice(list("ACGTacgtN"), size=1003))
+    for window, step in [(10, 10), (10, 3), (7, 5), (50, 100), (2000, 10)]:
+        windows = sliding_gc(sequence, window, step)
+        for entry in windows:
+            chunk = sequence[entry["Start"]:entry["End"]].upper()
+            expected = round((chunk.count("G") + chunk.count("C")) / len(chunk) * 100, 2)
+            assert entry["GC Percent"] == expected
+        assert windows[0]["Start"] == 0
+        assert windows[-1]["End"] <= len(sequence)
+
+
+def test_sliding_gc_truncates_last_window():
+    assert sliding_gc("GGGGGC", 4) == [
+        {"Start": 0, "End": 4, "GC Percent": 100.0},
+        {"Start": 4, "End": 6, "GC Percent": 100.0}
+    ]
+
+
+def test_sliding_gc_empty_sequence():
+    assert sliding_gc("", 10) == []
+
+
+def test_sliding_gc_invalid_window():
+    with pytest.raises(ValueError):
+        sliding_gc("ACGT", 0)
@@ -0,0 +1,79 @@
+import pytest
+
+from geneanalyzertool.analysis.basic_analysis import BasicSequenceAnalysis
+from geneanalyzertool.analysis.incremental import stream_incremental
+from geneanalyzertool.core.exceptions import SequenceParsingError
+from geneanalyzertool.core.manifest import ResultManifest
+from geneanalyzertool.core.metrics import RunMetrics
+from geneanalyzertool.core.selection import RecordSelection
+
+CONFIG = {"mode": "basic", "seq_type": "DNA", "analysis_method": ["gc_percent", "orf"], "method_options": {}}
+RECORDS = {"seq1": "ATGGCCTAAGG", "seq2": "GGGCCCATATAT", "seq3": "ATGAAATTTTGACC", "seq4": "CCCCGGGGAT"}
+
+
+def write_fasta(path, records: dict) -> str:
+    path.write_text("".join(f">{name}\n{sequence}\n" for name, sequence in records.items()))
+    return str(path)
+
+
+def run(path: str, manifest_file: str, metrics: RunMetrics | None = None, **options) -> list:
+    analyzer = BasicSequenceAnalysis(metrics=metrics, selection=options.pop("selection", None))
+    manifest = ResultManifest(manifest_file, CONFIG)
+    return list(stream_incremental(analyzer, manifest, path, "DNA", ["gc_percent", "orf"], **options))
+
+
+def full_run(path: str, **options) -> list:
+    analyzer = BasicSequenceAnalysis(selection=options.pop("selection", None))
+    return list(analyzer.stream_sequences(path, "DNA", ["gc_percent", "orf"], **options))
+
+
+@pytest.mark.parametrize("options", [{}, {"chunk_size": 4}, {"jobs": 2}])
+def test_rerun_only_analyzes_changed_records(tmp_path, options):
+    path, manifest_file = tmp_path / "records.fasta", str(tmp_path / "out.txt.manifest")
+    assert run(write_fasta(path, RECORDS), manifest_file, **options) == full_run(str(path), **options)
+
+    # seq2 changed, seq3 left, new1 came in.
+    updated = {"new1": "ATGCCCTGA", "seq1": RECORDS["seq1"], "seq2": "GGGCCCATATAA", "seq4": RECORDS["seq4"]}
+    metrics = RunMetrics()
+    results = run(write_fasta(path, updated), manifest_file, metrics if options.get("jobs") is None else None,
+                  **options)
+    assert results == full_run(str(path), **options)
+    assert [name for name, _ in results] == ["new1", "seq1", "seq2", "seq4"]
+    if options.get("jobs") is None:
+        assert metrics.records == 2
+
+    assert set(ResultManifest(manifest_file, CONFIG).records) == {"new1", "seq1", "seq2", "seq4"}
+
+
+def test_unchanged_file_is_not_analyzed(tmp_path, monkeypatch):
+    path, manifest_file = write_fasta(tmp_path / "records.fasta", RECORDS), str(tmp_path / "out.txt.manifest")
+    expected = run(path, manifest_file)
+    monkeypatch.setattr(BasicSequenceAnalysis, "stream_sequences",
+                        lambda *args, **kwargs: pytest.fail("unchanged records were analyzed"))
+    assert run(path, manifest_file) == expected
+
+
+def test_repeated_ids_are_always_analyzed(tmp_path):
+    path, manifest_file = tmp_path / "records.fasta", str(tmp_path / "out.txt.manifest")
+    path.write_text(">dup\nATGGCCTAA\n>seq2\nGGGCCC\n>dup\nATGAAATGA\n")
+    run(str(path), manifest_file)
+    assert run(str(path), manifest_file) == full_run(str(path))
+    assert set(ResultManifest(manifest_file, CONFIG).records) == {"seq2"}
+
+
+def test_selection_still_applies(tmp_path):
+    path, manifest_file = write_fasta(tmp_path / "records.fasta", RECORDS), str(tmp_path / "out.txt.manifest")
+    selection = RecordSelection(id_regex="seq[12]")
+    assert run(path, manifest_file, selection=selection) == full_run(path, selection=selection)
+    assert run(path, manifest_file) == full_run(path)
+
+
+@pytest.mark.parametrize("analyzed", [[("seq2", "50.0 %")], []])
+def test_records_changed_during_the_run_are_an_error(tmp_path, monkeypatch, analyzed):
+    path, manifest_file = write_fasta(tmp_path / "records.fasta", RECORDS), str(tmp_path / "out.txt.manifest")
+    run(path, manifest_file)
+    write_fasta(tmp_path / "records.fasta", {**RECORDS, "seq1": "ATGGCCTAAGC"})
+    monkeypatch.setattr(BasicSequenceAnalysis, "stream_sequences", lambda *args, **kwargs: iter(analyzed))
+    with pytest.raises(SequenceParsingError):
+        run(path, manifest_file)
+    assert set(ResultManifest(manifest_file, CONFIG).records) == set(RECORDS)
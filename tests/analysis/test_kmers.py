@@ -0,0 +1,154 @@
+from collections import Counter
+
+import numpy as np
+import pytest
+from geneanalyzertool.analysis.kmers import (
+    CountMinSketch, KmerCounter, decode_kmer, iter_kmer_codes, kmer_codes
+)
+from tests.helpers import random_sequence
+
+COMPLEMENT = str.maketrans("ACGT", "TGCA")
+
+
+def naive_counts(sequence: str, k: int, canonical: bool = True) -> Counter:
+    counts = Counter()
+    sequence = sequence.upper().replace("U", "T")
+    for start in range(len(sequence) - k + 1):
+        kmer = sequence[start:start + k]
+        if set(kmer) <= set("ACGT"):
+            counts[min(kmer, kmer.translate(COMPLEMENT)[::-1]) if canonical else kmer] += 1
+    return counts
+
+
+# ---------- encoding ----------
+def test_kmer_codes_round_trip():
+    codes = kmer_codes("ACGTTGCA", 4, canonical=False)
+    assert [decode_kmer(code, 4) for code in codes] == ["ACGT", "CGTT", "GTTG", "TTGC", "TGCA"]
+
+
+def test_kmer_codes_skip_ambiguous_bases_and_fold_case():
+    codes = kmer_codes("acgNACGu", 3, canonical=False)
+    assert [decode_kmer(code, 3) for code in codes] == ["ACG", "ACG", "CGT"]
+
+
+def test_canonical_codes_match_reverse_complement():
+    sequence = random_sequence(500)
+    reverse = sequence.translate(COMPLEMENT)[::-1]
+    assert sorted(kmer_codes(sequence, 11)) == sorted(kmer_codes(reverse, 11))
+
+
+def test_kmer_codes_of_short_sequence():
+    assert len(kmer_codes("ACG", 4)) == 0
+
+
+def test_iter_kmer_codes_chunks_cover_every_kmer():
+    sequence = random_sequence(1000)
+    chunks = list(iter_kmer_codes(sequence, 7, chunk_kmers=100))
+    assert len(chunks) == 10
+    assert np.concatenate(chunks).tolist() == kmer_codes(sequence, 7).tolist()
+
+
+@pytest.mark.parametrize("k", [0, 32])
+def test_invalid_k(k):
+    with pytest.raises(ValueError):
+        KmerCounter(k)
+
+
+# ---------- counting ----------
+@pytest.mark.parametrize("k, canonical", [(1, True), (5, True), (5, False), (17, True), (31, False)])
+def test_counter_matches_naive_counts(k, canonical):
+    sequence = random_sequence(3000, alphabet="ACGTN")
+    counter = KmerCounter(k, canonical)
+    counter.update(sequence)
+    expected = naive_counts(sequence, k, canonical)
+
+    codes, counts = counter.counts()
+    assert {decode_kmer(code, k): int(count) for code, count in zip(codes, counts)} == expected
+    assert counter.total == sum(expected.values())
+    assert counter.distinct() == len(expected)
+    assert counter.histogram() == dict(sorted(Counter(expected.values()).items()))
+
+
+@pytest.mark.parametrize("k", [5, 21])
+def test_records_without_valid_kmers(k):
+    counter = KmerCounter(k)
+    counter.update("N" * 50)
+    counter.update("ACGTN" + "ACGTACGTACGTACGTAC"[:k - 2])
+    assert counter.total == 0
+    assert counter.distinct() == 0
+    assert counter.report(10)["Histogram"] == {}
+
+
+def test_top_orders_by_count_then_kmer():
+    counter = KmerCounter(2, canonical=False)
+    counter.update("AAAACCGG")
+    assert counter.top(3) == [("AA", 3), ("AC", 1), ("CC", 1)]
+
+
+@pytest.mark.parametrize("k", [4, 15])
+def test_merge_equals_counting_together(k):
+    first, second = random_sequence(800, seed=1), random_sequence(600, seed=2)
+    merged, left, right = KmerCounter(k), KmerCounter(k), KmerCounter(k)
+    merged.update(first)
+    merged.update(second)
+    left.update(first)
+    right.update(second)
+    left.merge(right)
+
+    assert left.report() == merged.report()
+
+
+def test_merge_requires_same_settings():
+    with pytest.raises(ValueError):
+        KmerCounter(5).merge(KmerCounter(6))
+    with pytest.raises(ValueError):
+        KmerCounter(5).merge(KmerCounter(5, canonical=False))
+
+
+@pytest.mark.parametrize("k", [6, 21])
+def test_save_and_load(tmp_path, k):
+    counter = KmerCounter(k)
+    counter.update(random_sequence(2000))
+    counter.save(str(tmp_path / "counts.npz"))
+
+    assert KmerCounter.load(str(tmp_path / "counts.npz")).report() == counter.report()
+
+
+# ---------- bounded memory ----------
+def test_counter_switches_to_sketch():
+    sequence = random_sequence(20000) + "ACGTACGTACGTACGTACGT" * 50
+    counter = KmerCounter(21, max_distinct=500, sketch_width_bits=14)
+    counter.update(sequence)
+    expected = naive_counts(sequence, 21)
+
+    assert counter.approximate
+    assert counter.histogram() is None
+    assert "Histogram" not in counter.report()
+    assert len(counter.counts()[0]) <= 500
+    assert counter.total == sum(expected.values())
+    # Count-min estimates never undercount, and the repeated k-mers stay on top.
+    top = counter.top(2)
+    assert {kmer for kmer, _ in top} == {kmer for kmer, _ in expected.most_common(2)}
+    assert all(count >= expected[kmer] for kmer, count in top)
+    assert counter.distinct() == pytest.approx(len(expected), rel=0.1)
+
+
+def test_sketch_counters_merge_and_reload(tmp_path):
+    left, right = KmerCounter(21, max_distinct=100, sketch_width_bits=12), KmerCounter(21, sketch_width_bits=12)
+    left.update(random_sequence(3000, seed=1))
+    right.update(random_sequence(3000, seed=2) + "A" * 100)
+    left.merge(right)
+    left.save(str(tmp_path / "sketch.npz"))
+    loaded = KmerCounter.load(str(tmp_path / "sketch.npz"), max_distinct=100)
+
+    assert left.approximate and loaded.approximate
+    assert left.top(1) == loaded.top(1) == [("A" * 21, left.top(1)[0][1])]
+    assert left.top(1)[0][1] >= 80
+
+
+def test_count_min_sketch_never_undercounts():
+    sketch = CountMinSketch(width_bits=8, depth=3)
+    keys = np.arange(1000, dtype=np.uint64)
+    counts = np.arange(1000, dtype=np.int64)
+    sketch.add(keys, counts)
+    assert (sketch.estimate(keys) >= counts).all()
@@ -0,0 +1,129 @@
+import re
+
+import pytest
+from geneanalyzertool.analysis.motifs import (
+    IUPAC_MOTIF_BASES, Motif, MotifScanner, format_motif, motif_scanner, parse_motif, read_motif_file,
+    reverse_complement_motif
+)
+from tests.helpers import random_sequence
+
+
+def naive_hits(sequence: str, motifs: list, strand: str = "both") -> list:
+    hits = []
+    for motif in motifs:
+        reverse = reverse_complement_motif(motif.pattern)
+        orientations = [("+", motif.pattern)] if strand in ("+", "both") else []
+        if strand == "-" or (strand == "both" and reverse != motif.pattern):
+            orientations.append(("-", reverse))
+        for hit_strand, pattern in orientations:
+            expression = "".join(f"[{IUPAC_MOTIF_BASES[symbol]}]" for symbol in pattern)
+            for match in re.finditer(f"(?=({expression}))", sequence.upper()):
+                hits.append((match.start(), match.start() + len(pattern), hit_strand, motif))
+    return sorted(hits, key=lambda hit: (hit[0], hit[1]))
+
+
+# ---------- parsing ----------
+def test_parse_motif():
+    assert parse_motif("gaattc") == Motif("GAATTC", "GAATTC")
+    assert parse_motif("EcoRI=G^AATTC") == Motif("EcoRI", "GAATTC", 1)
+    assert parse_motif("RGCGCY", name="BsaHI") == Motif("BsaHI", "RGCGCY")
+
+
+@pytest.mark.parametrize("text", ["", "GAXTC", "G^AA^TTC", "name="])
+def test_parse_invalid_motif(text):
+    with pytest.raises(ValueError):
+        parse_motif(text)
+
+
+def test_format_motif_round_trip():
+    motif = parse_motif("HhaI=GCG^C")
+    assert format_motif(motif) == "HhaI=GCG^C"
+    assert parse_motif(format_motif(motif)) == motif
+
+
+def test_read_motif_file(tmp_path):
+    path = tmp_path / "enzymes.txt"
+    path.write_text("# restriction enzymes\nEcoRI G^AATTC\n\nBamHI=G^GATCC\n>TATA box\nTATAWAW\nGCGC\n")
+    assert read_motif_file(str(path)) == [Motif("EcoRI", "GAATTC", 1), Motif("BamHI", "GGATCC", 1),
+                                          Motif("TATA box", "TATAWAW"), Motif("GCGC", "GCGC")]
+
+
+def test_read_motif_file_invalid_line(tmp_path):
+    path = tmp_path / "motifs.txt"
+    path.write_text("EcoRI G^AATTC extra\n")
+    with pytest.raises(ValueError, match="Invalid motif line"):
+        read_motif_file(str(path))
+
+
+def test_reverse_complement_motif():
+    assert reverse_complement_motif("RGATCY") == "RGATCY"
+    assert reverse_complement_motif("ACGTN") == "NACGT"
+
+
+# ---------- scanning ----------
+@pytest.mark.parametrize("strand", ["+", "-", "both"])
+def test_scan_matches_naive_search(strand):
+    sequence = random_sequence(5000, 5, "ACGTN").encode()
+    motifs = [parse_motif(text) for text in ["GAATTC", "GATC", "RGCGCY", "TATAWAW", "CANNTG", "ACG", "A"]]
+    assert MotifScanner(motifs, strand).scan(sequence) == naive_hits(sequence.decode(), motifs, strand)
+
+
+def test_scan_folds_case_and_matches_rna():
+    motif = parse_motif("TTGA")
+    assert MotifScanner([motif], "+").scan(b"aauugaUUGA") == [(2, 6, "+", motif), (6, 10, "+", motif)]
+
+
+def test_palindromes_are_reported_once():
+    motif = parse_motif("GAATTC")
+    assert MotifScanner([motif]).scan(b"CCGAATTCGG") == [(2, 8, "+", motif)]
+
+
+def test_rna_palindromes_are_reported_once():
+    ecori, site = parse_motif("GAAUUC"), parse_motif("aauu")
+    assert MotifScanner([ecori]).scan(b"GAAUUC") == [(0, 6, "+", ecori)]
+    assert MotifScanner([site]).scan(b"GGAAUUGG") == [(2, 6, "+", site)]
+
+
+def test_overlapping_hits_of_several_motifs():
+    first, second = parse_motif("AAA"), parse_motif("AAAA")
+    hits = MotifScanner([first, second], "+").scan(b"AAAAA")
+    assert hits == [(0, 3, "+", first), (0, 4, "+", second), (1, 4, "+", first), (1, 5, "+", second),
+                    (2, 5, "+", first)]
+
+
+def test_ambiguous_sequence_bases_never_match():
+    assert MotifScanner([parse_motif("NNN")]).scan(b"ACNGT") == []
+
+
+@pytest.mark.parametrize("pattern", ["ACGTACGTACGTACGTACGTACGTACGTACGTA", "ACNNNNNNNNNGT"])
+def test_long_and_degenerate_motifs_fall_back_to_regex(pattern):
+    motif = parse_motif(pattern)
+    sequence = random_sequence(3000, seed=8).encode() + pattern.replace("N", "C").encode()
+    scanner = MotifScanner([motif])
+    assert scanner._expressions
+    assert scanner.scan(sequence) == naive_hits(sequence.decode(), [motif])
+
+
+def test_scan_crosses_chunk_boundaries(monkeypatch):
+    monkeypatch.setattr("geneanalyzertool.analysis.motifs.SCAN_CHUNK", 97)
+    sequence = random_sequence(2000, seed=2).encode()
+    motifs = [parse_motif("GATC"), parse_motif("ACGTW")]
+    assert MotifScanner(motifs).scan(sequence) == naive_hits(sequence.decode(), motifs)
+
+
+def test_invalid_strand():
+    with pytest.raises(ValueError):
+        MotifScanner([parse_motif("ACGT")], "forward")
+
+
+def test_motif_scanner_is_reused():
+    motifs = [parse_motif("GATC")]
+    assert motif_scanner(motifs) is motif_scanner(list(motifs))
+    assert motif_scanner(motifs) is not motif_scanner(motifs, "+")
+
+
+def test_motif_scanners_are_bounded():
+    first = motif_scanner([parse_motif("GATC")])
+    for length in range(4, 44):
+        motif_scanner([parse_motif("A" * length)])
+    assert motif_scanner([parse_motif("GATC")]) is not first
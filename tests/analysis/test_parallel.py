@@ -0,0 +1,64 @@
+import pytest
+from geneanalyzertool.core.sequences import DNA
+from geneanalyzertool.analysis.basic_analysis import BasicSequenceAnalysis
+from geneanalyzertool.analysis.parallel import analyze_in_parallel, batch_records, resolve_jobs
+from geneanalyzertool.core.exceptions import InvalidSequenceTypeError
+
+
+@pytest.fixture
+def records():
+    return [(f"seq{i}", "ATGC" * (i + 1) + "G" * i) for i in range(25)]
+
+
+# ---------- batching ----------
+def test_batch_records_respects_record_limit(records):
+    batches = list(batch_records(records, max_bases=10**9, max_records=10))
+    assert [len(batch) for batch in batches] == [10, 10, 5]
+
+
+def test_batch_records_respects_base_limit():
+    batches = list(batch_records([("a", "A" * 5), ("b", "A" * 5), ("c", "A" * 5)], max_bases=10))
+    assert [[key for key, _ in batch] for batch in batches] == [["a", "b"], ["c"]]
+
+
+def test_batch_records_empty():
+    assert list(batch_records([])) == []
+
+
+def test_resolve_jobs():
+    assert resolve_jobs(3) == 3
+    assert resolve_jobs(0) >= 1
+
+
+# ---------- parallel analysis ----------
+def test_analyze_in_parallel_keeps_input_order(records):
+    analyzer = BasicSequenceAnalysis()
+    results = list(analyze_in_parallel(BasicSequenceAnalysis(), records, "DNA", "gc_percent", jobs=2, batch_size=3))
+    assert [key for key, _ in results] == [key for key, _ in records]
+    assert results == [(key, analyzer.analyze(analyzer._sequence_class("DNA")(seq), "gc_percent"))
+                       for key, seq in records]
+
+
+def test_analyze_in_parallel_passes_method_options(records):
+    options = {"orf": {"strand": "+", "min_length": 6}}
+    results = dict(analyze_in_parallel(BasicSequenceAnalysis(), records, "DNA", "orf", options, jobs=2))
+    serial, _ = BasicSequenceAnalysis().process_sequences(records[3][1], False, "DNA", "orf", options)
+    assert results["seq3"] == serial["input_sequence"]
+
+
+def test_analyze_in_parallel_multiple_methods(records):
+    methods = ["gc_percent", "orf"]
+    analyzer = BasicSequenceAnalysis()
+    results = list(analyze_in_parallel(analyzer, records, "DNA", methods, jobs=2))
+    assert results == [(key, analyzer._analyze_record(DNA(seq), methods)) for key, seq in records]
+
+
+def test_analyze_in_parallel_raises_worker_errors(records):
+    with pytest.raises(InvalidSequenceTypeError):
+        list(analyze_in_parallel(BasicSequenceAnalysis(), records, "DNA", "translate", jobs=2))
+
+
+def test_process_sequences_with_jobs():
+    analyzer = BasicSequenceAnalysis()
+    results, sequence_keys = analyzer.process_sequences("ATGCATGC", False, "DNA", "gc_percent", jobs=2)
+    assert results == {"input_sequence": "50.0 %"}
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+from Bio.SeqUtils.ProtParam import ProteinAnalysis
+
+from geneanalyzertool.analysis.protein import (
+    AMINO_ACIDS, NOT_A_RESIDUE, RESIDUES, isoelectric_points, molecular_weights, protein_properties, residue_counts
+)
+
+
+def random_proteins(count: int, seed: int = 7) -> list:
+    rng = np.random.default_rng(seed)
+    return ["".join(rng.choice(list(AMINO_ACIDS), size=rng.integers(1, 80))) for _ in range(count)]
+
+
+def test_properties_match_biopython():
+    proteins = random_proteins(300)
+    for protein, report in zip(proteins, protein_properties([protein.encode() for protein in proteins])):
+        expected = ProteinAnalysis(protein)
+        assert report["Length"] == len(protein)
+        assert report["Molecular Weight"] == pytest.approx(expected.molecular_weight(), abs=0.011)
+        assert report["Isoelectric Point"] == pytest.approx(expected.isoelectric_point(), abs=0.011)
+        assert report["GRAVY"] == pytest.approx(expected.gravy(), abs=0.0011)
+        reduced, cystines = expected.molar_extinction_coefficient()
+        assert report["Extinction Coefficient"] == {"Reduced": reduced, "Cystines": cystines}
+        assert report["Composition"] == expected.count_amino_acids()
+
+
+def test_isoelectric_points_match_biopython_bisection():
+    proteins = random_proteins(200, seed=3)
+    points = isoelectric_points(*residue_counts([protein.encode() for protein in proteins]))
+    assert points.tolist() == pytest.approx([ProteinAnalysis(protein).isoelectric_point() for protein in proteins],
+                                            abs=1e-9)
+
+
+def test_residue_counts():
+    counts, first, last = residue_counts([b"MKwk*", b"", b"-X"])
+    assert counts.shape == (3, len(RESIDUES))
+    assert counts[0, RESIDUES.index("K")] == 2
+    assert counts[0].sum() == 4
+    assert counts[1].sum() == 0
+    assert counts[2, RESIDUES.index("X")] == 1
+    assert first.tolist() == [RESIDUES.index("M"), NOT_A_RESIDUE, NOT_A_RESIDUE]
+    assert last.tolist() == [NOT_A_RESIDUE, NOT_A_RESIDUE, RESIDUES.index("X")]
+
+
+def test_case_and_stop_codons_are_ignored():
+    assert protein_properties([b"mkwvtf*"]) == protein_properties([b"MKWVTF"])
+
+
+def test_ambiguous_residues_use_the_mean_of_their_residues():
+    weights = molecular_weights(residue_counts([b"B", b"D", b"N"])[0])
+    assert weights[0] == pytest.approx((weights[1] + weights[2]) / 2)
+    assert protein_properties([b"MXK"])[0]["Composition"]["X"] == 1
+    assert "X" not in protein_properties([b"MK"])[0]["Composition"]
+
+
+def test_empty_batch_and_sequence():
+    assert protein_properties([]) == []
+    report = protein_properties([b""])[0]
+    assert (report["Length"], report["Molecular Weight"], report["GRAVY"]) == (0, 0.0, 0.0)
@@ -0,0 +1,132 @@
+import pytest
+from geneanalyzertool.analysis.similarity_analysis import SimilarityAnalysis
+from geneanalyzertool.analysis.sketches import MinHashSketch, load_sketches, sketch_sequence
+from geneanalyzertool.core.cache import ResultCache
+from geneanalyzertool.core.exceptions import AnalysisMethodError, InvalidSequenceTypeError
+from geneanalyzertool.core.metrics import RunMetrics
+from geneanalyzertool.core.sequences import DNA, Protein
+from tests.helpers import random_sequence
+
+OPTIONS = {"sketch": {"k": 15, "size": 256}, "distance": {"k": 15, "size": 256, "metric": "mash"}}
+
+
+@pytest.fixture
+def analyzer():
+    return SimilarityAnalysis()
+
+
+@pytest.fixture
+def genomes():
+    sequence = random_sequence(5000)
+    relative = sequence[:2500] + random_sequence(2500, seed=4)
+    return {"genome_a": sequence, "genome_b": relative, "genome_c": random_sequence(3000, seed=5)}
+
+
+@pytest.fixture
+def fasta_file(tmp_path, genomes):
+    path = tmp_path / "genomes.fasta"
+    path.write_text("".join(f">{name}\n{sequence}\n" for name, sequence in genomes.items()))
+    return str(path)
+
+
+# ---------- sketch ----------
+def test_analyze_sketches_dna(analyzer):
+    sketch = analyzer.analyze(DNA("ACGT" * 50), "sketch", k=9, size=64)
+    assert sketch == sketch_sequence("ACGT" * 50, k=9, size=64)
+
+
+def test_analyze_invalid_method_and_type(analyzer):
+    with pytest.raises(ValueError):
+        analyzer.analyze(DNA("ACGT"), "distance")
+    with pytest.raises(InvalidSequenceTypeError):
+        analyzer._analyze_record(Protein("MKWV"), "sketch")
+
+
+def test_sketches_are_cached(tmp_path, monkeypatch):
+    analyzer = SimilarityAnalysis(cache=ResultCache(str(tmp_path)))
+    sequence = DNA(random_sequence(1000))
+    expected = analyzer.analyze(sequence, "sketch", k=11)
+    monkeypatch.setattr(analyzer, "_sketch", lambda *args, **kwargs: pytest.fail("sketch was not cached"))
+    assert analyzer.analyze(sequence, "sketch", k=11) == expected == sketch_sequence(sequence, k=11)
+
+
+def test_stream_sketches_in_file_order(analyzer, fasta_file, genomes):
+    results = list(analyzer.stream_sequences(fasta_file, "DNA", "sketch", OPTIONS))
+    assert [key for key, _ in results] == list(genomes)
+    assert [sketch for _, sketch in results] == [sketch_sequence(sequence, k=15, size=256) for sequence in genomes.values()]
+
+
+def test_chunked_and_parallel_sketches_match(analyzer, fasta_file):
+    expected = list(analyzer.stream_sequences(fasta_file, "DNA", "sketch", OPTIONS))
+    assert list(analyzer.stream_sequences(fasta_file, "DNA", "sketch", OPTIONS, chunk_size=100)) == expected
+    assert list(analyzer.stream_sequences(fasta_file, "DNA", "sketch", OPTIONS, jobs=2)) == expected
+
+
+# ---------- distance ----------
+def test_distance_rows(analyzer, fasta_file, genomes):
+    rows = dict(analyzer.stream_sequences(fasta_file, "DNA", "distance", OPTIONS))
+    assert list(rows) == list(genomes)
+    assert all(list(row) == list(genomes) for row in rows.values())
+    assert rows["genome_a"]["genome_a"] == 0.0
+    assert 0.0 < rows["genome_a"]["genome_b"] < 0.1
+    assert rows["genome_a"]["genome_c"] == 1.0
+    assert rows["genome_b"]["genome_a"] == rows["genome_a"]["genome_b"]
+
+
+def test_jaccard_distance(analyzer, fasta_file):
+    options = {"distance": {"k": 15, "size": 256, "metric": "jaccard"}}
+    rows = dict(analyzer.stream_sequences(fasta_file, "DNA", "distance", options))
+    assert rows["genome_a"]["genome_b"] == pytest.approx(2 / 3, abs=0.1)
+
+
+def test_process_sequences_matches_stream(analyzer, fasta_file, monkeypatch):
+    monkeypatch.setattr(analyzer, "select_sequences", lambda file, use_index=False: analyzer.fetch_sequences(
+        file, ["genome_a", "genome_b", "genome_c"]))
+    results, keys = analyzer.process_sequences(fasta_file, True, "DNA", "distance", OPTIONS)
+    assert [(key, results[key]) for key in keys] == list(analyzer.stream_sequences(fasta_file, "DNA", "distance",
+                                                                                   OPTIONS))
+
+
+def test_distances_from_a_sketch_file(analyzer, fasta_file, tmp_path):
+    sketch_file = str(tmp_path / "genomes.npz")
+    analyzer.export_stream(analyzer.stream_sequences(fasta_file, "DNA", "sketch", OPTIONS), sketch_file,
+                           analysis_method="sketch")
+    assert all(isinstance(sketch, MinHashSketch) for _, sketch in load_sketches(sketch_file))
+    assert list(analyzer.stream_sequences(sketch_file, "DNA", "distance", OPTIONS)) == \
+        list(analyzer.stream_sequences(fasta_file, "DNA", "distance", OPTIONS))
+
+
+def test_export_distance_matrix(analyzer, fasta_file, tmp_path):
+    out_file = tmp_path / "distances.tsv"
+    analyzer.export_stream(analyzer.stream_sequences(fasta_file, "DNA", "distance", OPTIONS), str(out_file),
+                           analysis_method="distance")
+    lines = [line.split("\t") for line in out_file.read_text().splitlines()]
+    assert lines[0] == ["#query", "genome_a", "genome_b", "genome_c"]
+    assert [line[0] for line in lines[1:]] == ["genome_a", "genome_b", "genome_c"]
+    assert lines[1][1] == "0.0" and lines[1][3] == "1.0"
+
+
+def test_export_sketches_only_as_sketch_file(analyzer, fasta_file, tmp_path):
+    with pytest.raises(AnalysisMethodError):
+        analyzer.export_stream(analyzer.stream_sequences(fasta_file, "DNA", "sketch", OPTIONS),
+                               str(tmp_path / "sketches.tsv"), "tsv", "sketch")
+
+
+def test_invalid_methods_and_options(analyzer, fasta_file):
+    for method in ("all", ["sketch", "distance"], "gc_percent"):
+        with pytest.raises(AnalysisMethodError):
+            list(analyzer.stream_sequences(fasta_file, "DNA", method))
+    with pytest.raises(AnalysisMethodError):
+        list(analyzer.stream_sequences(fasta_file, "DNA", "distance", {"distance": {"metric": "hamming"}}))
+    with pytest.raises(AnalysisMethodError):
+        list(analyzer.stream_sequences(fasta_file, "DNA", "sketch", {"sketch": {"k": 40}}))
+    with pytest.raises(InvalidSequenceTypeError):
+        list(analyzer.stream_sequences(fasta_file, "Protein", "sketch", chunk_size=100))
+
+
+def test_stream_metrics(fasta_file):
+    metrics = RunMetrics()
+    analyzer = SimilarityAnalysis(metrics=metrics)
+    list(analyzer.stream_sequences(fasta_file, "DNA", "distance", OPTIONS))
+    assert metrics.records == 3
+    assert {"read", "convert", "analyze"} <= set(metrics.stages)
@@ -0,0 +1,115 @@
+import numpy as np
+import pytest
+from geneanalyzertool.analysis.kmers import kmer_codes
+from geneanalyzertool.analysis.sketches import (
+    EMPTY_BIN, MinHashSketch, distance_rows, distances, jaccard_matrix, load_sketches, save_sketches, sketch_matrix,
+    sketch_sequence
+)
+from tests.helpers import random_sequence, substitute
+
+COMPLEMENT = str.maketrans("ACGT", "TGCA")
+
+
+def exact_jaccard(first: str, second: str, k: int = 21) -> float:
+    first, second = set(kmer_codes(first, k).tolist()), set(kmer_codes(second, k).tolist())
+    return len(first & second) / len(first | second)
+
+
+# ---------- sketching ----------
+def test_identical_sequences_have_identical_sketches():
+    sequence = random_sequence(5000)
+    assert sketch_sequence(sequence) == sketch_sequence(sequence)
+    assert sketch_sequence(sequence).jaccard(sketch_sequence(sequence)) == 1.0
+    assert sketch_sequence(sequence).distance(sketch_sequence(sequence)) == 0.0
+
+
+def test_sketches_are_strand_independent():
+    sequence = random_sequence(3000)
+    reverse = sequence.translate(COMPLEMENT)[::-1]
+    assert np.array_equal(sketch_sequence(sequence).bins, sketch_sequence(reverse).bins)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 20, 21, 777, 10_000])
+def test_chunked_sketch_matches_whole_sequence(chunk_size):
+    data = random_sequence(4000, seed=8).encode()
+    sketch = MinHashSketch()
+    sketch.add_chunks(data[offset:offset + chunk_size] for offset in range(0, len(data), chunk_size))
+    assert sketch == sketch_sequence(data)
+    assert sketch.length == len(data)
+
+
+def test_short_sequences_leave_bins_empty():
+    sketch = sketch_sequence("ACGTACGTAC" * 3, k=5, size=64)
+    assert 0 < sketch.filled() < 64
+    assert sketch_sequence("ACG", k=5).filled() == 0
+
+
+@pytest.mark.parametrize("rate", [0.001, 0.01, 0.05, 0.2])
+def test_jaccard_estimate_is_close_to_exact_jaccard(rate):
+    sequence = random_sequence(100_000)
+    mutated = substitute(sequence, rate)
+    estimate = sketch_sequence(sequence, size=2048).jaccard(sketch_sequence(mutated, size=2048))
+    assert estimate == pytest.approx(exact_jaccard(sequence, mutated), abs=0.04)
+
+
+def test_mash_distance_estimates_mutation_rate():
+    sequence = random_sequence(100_000)
+    # Random replacements keep the base one time in four.
+    distance = sketch_sequence(sequence).distance(sketch_sequence(substitute(sequence, 0.04)))
+    assert distance == pytest.approx(0.03, abs=0.005)
+
+
+def test_unrelated_sequences_are_one_apart():
+    first, second = sketch_sequence(random_sequence(2000, seed=1)), sketch_sequence(random_sequence(2000, seed=2))
+    assert first.distance(second) == 1.0
+    assert first.distance(second, "jaccard") == 1.0
+
+
+def test_incompatible_sketches_cannot_be_compared():
+    with pytest.raises(ValueError):
+        sketch_sequence("ACGT" * 20, k=5).jaccard(sketch_sequence("ACGT" * 20, k=7))
+    with pytest.raises(ValueError):
+        sketch_matrix([MinHashSketch(size=16), MinHashSketch(size=32)])
+
+
+# ---------- comparison ----------
+def test_jaccard_matrix_ignores_bins_empty_in_both():
+    bins = np.array([[1, 2, EMPTY_BIN, EMPTY_BIN],
+                     [1, 3, EMPTY_BIN, 4],
+                     [EMPTY_BIN] * 4], dtype=np.uint64)
+    assert jaccard_matrix(bins, bins).tolist() == [[1.0, 1 / 3, 0.0], [1 / 3, 1.0, 0.0], [0.0, 0.0, 0.0]]
+
+
+def test_distances():
+    jaccard = np.array([1.0, 0.5, 0.0])
+    assert distances(jaccard, 21, "jaccard").tolist() == [0.0, 0.5, 1.0]
+    mash = distances(jaccard, 21)
+    assert mash[0] == 0.0 and mash[2] == 1.0
+    assert mash[1] == pytest.approx(-np.log(2 / 3) / 21)
+    with pytest.raises(ValueError):
+        distances(jaccard, 21, "hamming")
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_distance_rows_match_pairwise_distances(monkeypatch, jobs):
+    sequence = random_sequence(20_000)
+    sketches = [sketch_sequence(substitute(sequence, rate, seed)) for seed, rate in enumerate([0, 0.01, 0.03, 0.1, 0.5])]
+    # Small blocks, so rows are computed over several blocks.
+    monkeypatch.setattr("geneanalyzertool.analysis.sketches.COMPARE_BYTES", 2 * 5 * 1024)
+    rows = np.array(list(distance_rows(sketch_matrix(sketches), 21, jobs=jobs)))
+    expected = [[first.distance(second) for second in sketches] for first in sketches]
+    np.testing.assert_allclose(rows, expected)
+    assert np.array_equal(rows, rows.T)
+
+
+def test_distance_rows_of_no_sketches():
+    assert list(distance_rows(sketch_matrix([]), 21)) == []
+
+
+# ---------- sketch files ----------
+def test_sketch_file_round_trip(tmp_path):
+    path = str(tmp_path / "genomes.npz")
+    records = [("first", sketch_sequence(random_sequence(1000, seed=1), k=15, size=128)),
+               ("second", sketch_sequence(random_sequence(50, seed=2), k=15, size=128))]
+    assert save_sketches(path, iter(records)) == 2
+    assert load_sketches(path) == records
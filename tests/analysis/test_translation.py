@@ -0,0 +1,56 @@
+import pytest
+from geneanalyzertool.analysis.translation import (
+    NCBI_TABLES, codon_lookup, start_codons, stop_codons, translate_sequence
+)
+
+
+# ---------- tables ----------
+def test_ncbi_tables_are_complete():
+    for name, amino_acids, starts in NCBI_TABLES.values():
+        assert len(amino_acids) == 64
+        assert len(starts) == 64
+
+
+def test_codon_lookup_is_cached():
+    assert codon_lookup(11) is codon_lookup(11)
+
+
+def test_codon_lookup_unknown_table():
+    with pytest.raises(ValueError):
+        codon_lookup(7)
+
+
+def test_stop_and_start_codons():
+    assert stop_codons(1) == ["TAA", "TAG", "TGA"]
+    assert stop_codons(2) == ["TAA", "TAG", "AGA", "AGG"]
+    assert start_codons(1) == ["TTG", "CTG", "ATG"]
+
+
+# ---------- translate_sequence ----------
+def test_translate_sequence_stops_at_first_stop():
+    assert translate_sequence("AUGUUUUAAGGG") == "MF*"
+
+
+def test_translate_sequence_read_through():
+    assert translate_sequence("AUGUUUUAAGGG", to_stop=False) == "MF*G"
+
+
+def test_translate_sequence_dna_and_lower_case():
+    assert translate_sequence("atgTTTtgg") == "MFW"
+
+
+def test_translate_sequence_ambiguous_and_partial_codons():
+    assert translate_sequence("AUGNNNUU") == "MXX"
+
+
+def test_translate_sequence_alternative_table():
+    assert translate_sequence("AUGUGAUAA", table=1) == "M*"
+    assert translate_sequence("AUGUGAUAA", table=2) == "MW*"
+
+
+def test_translate_sequence_frame_offset():
+    assert translate_sequence("GAUGUUU", frame=1) == "MF"
+
+
+def test_translate_sequence_empty():
+    assert translate_sequence("") == ""
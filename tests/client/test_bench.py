@@ -0,0 +1,88 @@
+from geneanalyzertool.analysis.basic_analysis import BasicSequenceAnalysis
+from geneanalyzertool.client.bench import (
+    BenchmarkCase, build_cases, compare_results, method_sequence_type, run_benchmarks, run_case
+)
+
+
+def test_method_sequence_type():
+    analyzer = BasicSequenceAnalysis()
+    assert method_sequence_type(analyzer, "gc_percent") == "DNA"
+    assert method_sequence_type(analyzer, "translate") == "RNA"
+
+
+def test_build_cases_covers_every_method():
+    cases = build_cases([1000], [1, 10])
+    names = {case.name for case in cases}
+    assert {f"analyze.{method}" for method in BasicSequenceAnalysis().available_methods()} <= names
+    assert {"io.read_sequences", "io.iter_sequences", "io.index_build", "io.index_fetch"} <= names
+    assert {"batch.reverse_complement", "batch.protein_properties"} <= names
+
+
+def test_batch_cases_follow_methods():
+    names = {case.name for case in build_cases([1000], [10], methods=["protein_properties"])}
+    assert names == {"analyze.protein_properties", "batch.protein_properties"} | \
+        {name for name in names if name.startswith("io.")}
+
+
+def test_run_batch_case(tmp_path):
+    result = run_case(BenchmarkCase("batch.protein_properties", "Protein", 2000, 50), 1, str(tmp_path))
+    assert result["records_per_second"] > 0
+
+
+def test_build_cases_adds_compact_cases():
+    cases = build_cases([1000], [10], methods=["gc_percent"], include_io=False, compact=True)
+    assert sorted((case.name, case.compact) for case in cases) == [
+        ("analyze.gc_percent", False), ("analyze.gc_percent", True),
+        ("stream.gc_percent", False), ("stream.gc_percent", True)
+    ]
+
+
+def test_compact_streaming_cuts_peak_rss(tmp_path):
+    # The raw record, its str copy and its bytes are never held by a compact run: peak RSS stays near that of the
+    # interpreter while the str backed run grows with the record.
+    cases = [BenchmarkCase("stream.gc_percent", "DNA", 64_000_000, 1, compact) for compact in (False, True)]
+    plain, compact = run_benchmarks(cases, repeat=1, workdir=str(tmp_path))["results"]
+    assert compact["peak_rss_mb"] * 4 < plain["peak_rss_mb"]
+
+
+def test_build_cases_skips_more_records_than_bases():
+    cases = build_cases([5], [1, 10], methods=["gc_percent"])
+    assert all(case.records <= case.size for case in cases)
+
+
+def test_run_case_reports_throughput(tmp_path):
+    result = run_case(BenchmarkCase("io.iter_sequences", "DNA", 2000, 4), 2, str(tmp_path))
+    assert result["name"] == "io.iter_sequences"
+    assert result["seconds"] > 0
+    assert result["bases_per_second"] == 2000 / result["seconds"]
+    assert result["peak_rss_mb"] > 0
+
+
+def test_run_benchmarks_isolates_cases(tmp_path):
+    report = run_benchmarks([BenchmarkCase("analyze.gc_percent", "DNA", 1000, 1)], repeat=1, workdir=str(tmp_path))
+    assert report["environment"]["python"]
+    assert [entry["name"] for entry in report["results"]] == ["analyze.gc_percent"]
+
+
+def test_compare_results_flags_regressions():
+    baseline = {"results": [
+        {"name": "a", "size": 1, "records": 1, "seconds": 1.0},
+        {"name": "b", "size": 1, "records": 1, "seconds": 1.0}
+    ]}
+    current = {"results": [
+        {"name": "a", "size": 1, "records": 1, "seconds": 1.05},
+        {"name": "b", "size": 1, "records": 1, "seconds": 1.5},
+        {"name": "c", "size": 1, "records": 1, "seconds": 9.0}
+    ]}
+    comparison = compare_results(current, baseline, threshold=0.1)
+    assert [(entry["name"], entry["regression"]) for entry in comparison] == [("a", False), ("b", True)]
+
+
+def test_compare_results_keeps_compact_cases_apart():
+    baseline = {"results": [{"name": "a", "size": 1, "records": 1, "seconds": 1.0}]}
+    current = {"results": [
+        {"name": "a", "size": 1, "records": 1, "compact": True, "seconds": 2.0},
+        {"name": "a", "size": 1, "records": 1, "compact": False, "seconds": 1.0}
+    ]}
+    comparison = compare_results(current, baseline, threshold=0.1)
+    assert [(entry["compact"], entry["regression"]) for entry in comparison] == [(False, False)]
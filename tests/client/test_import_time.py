@@ -0,0 +1,70 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+import geneanalyzertool
+
+# Cumulative import time of the CLI module, in microseconds. It takes about 80 ms; loading numpy, pandas or
+# Biopython eagerly again would push it well past the budget. Wall clock time depends on the machine, so the budget
+# is only checked when this environment variable is set, e.g. on a quiet benchmark machine.
+IMPORT_BUDGET_US = 200_000
+IMPORT_BUDGET_ENV = "GENEANALYZER2_CHECK_IMPORT_TIME"
+
+HEAVY_MODULES = {"numpy", "pandas", "Bio", "matplotlib", "sklearn", "pyarrow", "asyncio"}
+
+SRC_DIR = os.path.dirname(os.path.dirname(geneanalyzertool.__file__))
+
+
+def _run(code: str, *options: str) -> subprocess.CompletedProcess:
+    env = {**os.environ, "PYTHONPATH": SRC_DIR}
+    return subprocess.run([sys.executable, *options, "-c", code], capture_output=True, text=True, env=env, check=True)
+
+
+def _loaded_heavy_modules(argv: list) -> set:
+    code = (
+        "import sys\n"
+        f"sys.argv = {['geneanalyzer2', *argv]!r}\n"
+        "from geneanalyzertool.client.main import main\n"
+        "try:\n"
+        "    main()\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        "print(' '.join(sorted({name.split('.')[0] for name in sys.modules})))\n"
+    )
+    return set(_run(code).stdout.splitlines()[-1].split()) & HEAVY_MODULES
+
+
+def _import_times() -> dict:
+    """Cumulative import time in microseconds of every module imported by the CLI module."""
+    report = _run("import geneanalyzertool.client.main", "-X", "importtime").stderr
+    imported = {}
+    for line in report.splitlines():
+        if line.startswith("import time:") and "|" in line and "cumulative" not in line:
+            _, cumulative, name = line[len("import time:"):].split("|")
+            imported[name.strip()] = int(cumulative)
+    return imported
+
+
+def test_cli_imports_no_heavy_modules():
+    assert not {name.split(".")[0] for name in _import_times()} & HEAVY_MODULES
+
+
+@pytest.mark.skipif(not os.environ.get(IMPORT_BUDGET_ENV), reason=f"set {IMPORT_BUDGET_ENV} to check the budget")
+def test_cli_import_time_budget():
+    assert _import_times()["geneanalyzertool.client.main"] < IMPORT_BUDGET_US
+
+
+def test_help_loads_no_heavy_modules():
+    assert _loaded_heavy_modules(["--help"]) == set()
+
+
+def test_raw_sequence_analysis_skips_file_and_table_dependencies():
+    loaded = _loaded_heavy_modules(["--type", "DNA", "--analysis", "gc_percent", "--no-cache", "ATGC"])
+    assert not loaded & {"pandas", "Bio", "pyarrow", "asyncio"}
+
+
+def test_metrics_load_no_heavy_modules():
+    loaded = _loaded_heavy_modules(["--type", "DNA", "--analysis", "gc_percent", "--no-cache", "--metrics", "-", "ATGC"])
+    assert not loaded & {"pandas", "Bio", "pyarrow", "asyncio"}
@@ -0,0 +1,153 @@
+import asyncio
+import os
+import threading
+
+import pytest
+
+from geneanalyzertool.analysis.analysis import AnalysisReport, WindowedResult
+from geneanalyzertool.analysis.basic_analysis import BasicSequenceAnalysis
+from geneanalyzertool.client.remote import request_analysis, server_available
+from geneanalyzertool.client.server import AnalysisServer
+from geneanalyzertool.core.exceptions import GeneAnalyzerError, InvalidSequenceTypeError, SequenceParsingError
+
+FASTA = ">seq1 first\nATGGCCTAA\n>seq2\nGGGCCCAT\n>seq3\nATGAAATTTTGA\n"
+
+
+@pytest.fixture
+def server_socket(tmp_path):
+    socket_path = str(tmp_path / "ga.sock")
+    server = AnalysisServer(socket_path, {"basic": BasicSequenceAnalysis}, jobs=1)
+    loop = asyncio.new_event_loop()
+    loop.run_until_complete(server.start())
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+
+    yield socket_path
+
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    server.close()
+    loop.run_until_complete(_cancel_handlers())
+    loop.close()
+
+
+async def _cancel_handlers():
+    # Connection handlers still wait for their clients' next request.
+    handlers = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+    for task in handlers:
+        task.cancel()
+    await asyncio.gather(*handlers, return_exceptions=True)
+
+
+@pytest.fixture
+def fasta_file(tmp_path):
+    path = tmp_path / "input.fasta"
+    path.write_text(FASTA)
+    return str(path)
+
+
+def _request(sequence, is_file=False, analysis_method="gc_percent", seq_type="DNA", **extra):
+    return {"mode": "basic", "sequence": sequence, "is_file": is_file, "seq_type": seq_type,
+            "analysis_method": analysis_method, "method_options": None, **extra}
+
+
+def test_server_available(server_socket, tmp_path):
+    assert server_available(server_socket)
+    assert not server_available(str(tmp_path / "missing.sock"))
+
+
+def test_socket_is_private(server_socket):
+    assert os.stat(server_socket).st_mode & 0o777 == 0o600
+
+
+def test_raw_sequence_matches_local_analysis(server_socket):
+    local = BasicSequenceAnalysis()
+    results, keys = local.process_sequences("ATGGCCTAA", False, "DNA", "gc_percent")
+
+    assert list(request_analysis(server_socket, _request("ATGGCCTAA"))) == [(keys[0], results[keys[0]])]
+
+
+def test_file_analyzes_every_record(server_socket, fasta_file):
+    local = list(BasicSequenceAnalysis().stream_sequences(fasta_file, "DNA", "base_count"))
+    remote = list(request_analysis(server_socket, _request(fasta_file, True, "base_count")))
+
+    assert [name for name, _ in remote] == ["seq1", "seq2", "seq3"]
+    assert remote == local
+
+
+def test_file_regions(server_socket, fasta_file):
+    remote = list(request_analysis(server_socket, _request(fasta_file, True, "reverse_complement",
+                                                           regions=["seq2:1-4"], use_index=True)))
+    assert [result for _, result in remote] == ["GCCC"]
+
+
+def test_file_selection_only_applies_to_its_request(server_socket, fasta_file):
+    selection = {"ids": None, "id_regex": "seq[13]", "min_length": 10, "max_length": None}
+    remote = list(request_analysis(server_socket, _request(fasta_file, True, selection=selection)))
+    assert [name for name, _ in remote] == ["seq3"]
+
+    remote = list(request_analysis(server_socket, _request(fasta_file, True)))
+    assert [name for name, _ in remote] == ["seq1", "seq2", "seq3"]
+
+
+def test_multiple_methods_return_reports(server_socket):
+    request = _request("ATGGCCTAA", analysis_method=["gc_percent", "base_count"])
+    (_, report), = request_analysis(server_socket, request)
+    assert isinstance(report, AnalysisReport)
+    assert list(report) == ["gc_percent", "base_count"]
+
+
+def test_kmer_histograms_keep_integer_keys(server_socket, fasta_file):
+    options = {"kmer_count": {"k": 3}}
+    for method in ("kmer_count", "all"):
+        local = list(BasicSequenceAnalysis().stream_sequences(fasta_file, "DNA", method, options))
+        remote = list(request_analysis(server_socket, _request(fasta_file, True, method, method_options=options)))
+        assert remote == local
+
+
+def test_chunked_file_keeps_windowed_results(server_socket, fasta_file):
+    request = _request(fasta_file, True, "gc_windows", method_options={"gc_windows": {"window": 4}}, chunk_size=3)
+    local = list(BasicSequenceAnalysis().stream_sequences(fasta_file, "DNA", "gc_windows", {"gc_windows": {"window": 4}}))
+    remote = list(request_analysis(server_socket, request))
+
+    assert remote == local
+    assert all(isinstance(result, WindowedResult) for _, result in remote)
+
+
+def test_connection_serves_several_requests(server_socket):
+    for _ in range(3):
+        assert len(list(request_analysis(server_socket, _request("GGCC")))) == 1
+
+
+def test_errors_are_raised_on_the_client(server_socket, tmp_path):
+    with pytest.raises(InvalidSequenceTypeError):
+        list(request_analysis(server_socket, _request("MKV", seq_type="Protein")))
+    malformed = tmp_path / "reads.fastq"
+    malformed.write_text("@read1\nACGT\nACGT\nIIII\n")
+    with pytest.raises(SequenceParsingError, match="separator"):
+        list(request_analysis(server_socket, _request(str(malformed), True)))
+    with pytest.raises(GeneAnalyzerError, match="No such file"):
+        list(request_analysis(server_socket, _request(str(tmp_path / "missing.fasta"), True)))
+    with pytest.raises(GeneAnalyzerError, match="Unknown analysis mode"):
+        list(request_analysis(server_socket, _request("ATG", mode="advanced")))
+
+
+def test_second_server_on_same_socket_is_refused(server_socket):
+    with pytest.raises(GeneAnalyzerError, match="already running"):
+        asyncio.run(AnalysisServer(server_socket, {"basic": BasicSequenceAnalysis}).start())
+
+
+def test_stale_socket_is_replaced(tmp_path):
+    socket_path = str(tmp_path / "stale.sock")
+    open(socket_path, "w").close()
+    server = AnalysisServer(socket_path, {"basic": BasicSequenceAnalysis})
+
+    async def start_and_ping():
+        await server.start()
+        return await asyncio.to_thread(server_available, socket_path)
+
+    try:
+        assert asyncio.run(start_and_ping())
+    finally:
+        server.close()
+    assert not os.path.exists(socket_path)
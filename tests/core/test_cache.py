@@ -0,0 +1,80 @@
+import pickle
+import pytest
+from concurrent.futures import ProcessPoolExecutor
+
+from geneanalyzertool.core.cache import ResultCache, default_cache_dir
+from geneanalyzertool.core.compact_sequences import CompactDNA, CompactRNA
+from geneanalyzertool.core.sequences import DNA, RNA
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ResultCache(str(tmp_path / "cache"))
+    yield cache
+    cache.close()
+
+
+def _store(cache_dir: str, value: int):
+    cache = ResultCache(cache_dir)
+    for i in range(20):
+        cache.put(f"key{value}-{i}", value)
+    return cache.get(f"key{value}-0")
+
+
+# ---------- keys ----------
+def test_make_key_depends_on_sequence_type_method_and_options(cache):
+    key = cache.make_key(cache.sequence_digest(DNA("ACGT")), "orf", {"strand": "+"})
+    assert key == cache.make_key(cache.sequence_digest(DNA("ACGT")), "orf", {"strand": "+"})
+    assert key != cache.make_key(cache.sequence_digest(RNA("ACGT")), "orf", {"strand": "+"})
+    assert key != cache.make_key(cache.sequence_digest(DNA("ACGA")), "orf", {"strand": "+"})
+    assert key != cache.make_key(cache.sequence_digest(DNA("ACGT")), "gc_percent", {"strand": "+"})
+    assert key != cache.make_key(cache.sequence_digest(DNA("ACGT")), "orf", {"strand": "-"})
+
+
+def test_compact_and_str_sequences_share_digests(cache):
+    assert cache.sequence_digest(CompactDNA("ACGTN")) == cache.sequence_digest(DNA("ACGTN"))
+    assert cache.sequence_digest(CompactRNA("ACGU")) != cache.sequence_digest(CompactDNA("ACGU"))
+
+
+def test_default_cache_dir_follows_xdg(monkeypatch, tmp_path):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    assert default_cache_dir() == str(tmp_path / "geneanalyzer2")
+
+
+# ---------- storage ----------
+def test_get_miss_then_hit(cache):
+    assert cache.get("missing") == (False, None)
+    cache.put("present", {"A": 1})
+    assert cache.get("present") == (True, {"A": 1})
+
+
+def test_results_persist_across_instances(cache):
+    cache.put("key", "50.0 %")
+    assert ResultCache(cache.cache_dir).get("key") == (True, "50.0 %")
+
+
+def test_lru_eviction(tmp_path):
+    entry_size = len(pickle.dumps("x" * 100, protocol=pickle.HIGHEST_PROTOCOL))
+    cache = ResultCache(str(tmp_path), max_bytes=entry_size * 2)
+    cache.put("a", "x" * 100)
+    cache.put("b", "x" * 100)
+    cache.get("a")
+    cache.put("c", "x" * 100)
+    assert cache.get("a")[0] is True
+    assert cache.get("b")[0] is False
+    assert cache.get("c")[0] is True
+    assert cache.size() <= cache.max_bytes
+
+
+def test_clear(cache):
+    cache.put("key", 1)
+    cache.clear()
+    assert cache.get("key") == (False, None)
+    assert cache.size() == 0
+
+
+def test_cache_is_shared_between_processes(cache):
+    with ProcessPoolExecutor(max_workers=4) as pool:
+        hits = list(pool.map(_store, [cache.cache_dir] * 4, range(4)))
+    assert hits == [(True, value) for value in range(4)]
+    assert cache.get("key3-19") == (True, 3)
@@ -0,0 +1,129 @@
+import pickle
+import pytest
+
+from geneanalyzertool.core import compact_sequences
+from geneanalyzertool.core.compact_sequences import CompactDNA, CompactProtein, CompactRNA
+from geneanalyzertool.core.sequences import DNA, RNA, Protein, Sequence, same_storage
+
+
+# ---------- type checks ----------
+def test_compact_sequences_pass_type_checks():
+    assert isinstance(CompactDNA("ACGT"), DNA)
+    assert isinstance(CompactRNA("ACGU"), RNA)
+    assert isinstance(CompactProtein("MKWV"), Protein)
+    assert isinstance(CompactDNA("ACGT"), Sequence)
+    assert not isinstance(CompactDNA("ACGT"), RNA)
+
+
+def test_same_storage():
+    assert same_storage(DNA("ACGT"), RNA) is RNA
+    assert same_storage(CompactDNA("ACGT"), RNA) is CompactRNA
+    assert same_storage(CompactDNA("ACGT"), Protein) is CompactProtein
+
+
+# ---------- packing ----------
+def test_unambiguous_dna_is_packed_two_bits_per_base():
+    sequence = CompactDNA("ACGT" * 1000)
+    assert sequence.bits_per_residue == 2
+    assert sequence.nbytes == 1000
+    assert sequence == "ACGT" * 1000
+
+
+def test_iupac_dna_is_packed_four_bits_per_base():
+    sequence = CompactDNA("ACGTNNRYKM")
+    assert sequence.bits_per_residue == 4
+    assert sequence.nbytes == 5
+    assert str(sequence) == "ACGTNNRYKM"
+
+
+def test_unknown_symbols_are_stored_as_bytes():
+    sequence = CompactDNA("ACGT-ACGT")
+    assert sequence.bits_per_residue == 8
+    assert str(sequence) == "ACGT-ACGT"
+
+
+def test_soft_masking_survives_packing():
+    raw = "ACGTacgtACnnGTa" * 7
+    sequence = CompactDNA(raw)
+    assert sequence.bits_per_residue == 4
+    assert str(sequence) == raw
+    assert all(sequence[start:stop] == raw[start:stop] for start in range(len(raw)) for stop in range(start, len(raw)))
+
+
+def test_rna_uses_u_in_two_bit_alphabet():
+    assert CompactRNA("ACGU").bits_per_residue == 2
+    assert CompactDNA("ACGU").bits_per_residue == 4
+
+
+def test_protein_is_never_packed():
+    assert CompactProtein("MKWV").bits_per_residue == 8
+
+
+def test_empty_sequence():
+    sequence = CompactDNA("")
+    assert len(sequence) == 0
+    assert str(sequence) == ""
+
+
+@pytest.mark.parametrize("sequence_class, raw", [
+    (CompactDNA, "ACGTTGCA" * 5 + "acgtTTga" * 3),
+    (CompactDNA, "ACGTTGCA" * 5 + "NNnnRYAC" + "ACGTacgt" * 4),
+    (CompactDNA, "ACGTNNNN" * 4 + "ACGT-ACG" + "acgtAC"),
+    (CompactRNA, "ACGUacguUUAGNN" * 3),
+    (CompactProtein, "MKWVTFISLLfll" * 3),
+    (CompactDNA, ""),
+])
+def test_packing_chunks_matches_packing_the_whole_sequence(monkeypatch, sequence_class, raw):
+    monkeypatch.setattr(compact_sequences, "WIDEN_BASES", 8)
+    whole = sequence_class(raw)
+    for size in (1, 3, 4, 7, 64):
+        chunks = [raw[start:start + size].encode() for start in range(0, max(len(raw), 1), size)]
+        packed = sequence_class.from_chunks(chunks)
+        assert str(packed) == raw
+        assert (packed.bits_per_residue, packed.nbytes) == (whole.bits_per_residue, whole.nbytes)
+
+
+def test_iter_chunks():
+    sequence = CompactDNA("ACGTacgtNNAC")
+    assert [bytes(chunk) for chunk in sequence.iter_chunks(5)] == [b"ACGTa", b"cgtNN", b"AC"]
+    assert list(CompactDNA("").iter_chunks(5)) == []
+
+
+# ---------- sequence behaviour ----------
+def test_slicing_bytes_storage_is_zero_copy():
+    data = b"MKWVTFISLL"
+    sequence = CompactProtein(data)
+    part = sequence[2:5]
+    assert part == "WVT"
+    assert isinstance(part, CompactProtein)
+    assert part.as_buffer().obj is data
+
+
+def test_indexing():
+    sequence = CompactDNA("ACGTA")
+    assert sequence[1] == "C"
+    assert sequence[-1] == "A"
+    assert sequence[::2] == "AGA"
+    with pytest.raises(IndexError):
+        sequence[5]
+
+
+def test_equality_and_hash():
+    assert CompactDNA("ACGT") == CompactDNA(b"ACGT")
+    assert DNA("ACGT") == CompactDNA("ACGT")
+    assert hash(CompactDNA("ACGT")) == hash("ACGT")
+    assert CompactDNA("ACGT") != "ACGA"
+
+
+def test_count_upper_and_bytes():
+    sequence = CompactDNA("acgtAA")
+    assert sequence.count("A") == 2
+    assert sequence.upper() == "ACGTAA"
+    assert bytes(sequence) == b"acgtAA"
+
+
+def test_pickle_round_trip():
+    sequence = CompactDNA("ACGTNacgt")
+    restored = pickle.loads(pickle.dumps(sequence))
+    assert restored == sequence
+    assert type(restored) is CompactDNA
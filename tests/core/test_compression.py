@@ -0,0 +1,128 @@
+import gzip
+import pytest
+from Bio import bgzf
+
+from geneanalyzertool.core.compression import (BgzfRandomAccess, build_gzi, detect_compression, gzi_path, open_binary,
+                                               open_text, read_gzi, strip_compression_extension)
+from geneanalyzertool.core.exceptions import SequenceParsingError
+from geneanalyzertool.core.fasta_index import FastaIndex
+from geneanalyzertool.core.file_handler import FileHandler
+from geneanalyzertool.core.sequences import DNA
+from geneanalyzertool.core.synthetic import synthetic_sequence
+
+RECORDS = [("chr1", synthetic_sequence("DNA", 150_000, seed=1)), ("chr2", synthetic_sequence("DNA", 70_001, seed=2))]
+FASTA = "".join(f">{name}\n" + "\n".join(seq[i:i + 60] for i in range(0, len(seq), 60)) + "\n"
+                for name, seq in RECORDS).encode()
+
+
+@pytest.fixture
+def plain_file(tmp_path):
+    path = tmp_path / "genome.fa"
+    path.write_bytes(FASTA)
+    return str(path)
+
+
+@pytest.fixture
+def bgzf_file(tmp_path):
+    path = str(tmp_path / "genome.fa.bgz")
+    with bgzf.BgzfWriter(path, "wb") as out:
+        out.write(FASTA)
+    return path
+
+
+@pytest.fixture
+def gzip_file(tmp_path):
+    path = str(tmp_path / "genome.fa.gz")
+    with gzip.open(path, "wb") as out:
+        out.write(FASTA)
+    return path
+
+
+# ---------- detection ----------
+def test_detect_compression(plain_file, bgzf_file, gzip_file):
+    assert detect_compression(plain_file) is None
+    assert detect_compression(bgzf_file) == "bgzf"
+    assert detect_compression(gzip_file) == "gzip"
+
+
+def test_strip_compression_extension():
+    assert strip_compression_extension("genome.fa.gz") == "genome.fa"
+    assert strip_compression_extension("genome.fna.BGZ") == "genome.fna"
+    assert strip_compression_extension("genome.fasta") == "genome.fasta"
+
+
+def test_file_support_check_compressed(capsys):
+    assert FileHandler().file_support_check("genome.fasta.gz") is True
+    assert FileHandler().file_support_check("genome.txt.zst") is False
+
+
+# ---------- streaming decompression ----------
+@pytest.mark.parametrize("threads", [1, 3])
+def test_bgzf_reader(bgzf_file, threads):
+    with open_binary(bgzf_file, threads) as handle:
+        assert handle.read() == FASTA
+
+
+def test_bgzf_reader_lines(bgzf_file):
+    with open_text(bgzf_file, 2) as handle:
+        assert handle.readline() == ">chr1\n"
+        assert sum(1 for _ in handle) == FASTA.count(b"\n") - 1
+
+
+def test_bgzf_reader_detects_corruption(bgzf_file):
+    with open(bgzf_file, "r+b") as handle:
+        handle.seek(100)
+        byte = handle.read(1)
+        handle.seek(100)
+        handle.write(bytes([byte[0] ^ 0xFF]))
+    with pytest.raises(SequenceParsingError, match="Corrupt BGZF block"):
+        with open_binary(bgzf_file, 1) as handle:
+            handle.read()
+
+
+def test_gzip_and_zstd_inputs(gzip_file, tmp_path):
+    with open_binary(gzip_file) as handle:
+        assert handle.read() == FASTA
+
+    zstandard = pytest.importorskip("zstandard")
+    zstd_file = tmp_path / "genome.fa.zst"
+    zstd_file.write_bytes(zstandard.ZstdCompressor().compress(FASTA))
+    assert detect_compression(str(zstd_file)) == "zstd"
+    with open_binary(str(zstd_file)) as handle:
+        assert handle.read() == FASTA
+
+
+@pytest.mark.parametrize("parser", ["native", "biopython"])
+@pytest.mark.parametrize("fixture", ["plain_file", "bgzf_file", "gzip_file"])
+def test_iter_sequences_compressed(fixture, parser, request):
+    records = list(FileHandler(parser).iter_sequences(request.getfixturevalue(fixture)))
+    assert [(name, DNA(seq)) for name, seq in records] == RECORDS
+
+
+# ---------- random access ----------
+def test_gzi_index_is_written_and_read(bgzf_file):
+    BgzfRandomAccess(bgzf_file).close()
+    entries = read_gzi(gzi_path(bgzf_file))
+    assert entries == build_gzi(bgzf_file)
+    assert entries[0][1] == 65536
+    assert all(later > earlier for earlier, later in zip(entries, entries[1:]))
+
+
+@pytest.mark.parametrize("start, end", [(0, 10), (65530, 65542), (1000, 200_000), (0, len(FASTA)),
+                                        (len(FASTA) - 5, len(FASTA) + 5)])
+def test_bgzf_random_access(bgzf_file, start, end):
+    reader = BgzfRandomAccess(bgzf_file, threads=2)
+    assert reader.read(start, end) == FASTA[start:end]
+    reader.close()
+
+
+def test_fasta_index_on_bgzf(bgzf_file, plain_file):
+    with FastaIndex(bgzf_file) as compressed, FastaIndex(plain_file) as plain:
+        assert compressed.entries == plain.entries
+        assert compressed.fetch("chr2") == RECORDS[1][1]
+        assert compressed.fetch_region("chr1:65000-66000") == plain.fetch_region("chr1:65000-66000")
+
+
+def test_fasta_index_rejects_plain_gzip(gzip_file):
+    with pytest.raises(SequenceParsingError, match="bgzip"):
+        FastaIndex(gzip_file)
@@ -0,0 +1,107 @@
+import json
+import pytest
+
+from geneanalyzertool.analysis.analysis import AnalysisReport
+from geneanalyzertool.analysis.basic_analysis import BasicSequenceAnalysis
+from geneanalyzertool.core.export import (
+    MOTIF_COLUMNS, ORF_COLUMNS, VALUE_COLUMNS, WINDOW_COLUMNS, result_rows, value_rows, write_results
+)
+
+
+@pytest.fixture
+def orf_results():
+    analyzer = BasicSequenceAnalysis()
+    return [(name, analyzer._analyze_record(analyzer._sequence_class("DNA")(seq), "orf"))
+            for name, seq in [("seq1", "ATGAAATAGATGTGA"), ("seq2", "CCCC"), ("seq3", "TTACAT")]]
+
+
+# ---------- row flattening ----------
+def test_orf_results_are_flattened_one_row_per_orf(orf_results):
+    columns, rows = result_rows(orf_results, "orf")
+    assert columns == ORF_COLUMNS
+    assert list(rows) == [("seq1", "ORF_1", 0, 8, "+", 9),
+                          ("seq1", "ORF_2", 9, 14, "+", 6),
+                          ("seq3", "ORF_1", 0, 5, "-", 6)]
+
+
+def test_motif_results_are_flattened_one_row_per_hit():
+    analyzer = BasicSequenceAnalysis()
+    motifs = {"motif_search": {"motifs": ["EcoRI=G^AATTC", "GGTT"]}}
+    results = [(name, analyzer._analyze_record(analyzer._sequence_class("DNA")(seq), "motif_search", motifs))
+               for name, seq in [("seq1", "GAATTCAACC"), ("seq2", "CCCC")]]
+    columns, rows = result_rows(results, "motif_search")
+    assert columns == MOTIF_COLUMNS
+    assert list(rows) == [("seq1", "Hit_1", "EcoRI", 0, 5, "+", 6, 1, "GAATTC"),
+                          ("seq1", "Hit_2", "GGTT", 6, 9, "-", 4, None, "GGTT")]
+
+
+def test_gc_windows_are_flattened_one_row_per_window():
+    windows = BasicSequenceAnalysis()._gc_windows(BasicSequenceAnalysis()._sequence_class("DNA")("GGCCAAT"), window=4)
+    columns, rows = result_rows([("seq1", windows)], "gc_windows")
+    assert columns == WINDOW_COLUMNS
+    assert list(rows) == [("seq1", 0, 4, 100.0), ("seq1", 4, 7, 0.0)]
+
+
+def test_value_rows_flatten_nested_results():
+    rows = list(value_rows("seq1", "composition", {"Counts": {"A": 1}, "GC Windows": [{"GC Percent": 50.0}]}))
+    assert rows == [("seq1", "composition", "Counts.A", 1), ("seq1", "composition", "GC Windows.0.GC Percent", 50.0)]
+
+
+def test_value_rows_of_scalar_results():
+    assert list(value_rows("seq1", "gc_percent", "50.0 %")) == [("seq1", "gc_percent", "value", "50.0 %")]
+
+
+def test_reports_are_labelled_by_method():
+    report = AnalysisReport(gc_percent="50.0 %", base_count={"A": 1})
+    columns, rows = result_rows([("seq1", report)], ["gc_percent", "base_count"])
+    assert columns == VALUE_COLUMNS
+    assert list(rows) == [("seq1", "gc_percent", "value", "50.0 %"), ("seq1", "base_count", "A", 1)]
+
+
+# ---------- writers ----------
+def test_write_tsv_in_chunks(orf_results, tmp_path):
+    out_file = tmp_path / "orfs.tsv"
+    assert write_results(iter(orf_results), str(out_file), "tsv", "orf", chunk_rows=2) == 3
+    lines = out_file.read_text().splitlines()
+    assert lines[0] == "\t".join(ORF_COLUMNS)
+    assert lines[1:] == ["seq1\tORF_1\t0\t8\t+\t9", "seq1\tORF_2\t9\t14\t+\t6", "seq3\tORF_1\t0\t5\t-\t6"]
+
+
+def test_write_tsv_without_rows_writes_header(tmp_path):
+    out_file = tmp_path / "empty.tsv"
+    assert write_results([], str(out_file), "tsv", "gc_percent") == 0
+    assert out_file.read_text() == "\t".join(VALUE_COLUMNS) + "\n"
+
+
+def test_write_jsonl_keeps_value_types(tmp_path):
+    out_file = tmp_path / "out.jsonl"
+    write_results([("seq1", {"A": 3, "T": 1})], str(out_file), "jsonl", "base_count")
+    rows = [json.loads(line) for line in out_file.read_text().splitlines()]
+    assert rows == [{"sequence": "seq1", "method": "base_count", "field": "A", "value": 3},
+                    {"sequence": "seq1", "method": "base_count", "field": "T", "value": 1}]
+
+
+def test_write_parquet(orf_results, tmp_path):
+    pytest.importorskip("pyarrow")
+    import pandas as pd
+
+    out_file = tmp_path / "orfs.parquet"
+    write_results(orf_results, str(out_file), "parquet", "orf", chunk_rows=1)
+    table = pd.read_parquet(out_file)
+    assert list(table.columns) == list(ORF_COLUMNS)
+    assert table["start"].tolist() == [0, 9, 0]
+
+
+def test_write_unknown_format(tmp_path):
+    with pytest.raises(ValueError, match="Unsupported export format"):
+        write_results([], str(tmp_path / "out.xml"), "xml")
+
+
+def test_export_stream_table_format(tmp_path):
+    analyzer = BasicSequenceAnalysis()
+    fasta_file = tmp_path / "records.fasta"
+    fasta_file.write_text(">seq1\nATGCGC\n>seq2\nATAT\n")
+    out_file = tmp_path / "out.tsv"
+    analyzer.export_stream(analyzer.stream_sequences(str(fasta_file), "DNA", "gc_percent"), str(out_file), "tsv",
+                           "gc_percent")
+    assert out_file.read_text().splitlines()[1:] == ["seq1\tgc_percent\tvalue\t66.67 %", "seq2\tgc_percent\tvalue\t0.0 %"]
@@ -0,0 +1,115 @@
+import os
+import pytest
+
+from geneanalyzertool.core.exceptions import SequenceParsingError
+from geneanalyzertool.core.fasta_index import FaiEntry, FastaIndex, build_fai, index_path, read_fai
+from geneanalyzertool.core.file_handler import FileHandler
+
+FASTA = ">chr1 first record\nACGTACGTAC\nGTACGTACGT\nAC\n>chr2\nGGGG\n>empty\n>chr3\nTTTTT\nCC"
+
+
+@pytest.fixture
+def fasta_file(tmp_path):
+    path = tmp_path / "genome.fasta"
+    path.write_bytes(FASTA.encode())
+    return str(path)
+
+
+# ---------- building ----------
+def test_build_fai_matches_samtools_layout(fasta_file):
+    assert build_fai(fasta_file) == [
+        FaiEntry("chr1", 22, 19, 10, 11),
+        FaiEntry("chr2", 4, 50, 4, 5),
+        FaiEntry("empty", 0, 62, 0, 0),
+        FaiEntry("chr3", 7, 68, 5, 6),
+    ]
+
+
+def test_build_fai_windows_line_endings(tmp_path):
+    path = tmp_path / "crlf.fasta"
+    path.write_bytes(b">seq\r\nACG\r\nTA\r\n")
+    assert build_fai(str(path)) == [FaiEntry("seq", 5, 6, 3, 5)]
+    with FastaIndex(str(path)) as index:
+        assert index.fetch("seq") == "ACGTA"
+
+
+def test_build_fai_rejects_uneven_lines(tmp_path):
+    path = tmp_path / "uneven.fasta"
+    path.write_text(">seq\nACG\nA\nACG\n")
+    with pytest.raises(SequenceParsingError):
+        build_fai(str(path))
+
+
+def test_index_is_written_and_reused(fasta_file):
+    FastaIndex(fasta_file).close()
+    assert os.path.exists(index_path(fasta_file))
+    assert read_fai(index_path(fasta_file)) == build_fai(fasta_file)
+
+    with open(index_path(fasta_file), "a") as fai:
+        fai.write("extra\t1\t0\t1\t2\n")
+    with FastaIndex(fasta_file) as index:
+        assert "extra" in index
+    with FastaIndex(fasta_file, rebuild=True) as index:
+        assert "extra" not in index
+
+
+# ---------- fetching ----------
+def test_fetch_whole_records(fasta_file):
+    with FastaIndex(fasta_file) as index:
+        assert index.names == ["chr1", "chr2", "empty", "chr3"]
+        assert index.fetch("chr1") == "ACGTACGTACGTACGTACGTAC"
+        assert index.fetch("chr3") == "TTTTTCC"
+        assert index.fetch("empty") == ""
+        assert index.length("chr1") == 22
+
+
+def test_fetch_sub_ranges_across_lines(fasta_file):
+    with FastaIndex(fasta_file) as index:
+        full = index.fetch("chr1")
+        for start in range(len(full)):
+            for end in range(start, len(full) + 2):
+                assert index.fetch("chr1", start, end) == full[start:end]
+
+
+def test_fetch_region(fasta_file):
+    with FastaIndex(fasta_file) as index:
+        assert index.fetch_region("chr1:9-12") == "ACGT"
+        assert index.fetch_region("chr1:21") == "AC"
+        assert index.fetch_region("chr2") == "GGGG"
+        assert index.parse_region("chr1:1,000-2,000") == ("chr1", 999, 2000)
+
+
+def test_fetch_unknown_record(fasta_file):
+    with FastaIndex(fasta_file) as index:
+        with pytest.raises(SequenceParsingError):
+            index.fetch("chr9")
+        with pytest.raises(SequenceParsingError):
+            index.fetch_region("chr1:5-2")
+
+
+# ---------- file handler integration ----------
+def test_fetch_sequences(fasta_file):
+    fh = FileHandler()
+    sequences, keys = fh.fetch_sequences(fasta_file, ["chr2", "chr1:1-4"])
+    assert keys == ["chr2", "chr1:1-4"]
+    assert sequences == {"chr2": "GGGG", "chr1:1-4": "ACGT"}
+    assert fh.open_index(fasta_file) is fh.open_index(fasta_file)
+
+
+def test_non_ascii_record_names(tmp_path):
+    path = tmp_path / "latin1.fasta"
+    path.write_bytes(b">r\xe9c1 caf\xe9\nACGT\n>r2\nGGCC\n")
+    assert [entry.name for entry in build_fai(str(path))] == ["r\xe9c1", "r2"]
+
+    fh = FileHandler()
+    sequences, keys = fh.fetch_sequences(str(path), ["r2", "r\xe9c1:2-3"])
+    assert sequences == {"r2": "GGCC", "r\xe9c1:2-3": "CG"}
+    assert read_fai(index_path(str(path))) == build_fai(str(path))
+    assert [name for name, _ in fh.iter_sequences(str(path))] == ["r\xe9c1", "r2"]
+
+
+def test_select_sequences_with_index(fasta_file):
+    fh = FileHandler()
+    sequences, keys = fh.select_sequences(fasta_file, selection_func=lambda _: "4", use_index=True)
+    assert sequences == {"chr3": "TTTTTCC"}
+    assert keys == ["chr3"]
@@ -1,3 +1,5 @@
+import os
+
 import pytest
 from unittest.mock import patch
 from Bio.Seq import Seq
@@ -5,6 +7,7 @@ from Bio.SeqRecord import SeqRecord
 
 from geneanalyzertool.core.file_handler import FileHandler
 from geneanalyzertool.core.exceptions import SequenceParsingError
+from geneanalyzertool.core.selection import RecordSelection
 
 
 @pytest.fixture
@@ -31,14 +34,14 @@ def test_file_support_check_invalid(capsys):
 
 
 def test_read_sequences(mock_records):
-    fh = FileHandler()
+    fh = FileHandler(parser="biopython")
     with patch("Bio.SeqIO.parse", return_value=mock_records):
         seq_dict = fh.read_sequences("dummy.fasta")
     assert seq_dict == {"seq1": Seq("ATGC"), "seq2": Seq("GGGG")}
 
 
 def test_select_sequences_all(mock_records):
-    fh = FileHandler()
+    fh = FileHandler(parser="biopython")
     with patch("Bio.SeqIO.parse", return_value=mock_records):
         seq_dict, seq_keys = fh.select_sequences("dummy.fasta", selection_func=lambda _: "all")
     assert set(seq_dict.keys()) == {"seq1", "seq2"}
@@ -46,7 +49,7 @@ def test_select_sequences_all(mock_records):
 
 
 def test_select_sequences_by_number(mock_records):
-    fh = FileHandler()
+    fh = FileHandler(parser="biopython")
     with patch("Bio.SeqIO.parse", return_value=mock_records):
         seq_dict, seq_keys = fh.select_sequences("dummy.fasta", selection_func=lambda _: "2")
     assert seq_dict == {"seq2": Seq("GGGG")}
@@ -54,7 +57,7 @@ def test_select_sequences_by_number(mock_records):
 
 
 def test_select_sequences_invalid_then_valid(mock_records):
-    fh = FileHandler()
+    fh = FileHandler(parser="biopython")
     inputs = iter(["5", "1"])
     with patch("Bio.SeqIO.parse", return_value=mock_records):
         seq_dict, seq_keys = fh.select_sequences("dummy.fasta", selection_func=lambda _: next(inputs))
@@ -63,8 +66,74 @@ def test_select_sequences_invalid_then_valid(mock_records):
 
 
 def test_select_sequences_exceed_max_attempts(mock_records):
-    fh = FileHandler()
+    fh = FileHandler(parser="biopython")
     inputs = iter(["5", "0", "-1"])
     with patch("Bio.SeqIO.parse", return_value=mock_records):
         with pytest.raises(SequenceParsingError, match="Error: Maximum attempts exceeded. No valid sequences selected."):
             fh.select_sequences("dummy.fasta", selection_func=lambda _: next(inputs))
+
+
+def test_iter_sequences_is_lazy(mock_records):
+    fh = FileHandler(parser="biopython")
+    with patch("Bio.SeqIO.parse", return_value=iter(mock_records)):
+        records = fh.iter_sequences("dummy.fasta")
+        assert next(records) == ("seq1", Seq("ATGC"))
+        assert next(records) == ("seq2", Seq("GGGG"))
+        with pytest.raises(StopIteration):
+            next(records)
+
+
+@pytest.mark.parametrize("parser", ["native", "biopython"])
+def test_iter_sequence_chunks_groups_records(tmp_path, parser):
+    fasta_file = tmp_path / "records.fasta"
+    fasta_file.write_text(">dup\nACGTACG\n>dup\nTT\n>empty\n")
+    records = [(name, list(chunks)) for name, chunks in FileHandler(parser).iter_sequence_chunks(str(fasta_file), 3)]
+    assert records == [("dup", [b"ACG", b"TAC", b"G"]), ("dup", [b"TT"]), ("empty", [b""])]
+
+
+SELECTION_FASTA = ">chr1 first\nACGTACGTAC\nGT\n>chr2\nACG\n>plasmid_1\nGGGGCCCCGG\n>empty\n"
+
+
+@pytest.fixture
+def selection_fasta(tmp_path):
+    path = tmp_path / "selection.fasta"
+    path.write_text(SELECTION_FASTA)
+    return str(path)
+
+
+def test_selection_reads_only_selected_records_through_the_index(selection_fasta, monkeypatch):
+    fh = FileHandler(selection=RecordSelection(id_regex="^chr|plasmid", min_length=5))
+    monkeypatch.setattr("geneanalyzertool.core.file_handler.parse_sequences",
+                        lambda path: pytest.fail("the whole file was parsed"))
+    assert list(fh.iter_sequences(selection_fasta)) == [("chr1", b"ACGTACGTACGT"), ("plasmid_1", b"GGGGCCCCGG")]
+    assert os.path.exists(selection_fasta + ".fai")
+
+
+def test_select_sequences_with_a_selection_does_not_prompt(selection_fasta, capsys):
+    fh = FileHandler(selection=RecordSelection(ids=["chr2", "empty", "missing"]))
+    sequences, keys = fh.select_sequences(selection_fasta, selection_func=lambda prompt: pytest.fail("prompted"))
+    assert keys == ["chr2", "empty"]
+    assert sequences == {"chr2": b"ACG", "empty": b""}
+    assert capsys.readouterr().out == ""
+
+
+@pytest.mark.parametrize("chunk_size", [1, 5, 100])
+def test_selected_chunks_match_parsed_chunks(selection_fasta, chunk_size):
+    selection = RecordSelection(ids=["chr1", "empty"])
+    selected = [(name, list(chunks)) for name, chunks in
+                FileHandler(selection=selection).iter_sequence_chunks(selection_fasta, chunk_size)]
+    parsed = [(name, list(chunks)) for name, chunks in FileHandler().iter_sequence_chunks(selection_fasta, chunk_size)]
+    assert selected == [record for record in parsed if record[0] in ("chr1", "empty")]
+
+
+def test_selection_without_an_index(tmp_path):
+    path = tmp_path / "reads.fastq"
+    path.write_text("@read1\nACGT\n+\nIIII\n@read2\nACGTACGT\n+\nIIIIIIII\n@other\nAC\n+\nII\n")
+    fh = FileHandler(selection=RecordSelection(id_regex="^read", max_length=4))
+    assert list(fh.iter_sequences(str(path))) == [("read1", b"ACGT")]
+
+    by_id = FileHandler(selection=RecordSelection(ids=["read2"]))
+    assert [(name, b"".join(chunks)) for name, chunks in by_id.iter_sequence_chunks(str(path), 3)] == \
+        [("read2", b"ACGTACGT")]
+    with pytest.raises(SequenceParsingError):
+        list(fh.iter_sequence_chunks(str(path), 3))
@@ -0,0 +1,33 @@
+from geneanalyzertool.core.manifest import ResultManifest, manifest_path, record_digest
+
+CONFIG = {"mode": "basic", "seq_type": "DNA", "analysis_method": "gc_percent", "method_options": {}}
+
+
+def test_digest_does_not_depend_on_chunking():
+    assert record_digest([b"ACGTACGT"]) == record_digest([b"ACG", b"TAC", b"GT"]) == record_digest(["ACGTACGT"])
+    assert record_digest([b"ACGTACGT"]) != record_digest([b"ACGTACGA"])
+
+
+def test_manifest_round_trip(tmp_path):
+    path = manifest_path(str(tmp_path / "out.txt"))
+    assert path.endswith("out.txt.manifest")
+    digest = record_digest([b"ACGT"])
+    ResultManifest(path, CONFIG).save([("seq1", digest, 50.0)])
+
+    manifest = ResultManifest(path, CONFIG)
+    assert manifest.lookup("seq1", digest) == (True, 50.0)
+    assert manifest.lookup("seq1", record_digest([b"ACGA"])) == (False, None)
+    assert manifest.lookup("seq2", digest) == (False, None)
+
+
+def test_manifest_of_another_configuration_is_ignored(tmp_path):
+    path = str(tmp_path / "out.txt.manifest")
+    digest = record_digest([b"ACGT"])
+    ResultManifest(path, CONFIG).save([("seq1", digest, 50.0)])
+    assert ResultManifest(path, {**CONFIG, "analysis_method": "base_count"}).lookup("seq1", digest) == (False, None)
+
+
+def test_unreadable_manifest_is_ignored(tmp_path):
+    path = tmp_path / "out.txt.manifest"
+    path.write_bytes(b"not a pickle")
+    assert ResultManifest(str(path), CONFIG).records == {}
@@ -0,0 +1,124 @@
+import json
+import pstats
+import time
+
+import pytest
+
+from geneanalyzertool.core.metrics import RunMetrics, SamplingProfiler, peak_rss_bytes, profiled
+
+
+def busy(seconds: float) -> int:
+    end = time.process_time() + seconds
+    total = 0
+    while time.process_time() < end:
+        total += sum(range(100))
+    return total
+
+
+# ---------- stages ----------
+def test_nested_stages_are_booked_exclusively():
+    metrics = RunMetrics()
+    with metrics.stage("export"):
+        busy(0.02)
+        with metrics.stage("analyze"):
+            busy(0.05)
+    with metrics.stage("analyze"):
+        busy(0.01)
+
+    stages = metrics.summary()["stages"]
+    assert stages["analyze"]["calls"] == 2
+    assert stages["export"]["calls"] == 1
+    assert stages["analyze"]["cpu_s"] >= 0.06
+    assert 0.02 <= stages["export"]["cpu_s"] < 0.05
+
+
+def test_stage_is_booked_when_the_block_raises():
+    metrics = RunMetrics()
+    with pytest.raises(ValueError):
+        with metrics.stage("read"):
+            raise ValueError
+    assert metrics.summary()["stages"]["read"]["calls"] == 1
+
+
+def test_timed_books_each_item_and_passes_it_through():
+    metrics = RunMetrics()
+
+    def produce():
+        for i in range(3):
+            busy(0.01)
+            yield i
+
+    with metrics.stage("export"):
+        assert list(metrics.timed("read", produce())) == [0, 1, 2]
+
+    stages = metrics.summary()["stages"]
+    # One call per item plus the one ending the iteration.
+    assert stages["read"]["calls"] == 4
+    assert stages["read"]["cpu_s"] >= 0.03
+    assert stages["export"]["cpu_s"] < stages["read"]["cpu_s"]
+
+
+# ---------- summary ----------
+def test_summary_rates_and_counters():
+    metrics = RunMetrics()
+    metrics.count(2, 1000)
+    metrics.count(bases=500)
+    busy(0.01)
+    summary = metrics.summary()
+    assert summary["records"] == 3
+    assert summary["bases"] == 1500
+    assert summary["bases_per_s"] == pytest.approx(1500 / summary["wall_s"], rel=0.01)
+    assert summary["unattributed_wall_s"] == pytest.approx(summary["wall_s"], abs=1e-3)
+    assert summary["peak_rss_bytes"] > 1024 * 1024
+
+
+def test_peak_rss_is_in_bytes():
+    assert 1024 * 1024 < peak_rss_bytes() < 1024 ** 4
+
+
+def test_write(tmp_path, capsys):
+    metrics = RunMetrics()
+    with metrics.stage("analyze"):
+        pass
+    path = tmp_path / "metrics.json"
+    metrics.write(str(path))
+    assert json.loads(path.read_text())["stages"]["analyze"]["calls"] == 1
+
+    metrics.write("-")
+    assert json.loads(capsys.readouterr().err)["records"] == 0
+
+
+# ---------- profiles ----------
+def test_cprofile_dump(tmp_path):
+    path = tmp_path / "run.prof"
+    with profiled(str(path)):
+        busy(0.01)
+    functions = {function for _, _, function in pstats.Stats(str(path)).stats}
+    assert "busy" in functions
+
+
+def test_sampling_profile_writes_folded_stacks(tmp_path):
+    path = tmp_path / "run.folded"
+    with profiled(str(path), "sample"):
+        busy(0.2)
+
+    lines = path.read_text().splitlines()
+    assert lines
+    stack, count = lines[0].rsplit(" ", 1)
+    assert int(count) > 0
+    assert any("busy (test_metrics.py:" in line for line in lines)
+
+
+def test_sampling_profiler_restores_the_signal_handler():
+    import signal
+    previous = signal.getsignal(signal.SIGPROF)
+    sampler = SamplingProfiler()
+    sampler.start()
+    sampler.stop()
+    assert signal.getsignal(signal.SIGPROF) == previous
+
+
+def test_unknown_profile_mode(tmp_path):
+    with pytest.raises(ValueError, match="Unknown profile mode"):
+        with profiled(str(tmp_path / "run.prof"), "perf"):
+            pass
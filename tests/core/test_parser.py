@@ -0,0 +1,121 @@
+import io
+import gzip
+import random
+import pytest
+from Bio import SeqIO
+
+from geneanalyzertool.core.exceptions import SequenceParsingError
+from geneanalyzertool.core.parser import (
+    parse_fasta, parse_fasta_chunks, parse_fastq, parse_sequence_chunks, parse_sequences, sequence_format
+)
+
+FASTA = b"; comment before the first record\n>seq1 first record\nACGT\nAC\n>empty\n>seq3\r\nTT GG\r\nCC\r\n>last\nAAA"
+FASTQ = b"@read1 lane 1\nACGTN\n+\nIIIII\n@read2\nGG\n+read2\n#I\n"
+
+
+def biopython_records(data: bytes, file_format: str = "fasta"):
+    return [(record.id, str(record.seq).encode()) for record in SeqIO.parse(io.StringIO(data.decode()), file_format)]
+
+
+# ---------- fasta ----------
+def test_parse_fasta():
+    assert list(parse_fasta(io.BytesIO(FASTA))) == [
+        ("seq1", b"ACGTAC"), ("empty", b""), ("seq3", b"TTGGCC"), ("last", b"AAA")
+    ]
+
+
+@pytest.mark.parametrize("block_size", [1, 2, 3, 5, 7, 64])
+def test_parse_fasta_block_boundaries(block_size):
+    assert list(parse_fasta(io.BytesIO(FASTA), block_size)) == list(parse_fasta(io.BytesIO(FASTA)))
+
+
+def test_parse_fasta_matches_biopython():
+    rng = random.Random(0)
+    records = []
+    for index in range(200):
+        sequence = "".join(rng.choice("ACGTN") for _ in range(rng.randrange(0, 300)))
+        width = rng.randrange(1, 80)
+        lines = [sequence[i:i + width] for i in range(0, len(sequence), width)]
+        records.append(f">rec{index} description {index}\n" + "".join(line + "\n" for line in lines))
+    data = "".join(records).encode()
+
+    for block_size in (13, 4096):
+        assert list(parse_fasta(io.BytesIO(data), block_size)) == biopython_records(data)
+
+
+def test_parse_fasta_header_without_newline():
+    assert list(parse_fasta(io.BytesIO(b">a\nAC\n>b"))) == [("a", b"AC"), ("b", b"")]
+
+
+def test_parse_fasta_empty_input():
+    assert list(parse_fasta(io.BytesIO(b""))) == []
+
+
+# ---------- chunks ----------
+def joined_chunks(pieces) -> list:
+    records = []
+    for name, offset, chunk in pieces:
+        if offset == 0:
+            records.append((name, b""))
+        assert offset == len(records[-1][1])
+        records[-1] = (name, records[-1][1] + chunk)
+    return records
+
+
+@pytest.mark.parametrize("chunk_bases, block_size", [(1, 1), (2, 3), (4, 7), (5, 64), (1000, 5)])
+def test_parse_fasta_chunks_reassemble_records(chunk_bases, block_size):
+    pieces = list(parse_fasta_chunks(io.BytesIO(FASTA), chunk_bases, block_size))
+    assert all(len(chunk) <= chunk_bases for _, _, chunk in pieces)
+    assert joined_chunks(pieces) == list(parse_fasta(io.BytesIO(FASTA)))
+
+
+def test_parse_fasta_chunks_sizes():
+    assert list(parse_fasta_chunks(io.BytesIO(b">a\nACGTA\nCG\n>b\n>c\nTT"), 3)) == [
+        ("a", 0, b"ACG"), ("a", 3, b"TAC"), ("a", 6, b"G"), ("b", 0, b""), ("c", 0, b"TT")
+    ]
+
+
+def test_parse_sequence_chunks_of_fastq(tmp_path):
+    fastq_file = tmp_path / "reads.fastq"
+    fastq_file.write_bytes(FASTQ)
+    assert list(parse_sequence_chunks(str(fastq_file), 2)) == [
+        ("read1", 0, b"AC"), ("read1", 2, b"GT"), ("read1", 4, b"N"), ("read2", 0, b"GG")
+    ]
+
+
+def test_parse_sequence_chunks_invalid_size(tmp_path):
+    fasta_file = tmp_path / "records.fasta"
+    fasta_file.write_bytes(FASTA)
+    with pytest.raises(ValueError):
+        list(parse_sequence_chunks(str(fasta_file), 0))
+
+
+# ---------- fastq ----------
+def test_parse_fastq():
+    assert list(parse_fastq(io.BytesIO(FASTQ))) == [("read1", b"ACGTN"), ("read2", b"GG")]
+    assert list(parse_fastq(io.BytesIO(FASTQ))) == biopython_records(FASTQ, "fastq")
+
+
+def test_parse_fastq_quality_length_mismatch():
+    with pytest.raises(SequenceParsingError, match="quality lengths differ"):
+        list(parse_fastq(io.BytesIO(b"@read\nACGT\n+\nII\n")))
+
+
+def test_parse_fastq_missing_separator():
+    with pytest.raises(SequenceParsingError, match="separator"):
+        list(parse_fastq(io.BytesIO(b"@read\nACGT\nIIII\n")))
+
+
+# ---------- files ----------
+def test_parse_sequences_detects_format(tmp_path):
+    fasta_file = tmp_path / "records.txt"
+    fasta_file.write_bytes(FASTA[FASTA.index(b">"):])
+    fastq_file = tmp_path / "reads.fq.gz"
+    with gzip.open(fastq_file, "wb") as out:
+        out.write(FASTQ)
+
+    assert sequence_format(str(fasta_file)) == "fasta"
+    assert sequence_format(str(fastq_file)) == "fastq"
+    assert sequence_format("missing.fastq") == "fastq"
+    assert [name for name, _ in parse_sequences(str(fasta_file))] == ["seq1", "empty", "seq3", "last"]
+    assert list(parse_sequences(str(fastq_file))) == [("read1", b"ACGTN"), ("read2", b"GG")]
@@ -0,0 +1,45 @@
+import pytest
+
+from geneanalyzertool.core.selection import RecordSelection, read_id_list
+
+
+def test_read_id_list_from_a_list():
+    assert read_id_list("chr1, chr2,,chrX") == ["chr1", "chr2", "chrX"]
+
+
+def test_read_id_list_from_a_file(tmp_path):
+    path = tmp_path / "ids.txt"
+    path.write_text("# wanted records\nchr1\n\n>chr2 second chromosome\n  chrX  \n")
+    assert read_id_list(str(path)) == ["chr1", "chr2", "chrX"]
+
+
+def test_selection_matches_every_criterion():
+    selection = RecordSelection(ids=["contig_1", "contig_2", "scaffold_1"], id_regex=r"^contig_", min_length=100,
+                                max_length=200)
+    assert selection.matches("contig_1", 100)
+    assert selection.matches("contig_2", 200)
+    assert not selection.matches("contig_1", 99)
+    assert not selection.matches("contig_2", 201)
+    assert not selection.matches("scaffold_1", 150)
+    assert not selection.matches("contig_3", 150)
+    assert selection.by_length
+
+
+def test_regex_is_searched_anywhere_in_the_id():
+    selection = RecordSelection(id_regex="plasmid")
+    assert selection.matches_id("NZ_CP0001_plasmid_2")
+    assert not selection.matches_id("NZ_CP0001")
+    assert not selection.by_length
+
+
+def test_invalid_selections():
+    with pytest.raises(ValueError):
+        RecordSelection(id_regex="chr(")
+    with pytest.raises(ValueError):
+        RecordSelection(min_length=10, max_length=5)
+
+
+def test_to_dict_round_trip():
+    selection = RecordSelection(ids={"b", "a"}, id_regex="a|b", min_length=1)
+    copy = RecordSelection(**selection.to_dict())
+    assert (copy.ids, copy.id_regex, copy.min_length, copy.max_length) == ({"a", "b"}, "a|b", 1, None)
@@ -0,0 +1,44 @@
+import pytest
+from Bio import SeqIO
+
+from geneanalyzertool.core.synthetic import parse_size, record_lengths, synthetic_sequence, write_synthetic_fasta
+
+
+def test_parse_size():
+    assert parse_size("1k") == 1000
+    assert parse_size("10M") == 10_000_000
+    assert parse_size("1.5kb") == 1500
+    assert parse_size(42) == 42
+
+
+def test_parse_size_invalid():
+    with pytest.raises(ValueError):
+        parse_size("lots")
+
+
+def test_synthetic_sequence_is_deterministic():
+    assert synthetic_sequence("DNA", 100, seed=1) == synthetic_sequence("DNA", 100, seed=1)
+    assert synthetic_sequence("DNA", 100, seed=1) != synthetic_sequence("DNA", 100, seed=2)
+
+
+def test_synthetic_sequence_alphabets():
+    assert set(synthetic_sequence("DNA", 1000)) == set("ACGT")
+    assert set(synthetic_sequence("RNA", 1000)) == set("ACGU")
+    assert set(synthetic_sequence("Protein", 1000)) <= set("ACDEFGHIKLMNPQRSTVWY")
+
+
+def test_synthetic_sequence_unknown_type():
+    with pytest.raises(ValueError):
+        synthetic_sequence("XNA", 10)
+
+
+def test_record_lengths():
+    assert record_lengths(10, 3) == [4, 3, 3]
+
+
+def test_write_synthetic_fasta(tmp_path):
+    path = tmp_path / "synthetic.fasta"
+    write_synthetic_fasta(str(path), "DNA", 1001, records=4, line_width=7)
+    records = list(SeqIO.parse(str(path), "fasta"))
+    assert [len(record.seq) for record in records] == [251, 250, 250, 250]
+    assert all(len(line) <= 7 for line in path.read_text().splitlines() if not line.startswith(">"))
@@ -0,0 +1,32 @@
+import numpy as np
+
+# Helpers shared by the test modules.
+
+
+def random_sequence(size: int, seed: int = 3, alphabet: str = "ACGT", p: list | None = None) -> str:
+    """Reproducible random sequence of size symbols drawn from alphabet, with probabilities p (uniform by default)."""
+    return "".join(np.random.default_rng(seed).choice(list(alphabet), size=size, p=p))
+
+
+def substitute(sequence: str, rate: float, seed: int = 5) -> str:
+    """Replaces every base with a random base (possibly the same one) with probability rate."""
+    rng = np.random.default_rng(seed)
+    bases = np.array(list(sequence))
+    mutated = rng.random(len(bases)) < rate
+    bases[mutated] = rng.choice(list("ACGT"), size=mutated.sum())
+    return "".join(bases)
+
+
+def edit(sequence: str, edits: int, seed: int) -> str:
+    """Applies edits random substitutions, deletions and insertions of single bases."""
+    rng = np.random.default_rng(seed)
+    bases = list(sequence)
+    for _ in range(edits):
+        position, kind = rng.integers(len(bases)), rng.integers(3)
+        if kind == 0:
+            bases[position] = rng.choice(list("ACGT"))
+        elif kind == 1:
+            del bases[position]
+        else:
+            bases.insert(position, rng.choice(list("ACGT")))
+    return "".join(bases)